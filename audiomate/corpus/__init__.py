@@ -7,6 +7,7 @@ assets used in a corpus in :py:mod:`audiomate.corpus.assets`.
 from .base import CorpusView  # noqa: F401
 
 from .corpus import Corpus  # noqa: F401
+from .sqlite_corpus import SqliteCorpus  # noqa: F401
 
 from audiomate.corpus.subset.subview import Subview  # noqa: F401
 from audiomate.corpus.subset.subview import MatchingUtteranceIdxFilter  # noqa: F401
@@ -4,6 +4,8 @@ The assets module contains data-structures that are contained in a corpus.
 
 from .file import File  # noqa: F401
 from .utterance import Utterance  # noqa: F401
+from .utterance import LabelListDict  # noqa: F401
+from .utterance import PendingLabelLists  # noqa: F401
 
 from .issuer import Gender  # noqa: F401
 from .issuer import AgeGroup  # noqa: F401
@@ -13,6 +15,12 @@ from .issuer import Artist  # noqa: F401
 
 from .label import Label  # noqa: F401
 from .label import LabelList  # noqa: F401
+from .label_store import LabelStore  # noqa: F401
+from .label_store import LabelView  # noqa: F401
+from .label_store import LabelListView  # noqa: F401
 
 from .features import FeatureContainer  # noqa: F401
 from .features import PartitioningFeatureIterator  # noqa: F401
+from .features import FeatureTargetIterator  # noqa: F401
+from .loader import ParallelFeatureLoader  # noqa: F401
+from .sampling import WeightedFeatureSampler  # noqa: F401
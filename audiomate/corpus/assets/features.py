@@ -4,7 +4,9 @@ import re
 import h5py
 import numpy as np
 
+from audiomate.corpus.utils import label_encoding
 from audiomate.utils import stats
+from audiomate.utils import units
 
 
 class FeatureContainer(object):
@@ -264,6 +266,18 @@ class PartitioningFeatureIterator(object):
                             will be considered.
         excludes(iterable): Iterable of names of data sets to skip when iterating over the feature container. Mutually
                             exclusive with ``includes``. If both are specified, only ``includes`` will be considered.
+        rank(int): Index of the worker this iterator is used in, when the data is distributed over multiple workers
+                   (e.g. for data-parallel training). Has to be in the range ``[0, world_size)``.
+        world_size(int): Total number of workers the data is distributed over. If greater than 1, every worker only
+                         reads its own share of the partitions. The partitions are assigned deterministically, so that
+                         every worker gets roughly the same number of bytes.
+        epoch(int): Number of the current epoch. It is added to the seed, so the data is shuffled and distributed
+                    differently in every epoch, while all workers still agree on the assignment.
+
+    Note:
+        When distributing the data over multiple workers with ``shuffle=True``, a ``seed`` has to be given,
+        so every worker computes the same partitions. The partition is the unit of distribution, so the
+        ``partition_size`` should be chosen small enough to yield at least a few partitions per worker.
 
     Example:
         >>> import h5py
@@ -283,11 +297,20 @@ class PartitioningFeatureIterator(object):
 
     PARTITION_SIZE_PATTERN = re.compile('^([0-9]+(\.[0-9]+)?)([gmk])?$', re.I)
 
-    def __init__(self, hdf5file, partition_size, shuffle=True, seed=None, includes=None, excludes=None):
+    def __init__(self, hdf5file, partition_size, shuffle=True, seed=None, includes=None, excludes=None,
+                 rank=0, world_size=1, epoch=0):
+        if world_size < 1 or not 0 <= rank < world_size:
+            raise ValueError('Invalid rank {} for world size {}'.format(rank, world_size))
+
+        if world_size > 1 and shuffle and seed is None:
+            raise ValueError('A seed is required to shuffle the data distributed over multiple workers')
+
         self._file = hdf5file
         self._partition_size = self._parse_partition_size(partition_size)
         self._shuffle = shuffle
-        self._seed = seed
+        self._seed = None if seed is None else seed + epoch
+        self._rank = rank
+        self._world_size = world_size
 
         data_sets = self._filter_data_sets(hdf5file.keys(), includes=includes, excludes=excludes)
         if shuffle:
@@ -295,15 +318,81 @@ class PartitioningFeatureIterator(object):
 
         self._data_sets = tuple(data_sets)
         self._partitions = []
+        self._num_records = {}
         self._partition_idx = 0
         self._partition_data = None
+        self._resume_position = 0
 
         self._partition()
 
     def __iter__(self):
         return self
 
+    def state_dict(self):
+        """
+        Return the current state of the iterator, which can be used to resume the iteration later on
+        (e.g. after restarting a training job) with :py:meth:`load_state_dict`.
+        The state only contains builtin types, so it can be stored along with other checkpoint data.
+
+        Returns:
+            dict: The state containing the seed, the order of data sets and partitions,
+            the index of the current partition and the position within the current partition.
+        """
+        if self._partition_data is None:
+            partition_idx = self._partition_idx
+            position = self._resume_position
+        elif not self._partition_data.has_next():
+            partition_idx = self._partition_idx
+            position = 0
+        else:
+            partition_idx = self._partition_idx - 1
+            position = self._partition_data.position
+
+        return {
+            'seed': self._seed,
+            'shuffle': self._shuffle,
+            'data_sets': list(self._data_sets),
+            'partitions': [[list(start), list(end)] for start, end in self._partitions],
+            'partition_idx': partition_idx,
+            'position': position
+        }
+
+    def load_state_dict(self, state):
+        """
+        Restore the state of the iterator from a state created with :py:meth:`state_dict`.
+        The iteration continues with the next feature that wasn't emitted at the time the state was created.
+        Partitions that were already consumed completely aren't read again.
+
+        Args:
+            state (dict): The state to restore.
+        """
+        missing_data_sets = [dset for dset in state['data_sets'] if dset not in self._file]
+
+        if len(missing_data_sets) > 0:
+            raise ValueError('Data sets {} of the state are missing in the file'.format(', '.join(missing_data_sets)))
+
+        self._seed = state['seed']
+        self._shuffle = state['shuffle']
+        self._data_sets = tuple(state['data_sets'])
+        self._partitions = [(tuple(start), tuple(end)) for start, end in state['partitions']]
+        self._partition_idx = state['partition_idx']
+        self._resume_position = state['position']
+        self._partition_data = None
+        gc.collect()
+
     def __next__(self):
+        partition = self._current_partition()
+
+        if partition is None:
+            raise StopIteration
+
+        return next(partition)
+
+    def _current_partition(self):
+        """
+        Return the partition that still has data to emit, loading the next partition if the current one is exhausted.
+        Returns ``None`` if all partitions have been consumed.
+        """
         if self._partition_data is None or not self._partition_data.has_next():
             if self._partition_data is not None:
                 self._partition_data = None
@@ -311,10 +400,7 @@ class PartitioningFeatureIterator(object):
 
             self._partition_data = self._load_next_partition()
 
-            if self._partition_data is None:
-                raise StopIteration
-
-        return next(self._partition_data)
+        return self._partition_data
 
     def _load_next_partition(self):
         if len(self._partitions) == self._partition_idx:
@@ -323,28 +409,44 @@ class PartitioningFeatureIterator(object):
         start, end = self._partitions[self._partition_idx]
         self._partition_idx += 1
 
+        partition = self._create_partition(self._read_slices(start, end))
+
+        if self._resume_position > 0:
+            partition.seek(self._resume_position)
+            self._resume_position = 0
+
+        return partition
+
+    def _read_slices(self, start, end):
         start_dset_name, start_idx = start
         end_dset_name, end_idx = end
 
+        if start_dset_name == end_dset_name:
+            return [self._read_slice(start_dset_name, start_idx, end_idx)]
+
         start_dset_idx = self._data_sets.index(start_dset_name)
         end_dset_idx = self._data_sets.index(end_dset_name)
 
-        if start_dset_name == end_dset_name:
-            slices = [DataSetSlice(start_dset_name, start_idx, self._file[start_dset_name][start_idx:end_idx])]
-            return Partition(slices, shuffle=self._shuffle, seed=self._seed)
-
-        slices = [DataSetSlice(start_dset_name, start_idx, self._file[start_dset_name][start_idx:])]
+        slices = [self._read_slice(start_dset_name, start_idx, self._num_records[start_dset_name])]
 
         middle_dsets = self._data_sets[start_dset_idx + 1:end_dset_idx]
         for dset in middle_dsets:
-            slices.append(DataSetSlice(dset, 0, self._file[dset][:]))
+            if self._num_records.get(dset, 0) > 0:
+                slices.append(self._read_slice(dset, 0, self._num_records[dset]))
+
+        slices.append(self._read_slice(end_dset_name, 0, end_idx))
 
-        slices.append(DataSetSlice(end_dset_name, 0, self._file[end_dset_name][:end_idx]))
+        return slices
 
+    def _read_slice(self, dset_name, start_idx, end_idx):
+        return DataSetSlice(dset_name, start_idx, self._file[dset_name][start_idx:end_idx])
+
+    def _create_partition(self, slices):
         return Partition(slices, shuffle=self._shuffle, seed=self._seed)
 
     def _partition(self):
         dset_props = self._scan()
+        self._num_records = {props.name: props.num_of_records for props in dset_props}
 
         start = None
         partition_free_space = self._partition_size
@@ -394,6 +496,46 @@ class PartitioningFeatureIterator(object):
         if self._shuffle:
             _random_state(self._seed).shuffle(self._partitions)
 
+        if self._world_size > 1:
+            self._partitions = self._select_partitions_of_rank(dset_props)
+
+    def _select_partitions_of_rank(self, dset_props):
+        """
+        Distribute the partitions over all workers and return the partitions of the own rank (in the same order).
+        The partitions are assigned greedily (largest first) to the worker with the least number of bytes so far.
+        """
+        record_sizes = {props.name: props.record_size for props in dset_props}
+        partition_bytes = [self._num_bytes_of_partition(start, end, record_sizes) for start, end in self._partitions]
+
+        worker_bytes = [0] * self._world_size
+        own_partitions = set()
+
+        for index in sorted(range(len(self._partitions)), key=lambda i: (-partition_bytes[i], i)):
+            worker = worker_bytes.index(min(worker_bytes))
+            worker_bytes[worker] += partition_bytes[index]
+
+            if worker == self._rank:
+                own_partitions.add(index)
+
+        return [partition for index, partition in enumerate(self._partitions) if index in own_partitions]
+
+    def _num_bytes_of_partition(self, start, end, record_sizes):
+        start_dset_name, start_idx = start
+        end_dset_name, end_idx = end
+
+        if start_dset_name == end_dset_name:
+            return (end_idx - start_idx) * record_sizes[start_dset_name]
+
+        start_dset_idx = self._data_sets.index(start_dset_name)
+        end_dset_idx = self._data_sets.index(end_dset_name)
+
+        num_bytes = (self._num_records[start_dset_name] - start_idx) * record_sizes[start_dset_name]
+
+        for dset in self._data_sets[start_dset_idx + 1:end_dset_idx]:
+            num_bytes += self._num_records.get(dset, 0) * record_sizes.get(dset, 0)
+
+        return num_bytes + end_idx * record_sizes[end_dset_name]
+
     def _scan(self):
         dset_props = []
 
@@ -451,6 +593,148 @@ class PartitioningFeatureIterator(object):
         return [data_set for data_set in data_sets if data_set not in excludes]
 
 
+class FeatureTargetIterator(PartitioningFeatureIterator):
+    """
+    Iterates over the features of a :py:class:`FeatureContainer` together with the frame-wise targets
+    of the corresponding utterances.
+
+    The targets are computed once for every utterance before iterating, using a label encoder
+    (:py:mod:`audiomate.corpus.utils.label_encoding`) that is configured with the ``frame_size``, ``hop_size``
+    and ``sampling_rate`` of the container. The computed targets are cached in memory. If a ``target_container`` is
+    given, targets that already exist in it are reused and missing ones are computed and stored there,
+    so subsequent iterators don't have to compute them again.
+
+    Partitioning and shuffling work the same way as in :py:class:`PartitioningFeatureIterator`, except that the data is
+    emitted as tuples ``(features, targets)`` containing ``batch_size`` frames each. Only the last batch may contain
+    fewer frames. If the number of frames of the features and the targets of an utterance differ,
+    only the frames present in both are used.
+
+    Args:
+        container (FeatureContainer): The (opened) feature-container to read the features from.
+        corpus (CorpusView): The corpus containing the utterances the features belong to.
+        labels (list): List of labels (str) which should be considered by the encoder.
+        partition_size (str): Size of the partitions in bytes (see :py:class:`PartitioningFeatureIterator`).
+                              Only the size of the features is considered.
+        batch_size (int): Number of frames per emitted batch.
+        label_list_idx (str): The idx of the label-list to create the targets from.
+        encoder_cls (class): The encoder class to use for creating the targets
+                             (e.g. :py:class:`audiomate.corpus.utils.label_encoding.FrameOrdinalEncoder`).
+        target_container (FeatureContainer): An (opened) feature-container to cache the targets in. (Optional)
+        shuffle (bool): Indicates whether the frames should be returned in random order (``True``) or not (``False``).
+        seed (int): Seed to be used for the random number generator.
+        includes (iterable): Iterable of names of data sets that should be included.
+        excludes (iterable): Iterable of names of data sets to skip.
+        rank (int): Index of the worker this iterator is used in (see :py:class:`PartitioningFeatureIterator`).
+        world_size (int): Total number of workers the data is distributed over.
+        epoch (int): Number of the current epoch.
+
+    Example:
+        >>> container = FeatureContainer('/path/to/features')
+        >>> container.open()
+        >>> iterator = FeatureTargetIterator(container, corpus, ['music', 'speech'], '1g', batch_size=256)
+        >>> features, targets = next(iterator)
+        >>> features.shape, targets.shape
+        ((256, 40), (256, 2))
+    """
+
+    def __init__(self, container, corpus, labels, partition_size, batch_size=1, label_list_idx='default',
+                 encoder_cls=label_encoding.FrameOneHotEncoder, target_container=None, shuffle=True, seed=None,
+                 includes=None, excludes=None, rank=0, world_size=1, epoch=0):
+        container._check_is_open()
+
+        if batch_size < 1:
+            raise ValueError('The batch size has to be at least 1.')
+
+        self._corpus = corpus
+        self._batch_size = batch_size
+        self._label_list_idx = label_list_idx
+        self._encoder = encoder_cls(labels,
+                                    units.FrameSettings(container.frame_size, container.hop_size),
+                                    sr=container.sampling_rate)
+
+        data_sets = self._filter_data_sets(container.keys(), includes=includes, excludes=excludes)
+        self._targets = self._compute_targets(data_sets, target_container)
+
+        super(FeatureTargetIterator, self).__init__(container._file, partition_size, shuffle=shuffle, seed=seed,
+                                                    includes=includes, excludes=excludes, rank=rank,
+                                                    world_size=world_size, epoch=epoch)
+
+    @property
+    def targets(self):
+        """
+        Return the precomputed targets.
+
+        Returns:
+            dict: A dictionary containing the targets (numpy.ndarray) with the utterance-idx as key.
+        """
+        return self._targets
+
+    def __next__(self):
+        features = []
+        targets = []
+        num_frames = 0
+
+        while num_frames < self._batch_size:
+            partition = self._current_partition()
+
+            if partition is None:
+                break
+
+            batch_features, batch_targets = partition.next_batch(self._batch_size - num_frames)
+            features.append(batch_features)
+            targets.append(batch_targets)
+            num_frames += batch_features.shape[0]
+
+        if num_frames == 0:
+            raise StopIteration
+
+        if len(features) == 1:
+            return features[0], targets[0]
+
+        return np.concatenate(features), np.concatenate(targets)
+
+    def _compute_targets(self, data_sets, target_container):
+        targets = {}
+        missing = []
+
+        for utt_idx in data_sets:
+            utt_targets = None
+
+            if target_container is not None:
+                utt_targets = target_container.get(utt_idx, mem_map=False)
+
+            if utt_targets is None:
+                missing.append(self._corpus.utterances[utt_idx])
+            else:
+                targets[utt_idx] = utt_targets
+
+        # The targets of all missing utterances are computed at once
+        encoded = self._encoder.encode_utterances(missing, label_list_idx=self._label_list_idx)
+
+        for utterance, utt_targets in zip(missing, encoded):
+            if target_container is not None:
+                target_container.set(utterance.idx, utt_targets)
+
+            targets[utterance.idx] = utt_targets
+
+        return targets
+
+    def _scan(self):
+        dset_props = []
+
+        for props in super(FeatureTargetIterator, self)._scan():
+            props.num_of_records = min(props.num_of_records, len(self._targets[props.name]))
+
+            if props.num_of_records > 0:
+                dset_props.append(props)
+
+        return dset_props
+
+    def _create_partition(self, slices):
+        targets = [self._targets[s.data_set_name][s.start_index:s.start_index + s.length] for s in slices]
+        return BatchPartition(slices, targets, shuffle=self._shuffle, seed=self._seed)
+
+
 class DataSetProperties:
     def __init__(self, name, num_of_records, record_size):
         self.name = name
@@ -497,6 +781,42 @@ class Partition:
     def has_next(self):
         return self._index < self._total_length
 
+    @property
+    def position(self):
+        return self._index
+
+    def seek(self, position):
+        self._index = min(position, self._total_length)
+
+
+class BatchPartition:
+    def __init__(self, slices, targets, shuffle=True, seed=None):
+        self._features = np.concatenate([item.data for item in slices])
+        self._targets = np.concatenate(targets)
+        self._total_length = self._features.shape[0]
+        self._index = 0
+
+        if shuffle:
+            self._elements = _random_state(seed).permutation(self._total_length)
+        else:
+            self._elements = np.arange(0, self._total_length)
+
+    def next_batch(self, max_size):
+        indices = self._elements[self._index:self._index + max_size]
+        self._index += len(indices)
+
+        return self._features[indices], self._targets[indices]
+
+    def has_next(self):
+        return self._index < self._total_length
+
+    @property
+    def position(self):
+        return self._index
+
+    def seek(self, position):
+        self._index = min(position, self._total_length)
+
 
 class DataSetSlice:
     def __init__(self, data_set_name, start_index, data):
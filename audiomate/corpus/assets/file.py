@@ -1,3 +1,5 @@
+import copy
+
 import librosa
 import audioread
 
@@ -10,11 +12,37 @@ class File(object):
         idx (str): A unique identifier within a corpus for the file.
         path (str): The path to the file.
     """
-    __slots__ = ['idx', 'path']
+    __slots__ = ['idx', '_path', '_corpus']
 
     def __init__(self, idx, path):
         self.idx = idx
-        self.path = path
+        self._path = path
+
+        # The corpus the file was added to, changes are reported to it
+        self._corpus = None
+
+    def __deepcopy__(self, memo):
+        # The copy only belongs to the corpus, if the corpus is copied along (e.g. with the whole corpus)
+        file = File.__new__(type(self))
+        memo[id(self)] = file
+
+        file.idx = copy.deepcopy(self.idx, memo)
+        file._path = copy.deepcopy(self._path, memo)
+        file._corpus = memo.get(id(self._corpus))
+        return file
+
+    @property
+    def path(self):
+        """ The path to the file. """
+        return self._path
+
+    @path.setter
+    def path(self, value):
+        self._path = value
+
+        # The duration of utterances until the end of the file depends on it
+        if self._corpus is not None:
+            self._corpus._register_change()
 
     @property
     def sampling_rate(self):
@@ -1,7 +1,10 @@
 import collections
-import heapq
+import copy
+import math
 from functools import total_ordering
 
+import numpy as np
+
 
 @total_ordering
 class Label(object):
@@ -18,14 +21,14 @@ class Label(object):
     Attributes:
         label_list (LabelList): The label-list this label is belonging to.
     """
-    __slots__ = ['value', 'start', 'end', 'label_list', 'meta']
+    __slots__ = ['_value', '_start', '_end', 'label_list', 'meta']
 
     def __init__(self, value, start=0, end=-1, meta=None):
-        self.value = value
-        self.start = start
-        self.end = end
-        self.meta = meta or {}
         self.label_list = None
+        self._value = value
+        self._start = start
+        self._end = end
+        self.meta = meta or {}
 
     def __eq__(self, other):
         return (self.start, self.end, self.value.lower()) == (other.start, other.end, other.value.lower())
@@ -39,6 +42,36 @@ class Label(object):
     def __repr__(self) -> str:
         return 'Label({}, {}, {})'.format(self.value, self.start, self.end)
 
+    @property
+    def value(self):
+        """ The text of the label. """
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._register_change()
+        self._value = value
+
+    @property
+    def start(self):
+        """ Start of the label within the utterance in seconds. """
+        return self._start
+
+    @start.setter
+    def start(self, value):
+        self._register_change()
+        self._start = value
+
+    @property
+    def end(self):
+        """ End of the label within the utterance in seconds (-1 defines the end of the utterance). """
+        return self._end
+
+    @end.setter
+    def end(self, value):
+        self._register_change()
+        self._end = value
+
     @property
     def start_abs(self):
         """
@@ -89,6 +122,10 @@ class Label(object):
 
         return self.label_list.utterance.file.read_samples(sr=sr, offset=self.start_abs, duration=duration)
 
+    def _register_change(self):
+        if self.label_list is not None:
+            self.label_list._register_change()
+
 
 class LabelList(object):
     """
@@ -110,14 +147,32 @@ class LabelList(object):
         >>> ])
     """
 
-    __slots__ = ['idx', 'labels', 'utterance']
+    __slots__ = ['idx', '_labels', 'utterance', '_index']
 
     def __init__(self, idx='default', labels=[]):
         self.idx = idx
         self.utterance = None
+        self._index = None
+        self._labels = LabelSequence(self, labels)
 
-        self.labels = []
-        self.extend(labels)
+        for label in self._labels:
+            label.label_list = self
+
+    @property
+    def labels(self):
+        """
+        The list containing the :py:class:`audiomate.corpus.assets.Label`.
+        The list can be edited directly, labels added to it are linked to the label-list (as with :py:meth:`append`).
+        """
+        return self._labels
+
+    @labels.setter
+    def labels(self, value):
+        self._register_change()
+        self._labels = LabelSequence(self, value)
+
+        for label in self._labels:
+            label.label_list = self
 
     def append(self, label):
         """
@@ -126,9 +181,18 @@ class LabelList(object):
         Args:
             label (Label): The label to add.
         """
-        label.label_list = self
         self.labels.append(label)
 
+    def remove(self, label):
+        """
+        Remove the given label from the list.
+
+        Args:
+            label (Label): The label to remove.
+        """
+        self.labels.remove(label)
+        label.label_list = None
+
     def extend(self, labels):
         """
         Add a list of labels to the end of the list.
@@ -136,8 +200,18 @@ class LabelList(object):
         Args:
             labels (list): Labels to add.
         """
-        for label in labels:
-            self.append(label)
+        self.labels.extend(labels)
+
+    def _register_change(self):
+        """
+        Register a change of the labels of the list, before it is made.
+        The interval index is discarded and rebuilt on the next lookup
+        and the change is reported to the utterance (see :py:attr:`audiomate.corpus.Corpus.num_changes`).
+        """
+        self._index = None
+
+        if self.utterance is not None:
+            self.utterance._register_change(labels=True)
 
     def ranges(self, yield_ranges_without_labels=False, include_labels=None):
         """
@@ -170,41 +244,79 @@ class LabelList(object):
             (5.1, 7.2, [<audiomate.corpus.assets.label.Label at 0x1090484c8>])
         """
 
-        # all label start events
-        events = [(l.start, 1, l) for l in self.labels]
-        labels_to_end = False
-        heapq.heapify(events)
+        index = self._interval_index()
+        labels = index.labels
+        included = None
+
+        if include_labels is not None:
+            included = [label.value in include_labels for label in labels]
+
+        ranges = sweep_ranges(index.starts, [label.end for label in labels], included=included,
+                              with_empty=yield_ranges_without_labels)
+
+        starts = ranges.starts.tolist()
+        ends = ranges.ends.tolist()
+        offsets = ranges.offsets.tolist()
+        label_indices = ranges.label_indices.tolist()
+
+        for i in range(len(starts)):
+            yield (starts[i], ends[i], [labels[j] for j in label_indices[offsets[i]:offsets[i + 1]]])
+
+    def labels_in_range(self, start, end=-1):
+        """
+        Return all labels that overlap with the given time range.
+        A label overlaps if it starts before the end of the range and ends after the start of the range.
+        The lookup uses an interval index, which is built on first use and rebuilt after the list has changed.
+        Hence the cost of a lookup is in O(log n + k) for ``n`` labels and ``k`` matches.
+
+        Args:
+            start (float): Start of the range in seconds.
+            end (float): End of the range in seconds (-1 defines the end of the utterance).
 
-        current_range_labels = []
-        current_range_start = -123
+        Returns:
+            list: The overlapping labels sorted by start time.
 
-        while len(events) > 0:
-            next_event = heapq.heappop(events)
-            label = next_event[2]
+        Example:
+            >>> ll = LabelList(labels=[
+            >>>     Label('a', 3.2, 4.5),
+            >>>     Label('b', 5.1, 8.9),
+            >>>     Label('c', 7.2, 10.5),
+            >>>     Label('d', 10.5, 14)
+            >>> ])
+            >>> ll.labels_in_range(4.0, 7.5)
+            [Label(a, 3.2, 4.5), Label(b, 5.1, 8.9), Label(c, 7.2, 10.5)]
+        """
+        end = math.inf if end == -1 else end
+        return self._interval_index().overlapping(start, end)
 
-            # Return current range if its not the first event and not the same time as the previous
-            # event
-            if -1 < current_range_start < next_event[0]:
+    def labels_at(self, time):
+        """
+        Return all labels that are active at the given time (``start <= time < end``).
+        See :py:meth:`labels_in_range` for the cost of the lookup.
 
-                if len(current_range_labels) > 0 or yield_ranges_without_labels:
-                    yield (current_range_start, next_event[0], list(current_range_labels))
+        Args:
+            time (float): Time in seconds.
 
-            # Update labels and add the "end" event
-            if next_event[1] == 1:
-                if include_labels is None or label.value in include_labels:
-                    current_range_labels.append(label)
+        Returns:
+            list: The labels sorted by start time.
 
-                    if label.end == -1:
-                        labels_to_end = True
-                    else:
-                        heapq.heappush(events, (label.end, -1, label))
-            else:
-                current_range_labels.remove(label)
+        Example:
+            >>> ll = LabelList(labels=[
+            >>>     Label('a', 3.2, 4.5),
+            >>>     Label('b', 4.5, 8.9),
+            >>>     Label('c', 7.2, 10.5)
+            >>> ])
+            >>> ll.labels_at(4.5)
+            [Label(b, 4.5, 8.9)]
+        """
+        return self._interval_index().overlapping(time, time, include_start=True)
 
-            current_range_start = next_event[0]
+    def _interval_index(self):
+        # Every change of the labels (see _register_change) discards the index
+        if self._index is None:
+            self._index = LabelIntervalIndex(self.labels)
 
-        if labels_to_end and len(current_range_labels) > 0:
-            yield (current_range_start, -1, list(current_range_labels))
+        return self._index
 
     def label_values(self):
         """
@@ -304,6 +416,18 @@ class LabelList(object):
         for label in self.labels:
             fn(label)
 
+    def copy(self):
+        """
+        Return a copy of the label-list with copies of all labels. The copy doesn't belong to any utterance.
+
+        Returns:
+            LabelList: The copied label-list.
+        """
+        labels = [Label(label.value, label.start, label.end, copy.deepcopy(label.meta) if label.meta else None)
+                  for label in self]
+
+        return LabelList(idx=self.idx, labels=labels)
+
     def __getitem__(self, item):
         return self.labels.__getitem__(item)
 
@@ -320,3 +444,294 @@ class LabelList(object):
         return LabelList(idx=idx, labels=[
             Label(value=value)
         ])
+
+
+class LabelSequence(list):
+    """
+    The list of the labels of a :py:class:`LabelList` (:py:attr:`LabelList.labels`).
+    It behaves like an ordinary list, but every modification is registered at the label-list
+    (so derived data like the interval index is discarded) and added labels are linked to the label-list.
+
+    Args:
+        label_list (LabelList): The label-list the labels belong to.
+        labels (list): The labels.
+    """
+
+    __slots__ = ['_label_list']
+
+    def __init__(self, label_list, labels=()):
+        super(LabelSequence, self).__init__(labels)
+        self._label_list = label_list
+
+    def __reduce_ex__(self, protocol):
+        # Restored without registering changes, the label-list is restored by the caller
+        return LabelSequence, (self._label_list, list(self))
+
+    def _changing(self, added=()):
+        self._label_list._register_change()
+
+        for label in added:
+            label.label_list = self._label_list
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            value = list(value)
+            self._changing(value)
+        else:
+            self._changing((value,))
+
+        super(LabelSequence, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._changing()
+        super(LabelSequence, self).__delitem__(key)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, other):
+        self._changing()
+        return super(LabelSequence, self).__imul__(other)
+
+    def append(self, label):
+        self._changing((label,))
+        super(LabelSequence, self).append(label)
+
+    def extend(self, labels):
+        labels = list(labels)
+        self._changing(labels)
+        super(LabelSequence, self).extend(labels)
+
+    def insert(self, index, label):
+        self._changing((label,))
+        super(LabelSequence, self).insert(index, label)
+
+    def pop(self, *args):
+        self._changing()
+        return super(LabelSequence, self).pop(*args)
+
+    def remove(self, label):
+        self._changing()
+        super(LabelSequence, self).remove(label)
+
+    def clear(self):
+        self._changing()
+        super(LabelSequence, self).clear()
+
+    def sort(self, *args, **kwargs):
+        self._changing()
+        super(LabelSequence, self).sort(*args, **kwargs)
+
+    def reverse(self):
+        self._changing()
+        super(LabelSequence, self).reverse()
+
+
+class LabelIntervalIndex(object):
+    """
+    Index over the time ranges of labels to find all labels overlapping a given range in O(log n + k).
+
+    The labels are sorted by start time and form an implicit binary search tree, where every node stores
+    the maximal end of its subtree (augmented interval tree stored in a flat list, as in cgranges).
+    Labels ending at the end of the utterance (-1) are treated as ending at infinity.
+
+    Args:
+        labels (list): The labels to index.
+    """
+
+    __slots__ = ['num_labels', 'labels', 'starts', 'ends', 'max_ends', 'max_level']
+
+    def __init__(self, labels):
+        def end_or_inf(label):
+            return math.inf if label.end == -1 else label.end
+
+        ordered = sorted(labels, key=lambda label: (label.start, end_or_inf(label), label.value.lower()))
+
+        self.num_labels = len(ordered)
+        self.labels = ordered
+        self.starts = [label.start for label in ordered]
+        self.ends = [end_or_inf(label) for label in ordered]
+        self.max_ends, self.max_level = self._build_tree(self.ends)
+
+    def overlapping(self, start, end, include_start=False):
+        """
+        Return all labels with ``label.start < end`` and ``start < label.end``, sorted by start.
+        If ``include_start`` is ``True``, labels with ``label.start == end`` are returned as well.
+        """
+        starts = self.starts
+        ends = self.ends
+        max_ends = self.max_ends
+        num = self.num_labels
+        found = []
+
+        if num == 0:
+            return found
+
+        def starts_before_end(i):
+            return starts[i] < end or (include_start and starts[i] == end)
+
+        stack = [(self.max_level, (1 << self.max_level) - 1, False)]
+
+        while len(stack) > 0:
+            level, node, left_done = stack.pop()
+
+            if level <= 3:
+                # Small subtree, scan linearly
+                i = node >> level << level
+                last = min(i + (1 << (level + 1)) - 1, num)
+
+                while i < last and starts_before_end(i):
+                    if start < ends[i]:
+                        found.append(i)
+                    i += 1
+
+            elif not left_done:
+                left = node - (1 << (level - 1))
+                stack.append((level, node, True))
+
+                if left >= num or max_ends[left] > start:
+                    stack.append((level - 1, left, False))
+
+            elif node < num and starts_before_end(node):
+                if start < ends[node]:
+                    found.append(node)
+
+                stack.append((level - 1, node + (1 << (level - 1)), False))
+
+        found.sort()
+        return [self.labels[i] for i in found]
+
+    @staticmethod
+    def _build_tree(ends):
+        num = len(ends)
+        max_ends = list(ends)
+
+        if num == 0:
+            return max_ends, -1
+
+        last_i = 0
+        last = None
+
+        for i in range(0, num, 2):
+            last_i = i
+            last = ends[i]
+
+        level = 1
+
+        while (1 << level) <= num:
+            x = 1 << (level - 1)
+
+            for i in range((x << 1) - 1, num, x << 2):
+                right = max_ends[i + x] if i + x < num else last
+                max_ends[i] = max(ends[i], max_ends[i - x], right)
+
+            last_i = last_i - x if (last_i >> level) & 1 else last_i + x
+
+            if last_i < num and max_ends[last_i] > last:
+                last = max_ends[last_i]
+
+            level += 1
+
+        return max_ends, level - 1
+
+
+LabelRanges = collections.namedtuple('LabelRanges', ['starts', 'ends', 'groups', 'offsets', 'label_indices'])
+LabelRanges.__doc__ = """
+Ranges computed by :py:func:`sweep_ranges`. The labels of the range ``i`` are
+``label_indices[offsets[i]:offsets[i + 1]]`` (indices into the input arrays, in ascending order).
+A range that lasts until the end of the utterance has an end of -1.
+"""
+
+
+def sweep_ranges(starts, ends, groups=None, included=None, with_empty=False):
+    """
+    Compute the ranges (parts with the same active labels) of one or more label-lists at once,
+    with the same semantics as :py:meth:`LabelList.ranges`.
+
+    Instead of processing every start and end event, all boundaries are sorted in one go. Every label then covers
+    the ranges between the boundary of its start and the boundary of its end, which are expanded in bulk
+    into the active labels of every range.
+
+    Args:
+        starts (array-like): Start of every label.
+        ends (array-like): End of every label (-1 defines the end of the utterance).
+        groups (array-like): Number of the label-list of every label. Ranges are computed for every group separately.
+                             If ``None`` all labels belong to the same label-list.
+        included (array-like): Boolean flag for every label, whether it is considered. Labels that are not considered
+                               only split the ranges at their start (as with ``include_labels``).
+        with_empty (bool): If ``True`` ranges without labels are returned as well.
+
+    Returns:
+        LabelRanges: The ranges sorted by group and start.
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    num_labels = starts.size
+
+    if groups is None:
+        groups = np.zeros(num_labels, dtype=np.int64)
+    else:
+        groups = np.asarray(groups, dtype=np.int64)
+
+    if included is None:
+        included = np.ones(num_labels, dtype=bool)
+    else:
+        included = np.asarray(included, dtype=bool)
+
+    to_end = included & (ends == -1)
+    has_end = included & ~to_end
+
+    # Labels with the end before the start are considered to end at the start
+    ends = np.maximum(starts, ends)
+
+    # Boundaries are all starts and the ends of the considered labels
+    times = np.concatenate([starts, ends[has_end]])
+    time_groups = np.concatenate([groups, groups[has_end]])
+    order = np.lexsort((times, time_groups))
+    sorted_times = times[order]
+    sorted_groups = time_groups[order]
+
+    is_new = np.ones(order.size, dtype=bool)
+    is_new[1:] = (sorted_times[1:] != sorted_times[:-1]) | (sorted_groups[1:] != sorted_groups[:-1])
+
+    boundary_ids = np.empty(order.size, dtype=np.int64)
+    boundary_ids[order] = np.cumsum(is_new) - 1
+
+    boundaries = sorted_times[is_new]
+    boundary_groups = sorted_groups[is_new]
+    num_boundaries = boundaries.size
+
+    # Range i starts at boundary i and ends at the next boundary of the group, the last one at the end of the utterance
+    is_last = np.ones(num_boundaries, dtype=bool)
+    is_last[:-1] = boundary_groups[1:] != boundary_groups[:-1]
+    last_ids = np.flatnonzero(is_last)
+
+    range_ends = np.empty(num_boundaries, dtype=np.float64)
+    range_ends[:-1] = boundaries[1:]
+    range_ends[is_last] = -1
+
+    # Every label covers the ranges [first, last)
+    first = boundary_ids[:num_labels]
+    last = first.copy()
+    last[has_end] = boundary_ids[num_labels:]
+    last[to_end] = last_ids[np.searchsorted(last_ids, first[to_end])] + 1
+
+    counts = last - first
+    offsets = np.cumsum(counts) - counts
+    label_indices = np.repeat(np.arange(num_labels), counts)
+    range_ids = np.repeat(first - offsets, counts) + np.arange(label_indices.size)
+
+    label_indices = label_indices[np.argsort(range_ids, kind='stable')]
+    range_counts = np.bincount(range_ids, minlength=num_boundaries)
+
+    # The last range of a group only exists if there are labels lasting until the end
+    if with_empty:
+        keep = ~is_last | (range_counts > 0)
+    else:
+        keep = range_counts > 0
+
+    range_offsets = np.zeros(np.count_nonzero(keep) + 1, dtype=np.int64)
+    np.cumsum(range_counts[keep], out=range_offsets[1:])
+
+    return LabelRanges(boundaries[keep], range_ends[keep], boundary_groups[keep], range_offsets, label_indices)
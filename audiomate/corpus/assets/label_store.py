@@ -0,0 +1,473 @@
+import collections
+import copy
+
+import numpy as np
+
+from . import label
+
+
+class LabelStore(object):
+    """
+    Columnar storage for the labels of many label-lists with the same idx (usually one label-list per utterance of
+    a corpus). Instead of a :py:class:`Label` object per label, all labels are held in contiguous arrays,
+    which are sorted by label-list:
+
+    * ``list_indices``: Position of the label-list the label belongs to
+    * ``starts`` / ``ends``: Start and end of the label in seconds (-1 defines the end of the utterance)
+    * ``codes``: Code of the label-value, the values are interned in ``values``
+    * ``meta``: Sparse table with the meta-data (dict) of a label with the index of the label as key
+
+    The label-lists are accessed with :py:meth:`label_lists`, which returns a :py:class:`LabelListView` per
+    label-list. The views provide the same API as :py:class:`LabelList`, but the labels are only created as
+    lightweight :py:class:`LabelView` objects when accessed. Changing the start, end, value or meta-data
+    of a label-view writes through to the store. If the labels of a label-list are changed in any other way
+    (e.g. appending or removing labels, accessing ``labels``), the label-list is detached from the store and from then
+    on holds ordinary :py:class:`Label` objects.
+
+    The statistics (:py:meth:`label_count`, :py:meth:`label_durations`, :py:meth:`label_values`) are computed with
+    vectorized reductions over the arrays, considering only the label-lists given by position.
+
+    A copy of the store (:py:meth:`copy`) shares the arrays and the meta-data with the original store.
+    The arrays (or the meta-data) are only copied, when they are changed in either of the stores.
+
+    Args:
+        idx (str): The idx of the label-lists.
+        num_label_lists (int): The number of label-lists.
+        list_indices (numpy.ndarray): Position of the label-list of every label, sorted ascending.
+        starts (numpy.ndarray): Start of every label.
+        ends (numpy.ndarray): End of every label.
+        codes (numpy.ndarray): Code of the value of every label.
+        values (list): The label-values, the code is the index in this list.
+        meta (dict): Meta-data of the labels with the index of the label as key.
+
+    Example:
+        >>> store = LabelStore.from_label_lists([ll_1, ll_2, ll_3], idx='phones')
+        >>> views = store.label_lists()
+        >>> store.label_count([0, 2])
+        {'a': 12, 'sh': 3}
+    """
+
+    def __init__(self, idx, num_label_lists, list_indices, starts, ends, codes, values, meta=None):
+        self.idx = idx
+        self.list_indices = np.asarray(list_indices, dtype=np.int32)
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        self.codes = np.asarray(codes, dtype=np.int32)
+        self.values = list(values)
+        self.meta = meta or {}
+
+        self._value_codes = {value: code for code, value in enumerate(self.values)}
+        self._offsets = np.searchsorted(self.list_indices, np.arange(num_label_lists + 1)).astype(np.int64)
+        self._attached = np.ones(num_label_lists, dtype=bool)
+        self._views = None
+        self._shared_arrays = False
+        self._shared_meta = False
+
+    @classmethod
+    def from_label_lists(cls, label_lists, idx=None):
+        """
+        Create a store with the labels of the given label-lists.
+
+        Args:
+            label_lists (list): List of :py:class:`LabelList`. The position of a label-list in the store
+                                equals its position in this list.
+            idx (str): The idx of the store. If ``None`` the idx of the first label-list is used.
+
+        Returns:
+            LabelStore: The store.
+        """
+        if idx is None:
+            idx = label_lists[0].idx if len(label_lists) > 0 else 'default'
+
+        list_indices = []
+        starts = []
+        ends = []
+        codes = []
+        value_codes = {}
+        meta = {}
+
+        for list_index, label_list in enumerate(label_lists):
+            for lbl in label_list:
+                if len(lbl.meta) > 0:
+                    meta[len(starts)] = dict(lbl.meta)
+
+                list_indices.append(list_index)
+                starts.append(lbl.start)
+                ends.append(lbl.end)
+                codes.append(value_codes.setdefault(lbl.value, len(value_codes)))
+
+        return cls(idx, len(label_lists), list_indices, starts, ends, codes, list(value_codes.keys()), meta=meta)
+
+    @property
+    def num_labels(self):
+        """ Return the number of labels in the store (including the ones of detached label-lists). """
+        return self.starts.size
+
+    @property
+    def num_label_lists(self):
+        """ Return the number of label-lists in the store. """
+        return self._attached.size
+
+    def copy(self, positions=None):
+        """
+        Return an independent copy of the store (with its own views).
+        The arrays and the meta-data are shared with this store, until they are changed in one of both stores.
+
+        Args:
+            positions (list): If not None, only the label-lists at these positions are attached in the copy,
+                              all others are ignored by the statistics of the copy.
+
+        Returns:
+            LabelStore: The copy.
+        """
+        store = LabelStore.__new__(LabelStore)
+        store.idx = self.idx
+        store.list_indices = self.list_indices
+        store.starts = self.starts
+        store.ends = self.ends
+        store.codes = self.codes
+        store.values = self.values
+        store.meta = self.meta
+
+        store._value_codes = self._value_codes
+        store._offsets = self._offsets
+        store._attached = np.empty_like(self._attached)
+        store._views = None
+
+        self._shared_arrays = store._shared_arrays = True
+        self._shared_meta = store._shared_meta = True
+
+        if positions is None:
+            store._attached[:] = self._attached
+        else:
+            store._attached[:] = False
+            store._attached[positions] = self._attached[positions]
+
+        return store
+
+    def label_lists(self):
+        """
+        Return a :py:class:`LabelListView` for every label-list of the store.
+        The same views are returned on every call.
+
+        Returns:
+            list: The label-lists in the order of their position.
+        """
+        if self._views is None:
+            self._views = [LabelListView(self, position) for position in range(self.num_label_lists)]
+
+        return self._views
+
+    def is_attached(self, position):
+        """ Return ``True`` if the label-list at the given position is still backed by the store. """
+        return bool(self._attached[position])
+
+    def rows(self, position):
+        """ Return the range of the indices of the labels of the label-list at the given position. """
+        return range(self._offsets[position], self._offsets[position + 1])
+
+    def value_code(self, value):
+        """ Return the code of the given value, the value is added if it doesn't exist yet. """
+        code = self._value_codes.get(value)
+
+        if code is None:
+            self._own_arrays()
+            code = len(self.values)
+            self.values.append(value)
+            self._value_codes[value] = code
+
+        return code
+
+    #
+    #   Statistics
+    #
+
+    def label_values(self, positions=None):
+        """
+        Return all label-values occurring in the label-lists at the given positions.
+
+        Args:
+            positions (list): Positions of the label-lists to consider. If ``None`` all attached label-lists are used.
+
+        Returns:
+            set: A set of distinct label-values.
+        """
+        counts = self._code_counts(positions)
+        return {self.values[code] for code in np.flatnonzero(counts)}
+
+    def label_count(self, positions=None):
+        """
+        Return the number of occurrences of every label-value in the label-lists at the given positions.
+
+        Args:
+            positions (list): Positions of the label-lists to consider. If ``None`` all attached label-lists are used.
+
+        Returns:
+            dict: A dictionary containing the number of occurrences with the label-value as key.
+        """
+        counts = self._code_counts(positions)
+        return {self.values[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+    def label_durations(self, positions=None):
+        """
+        Return the total duration of every label-value in the label-lists at the given positions.
+        Labels ending at the end of the utterance (-1) need the label-list to be linked to an utterance.
+
+        Args:
+            positions (list): Positions of the label-lists to consider. If ``None`` all attached label-lists are used.
+
+        Returns:
+            dict: A dictionary containing the total duration in seconds with the label-value as key.
+        """
+        rows = self._selected_rows(positions)
+        counts = np.bincount(self.codes[rows], minlength=len(self.values))
+        durations = self._durations(rows)
+        sums = np.bincount(self.codes[rows], weights=durations, minlength=len(self.values))
+
+        return {self.values[code]: float(sums[code]) for code in np.flatnonzero(counts)}
+
+    def _code_counts(self, positions):
+        rows = self._selected_rows(positions)
+        return np.bincount(self.codes[rows], minlength=len(self.values))
+
+    def _selected_rows(self, positions):
+        if positions is None:
+            return np.flatnonzero(self._attached[self.list_indices])
+
+        # The labels are sorted by label-list, so the rows are gathered from the offsets of the selected label-lists
+        # (in the size of the selection, not of the whole store)
+        positions = np.unique(np.asarray(positions, dtype=np.int64))
+        positions = positions[self._attached[positions]]
+
+        starts = self._offsets[positions]
+        lengths = self._offsets[positions + 1] - starts
+        ends = np.cumsum(lengths)
+
+        if ends.size == 0:
+            return ends
+
+        return np.arange(ends[-1]) + np.repeat(starts - ends + lengths, lengths)
+
+    def _durations(self, rows):
+        starts = self.starts[rows]
+        ends = self.ends[rows]
+        durations = ends - starts
+
+        # Labels until the end of the utterance, end_abs - start_abs equals the utterance duration - start
+        to_end = np.flatnonzero(ends == -1)
+
+        if to_end.size > 0:
+            views = self.label_lists()
+            positions, inverse = np.unique(self.list_indices[rows[to_end]], return_inverse=True)
+            utt_durations = np.array([views[p].utterance.duration for p in positions.tolist()], dtype=np.float64)
+            durations[to_end] = utt_durations[inverse.reshape(-1)] - starts[to_end]
+
+        return durations
+
+    #
+    #   Views
+    #
+
+    def _detach(self, position):
+        self._attached[position] = False
+
+    def _own_arrays(self):
+        # Copy the arrays shared with other stores (see :py:meth:`copy`) before they are changed
+        if self._shared_arrays:
+            self.starts = self.starts.copy()
+            self.ends = self.ends.copy()
+            self.codes = self.codes.copy()
+            self.values = list(self.values)
+            self._value_codes = dict(self._value_codes)
+            self._shared_arrays = False
+
+    def _own_meta(self):
+        if self._shared_meta:
+            self.meta = copy.deepcopy(self.meta)
+            self._shared_meta = False
+
+
+class LabelView(label.Label):
+    """
+    A label of a :py:class:`LabelStore`. It behaves like a :py:class:`Label`, but reads and writes
+    its start, end, value and meta-data from/to the store.
+
+    Args:
+        store (LabelStore): The store containing the label.
+        row (int): The index of the label in the store.
+        label_list (LabelListView): The label-list the label belongs to.
+    """
+
+    __slots__ = ['_store', '_row']
+
+    def __init__(self, store, row, label_list=None):
+        self._store = store
+        self._row = row
+        self.label_list = label_list
+
+    @property
+    def value(self):
+        return self._store.values[self._store.codes[self._row]]
+
+    @value.setter
+    def value(self, value):
+        self._register_change()
+        self._store._own_arrays()
+        self._store.codes[self._row] = self._store.value_code(value)
+
+    @property
+    def start(self):
+        return self._store.starts[self._row].item()
+
+    @start.setter
+    def start(self, value):
+        self._register_change()
+        self._store._own_arrays()
+        self._store.starts[self._row] = value
+
+    @property
+    def end(self):
+        return self._store.ends[self._row].item()
+
+    @end.setter
+    def end(self, value):
+        self._register_change()
+        self._store._own_arrays()
+        self._store.ends[self._row] = value
+
+    @property
+    def meta(self):
+        # The dict is only allocated when the meta-data is accessed, so it can be edited in place
+        self._store._own_meta()
+        return self._store.meta.setdefault(self._row, {})
+
+    @meta.setter
+    def meta(self, value):
+        self._store._own_meta()
+        self._store.meta[self._row] = value or {}
+
+
+class LabelListView(label.LabelList):
+    """
+    A label-list of a :py:class:`LabelStore`. It provides the same API as :py:class:`LabelList`,
+    the labels are returned as :py:class:`LabelView`.
+
+    Reading operations are served from the store. Operations that change the list itself (``append``, ``remove``,
+    ``extend``, ``apply`` or accessing ``labels``) detach the label-list from the store. The labels are then copied
+    into ordinary :py:class:`Label` objects and the store ignores the label-list from then on.
+
+    Args:
+        store (LabelStore): The store containing the labels.
+        position (int): The position of the label-list in the store.
+    """
+
+    __slots__ = ['_store', '_position']
+
+    def __init__(self, store, position):
+        self.idx = store.idx
+        self.utterance = None
+        self._index = None
+        self._store = store
+        self._position = position
+        self._labels = None
+
+    @property
+    def store(self):
+        """ Return the store, if the label-list is still backed by it, otherwise ``None``. """
+        if self._labels is None:
+            return self._store
+
+    @property
+    def position(self):
+        """ Return the position of the label-list in the store. """
+        return self._position
+
+    @property
+    def labels(self):
+        if self._labels is None:
+            self._detach()
+
+        return self._labels
+
+    @labels.setter
+    def labels(self, value):
+        if self._labels is None:
+            self._store._detach(self._position)
+
+        label.LabelList.labels.fset(self, value)
+
+    def __getitem__(self, item):
+        if self._labels is not None:
+            return self._labels[item]
+
+        rows = self._store.rows(self._position)
+
+        if isinstance(item, slice):
+            return [LabelView(self._store, row, self) for row in rows[item]]
+
+        return LabelView(self._store, rows[item], self)
+
+    def __iter__(self):
+        if self._labels is not None:
+            return iter(self._labels)
+
+        return (LabelView(self._store, row, self) for row in self._store.rows(self._position))
+
+    def __len__(self):
+        if self._labels is not None:
+            return len(self._labels)
+
+        return len(self._store.rows(self._position))
+
+    def label_values(self):
+        if self._labels is not None:
+            return super(LabelListView, self).label_values()
+
+        return sorted(self._store.label_values([self._position]))
+
+    def label_count(self):
+        if self._labels is not None:
+            return super(LabelListView, self).label_count()
+
+        return collections.defaultdict(int, self._store.label_count([self._position]))
+
+    def label_total_duration(self):
+        if self._labels is not None:
+            return super(LabelListView, self).label_total_duration()
+
+        return collections.defaultdict(float, self._store.label_durations([self._position]))
+
+    def _interval_index(self):
+        if self._labels is not None:
+            return super(LabelListView, self)._interval_index()
+
+        # Start/end changes of the label-views discard the index, any other change detaches the label-list
+        if self._index is None:
+            self._index = label.LabelIntervalIndex(list(self))
+
+        return self._index
+
+    def copy(self):
+        if self._labels is not None:
+            return super(LabelListView, self).copy()
+
+        return label.LabelList(idx=self.idx, labels=self._create_labels())
+
+    def _detach(self):
+        labels = self._create_labels(self)
+
+        self._store._detach(self._position)
+        self._labels = label.LabelSequence(self, labels)
+        self._index = None
+
+    def _create_labels(self, label_list=None):
+        labels = []
+
+        for row in self._store.rows(self._position):
+            meta = self._store.meta.get(row)
+            lbl = label.Label(self._store.values[self._store.codes[row]], self._store.starts[row].item(),
+                              self._store.ends[row].item(), meta=copy.deepcopy(meta) if meta else None)
+            lbl.label_list = label_list
+            labels.append(lbl)
+
+        return labels
@@ -0,0 +1,264 @@
+import ctypes
+import multiprocessing
+import queue
+import traceback
+
+import h5py
+import numpy as np
+
+from . import features
+
+
+class FeatureLoaderException(Exception):
+    pass
+
+
+class ParallelFeatureLoader(object):
+    """
+    Loads batches of features from a HDF5 file (e.g. the file of a :py:class:`FeatureContainer`) using multiple
+    worker processes.
+
+    Every worker opens its own handle to the file and iterates over its share of the partitions with a
+    :py:class:`PartitioningFeatureIterator` (the partitions are distributed the same way as with ``rank`` and
+    ``world_size``). The worker assembles the batches directly in a ring of shared memory slots and only passes the
+    index of the slot back to the loading process, so the feature data is never pickled. Reading, shuffling and
+    assembling the batches therefore scales with the number of workers.
+
+    The loader emits batches (numpy.ndarray with shape ``(batch_size, feature dimension)``) until all workers have
+    processed all of their partitions. The last batch of every worker may contain fewer frames. All data sets need to
+    have the same feature dimension and data type.
+
+    If a worker fails, the loader stops all workers and raises a :py:class:`FeatureLoaderException`
+    containing the traceback of the worker.
+
+    Args:
+        path (str): Path to the HDF5 file containing the features. The file must not be opened for writing.
+        partition_size (str): Size of the partitions per worker (see :py:class:`PartitioningFeatureIterator`).
+        batch_size (int): Number of frames per batch.
+        num_workers (int): Number of worker processes to spawn.
+        num_slots (int): Number of batches every worker can prepare in advance.
+        shuffle (bool): Indicates whether the features should be returned in random order (``True``) or not (``False``).
+        seed (int): Seed to be used for the random number generator. If ``None`` and ``shuffle`` is ``True``,
+                    a random seed is chosen, which is shared by all workers.
+        includes (iterable): Iterable of names of data sets that should be included.
+        excludes (iterable): Iterable of names of data sets to skip.
+        epoch (int): Number of the current epoch (see :py:class:`PartitioningFeatureIterator`).
+        mp_context (str): The multiprocessing start method (``fork``, ``spawn``, ``forkserver``).
+                          If ``None`` the default of the platform is used.
+
+    Example:
+        >>> with ParallelFeatureLoader('/path/to/features', '512m', batch_size=256, num_workers=4) as loader:
+        >>>     for batch in loader:
+        >>>         train(batch)
+    """
+
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, path, partition_size, batch_size, num_workers=2, num_slots=4, shuffle=True, seed=None,
+                 includes=None, excludes=None, epoch=0, mp_context=None):
+        if batch_size < 1:
+            raise ValueError('The batch size has to be at least 1.')
+
+        if num_workers < 1 or num_slots < 1:
+            raise ValueError('At least one worker with one slot is required.')
+
+        if shuffle and seed is None:
+            seed = int(np.random.randint(0, 2 ** 31 - 1))
+
+        self.path = path
+        self.batch_size = batch_size
+        self.num_workers = num_workers
+        self.num_slots = num_slots
+
+        self._iterator_args = {
+            'partition_size': partition_size,
+            'shuffle': shuffle,
+            'seed': seed,
+            'includes': includes,
+            'excludes': excludes,
+            'epoch': epoch
+        }
+
+        self._feature_dim, self._dtype = self._scan_data_sets(path, includes, excludes)
+        self._context = multiprocessing.get_context(mp_context)
+
+        self._workers = []
+        self._buffers = []
+        self._free_slots = []
+        self._ready = None
+        self._num_active_workers = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __iter__(self):
+        self.start()
+        return self
+
+    def __next__(self):
+        while self._num_active_workers > 0:
+            try:
+                worker_idx, slot, info = self._ready.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                self._check_workers_alive()
+                continue
+
+            if slot is None:
+                if info is not None:
+                    self.close()
+                    raise FeatureLoaderException('Worker {} failed:\n{}'.format(worker_idx, info))
+
+                self._num_active_workers -= 1
+                continue
+
+            batch = np.array(self._slots_of_worker(worker_idx)[slot, :info])
+            self._free_slots[worker_idx].put(slot)
+
+            return batch
+
+        self.close()
+        raise StopIteration
+
+    def start(self):
+        """
+        Start the worker processes. This is done automatically when iterating over the loader.
+        Nothing happens if the workers are already started.
+        """
+        if len(self._workers) > 0:
+            return
+
+        self._ready = self._context.Queue()
+        slot_size = self.batch_size * self._feature_dim * self._dtype.itemsize
+
+        for worker_idx in range(self.num_workers):
+            buffer = self._context.RawArray(ctypes.c_byte, max(self.num_slots * slot_size, 1))
+            free_slots = self._context.Queue()
+
+            for slot in range(self.num_slots):
+                free_slots.put(slot)
+
+            worker = self._context.Process(target=_load_batches,
+                                           args=(worker_idx, self.num_workers, self.path, buffer, free_slots,
+                                                 self._ready, self.num_slots, self.batch_size, self._feature_dim,
+                                                 self._dtype.str, self._iterator_args),
+                                           daemon=True)
+
+            self._buffers.append(buffer)
+            self._free_slots.append(free_slots)
+            self._workers.append(worker)
+
+        for worker in self._workers:
+            worker.start()
+
+        self._num_active_workers = self.num_workers
+
+    def close(self):
+        """
+        Stop all worker processes and release the shared memory.
+        """
+        for free_slots in self._free_slots:
+            free_slots.put(None)
+
+        for worker in self._workers:
+            worker.join(timeout=self.POLL_INTERVAL)
+
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+
+        self._workers = []
+        self._buffers = []
+        self._free_slots = []
+        self._ready = None
+        self._num_active_workers = 0
+
+    def _slots_of_worker(self, worker_idx):
+        return _slots_from_buffer(self._buffers[worker_idx], self.num_slots, self.batch_size, self._feature_dim,
+                                  self._dtype)
+
+    def _check_workers_alive(self):
+        for worker_idx, worker in enumerate(self._workers):
+            if worker.exitcode is not None and worker.exitcode != 0:
+                self.close()
+                raise FeatureLoaderException('Worker {} exited unexpectedly with code {}'.format(
+                    worker_idx, worker.exitcode))
+
+    @staticmethod
+    def _scan_data_sets(path, includes, excludes):
+        """
+        Return the feature dimension and the data type, which all data sets need to share.
+        The file is closed again before any worker is started.
+        """
+        feature_dim = None
+        dtype = None
+
+        with h5py.File(path, 'r') as f:
+            data_sets = features.PartitioningFeatureIterator._filter_data_sets(f.keys(),
+                                                                               includes=includes,
+                                                                               excludes=excludes)
+
+            for dset_name in data_sets:
+                dset = f[dset_name]
+
+                if len(dset) == 0:
+                    continue
+
+                if feature_dim is None:
+                    feature_dim = dset.shape[1]
+                    dtype = dset.dtype
+                elif dset.shape[1] != feature_dim or dset.dtype != dtype:
+                    raise ValueError('All data sets need to have the same feature dimension and data type '
+                                     '("{}" differs).'.format(dset_name))
+
+        if feature_dim is None:
+            return 0, np.dtype(np.float32)
+
+        return feature_dim, np.dtype(dtype)
+
+
+def _slots_from_buffer(buffer, num_slots, batch_size, feature_dim, dtype):
+    num_values = num_slots * batch_size * feature_dim
+    return np.frombuffer(buffer, dtype=dtype, count=num_values).reshape(num_slots, batch_size, feature_dim)
+
+
+def _load_batches(worker_idx, num_workers, path, buffer, free_slots, ready, num_slots, batch_size, feature_dim,
+                  dtype, iterator_args):
+    """
+    Entry point of a worker process. Fills the free slots of its buffer with batches and announces every filled slot
+    as ``(worker index, slot, number of frames)``. When done ``(worker index, None, None)`` is sent, if an error occurs
+    ``(worker index, None, traceback)``.
+    """
+    try:
+        slots = _slots_from_buffer(buffer, num_slots, batch_size, feature_dim, np.dtype(dtype))
+
+        with h5py.File(path, 'r') as f:
+            iterator = features.PartitioningFeatureIterator(f, rank=worker_idx, world_size=num_workers,
+                                                            **iterator_args)
+            slot = None
+            num_frames = 0
+
+            for _, _, feature in iterator:
+                if slot is None:
+                    slot = free_slots.get()
+
+                    if slot is None:  # loader closed
+                        return
+
+                slots[slot, num_frames] = feature
+                num_frames += 1
+
+                if num_frames == batch_size:
+                    ready.put((worker_idx, slot, num_frames))
+                    slot = None
+                    num_frames = 0
+
+            if num_frames > 0:
+                ready.put((worker_idx, slot, num_frames))
+
+        ready.put((worker_idx, None, None))
+    except Exception:
+        ready.put((worker_idx, None, traceback.format_exc()))
@@ -0,0 +1,267 @@
+import collections
+
+import numpy as np
+
+from . import features
+
+
+class AliasTable(object):
+    """
+    Alias table (Walker/Vose) for drawing indices with replacement according to (unnormalized) weights in constant
+    time per sample.
+
+    The table is built without a loop over the single weights, so it can be used for millions of weights.
+    All small entries (probability below the average) are aligned with the large entries based on the prefix sums of
+    their deficits and excesses. A large entry that gives away more than its excess is aliased to the next large entry.
+
+    Args:
+        weights (numpy.ndarray): Non-negative weights with at least one weight greater than zero.
+
+    Attributes:
+        prob (numpy.ndarray): Probability of every slot to return its own index.
+        alias (numpy.ndarray): Index returned by every slot otherwise.
+    """
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+
+        if weights.ndim != 1 or weights.size == 0:
+            raise ValueError('The weights have to be a non-empty vector.')
+
+        if np.any(weights < 0) or not np.isfinite(weights).all() or weights.sum() <= 0:
+            raise ValueError('The weights have to be finite, non-negative and not all zero.')
+
+        num = weights.size
+        prob = weights * (num / weights.sum())
+        alias = np.arange(num)
+
+        small = np.flatnonzero(prob < 1.0)
+        large = np.flatnonzero(prob > 1.0)
+
+        if small.size > 0 and large.size > 0:
+            deficits = 1.0 - prob[small]
+            deficit_end = np.cumsum(deficits)
+            deficit_start = deficit_end - deficits
+            excess_end = np.cumsum(prob[large] - 1.0)
+
+            # Every small entry takes its deficit from the large entry, whose excess covers the start of the deficit
+            owner = np.minimum(np.searchsorted(excess_end, deficit_start, side='right'), large.size - 1)
+            alias[small] = large[owner]
+
+            # The large entry keeps what is left after covering the deficit reaching beyond its excess
+            last_small = np.minimum(np.searchsorted(deficit_end, excess_end, side='left'), small.size - 1)
+            overflow = np.clip(deficit_end[last_small] - excess_end, 0.0, 1.0)
+            prob[large] = 1.0 - overflow
+
+            chained = np.flatnonzero(overflow[:-1] > 0)
+            alias[large[chained]] = large[chained + 1]
+            prob[large[-1]] = 1.0
+
+        prob[large] = np.minimum(prob[large], 1.0)
+
+        if large.size == 0:
+            prob[small] = 1.0  # only rounding errors, all weights are equal
+
+        self.prob = prob
+        self.alias = alias
+
+    def __len__(self):
+        return self.prob.size
+
+    def sample(self, num, random_state):
+        """
+        Draw ``num`` indices with replacement.
+
+        Args:
+            num (int): Number of indices to draw.
+            random_state (numpy.random.RandomState): The random number generator to use.
+
+        Returns:
+            numpy.ndarray: The drawn indices.
+        """
+        slots = random_state.randint(0, self.prob.size, size=num)
+        keep = random_state.random_sample(num) < self.prob[slots]
+
+        return np.where(keep, slots, self.alias[slots])
+
+
+class WeightedFeatureSampler(object):
+    """
+    Draws frames or utterances with replacement from a feature-container according to given weights.
+    This is used to counter imbalanced data, e.g. by balancing the classes of a label-list.
+
+    The weights are defined by one of the following:
+
+    * ``weights`` with a number per utterance: The number defines the total probability mass of the utterance.
+      When drawing frames, the mass is spread evenly over the frames of the utterance.
+    * ``weights`` with an array per utterance: Every frame of the utterance gets its own weight.
+      (Only when drawing frames)
+    * ``corpus`` and ``label_list_idx``: Every label-value of the given label-list gets the same probability mass.
+      When drawing utterances, the mass of a label-value is spread over all utterances containing it.
+      When drawing frames, the mass is spread over all frames of those utterances.
+      Utterances with multiple label-values get the mean of the weights of their values.
+
+    Utterances without weight (or with a weight of zero) are never drawn. The frames are indexed with flat arrays
+    (offset of every utterance and weight of every frame), so no Python object per frame is created.
+    When sampling, only the data sets of the drawn utterances are read.
+
+    Args:
+        container (FeatureContainer): The (opened) feature-container to sample from.
+        weights (dict): Weights (number or numpy.ndarray) with the utterance-idx as key.
+        corpus (CorpusView): The corpus used for balancing on a label-list.
+        label_list_idx (str): The idx of the label-list to balance on.
+        per_utterance (bool): If ``True`` whole utterances are drawn, otherwise single frames.
+        seed (int): Seed to be used for the random number generator.
+        includes (iterable): Iterable of names of data sets that should be included.
+        excludes (iterable): Iterable of names of data sets to skip.
+
+    Example:
+        >>> sampler = WeightedFeatureSampler(container, corpus=corpus, label_list_idx=audiomate.corpus.LL_SOUND_CLASS)
+        >>> sampler.sample(256).shape
+        (256, 40)
+    """
+
+    def __init__(self, container, weights=None, corpus=None, label_list_idx=None, per_utterance=False, seed=None,
+                 includes=None, excludes=None):
+        container._check_is_open()
+
+        if weights is None and (corpus is None or label_list_idx is None):
+            raise ValueError('Either weights or a corpus with a label-list idx are required.')
+
+        self._file = container._file
+        self._per_utterance = per_utterance
+        self._random_state = features._random_state(seed)
+
+        data_sets = features.PartitioningFeatureIterator._filter_data_sets(container.keys(),
+                                                                           includes=includes,
+                                                                           excludes=excludes)
+        num_frames = {dset: len(self._file[dset]) for dset in data_sets}
+
+        if weights is None:
+            weights = self._label_balancing_weights(corpus, label_list_idx, num_frames)
+
+        utt_ids = []
+        utt_weights = []
+
+        for dset in data_sets:
+            if dset not in weights or num_frames[dset] == 0:
+                continue
+
+            weight = np.asarray(weights[dset], dtype=np.float64)
+
+            if weight.ndim == 0 and weight <= 0:
+                continue
+
+            if weight.ndim > 0 and (per_utterance or weight.shape != (num_frames[dset],)):
+                raise ValueError('Invalid frame weights for {}'.format(dset))
+
+            utt_ids.append(dset)
+            utt_weights.append(weight)
+
+        if len(utt_ids) == 0:
+            raise ValueError('There are no utterances with a weight greater than zero.')
+
+        self._utt_ids = np.array(utt_ids)
+
+        if per_utterance:
+            self._offsets = None
+            self._table = AliasTable(np.array(utt_weights))
+        else:
+            lengths = np.array([num_frames[utt_idx] for utt_idx in utt_ids], dtype=np.int64)
+            self._offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+            frame_weights = np.empty(self._offsets[-1], dtype=np.float64)
+
+            for index, weight in enumerate(utt_weights):
+                start, end = self._offsets[index], self._offsets[index + 1]
+                frame_weights[start:end] = weight if weight.ndim > 0 else weight / (end - start)
+
+            self._table = AliasTable(frame_weights)
+
+    def sample_indices(self, num):
+        """
+        Draw ``num`` frames or utterances, without reading any features.
+
+        Returns:
+            tuple: When drawing frames, a tuple with an array of the utterance-ids and an array of the frame indices
+            within the utterances. When drawing utterances, an array with the utterance-ids.
+        """
+        positions, frame_indices = self._draw(num)
+
+        if self._per_utterance:
+            return self._utt_ids[positions]
+
+        return self._utt_ids[positions], frame_indices
+
+    def sample(self, num):
+        """
+        Draw ``num`` frames or utterances and read their features.
+
+        Returns:
+            numpy.ndarray, list: When drawing frames, an array with the features of the frames (in the order they
+            were drawn). When drawing utterances, a list with the feature-matrix of every utterance.
+        """
+        positions, frame_indices = self._draw(num)
+
+        if self._per_utterance:
+            return [self._file[utt_idx][()] for utt_idx in self._utt_ids[positions]]
+
+        order = np.lexsort((frame_indices, positions))
+        sorted_positions = positions[order]
+        group_starts = np.flatnonzero(np.diff(np.concatenate([[-1], sorted_positions])))
+        group_ends = np.concatenate([group_starts[1:], [num]])
+
+        result = None
+
+        for start, end in zip(group_starts, group_ends):
+            dset = self._file[self._utt_ids[sorted_positions[start]]]
+            frame_ids, inverse = np.unique(frame_indices[order[start:end]], return_inverse=True)
+            data = dset[frame_ids]
+
+            if result is None:
+                result = np.empty((num,) + data.shape[1:], dtype=data.dtype)
+
+            result[order[start:end]] = data[inverse]
+
+        return result
+
+    def _draw(self, num):
+        indices = self._table.sample(num, self._random_state)
+
+        if self._per_utterance:
+            return indices, None
+
+        positions = np.searchsorted(self._offsets, indices, side='right') - 1
+        return positions, indices - self._offsets[positions]
+
+    def _label_balancing_weights(self, corpus, label_list_idx, num_frames):
+        utt_values = {}
+        value_mass = collections.defaultdict(float)
+
+        for utt_idx, utt_num_frames in num_frames.items():
+            utterance = corpus.utterances[utt_idx]
+
+            if label_list_idx not in utterance.label_lists:
+                continue
+
+            values = utterance.label_lists[label_list_idx].label_values()
+
+            if len(values) == 0:
+                continue
+
+            utt_values[utt_idx] = values
+
+            for value in values:
+                value_mass[value] += 1 if self._per_utterance else utt_num_frames
+
+        weights = {}
+
+        for utt_idx, values in utt_values.items():
+            weight = np.mean([1.0 / value_mass[value] for value in values])
+
+            if not self._per_utterance:
+                weight *= num_frames[utt_idx]  # mass of the utterance, spread over its frames
+
+            weights[utt_idx] = weight
+
+        return weights
@@ -1,4 +1,5 @@
 import collections
+import copy
 
 import numpy as np
 
@@ -23,22 +24,84 @@ class Utterance(object):
         label_lists (dict): A dictionary containing label-lists with the label-list-idx as key.
     """
 
-    __slots__ = ['idx', 'file', 'issuer', 'start', 'end', 'label_lists']
+    __slots__ = ['idx', '_file', '_issuer', '_start', '_end', 'label_lists', '_corpus']
 
     def __init__(self, idx, file, issuer=None, start=0, end=-1, label_lists=None):
         self.idx = idx
-        self.file = file
-        self.issuer = issuer
-        self.start = start
-        self.end = end
+        self._file = file
+        self._issuer = issuer
+        self._start = start
+        self._end = end
         self.label_lists = {}
 
+        # The corpus the utterance was added to, changes are reported to it
+        self._corpus = None
+
         if label_lists is not None:
             self.set_label_list(label_lists)
 
         if self.issuer is not None:
             self.issuer.utterances.add(self)
 
+    def __deepcopy__(self, memo):
+        # The copy only belongs to the corpus, if the corpus is copied along (e.g. with the whole corpus)
+        utterance = Utterance.__new__(type(self))
+        memo[id(self)] = utterance
+
+        for name in Utterance.__slots__:
+            if name != '_corpus':
+                setattr(utterance, name, copy.deepcopy(getattr(self, name), memo))
+
+        utterance._corpus = memo.get(id(self._corpus))
+        return utterance
+
+    @property
+    def file(self):
+        """ The file this utterance is belonging to. """
+        return self._file
+
+    @file.setter
+    def file(self, value):
+        previous = self._file
+        self._file = value
+
+        if self._corpus is not None:
+            self._corpus._register_reassignment(self, previous, self._issuer)
+
+    @property
+    def issuer(self):
+        """ The issuer this utterance was created from. """
+        return self._issuer
+
+    @issuer.setter
+    def issuer(self, value):
+        previous = self._issuer
+        self._issuer = value
+
+        if self._corpus is not None:
+            self._corpus._register_reassignment(self, self._file, previous)
+
+    @property
+    def start(self):
+        """ The start of the utterance within the audio file in seconds. """
+        return self._start
+
+    @start.setter
+    def start(self, value):
+        # The duration of labels until the end of the utterance depends on it
+        self._register_change()
+        self._start = value
+
+    @property
+    def end(self):
+        """ The end of the utterance within the audio file in seconds (-1 for the end of the file). """
+        return self._end
+
+    @end.setter
+    def end(self, value):
+        self._register_change()
+        self._end = value
+
     @property
     def end_abs(self):
         """
@@ -136,6 +199,7 @@ class Utterance(object):
 
             label_list.utterance = self
             self.label_lists[label_list.idx] = label_list
+            self._register_change(labels=True)
 
     def all_label_values(self, label_list_ids=None):
         """
@@ -195,3 +259,135 @@ class Utterance(object):
                     duration[label_value] += label_duration
 
         return duration
+
+    def _register_change(self, labels=False):
+        # Data cached by the corpus (e.g. the label statistics) depends on the utterance and its labels
+        if self._corpus is not None:
+            self._corpus._register_change(self if labels else None)
+
+
+class PendingLabelLists(object):
+    """
+    Functions loading label-lists, that haven't been loaded yet. Every function loads the label-lists with a given
+    idx for all utterances of a corpus (e.g. by reading a label file). The registry is shared by the
+    :py:class:`LabelListDict` of all utterances of the corpus. A function is called on first access to a
+    label-list with its idx and is removed afterwards.
+    """
+
+    def __init__(self):
+        self.loaders = collections.defaultdict(list)
+
+    def __len__(self):
+        return len(self.loaders)
+
+    def add(self, idx, loader):
+        """
+        Add a function, that loads the label-lists with the given idx.
+        If there are already functions for the idx, all of them are called (in the order they were added).
+
+        Args:
+            idx (str): The idx of the label-lists.
+            loader (func): Function without arguments, setting the label-lists on the utterances
+                           (e.g. with :py:meth:`Utterance.set_label_list`).
+        """
+        self.loaders[idx].append(loader)
+
+    def load(self, idx=None):
+        """
+        Load the label-lists with the given idx (if pending).
+        If ``idx`` is ``None``, all pending label-lists are loaded.
+        """
+        if idx is None:
+            while len(self.loaders) > 0:
+                self.load(next(iter(self.loaders)))
+        else:
+            for loader in self.loaders.pop(idx, ()):
+                loader()
+
+
+class LabelListDict(dict):
+    """
+    Dictionary with the label-lists of an utterance (:py:attr:`Utterance.label_lists`),
+    supporting label-lists that are loaded on first access.
+    Accessing a label-list by its idx loads the pending label-lists with this idx,
+    any operation considering all label-lists (iterating, ``len``, ``keys``, ...) loads all pending label-lists.
+
+    Args:
+        pending (PendingLabelLists): The pending label-lists of the corpus.
+        label_lists (dict): The already loaded label-lists.
+    """
+
+    __slots__ = ['pending']
+
+    def __init__(self, pending, label_lists=()):
+        super(LabelListDict, self).__init__(label_lists)
+        self.pending = pending
+
+    def __reduce__(self):
+        # Copies/pickles are ordinary dictionaries with all label-lists
+        self.pending.load()
+        return dict, (dict(self),)
+
+    def __getitem__(self, key):
+        self.pending.load(key)
+        return super(LabelListDict, self).__getitem__(key)
+
+    def __setitem__(self, key, value):
+        # A pending label-list would override the new one when loaded
+        self.pending.load(key)
+        super(LabelListDict, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.pending.load(key)
+        super(LabelListDict, self).__delitem__(key)
+
+    def __contains__(self, key):
+        self.pending.load(key)
+        return super(LabelListDict, self).__contains__(key)
+
+    def get(self, key, default=None):
+        self.pending.load(key)
+        return super(LabelListDict, self).get(key, default)
+
+    def pop(self, key, *args):
+        self.pending.load(key)
+        return super(LabelListDict, self).pop(key, *args)
+
+    def setdefault(self, key, default=None):
+        self.pending.load(key)
+        return super(LabelListDict, self).setdefault(key, default)
+
+    def __iter__(self):
+        self.pending.load()
+        return super(LabelListDict, self).__iter__()
+
+    def __len__(self):
+        self.pending.load()
+        return super(LabelListDict, self).__len__()
+
+    def __eq__(self, other):
+        self.pending.load()
+        return super(LabelListDict, self).__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self.pending.load()
+        return super(LabelListDict, self).__repr__()
+
+    def keys(self):
+        self.pending.load()
+        return super(LabelListDict, self).keys()
+
+    def values(self):
+        self.pending.load()
+        return super(LabelListDict, self).values()
+
+    def items(self):
+        self.pending.load()
+        return super(LabelListDict, self).items()
+
+    def copy(self):
+        self.pending.load()
+        return dict(self)
@@ -1,8 +1,8 @@
 import abc
-import collections
 
 import numpy as np
 
+from audiomate.corpus.utils import label_statistics
 from audiomate.utils import stats
 
 
@@ -21,6 +21,56 @@ class CorpusView(metaclass=abc.ABCMeta):
         """ Return the name of the dataset (Equals basename of the path, if not None). """
         return 'undefined'
 
+    @property
+    def num_changes(self):
+        """
+        Return a number that changes whenever the corpus is modified (assets are added, labels or label-lists are
+        changed). Views deriving data from the corpus (e.g. :py:class:`audiomate.corpus.subset.Subview`) use it
+        to decide whether cached data is still valid. If ``None``, the corpus doesn't track its modifications.
+        """
+        return None
+
+    def pending_label_list_ids(self):
+        """
+        Return the ids of the label-lists, that aren't loaded yet (if the corpus was loaded lazily).
+        Writers can keep the saved data of these label-lists without loading them.
+
+        Returns:
+            set: The ids of the pending label-lists.
+        """
+        return set()
+
+    def has_pending_subviews(self):
+        """
+        Return ``True``, if the subviews aren't loaded yet (if the corpus was loaded lazily).
+        Writers can keep the saved subviews without loading them.
+        """
+        return False
+
+    def saved_state(self, path):
+        """
+        Return the state stored by the writer, when the corpus was saved at (or loaded from) the given path
+        (see :py:meth:`mark_saved`). The :py:class:`audiomate.corpus.io.DefaultWriter` for example stores
+        the digests of the written files, so it only has to rewrite the files whose content has changed.
+
+        Args:
+            path (str): Path of the saved corpus.
+
+        Returns:
+            dict: The state, ``None`` if the corpus wasn't saved at (or loaded from) the given path.
+        """
+        return None
+
+    def mark_saved(self, path, state=None):
+        """
+        Remember, that the corpus was saved at (or loaded from) the given path (see :py:meth:`saved_state`).
+
+        Args:
+            path (str): Path of the saved corpus.
+            state (dict): State of the writer (e.g. digests of the written files), if ``None`` an empty state is used.
+        """
+        pass
+
     #
     #   Files
     #
@@ -63,6 +113,64 @@ class CorpusView(metaclass=abc.ABCMeta):
         """ Return number of utterances. """
         return len(self.utterances)
 
+    def utterance_ids_of_file(self, file_idx):
+        """
+        Return the ids of all utterances in the file with the given id.
+
+        Returns:
+            set: The utterance-ids.
+        """
+        return {utt_idx for utt_idx, utterance in self.utterances.items() if utterance.file.idx == file_idx}
+
+    def utterance_ids_of_issuer(self, issuer_idx):
+        """
+        Return the ids of all utterances of the issuer with the given id.
+
+        Returns:
+            set: The utterance-ids.
+        """
+        return {utt_idx for utt_idx, utterance in self.utterances.items()
+                if utterance.issuer is not None and utterance.issuer.idx == issuer_idx}
+
+    def utterance_ids_with_label_list(self, label_list_idx):
+        """
+        Return the ids of all utterances with a label-list with the given id.
+
+        Returns:
+            set: The utterance-ids.
+        """
+        return {utt_idx for utt_idx, utterance in self.utterances.items() if label_list_idx in utterance.label_lists}
+
+    def utterance_ids_with_label(self, value, label_list_ids=None):
+        """
+        Return the ids of all utterances with at least one label with the given value.
+
+        Args:
+            value (str): The label-value.
+            label_list_ids (list): If not None, only labels from label-lists with an id contained in this list
+                                   are considered.
+
+        Returns:
+            set: The utterance-ids.
+        """
+        utterance_ids = set()
+
+        for utt_idx, utterance in self.utterances.items():
+            for label_list_idx, label_list in utterance.label_lists.items():
+                if label_list_ids is None or label_list_idx in label_list_ids:
+                    if any(label.value == value for label in label_list):
+                        utterance_ids.add(utt_idx)
+                        break
+
+        return utterance_ids
+
+    def _utterances_with_ids(self, utterance_ids):
+        """
+        Return a dictionary with the utterances with the given ids (if in the corpus),
+        in the same order as in :py:attr:`utterances`.
+        """
+        return {utt_idx: utterance for utt_idx, utterance in self.utterances.items() if utt_idx in utterance_ids}
+
     #
     #   Issuers
     #
@@ -128,6 +236,16 @@ class CorpusView(metaclass=abc.ABCMeta):
     #   Labels
     #
 
+    def label_statistics(self):
+        """
+        Return the label statistics of all utterances, which are used to compute
+        :py:meth:`all_label_values`, :py:meth:`label_count` and :py:meth:`label_durations`.
+
+        Returns:
+            LabelStatistics: The statistics (:py:class:`audiomate.corpus.utils.label_statistics.LabelStatistics`).
+        """
+        return label_statistics.LabelStatistics(self.utterances.values())
+
     def all_label_values(self, label_list_ids=None):
         """
         Return a set of all label-values occurring in this corpus.
@@ -139,12 +257,7 @@ class CorpusView(metaclass=abc.ABCMeta):
         Returns:
              set: A set of distinct label-values.
         """
-        values = set()
-
-        for utterance in self.utterances.values():
-            values = values.union(utterance.all_label_values(label_list_ids=label_list_ids))
-
-        return values
+        return self.label_statistics().label_values(label_list_ids=label_list_ids)
 
     def label_count(self, label_list_ids=None):
         """
@@ -157,13 +270,7 @@ class CorpusView(metaclass=abc.ABCMeta):
         Returns:
             dict: A dictionary containing the number of occurrences with the label-value as key.
         """
-        count = collections.defaultdict(int)
-
-        for utterance in self.utterances.values():
-            for label_value, utt_count in utterance.label_count(label_list_ids=label_list_ids).items():
-                count[label_value] += utt_count
-
-        return count
+        return self.label_statistics().label_count(label_list_ids=label_list_ids)
 
     def label_durations(self, label_list_ids=None):
         """
@@ -176,13 +283,7 @@ class CorpusView(metaclass=abc.ABCMeta):
         Returns:
             dict: A dictionary containing the total duration with the label-value as key.
         """
-        duration = collections.defaultdict(int)
-
-        for utterance in self.utterances.values():
-            for label_value, utt_count in utterance.label_total_duration(label_list_ids=label_list_ids).items():
-                duration[label_value] += utt_count
-
-        return duration
+        return self.label_statistics().label_durations(label_list_ids=label_list_ids)
 
     #
     #   Data
@@ -1,8 +1,12 @@
+import collections
 import copy
 import os
 import shutil
 
 from audiomate.corpus import assets
+from audiomate.corpus.utils import corpus_index
+from audiomate.corpus.utils import label_statistics
+from audiomate.utils import misc
 from audiomate.utils import naming
 from . import base
 from . import subset
@@ -31,6 +35,16 @@ class Corpus(base.CorpusView):
         self._issuers = {}
         self._feature_containers = {}
         self._subviews = {}
+        self._file_names = naming.UniqueNames(self._files)
+        self._utterance_names = naming.UniqueNames(self._utterances)
+        self._issuer_names = naming.UniqueNames(self._issuers)
+        self._label_statistics = None
+        self._label_statistics_key = None
+        self._index = corpus_index.CorpusIndex()
+        self._num_changes = 0
+        self._saved_state = None
+        self._pending_label_lists = None
+        self._pending_subviews = None
 
     @property
     def name(self):
@@ -39,6 +53,49 @@ class Corpus(base.CorpusView):
         else:
             return os.path.basename(os.path.abspath(self.path))
 
+    @property
+    def num_changes(self):
+        # Files, utterances and label-lists of the corpus report their changes (see _register_change)
+        return self._num_changes
+
+    def pending_label_list_ids(self):
+        if self._pending_label_lists is None:
+            return set()
+
+        return set(self._pending_label_lists.loaders.keys())
+
+    def has_pending_subviews(self):
+        return self._pending_subviews is not None
+
+    def saved_state(self, path):
+        if self._saved_state is None or self._saved_state[0] != os.path.abspath(path):
+            return None
+
+        return self._saved_state[1]
+
+    def mark_saved(self, path, state=None):
+        self._saved_state = (os.path.abspath(path), state or {})
+
+    def _register_change(self, utterance=None):
+        """
+        Count a change of the corpus. Files, utterances and label-lists of the corpus report their changes here.
+
+        Args:
+            utterance (Utterance): If not None, the labels or label-lists of this utterance have changed.
+        """
+        self._num_changes += 1
+
+        if utterance is not None:
+            self._index.invalidate_labels(utterance)
+
+    def _register_reassignment(self, utterance, file, issuer):
+        """
+        Count the reassignment of the file or issuer of the given utterance (from the given previous ones)
+        and update the indexes.
+        """
+        self._num_changes += 1
+        self._index.reassign(utterance, file, issuer)
+
     @property
     def files(self):
         return self._files
@@ -57,6 +114,7 @@ class Corpus(base.CorpusView):
 
     @property
     def subviews(self):
+        self._load_pending_subviews()
         return self._subviews
 
     #
@@ -96,7 +154,7 @@ class Corpus(base.CorpusView):
         self.path = path
 
     @classmethod
-    def load(cls, path, reader=None):
+    def load(cls, path, reader=None, lazy=False):
         """
         Loads the corpus from the given path, using the given reader. If no reader is given the
         :py:class:`audiomate.corpus.io.DefaultReader` is used.
@@ -104,6 +162,8 @@ class Corpus(base.CorpusView):
         Args:
             path (str): Path to load the corpus from.
             reader (str, CorpusReader): The reader or the name of the reader to use.
+            lazy (bool): If ``True``, label-lists and subviews are only loaded when accessed,
+                         if supported by the reader (see :py:meth:`audiomate.corpus.io.CorpusReader.load`).
 
         Returns:
             Corpus: The loaded corpus.
@@ -117,7 +177,7 @@ class Corpus(base.CorpusView):
             from . import io
             reader = io.create_reader_of_type(reader)
 
-        return reader.load(path)
+        return reader.load(path, lazy=lazy)
 
     #
     # File
@@ -141,8 +201,8 @@ class Corpus(base.CorpusView):
         new_file_path = os.path.abspath(path)
 
         # Add index to idx if already existing
-        if new_file_idx in self._files.keys():
-            new_file_idx = naming.index_name_if_in_list(new_file_idx, self._files.keys())
+        if new_file_idx in self._files:
+            new_file_idx = self._file_names.index_name(new_file_idx)
 
         # Copy file to default file dir
         if copy_file:
@@ -158,7 +218,9 @@ class Corpus(base.CorpusView):
 
         # Create file obj
         new_file = assets.File(new_file_idx, new_file_path)
+        new_file._corpus = self
         self._files[new_file_idx] = new_file
+        self._register_change()
 
         return new_file
 
@@ -185,10 +247,12 @@ class Corpus(base.CorpusView):
             idx_mapping[file.idx] = file
 
             # Add index to idx if already existing
-            if file.idx in self._files.keys():
-                file.idx = naming.index_name_if_in_list(file.idx, self._files.keys())
+            if file.idx in self._files:
+                file.idx = self._file_names.index_name(file.idx)
 
+            file._corpus = self
             self._files[file.idx] = file
+            self._register_change()
 
         return idx_mapping
 
@@ -229,8 +293,8 @@ class Corpus(base.CorpusView):
                 issuer = self._issuers[issuer_idx]
 
         # Add index to idx if already existing
-        if new_utt_idx in self._utterances.keys():
-            new_utt_idx = naming.index_name_if_in_list(new_utt_idx, self._utterances.keys())
+        if new_utt_idx in self._utterances:
+            new_utt_idx = self._utterance_names.index_name(new_utt_idx)
 
         new_utt = assets.Utterance(new_utt_idx,
                                    self.files[file_idx],
@@ -238,7 +302,10 @@ class Corpus(base.CorpusView):
                                    start=start,
                                    end=end)
 
+        new_utt._corpus = self
         self._utterances[new_utt_idx] = new_utt
+        self._index.add(new_utt)
+        self._register_change()
 
         return new_utt
 
@@ -265,22 +332,72 @@ class Corpus(base.CorpusView):
             idx_mapping[utterance.idx] = utterance
 
             # Check if there is a file with the given idx
-            if utterance.file not in self._files.values():
+            if self._files.get(utterance.file.idx) is not utterance.file:
                 raise ValueError('File with id {} is not in the corpus.'.format(utterance.file.idx, utterance.idx))
 
             # Check if there is a issuer with the given idx
-            if utterance.issuer is not None and utterance.issuer not in self._issuers.values():
+            if utterance.issuer is not None and self._issuers.get(utterance.issuer.idx) is not utterance.issuer:
                 raise ValueError('No issuer in corpus with id {} to add utterance {}.'.format(
                     utterance.issuer.idx, utterance.idx))
 
             # Add index to idx if already existing
-            if utterance.idx in self._utterances.keys():
-                utterance.idx = naming.index_name_if_in_list(utterance.idx, self._utterances.keys())
+            if utterance.idx in self._utterances:
+                utterance.idx = self._utterance_names.index_name(utterance.idx)
 
+            utterance._corpus = self
             self._utterances[utterance.idx] = utterance
+            self._index.add(utterance)
+            self._register_change()
 
         return idx_mapping
 
+    #
+    #   Queries
+    #
+
+    def utterance_ids_of_file(self, file_idx):
+        return self._utterance_index().utterance_ids_of_file(file_idx)
+
+    def utterance_ids_of_issuer(self, issuer_idx):
+        return self._utterance_index().utterance_ids_of_issuer(issuer_idx)
+
+    def utterance_ids_with_label_list(self, label_list_idx):
+        return self._label_index().utterance_ids_with_label_list(label_list_idx)
+
+    def utterance_ids_with_label(self, value, label_list_ids=None):
+        return self._label_index().utterance_ids_with_label(value, label_list_ids=label_list_ids)
+
+    def all_label_values(self, label_list_ids=None):
+        return self._label_index().label_values(label_list_ids=label_list_ids)
+
+    def _utterances_with_ids(self, utterance_ids):
+        if len(utterance_ids) * 4 > len(self._utterances):
+            return super(Corpus, self)._utterances_with_ids(utterance_ids)
+
+        return {utt_idx: self._utterances[utt_idx] for utt_idx in self._utterance_index().sort(utterance_ids)}
+
+    def _utterance_index(self):
+        """
+        Return the inverted indexes of the utterances (:py:class:`audiomate.corpus.utils.corpus_index.CorpusIndex`).
+        The indexes are updated when utterances are added with :py:meth:`new_utterance` or
+        :py:meth:`import_utterances`. If the utterances were changed in any other way, they are rebuilt.
+        """
+        if self._index.num_utterances != len(self._utterances):
+            self._index.rebuild(self._utterances.values())
+
+        return self._index
+
+    def _label_index(self):
+        index = self._utterance_index()
+
+        # All label-lists are indexed, so pending ones are loaded first
+        if self._pending_label_lists is not None:
+            self._pending_label_lists.load()
+
+        index.update_labels(self._utterances.values())
+
+        return index
+
     #
     #   Issuer
     #
@@ -301,11 +418,12 @@ class Corpus(base.CorpusView):
         new_issuer_idx = issuer_idx
 
         # Add index to idx if already existing
-        if new_issuer_idx in self._issuers.keys():
-            new_issuer_idx = naming.index_name_if_in_list(new_issuer_idx, self._issuers.keys())
+        if new_issuer_idx in self._issuers:
+            new_issuer_idx = self._issuer_names.index_name(new_issuer_idx)
 
         new_issuer = assets.Issuer(new_issuer_idx, info=info)
         self._issuers[new_issuer_idx] = new_issuer
+        self._register_change()
 
         return new_issuer
 
@@ -332,10 +450,11 @@ class Corpus(base.CorpusView):
             idx_mapping[issuer.idx] = issuer
 
             # Add index to idx if already existing
-            if issuer.idx in self._issuers.keys():
-                issuer.idx = naming.index_name_if_in_list(issuer.idx, self._issuers.keys())
+            if issuer.idx in self._issuers:
+                issuer.idx = self._issuer_names.index_name(issuer.idx)
 
             self._issuers[issuer.idx] = issuer
+            self._register_change()
 
         return idx_mapping
 
@@ -374,13 +493,106 @@ class Corpus(base.CorpusView):
 
         container = assets.FeatureContainer(new_feature_path)
         self._feature_containers[new_feature_idx] = container
+        self._register_change()
 
         return container
 
+    #
+    #   Labels
+    #
+
+    def label_statistics(self):
+        """
+        Return the label statistics of all utterances (see :py:meth:`audiomate.corpus.CorpusView.label_statistics`).
+        The statistics are cached and only recomputed, if labels, label-lists or utterances have changed.
+        """
+        key = (self.num_changes, len(self._utterances))
+
+        if self._label_statistics is None or self._label_statistics_key != key:
+            self._label_statistics = label_statistics.LabelStatistics(self._utterances.values())
+            self._label_statistics_key = key
+
+        return self._label_statistics
+
+    def compact_labels(self, label_list_ids=None):
+        """
+        Move the labels of the corpus into columnar stores (:py:class:`audiomate.corpus.assets.LabelStore`),
+        one per label-list idx. The label-lists of the utterances are replaced by views on the stores
+        (:py:class:`audiomate.corpus.assets.LabelListView`), which provide the same API.
+        This reduces the memory needed for corpora with many labels and the label statistics of the corpus
+        are computed with vectorized operations.
+
+        Args:
+            label_list_ids (list): If not None, only label-lists with an id contained in this list are compacted.
+
+        Returns:
+            dict: The created stores with the label-list idx as key.
+        """
+        label_lists = collections.defaultdict(list)
+
+        for utterance in self._utterances.values():
+            for label_list in utterance.label_lists.values():
+                if label_list_ids is None or label_list.idx in label_list_ids:
+                    label_lists[label_list.idx].append(label_list)
+
+        stores = {}
+
+        for idx, lists in label_lists.items():
+            store = assets.LabelStore.from_label_lists(lists, idx=idx)
+
+            for label_list, view in zip(lists, store.label_lists()):
+                label_list.utterance.set_label_list(view)
+
+            stores[idx] = store
+
+        return stores
+
+    def defer_label_lists(self, idx, loader):
+        """
+        Register a function, that loads the label-lists with the given idx for the utterances of the corpus.
+        The function is called on first access to a label-list with this idx
+        (e.g. ``utterance.label_lists[idx]``) or to all label-lists of an utterance.
+        It is used by readers to load label-lists lazily.
+
+        Args:
+            idx (str): The idx of the label-lists.
+            loader (func): Function without arguments, setting the label-lists on the utterances
+                           (e.g. with :py:meth:`audiomate.corpus.assets.Utterance.set_label_list`).
+        """
+        if self._pending_label_lists is None:
+            self._pending_label_lists = assets.PendingLabelLists()
+
+        pending = self._pending_label_lists
+
+        for utterance in self._utterances.values():
+            label_lists = utterance.label_lists
+
+            if not isinstance(label_lists, assets.LabelListDict) or label_lists.pending is not pending:
+                utterance.label_lists = assets.LabelListDict(pending, label_lists)
+
+        pending.add(idx, loader)
+
     #
     #   Subviews
     #
 
+    def defer_subviews(self, loader):
+        """
+        Register a function, that loads the subviews of the corpus (with :py:meth:`import_subview`).
+        The function is called on first access to :py:attr:`subviews`.
+        It is used by readers to load subviews lazily.
+
+        Args:
+            loader (func): Function without arguments, adding the subviews to the corpus.
+        """
+        self._pending_subviews = loader
+
+    def _load_pending_subviews(self):
+        if self._pending_subviews is not None:
+            loader = self._pending_subviews
+            self._pending_subviews = None
+            loader()
+
     def import_subview(self, idx, subview):
         """
         Add the given subview to the corpus.
@@ -391,8 +603,12 @@ class Corpus(base.CorpusView):
             subview (Subview): The subview to add.
         """
 
+        # Pending subviews would override the new one when loaded
+        self._load_pending_subviews()
+
         subview.corpus = self
         self._subviews[idx] = subview
+        self._register_change()
 
     #
     #   Merge
@@ -408,27 +624,92 @@ class Corpus(base.CorpusView):
             corpus (CorpusView): The corpus to merge.
         """
 
-        # Create a copy, so objects aren't changed in the original merging corpus
-        merging_corpus = Corpus.from_corpus(corpus)
+        with misc.paused_garbage_collection():
+            utterance_idx_mapping = self._import_copies(corpus)
+
+        # Only the ids of utterances, that had to be renamed, are replaced in the subviews
+        renamed_utterances = {old_idx: utterance.idx for old_idx, utterance in utterance_idx_mapping.items()
+                              if old_idx != utterance.idx}
 
-        self.import_files(corpus.files.values())
-        self.import_issuers(corpus.issuers.values())
-        utterance_idx_mapping = self.import_utterances(corpus.utterances.values())
+        for subview_idx, subview in corpus.subviews.items():
+            subview = subset.Subview(None, filter_criteria=copy.deepcopy(subview.filter_criteria))
 
-        for subview_idx, subview in merging_corpus.subviews.items():
-            for filter in subview.filter_criteria:
-                if isinstance(filter, subset.MatchingUtteranceIdxFilter):
-                    new_filtered_utt_ids = set()
-                    for utt_idx in filter.utterance_idxs:
-                        new_filtered_utt_ids.add(utterance_idx_mapping[utt_idx].idx)
-                    filter.utterance_idxs = new_filtered_utt_ids
+            if len(renamed_utterances) > 0:
+                for filter in subview.filter_criteria:
+                    if isinstance(filter, subset.MatchingUtteranceIdxFilter):
+                        filter.utterance_idxs = {renamed_utterances.get(utt_idx, utt_idx)
+                                                 for utt_idx in filter.utterance_idxs}
 
             new_idx = naming.index_name_if_in_list(subview_idx, self.subviews.keys())
             self.import_subview(new_idx, subview)
 
-        for feat_container_idx, feat_container in merging_corpus.feature_containers.items():
+        for feat_container_idx, feat_container in corpus.feature_containers.items():
             self.new_feature_container(feat_container_idx, feat_container.path)
 
+    def _import_copies(self, corpus):
+        """
+        Import copies of the files, issuers and utterances of the given corpus.
+        If any of the ids already exists, a suffix is appended so it is unique.
+
+        The assets are copied directly instead of with :py:func:`copy.deepcopy`, which would walk
+        the whole object graph (every utterance references its issuer, which references its utterances).
+        Label-lists backed by a :py:class:`audiomate.corpus.assets.LabelStore` are copied with a copy of the store
+        (one per store), so their labels aren't created as objects. The copy shares the arrays of the store
+        until the labels are changed in either corpus.
+
+        Args:
+            corpus (CorpusView): The corpus to copy the assets from.
+
+        Returns:
+            dict: The imported utterances with the utterance-idx in the given corpus as key.
+        """
+        file_mapping = self.import_files([assets.File(file.idx, file.path) for file in corpus.files.values()])
+
+        issuers = []
+
+        for issuer in corpus.issuers.values():
+            issuer_copy = copy.copy(issuer)
+            issuer_copy.info = copy.deepcopy(issuer.info)
+            issuer_copy.utterances = set()
+            issuers.append(issuer_copy)
+
+        issuer_mapping = self.import_issuers(issuers)
+
+        utterances = []
+        label_lists = []
+
+        for utterance in corpus.utterances.values():
+            issuer = None
+
+            if utterance.issuer is not None:
+                issuer = issuer_mapping[utterance.issuer.idx]
+
+            utterance_copy = assets.Utterance(utterance.idx, file_mapping[utterance.file.idx], issuer=issuer,
+                                              start=utterance.start, end=utterance.end)
+            utterances.append(utterance_copy)
+
+            for label_list in utterance.label_lists.values():
+                label_lists.append((utterance_copy, label_list))
+
+        utterance_mapping = self.import_utterances(utterances)
+        stores = {}
+
+        for utterance_copy, label_list in label_lists:
+            store = getattr(label_list, 'store', None)
+
+            if store is None:
+                utterance_copy.set_label_list(label_list.copy())
+            else:
+                stores.setdefault(id(store), (store, []))[1].append((utterance_copy, label_list.position))
+
+        for store, copies in stores.values():
+            views = store.copy(positions=[position for _, position in copies]).label_lists()
+
+            for utterance_copy, position in copies:
+                utterance_copy.set_label_list(views[position])
+
+        return utterance_mapping
+
     #
     #   Creation
     #
@@ -447,33 +728,7 @@ class Corpus(base.CorpusView):
         """
 
         ds = Corpus()
-
-        # Files
-        files = copy.deepcopy(list(corpus.files.values()))
-        file_mapping = ds.import_files(files)
-
-        # Issuers
-        issuers = copy.deepcopy(list(corpus.issuers.values()))
-        issuer_mapping = ds.import_issuers(issuers)
-
-        # Utterances, with replacing changed file- and issuer-ids
-        utterances = copy.deepcopy(list(corpus.utterances.values()))
-        for utterance in utterances:
-            utterance.file = file_mapping[utterance.file.idx]
-
-            if utterance.issuer is not None:
-                utterance.issuer = issuer_mapping[utterance.issuer.idx]
-
-        ds.import_utterances(utterances)
-
-        # Subviews
-        subviews = copy.deepcopy(corpus.subviews)
-        for subview_idx, subview in subviews.items():
-            ds.import_subview(subview_idx, subview)
-
-        # Feat-Containers
-        for feat_container_idx, feature_container in corpus.feature_containers.items():
-            ds.new_feature_container(feat_container_idx, feature_container.path)
+        ds.merge_corpus(corpus)
 
         return ds
 
@@ -4,8 +4,11 @@ used to convert between formats.
 """
 
 from .base import CorpusDownloader, CorpusReader, CorpusWriter
+from .base import UtteranceRecord  # noqa: F401
 from .broadcast import BroadcastReader  # noqa: F401
 from .default import DefaultReader, DefaultWriter  # noqa: F401
+from .snapshot import SnapshotReader, SnapshotWriter  # noqa: F401
+from .sqlite import SqliteReader, SqliteWriter  # noqa: F401
 from .gtzan import GtzanDownloader, GtzanReader  # noqa: F401
 from .kaldi import KaldiReader, KaldiWriter  # noqa: F401
 from .musan import MusanDownloader, MusanReader  # noqa: F401
@@ -153,3 +156,33 @@ def create_writer_of_type(type_name):
         raise UnknownWriterException('Unknown writer: %s' % (type_name,))
 
     return writers[type_name]()
+
+
+def convert(source_path, target_path, reader, writer):
+    """
+    Convert the corpus at ``source_path`` into another format.
+
+    If both the reader and the writer support streaming (see :py:meth:`CorpusReader.supports_streaming`,
+    :py:meth:`CorpusWriter.supports_streaming`), the corpus is passed utterance by utterance from the reader
+    to the writer, without holding the whole corpus in memory. Otherwise the corpus is loaded and saved.
+
+    Args:
+        source_path (str): Path of the corpus to convert.
+        target_path (str): Path to write the converted corpus to.
+        reader (str, CorpusReader): The reader or the name of the reader to use.
+        writer (str, CorpusWriter): The writer or the name of the writer to use.
+
+    Example::
+
+        >>> convert('/data/common-voice', '/data/kaldi', 'common-voice', 'kaldi')
+    """
+    if type(reader) == str:
+        reader = create_reader_of_type(reader)
+
+    if type(writer) == str:
+        writer = create_writer_of_type(writer)
+
+    if reader.supports_streaming() and writer.supports_streaming():
+        writer.save_stream(reader.stream(source_path), target_path)
+    else:
+        writer.save(reader.load(source_path), target_path)
@@ -1,4 +1,15 @@
 import abc
+import collections
+
+import audiomate
+from audiomate.corpus import subset
+from audiomate.utils import misc
+
+#: A record of a corpus read utterance by utterance (see :py:meth:`CorpusReader.stream`).
+#: It contains an utterance (with its file, issuer and label-lists) and the ids of the subviews
+#: the utterance is part of. Files and issuers of different records with the same idx are the same file/issuer,
+#: but they don't have to be the same objects (so the records don't have to be held in memory).
+UtteranceRecord = collections.namedtuple('UtteranceRecord', ['utterance', 'subview_ids'])
 
 
 class FailedDownloadException(Exception):
@@ -58,12 +69,14 @@ class CorpusReader(metaclass=abc.ABCMeta):
     implementation.
     """
 
-    def load(self, path):
+    def load(self, path, lazy=False):
         """
         Load and return the corpus from the given path.
 
         Args:
             path (str): Path to the data set to load.
+            lazy (bool): If ``True``, the reader may defer loading label-lists and subviews until they are accessed
+                         (see :py:meth:`_load_lazy`). Readers not supporting lazy loading load the whole corpus.
 
         Returns:
             Corpus: The loaded corpus
@@ -78,8 +91,45 @@ class CorpusReader(metaclass=abc.ABCMeta):
             raise IOError('Invalid data set of type {}: files {} not found at {}'.format(
                 self.type(), ' '.join(missing_files), path))
 
+        if lazy:
+            return self._load_lazy(path)
+
         return self._load(path)
 
+    def stream(self, path):
+        """
+        Read the corpus from the given path utterance by utterance, for example to convert it into another format
+        without holding it in memory (see :py:func:`audiomate.corpus.io.convert`).
+        Feature-containers are not part of the stream.
+
+        If the reader doesn't support streaming (see :py:meth:`supports_streaming`),
+        the whole corpus is loaded first.
+
+        Args:
+            path (str): Path to the data set to load.
+
+        Returns:
+            generator: A generator yielding a :py:data:`UtteranceRecord` for every utterance.
+
+        Raises:
+            IOError: When the data set is invalid, for example because required files (annotations, …) are missing.
+        """
+        missing_files = self._check_for_missing_files(path)
+
+        if len(missing_files) > 0:
+            raise IOError('Invalid data set of type {}: files {} not found at {}'.format(
+                self.type(), ' '.join(missing_files), path))
+
+        return self._stream(path)
+
+    @classmethod
+    def supports_streaming(cls):
+        """
+        Return ``True`` if the reader reads the corpus utterance by utterance in :py:meth:`stream`,
+        ``False`` if the whole corpus is loaded first.
+        """
+        return False
+
     @classmethod
     @abc.abstractmethod
     def type(cls):
@@ -110,6 +160,34 @@ class CorpusReader(metaclass=abc.ABCMeta):
         """
         pass
 
+    def _load_lazy(self, path):
+        """
+        Performs the reading of the corpus, deferring the loading of label-lists and subviews until they are accessed
+        (see :py:meth:`audiomate.corpus.Corpus.defer_label_lists`, :py:meth:`audiomate.corpus.Corpus.defer_subviews`).
+        By default the whole corpus is loaded with :py:meth:`_load`.
+
+        Args:
+            path (str): Path to a directory where the data set resides.
+
+        Returns:
+            Corpus: The loaded corpus
+        """
+        return self._load(path)
+
+    def _stream(self, path):
+        """
+        Performs the reading of the corpus utterance by utterance (see :py:meth:`stream`).
+        Readers implementing it have to return ``True`` in :py:meth:`supports_streaming`.
+        By default the whole corpus is loaded with :py:meth:`_load`.
+
+        Args:
+            path (str): Path to a directory where the data set resides.
+
+        Returns:
+            generator: A generator yielding a :py:data:`UtteranceRecord` for every utterance.
+        """
+        return records_of_corpus(self._load(path))
+
     @abc.abstractmethod
     def _check_for_missing_files(self, path):
         """
@@ -145,6 +223,27 @@ class CorpusWriter(metaclass=abc.ABCMeta):
         """
         self._save(corpus, path)
 
+    def save_stream(self, records, path):
+        """
+        Save the corpus given utterance by utterance at the given path (see :py:meth:`CorpusReader.stream`).
+
+        If the writer doesn't support streaming (see :py:meth:`supports_streaming`),
+        the corpus is built in memory from the records first.
+
+        Args:
+            records (iterable): The records (:py:data:`UtteranceRecord`) of the corpus to save.
+            path (str): Path to save the corpus to.
+        """
+        self._save_stream(records, path)
+
+    @classmethod
+    def supports_streaming(cls):
+        """
+        Return ``True`` if the writer writes the records one by one in :py:meth:`save_stream`,
+        ``False`` if the whole corpus is built in memory first.
+        """
+        return False
+
     @classmethod
     @abc.abstractmethod
     def type(cls):
@@ -169,3 +268,84 @@ class CorpusWriter(metaclass=abc.ABCMeta):
             path (str): Path of the target directory
         """
         pass
+
+    def _save_stream(self, records, path):
+        """
+        Writes the corpus given utterance by utterance to disk (see :py:meth:`save_stream`).
+        Writers implementing it have to return ``True`` in :py:meth:`supports_streaming`.
+        By default the corpus is built from the records with :py:func:`corpus_from_records`
+        and written with :py:meth:`_save`.
+
+        Args:
+            records (iterable): The records (:py:data:`UtteranceRecord`) of the corpus.
+            path (str): Path of the target directory
+        """
+        self._save(corpus_from_records(records), path)
+
+
+def records_of_corpus(corpus):
+    """
+    Generate the records (:py:data:`UtteranceRecord`) of all utterances of the given corpus.
+
+    Args:
+        corpus (CorpusView): The corpus.
+
+    Returns:
+        generator: A generator yielding a :py:data:`UtteranceRecord` for every utterance.
+    """
+    subview_utterance_ids = {subview_idx: set(subview.utterances.keys())
+                             for subview_idx, subview in corpus.subviews.items()}
+
+    for utterance in corpus.utterances.values():
+        subview_ids = [subview_idx for subview_idx, utterance_ids in subview_utterance_ids.items()
+                       if utterance.idx in utterance_ids]
+
+        yield UtteranceRecord(utterance, subview_ids)
+
+
+def corpus_from_records(records, path=None):
+    """
+    Create a corpus containing the utterances of the given records (:py:data:`UtteranceRecord`).
+    Files and issuers of different records with the same idx are the same file/issuer,
+    only the first one is added to the corpus.
+    The subviews are created with a :py:class:`audiomate.corpus.subset.MatchingUtteranceIdxFilter`.
+
+    Args:
+        records (iterable): The records.
+        path (str): The path of the corpus.
+
+    Returns:
+        Corpus: The corpus.
+    """
+    corpus = audiomate.Corpus(path=path)
+    subview_utterance_ids = collections.OrderedDict()
+
+    with misc.paused_garbage_collection():
+        for utterance, subview_ids in records:
+            file = corpus.files.get(utterance.file.idx)
+
+            if file is None:
+                corpus.import_files(utterance.file)
+            else:
+                utterance.file = file
+
+            if utterance.issuer is not None:
+                issuer = corpus.issuers.get(utterance.issuer.idx)
+
+                if issuer is None:
+                    corpus.import_issuers(utterance.issuer)
+                elif issuer is not utterance.issuer:
+                    utterance.issuer.utterances.discard(utterance)
+                    utterance.issuer = issuer
+                    issuer.utterances.add(utterance)
+
+            corpus.import_utterances(utterance)
+
+            for subview_idx in subview_ids:
+                subview_utterance_ids.setdefault(subview_idx, set()).add(utterance.idx)
+
+    for subview_idx, utterance_ids in subview_utterance_ids.items():
+        utterance_filter = subset.MatchingUtteranceIdxFilter(utterance_idxs=utterance_ids)
+        corpus.import_subview(subview_idx, subset.Subview(corpus, filter_criteria=[utterance_filter]))
+
+    return corpus
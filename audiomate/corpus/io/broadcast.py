@@ -2,6 +2,7 @@ import os
 import json
 
 import audiomate
+from audiomate.corpus import assets
 from audiomate.formats import audacity
 from audiomate.utils import textfile
 from . import base
@@ -76,7 +77,12 @@ class BroadcastReader(base.CorpusReader):
             if len(record) > 2:
                 label_idx = record[2]
 
-            ll = audacity.read_label_list(label_path)
+            # A missing label file is treated as empty label-list
+            if os.path.isfile(label_path):
+                ll = audacity.read_label_list(label_path)
+            else:
+                ll = assets.LabelList()
+
             ll.idx = label_idx
             ll.apply(extract_meta_from_label_value)
 
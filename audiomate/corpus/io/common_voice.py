@@ -57,9 +57,18 @@ class CommonVoiceReader(base.CorpusReader):
     def type(cls):
         return 'common-voice'
 
+    @classmethod
+    def supports_streaming(cls):
+        return True
+
     def _check_for_missing_files(self, path):
         return []
 
+    def _stream(self, path):
+        for subset_idx in CommonVoiceReader.get_subset_ids(path):
+            for utterance in CommonVoiceReader.subset_utterances(path, subset_idx):
+                yield base.UtteranceRecord(utterance, [subset_idx])
+
     def _load(self, path):
         corpus = audiomate.Corpus(path=path)
         subset_ids = CommonVoiceReader.get_subset_ids(path)
@@ -84,9 +93,24 @@ class CommonVoiceReader(base.CorpusReader):
     @staticmethod
     def load_subset(corpus, path, subset_idx):
         """ Load subset into corpus. """
-        csv_file = os.path.join(path, '{}.csv'.format(subset_idx))
         utt_ids = []
 
+        for utterance in CommonVoiceReader.subset_utterances(path, subset_idx):
+            corpus.import_files(utterance.file)
+            corpus.import_issuers(utterance.issuer)
+            corpus.import_utterances(utterance)
+
+            utt_ids.append(utterance.idx)
+
+        filter = subset.MatchingUtteranceIdxFilter(utterance_idxs=set(utt_ids))
+        subview = subset.Subview(corpus, filter_criteria=[filter])
+        corpus.import_subview(subset_idx, subview)
+
+    @staticmethod
+    def subset_utterances(path, subset_idx):
+        """ Generate the utterances of the subset, each with its own file, speaker and transcription. """
+        csv_file = os.path.join(path, '{}.csv'.format(subset_idx))
+
         for entry in textfile.read_separated_lines_generator(csv_file, separator=',', max_columns=8,
                                                              ignore_lines_starting_with=['filename']):
             rel_file_path = entry[0]
@@ -99,18 +123,13 @@ class CommonVoiceReader(base.CorpusReader):
             idx = '{}-{}'.format(subset_idx, basename)
             file_path = os.path.join(path, rel_file_path)
 
-            corpus.new_file(file_path, idx)
+            file = assets.File(idx, os.path.abspath(file_path))
             issuer = assets.Speaker(idx, gender=gender, age_group=age)
-            corpus.import_issuers(issuer)
-            utterance = corpus.new_utterance(idx, idx, issuer.idx)
+            utterance = assets.Utterance(idx, file, issuer=issuer)
             utterance.set_label_list(assets.LabelList.create_single(transcription,
                                                                     idx=audiomate.corpus.LL_WORD_TRANSCRIPT))
 
-            utt_ids.append(idx)
-
-        filter = subset.MatchingUtteranceIdxFilter(utterance_idxs=set(utt_ids))
-        subview = subset.Subview(corpus, filter_criteria=[filter])
-        corpus.import_subview(subset_idx, subview)
+            yield utterance
 
     @staticmethod
     def map_age(age):
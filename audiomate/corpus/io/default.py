@@ -1,5 +1,7 @@
 import collections
+import functools
 import glob
+import itertools
 import os
 import re
 import json
@@ -9,6 +11,7 @@ from audiomate.corpus import assets
 from audiomate.corpus.subset import subview
 from audiomate.utils import textfile
 from audiomate.utils import jsonfile
+from audiomate.utils import files
 from . import base
 
 FILES_FILE_NAME = 'files.txt'
@@ -19,6 +22,9 @@ LABEL_FILE_PREFIX = 'labels'
 FEAT_CONTAINER_FILE_NAME = 'features.txt'
 SUBVIEW_FILE_PREFIX = 'subview'
 
+# Buffer size of the files written by the DefaultWriter
+WRITE_BUFFER_SIZE = 2 ** 20
+
 LABEL_META_REGEX = r'(.*) \[(\{.*\})\]'
 META_PATTERN = re.compile(LABEL_META_REGEX)
 
@@ -61,6 +67,35 @@ class DefaultReader(base.CorpusReader):
         DefaultReader.read_feature_containers(feat_path, corpus)
         DefaultReader.read_subviews(path, corpus)
 
+        # Allows saving only the parts changed after loading
+        corpus.mark_saved(path)
+
+        return corpus
+
+    def _load_lazy(self, path):
+        file_path = os.path.join(path, FILES_FILE_NAME)
+        issuer_path = os.path.join(path, ISSUER_FILE_NAME)
+        utt_issuer_path = os.path.join(path, UTT_ISSUER_FILE_NAME)
+        utterance_path = os.path.join(path, UTTERANCE_FILE_NAME)
+        feat_path = os.path.join(path, FEAT_CONTAINER_FILE_NAME)
+
+        corpus = audiomate.Corpus(path=path)
+
+        DefaultReader.read_files(file_path, corpus)
+        DefaultReader.read_issuers(issuer_path, corpus)
+        utt_id_to_issuer = DefaultReader.read_utt_to_issuer_mapping(utt_issuer_path, corpus)
+        DefaultReader.read_utterances(utterance_path, corpus, utt_id_to_issuer)
+        DefaultReader.read_feature_containers(feat_path, corpus)
+
+        # Every label file is only parsed on first access to its label-lists
+        for key, label_file in DefaultReader.label_files(path).items():
+            corpus.defer_label_lists(key, functools.partial(DefaultReader.read_label_file, label_file, key, corpus))
+
+        # Bitmaps of subviews refer to the utterances on disk, which may have changed when the subviews are loaded
+        utterance_ids = list(corpus.utterances.keys())
+        corpus.defer_subviews(functools.partial(DefaultReader.read_subviews, path, corpus, utterance_ids))
+        corpus.mark_saved(path)
+
         return corpus
 
     @staticmethod
@@ -77,29 +112,34 @@ class DefaultReader(base.CorpusReader):
         data = jsonfile.read_json_file(file_path)
 
         for issuer_idx, issuer_data in data.items():
-            issuer_type = issuer_data.get('type', None)
-            issuer_info = issuer_data.get('info', {})
-
-            if issuer_type == 'speaker':
-                gender = assets.Gender(issuer_data.get('gender', 'unknown').lower())
-                age_group = assets.AgeGroup(issuer_data.get('age_group', 'unknown').lower())
-                native_language = issuer_data.get('native_language', None)
-
-                issuer = assets.Speaker(issuer_idx,
-                                        gender=gender,
-                                        age_group=age_group,
-                                        native_language=native_language,
-                                        info=issuer_info)
-            elif issuer_type == 'artist':
-                name = issuer_data.get('name', None)
-
-                issuer = assets.Artist(issuer_idx,
-                                       name=name,
-                                       info=issuer_info)
-            else:
-                issuer = assets.Issuer(issuer_idx, info=issuer_info)
+            corpus.import_issuers(DefaultReader.create_issuer(issuer_idx, issuer_data))
 
-            corpus.import_issuers(issuer)
+    @staticmethod
+    def create_issuer(issuer_idx, issuer_data):
+        """
+        Create an issuer from its dictionary representation (as stored in ``issuers.json``).
+        """
+        issuer_type = issuer_data.get('type', None)
+        issuer_info = issuer_data.get('info', {})
+
+        if issuer_type == 'speaker':
+            gender = assets.Gender(issuer_data.get('gender', 'unknown').lower())
+            age_group = assets.AgeGroup(issuer_data.get('age_group', 'unknown').lower())
+            native_language = issuer_data.get('native_language', None)
+
+            return assets.Speaker(issuer_idx,
+                                  gender=gender,
+                                  age_group=age_group,
+                                  native_language=native_language,
+                                  info=issuer_info)
+        elif issuer_type == 'artist':
+            name = issuer_data.get('name', None)
+
+            return assets.Artist(issuer_idx,
+                                 name=name,
+                                 info=issuer_info)
+        else:
+            return assets.Issuer(issuer_idx, info=issuer_info)
 
     @staticmethod
     def read_utt_to_issuer_mapping(utt_issuer_path, corpus):
@@ -116,52 +156,74 @@ class DefaultReader(base.CorpusReader):
 
     @staticmethod
     def read_utterances(utterance_path, corpus, utt_idx_to_issuer):
-        utterances = textfile.read_separated_lines_with_first_key(utterance_path, separator=' ', max_columns=4)
+        utt_ids, file_ids, starts, ends = textfile.read_separated_columns(utterance_path, 4, separator=' ',
+                                                                          fill_values=['', '', '0', '-1'],
+                                                                          float_columns=[2, 3])
 
-        for utterance_idx, utt_info in utterances.items():
+        for utterance_idx, file_idx, start, end in zip(utt_ids, file_ids, starts.tolist(), ends.tolist()):
             issuer_idx = None
-            start = 0
-            end = -1
-
-            if len(utt_info) > 1:
-                start = float(utt_info[1])
-
-            if len(utt_info) > 2:
-                end = float(utt_info[2])
 
-            if utterance_idx in utt_idx_to_issuer.keys():
+            if utterance_idx in utt_idx_to_issuer:
                 issuer_idx = utt_idx_to_issuer[utterance_idx].idx
 
-            corpus.new_utterance(utterance_idx, utt_info[0], issuer_idx=issuer_idx, start=start, end=end)
+            corpus.new_utterance(utterance_idx, file_idx, issuer_idx=issuer_idx, start=start, end=end)
 
     @staticmethod
     def read_labels(path, corpus):
+        for key, label_file in DefaultReader.label_files(path).items():
+            DefaultReader.read_label_file(label_file, key, corpus)
+
+    @staticmethod
+    def label_files(path):
+        """
+        Return the paths of the label files in the given directory, with the label-list idx as key.
+        """
+        label_files = {}
 
         for label_file in glob.glob(os.path.join(path, '{}_*.txt'.format(LABEL_FILE_PREFIX))):
             file_name = os.path.basename(label_file)
             key = file_name[len('{}_'.format(LABEL_FILE_PREFIX)):len(file_name) - len('.txt')]
+            label_files[key] = label_file
+
+        return label_files
+
+    @staticmethod
+    def subview_files(path):
+        """
+        Return the paths of the subview files in the given directory, with the subview idx as key.
+        """
+        subview_files = {}
+
+        for subview_file in glob.glob(os.path.join(path, '{}_*.txt'.format(SUBVIEW_FILE_PREFIX))):
+            file_name = os.path.basename(subview_file)
+            key = file_name[len('{}_'.format(SUBVIEW_FILE_PREFIX)):len(file_name) - len('.txt')]
+            subview_files[key] = subview_file
 
-            utterance_labels = collections.defaultdict(list)
+        return subview_files
+
+    @staticmethod
+    def read_label_file(label_file, key, corpus):
+        utterance_labels = collections.defaultdict(list)
 
-            labels = textfile.read_separated_lines_generator(label_file, separator=' ', max_columns=4)
+        utt_ids, starts, ends, values = textfile.read_separated_columns(label_file, 4, separator=' ',
+                                                                        float_columns=[1, 2])
 
-            for record in labels:
-                label = record[3]
-                start = float(record[1])
-                end = float(record[2])
-                meta = None
+        for utt_idx, start, end, label in zip(utt_ids, starts.tolist(), ends.tolist(), values):
+            meta = None
+
+            # Only labels containing the meta-data separator have to be matched
+            if ' [{' in label:
                 meta_match = META_PATTERN.match(label)
 
                 if meta_match is not None:
-                    meta_json = meta_match.group(2)
-                    meta = json.loads(meta_json)
+                    meta = json.loads(meta_match.group(2))
                     label = meta_match.group(1)
 
-                utterance_labels[record[0]].append(assets.Label(label, start, end, meta=meta))
+            utterance_labels[utt_idx].append(assets.Label(label, start, end, meta=meta))
 
-            for utterance_idx, labels in utterance_labels.items():
-                ll = assets.LabelList(idx=key, labels=labels)
-                corpus.utterances[utterance_idx].set_label_list(ll)
+        for utterance_idx, labels in utterance_labels.items():
+            ll = assets.LabelList(idx=key, labels=labels)
+            corpus.utterances[utterance_idx].set_label_list(ll)
 
     @staticmethod
     def read_feature_containers(feat_path, corpus):
@@ -172,21 +234,47 @@ class DefaultReader(base.CorpusReader):
                 corpus.new_feature_container(container_name, path=os.path.join(base_path, container_path))
 
     @staticmethod
-    def read_subviews(path, corpus):
-        for sv_file in glob.glob(os.path.join(path, '{}_*.txt'.format(SUBVIEW_FILE_PREFIX))):
-            file_name = os.path.basename(sv_file)
-            key = file_name[len('{}_'.format(SUBVIEW_FILE_PREFIX)):len(file_name) - len('.txt')]
-
+    def read_subviews(path, corpus, utterance_ids=None):
+        """
+        Read the subviews of the corpus at the given path.
+
+        Args:
+            path (str): Path of the corpus.
+            corpus (Corpus): The corpus to add the subviews to.
+            utterance_ids (list): The ids of the utterances stored at the path, bitmaps of subviews refer to them.
+                                  If ``None``, the utterances of the corpus are used.
+        """
+        utterance_table = None
+
+        for key, sv_file in DefaultReader.subview_files(path).items():
             with open(sv_file, 'r') as f:
                 content = f.read().strip()
 
-            sv = subview.Subview.parse(content)
+            if utterance_table is None:
+                if utterance_ids is None:
+                    utterance_ids = corpus.utterances.keys()
+
+                utterance_table = subview.UtteranceTable(utterance_ids)
+
+            sv = subview.Subview.parse(content, utterance_table=utterance_table)
             corpus.import_subview(key, sv)
 
 
 class DefaultWriter(base.CorpusWriter):
     """
     Writes corpora in the Default format.
+
+    If the corpus was loaded from or saved at the same path before (see
+    :py:meth:`audiomate.corpus.CorpusView.saved_state`), only the files whose content has changed are rewritten.
+    The content of every file is compared with the digest of the file, when it was written or loaded,
+    so all changes are detected, no matter how the corpus was modified. Label-lists and subviews of a lazily
+    loaded corpus, that haven't been loaded, keep their files without being parsed.
+    For example adding a label-list to a lazily loaded corpus only writes the new label file::
+
+        >>> corpus = audiomate.Corpus.load('/path/to/corpus', lazy=True)
+        >>> for utterance in corpus.utterances.values():
+        >>>     utterance.set_label_list(assets.LabelList(idx='vad', labels=detect_speech(utterance)))
+        >>> corpus.save()
     """
 
     @classmethod
@@ -194,99 +282,343 @@ class DefaultWriter(base.CorpusWriter):
         return 'default'
 
     def _save(self, corpus, path):
-        file_path = os.path.join(path, FILES_FILE_NAME)
-        issuer_path = os.path.join(path, ISSUER_FILE_NAME)
-        utterance_path = os.path.join(path, UTTERANCE_FILE_NAME)
-        utt_issuer_path = os.path.join(path, UTT_ISSUER_FILE_NAME)
-        container_path = os.path.join(path, FEAT_CONTAINER_FILE_NAME)
+        saved_digests = corpus.saved_state(path)
+        pending_label_list_ids = set()
+        keep_subviews = False
+
+        if saved_digests is not None:
+            # Label-lists and subviews, that haven't been loaded, are unchanged
+            pending_label_list_ids = corpus.pending_label_list_ids()
+            keep_subviews = corpus.has_pending_subviews()
+
+        label_list_ids = DefaultWriter.label_list_ids(corpus, loaded_only=saved_digests is not None)
+        pending_label_list_ids -= label_list_ids
+
+        contents = [
+            (FILES_FILE_NAME, functools.partial(DefaultWriter.file_lines, corpus, path)),
+            (ISSUER_FILE_NAME, functools.partial(DefaultWriter.issuer_lines, corpus)),
+            (UTTERANCE_FILE_NAME, functools.partial(DefaultWriter.utterance_lines, corpus)),
+            (UTT_ISSUER_FILE_NAME, functools.partial(DefaultWriter.utt_to_issuer_lines, corpus)),
+            (FEAT_CONTAINER_FILE_NAME, functools.partial(DefaultWriter.feature_container_lines, corpus))
+        ]
+
+        for idx in sorted(label_list_ids):
+            contents.append((label_file_name(idx), functools.partial(DefaultWriter.label_lines, corpus, idx)))
+
+        digests = {}
+        written = set()
+
+        # All files are written to a temporary folder first and only moved into place if everything was written,
+        # so a failing save doesn't leave a partially written corpus behind (nor the folder of an interrupted save)
+        files.remove_staged_directories(path)
+
+        with files.staged_directory(path) as tmp_path:
+            def save_file(file_name, lines):
+                digest, changed = DefaultWriter.write_if_changed(file_name, lines, path, tmp_path, saved_digests)
+                digests[file_name] = digest
+
+                if changed:
+                    written.add(file_name)
+
+            for file_name, lines in contents:
+                save_file(file_name, lines)
+
+            # The ids of large subviews are encoded relative to the utterance-ids
+            if keep_subviews and UTTERANCE_FILE_NAME not in written:
+                subviews = {}
+            else:
+                keep_subviews = False
+                subviews = corpus.subviews
+
+            if len(subviews) > 0:
+                utterance_table = subview.UtteranceTable(corpus.utterances.keys())
+
+                for name, sv in subviews.items():
+                    lines = functools.partial(DefaultWriter.subview_lines, sv, utterance_table)
+                    save_file(subview_file_name(name), lines)
+
+        # Remove the files of label-lists and subviews, that aren't part of the corpus anymore
+        for key, label_file in DefaultReader.label_files(path).items():
+            if key not in label_list_ids and key not in pending_label_list_ids:
+                os.remove(label_file)
+
+        if not keep_subviews:
+            for key, subview_file in DefaultReader.subview_files(path).items():
+                if key not in subviews:
+                    os.remove(subview_file)
+
+        # The files kept without loading remain valid
+        kept_files = [label_file_name(idx) for idx in pending_label_list_ids]
+
+        if keep_subviews:
+            kept_files.extend(subview_file_name(name) for name in DefaultReader.subview_files(path).keys())
+
+        state = {file_name: saved_digests[file_name] for file_name in kept_files if file_name in saved_digests}
+
+        for file_name, digest in digests.items():
+            stat = os.stat(os.path.join(path, file_name))
+            state[file_name] = (digest, stat.st_size, stat.st_mtime_ns)
+
+        corpus.mark_saved(path, state)
+
+    @staticmethod
+    def write_if_changed(file_name, lines, path, tmp_path, saved_digests):
+        """
+        Write the file with the given name into ``tmp_path``, unless the file in ``path`` has the same content.
+
+        Args:
+            file_name (str): The name of the file.
+            lines (func): Function without arguments, returning the lines of the file.
+                          It is called a second time, if the file has changed.
+            path (str): The path of the corpus.
+            tmp_path (str): The path of the folder to write the file to.
+            saved_digests (dict): Digest, size and modification time of the files at the last save
+                                  (see :py:meth:`audiomate.corpus.CorpusView.saved_state`). If ``None``,
+                                  the file is written without comparing.
+
+        Returns:
+            tuple: The digest of the content of the file and whether the file was written.
+        """
+        target_path = os.path.join(path, file_name)
+
+        if saved_digests is not None and os.path.isfile(target_path):
+            digest = content_digest(lines())
+
+            if digest == DefaultWriter.saved_digest(target_path, saved_digests.get(file_name)):
+                return digest, False
+
+        return write_lines(os.path.join(tmp_path, file_name), lines()), True
+
+    @staticmethod
+    def saved_digest(file_path, saved):
+        """
+        Return the digest of the file at the given path.
+        The saved digest is used, as long as the size and modification time of the file are unchanged,
+        otherwise the file is read.
+
+        Args:
+            file_path (str): Path of the file.
+            saved (tuple): Digest, size and modification time of the file at the last save (or ``None``).
+        """
+        if saved is not None:
+            stat = os.stat(file_path)
+
+            if (stat.st_size, stat.st_mtime_ns) == tuple(saved[1:]):
+                return saved[0]
 
-        DefaultWriter.write_files(file_path, corpus, path)
-        DefaultWriter.write_issuers(issuer_path, corpus)
-        DefaultWriter.write_utterances(utterance_path, corpus)
-        DefaultWriter.write_utt_to_issuer_mapping(utt_issuer_path, corpus)
-        DefaultWriter.write_labels(path, corpus)
-        DefaultWriter.write_feature_containers(container_path, corpus)
-        DefaultWriter.write_subviews(path, corpus)
+        return files.file_digest(file_path)
+
+    @staticmethod
+    def label_list_ids(corpus, loaded_only=False):
+        """
+        Return the ids of all label-lists of the utterances of the corpus.
+        If ``loaded_only`` is ``True``, label-lists that haven't been loaded yet aren't considered.
+        """
+        label_list_ids = set()
+
+        for utterance in corpus.utterances.values():
+            if loaded_only:
+                label_list_ids.update(dict.keys(utterance.label_lists))
+            else:
+                label_list_ids.update(utterance.label_lists.keys())
+
+        return label_list_ids
 
     @staticmethod
     def write_files(file_path, corpus, path):
-        file_records = [[file.idx, os.path.relpath(file.path, path)] for file in corpus.files.values()]
-        textfile.write_separated_lines(file_path, file_records, separator=' ', sort_by_column=0)
+        write_lines(file_path, DefaultWriter.file_lines(corpus, path))
+
+    @staticmethod
+    def file_lines(corpus, path):
+        for file_idx in sorted(corpus.files.keys()):
+            yield '{} {}\n'.format(file_idx, os.path.relpath(corpus.files[file_idx].path, path))
 
     @staticmethod
     def write_issuers(file_path, corpus):
-        data = {}
+        write_lines(file_path, DefaultWriter.issuer_lines(corpus))
 
-        for issuer in corpus.issuers.values():
-            issuer_data = {}
+    @staticmethod
+    def issuer_lines(corpus):
+        data = {issuer.idx: DefaultWriter.issuer_data(issuer) for issuer in corpus.issuers.values()}
+        yield json.dumps(data)
+
+    @staticmethod
+    def issuer_data(issuer):
+        """
+        Return the dictionary representation of the given issuer (as stored in ``issuers.json``).
+        """
+        issuer_data = {}
 
-            if issuer.info is not None and len(issuer.info) > 0:
-                issuer_data['info'] = issuer.info
+        if issuer.info is not None and len(issuer.info) > 0:
+            issuer_data['info'] = issuer.info
 
-            if type(issuer) == assets.Speaker:
-                issuer_data['type'] = 'speaker'
+        if type(issuer) == assets.Speaker:
+            issuer_data['type'] = 'speaker'
 
-                if issuer.gender != assets.Gender.UNKNOWN:
-                    issuer_data['gender'] = issuer.gender.value
+            if issuer.gender != assets.Gender.UNKNOWN:
+                issuer_data['gender'] = issuer.gender.value
 
-                if issuer.age_group != assets.AgeGroup.UNKNOWN:
-                    issuer_data['age_group'] = issuer.age_group.value
+            if issuer.age_group != assets.AgeGroup.UNKNOWN:
+                issuer_data['age_group'] = issuer.age_group.value
 
-                if issuer.native_language not in ['', None]:
-                    issuer_data['native_language'] = issuer.native_language
+            if issuer.native_language not in ['', None]:
+                issuer_data['native_language'] = issuer.native_language
 
-            elif type(issuer) == assets.Artist:
-                if issuer.name not in ['', None]:
-                    issuer_data['name'] = issuer.name
+        elif type(issuer) == assets.Artist:
+            issuer_data['type'] = 'artist'
 
-            data[issuer.idx] = issuer_data
+            if issuer.name not in ['', None]:
+                issuer_data['name'] = issuer.name
 
-        jsonfile.write_json_to_file(file_path, data)
+        return issuer_data
 
     @staticmethod
     def write_utterances(utterance_path, corpus):
-        utterance_records = {utterance.idx: [utterance.file.idx, utterance.start, utterance.end] for
-                             utterance in corpus.utterances.values()}
-        textfile.write_separated_lines(utterance_path, utterance_records, separator=' ', sort_by_column=0)
+        write_lines(utterance_path, DefaultWriter.utterance_lines(corpus))
+
+    @staticmethod
+    def utterance_lines(corpus):
+        for utterance in sorted_utterances(corpus):
+            yield '{} {} {} {}\n'.format(utterance.idx, utterance.file.idx, utterance.start, utterance.end)
 
     @staticmethod
     def write_utt_to_issuer_mapping(utt_issuer_path, corpus):
-        utt_issuer_records = {}
+        write_lines(utt_issuer_path, DefaultWriter.utt_to_issuer_lines(corpus))
 
-        for utterance in corpus.utterances.values():
+    @staticmethod
+    def utt_to_issuer_lines(corpus):
+        for utterance in sorted_utterances(corpus):
             if utterance.issuer is not None:
-                utt_issuer_records[utterance.idx] = utterance.issuer.idx
+                yield '{} {}\n'.format(utterance.idx, utterance.issuer.idx)
 
-        textfile.write_separated_lines(utt_issuer_path, utt_issuer_records, separator=' ', sort_by_column=0)
+    @staticmethod
+    def write_labels(path, corpus, label_list_ids=None):
+        """
+        Write the label files of the label-lists with the given ids (all if ``None``) into the given folder.
+
+        Returns:
+            set: The ids of the written label-lists.
+        """
+        existing_ids = DefaultWriter.label_list_ids(corpus)
+
+        if label_list_ids is not None:
+            existing_ids.intersection_update(label_list_ids)
+
+        for idx in existing_ids:
+            write_lines(os.path.join(path, label_file_name(idx)), DefaultWriter.label_lines(corpus, idx))
+
+        return existing_ids
 
     @staticmethod
-    def write_labels(path, corpus):
-        records = collections.defaultdict(list)
+    def label_lines(corpus, label_list_idx):
+        for utterance in sorted_utterances(corpus):
+            label_list = utterance.label_lists.get(label_list_idx)
 
-        for utterance in corpus.utterances.values():
-            for label_list_idx, label_list in utterance.label_lists.items():
-                utt_records = []
-                for l in label_list:
-                    if len(l.meta) > 0:
-                        value = '{} [{}]'.format(l.value, json.dumps(l.meta, sort_keys=True))
-                        utt_records.append((utterance.idx, l.start, l.end, value))
-                    else:
-                        utt_records.append((utterance.idx, l.start, l.end, l.value))
+            if label_list is None:
+                continue
+
+            records = []
+
+            for label in label_list:
+                value = label.value
+
+                if len(label.meta) > 0:
+                    value = '{} [{}]'.format(value, json.dumps(label.meta, sort_keys=True))
 
-                records[label_list_idx].extend(utt_records)
+                records.append((label.start, label.end, value))
 
-        for label_list_idx, label_list_records in records.items():
-            file_path = os.path.join(path, '{}_{}.txt'.format(LABEL_FILE_PREFIX, label_list_idx))
-            textfile.write_separated_lines(file_path, label_list_records, separator=' ')
+            # Sorted within the utterance, as the label files are sorted by utterance, start, end and value
+            records.sort()
+
+            for start, end, value in records:
+                yield '{} {} {} {}\n'.format(utterance.idx, start, end, value)
 
     @staticmethod
     def write_feature_containers(container_path, corpus):
-        feat_records = [(idx, container.path) for idx, container in corpus.feature_containers.items()]
-        textfile.write_separated_lines(container_path, feat_records, separator=' ')
+        write_lines(container_path, DefaultWriter.feature_container_lines(corpus))
+
+    @staticmethod
+    def feature_container_lines(corpus):
+        for idx, container in sorted(corpus.feature_containers.items()):
+            yield '{} {}\n'.format(idx, container.path)
 
     @staticmethod
     def write_subviews(path, corpus):
+        # Large utterance-id filters are written as bitmap over the sorted utterance-ids (as in utterances.txt)
+        utterance_table = None
+
         for name, sv in corpus.subviews.items():
-            sv_path = os.path.join(path, '{}_{}.txt'.format(SUBVIEW_FILE_PREFIX, name))
-            with open(sv_path, 'w') as f:
-                f.write(sv.serialize())
+            if utterance_table is None:
+                utterance_table = subview.UtteranceTable(corpus.utterances.keys())
+
+            write_lines(os.path.join(path, subview_file_name(name)), DefaultWriter.subview_lines(sv, utterance_table))
+
+    @staticmethod
+    def subview_lines(sv, utterance_table):
+        yield sv.serialize(utterance_table=utterance_table)
+
+
+def label_file_name(label_list_idx):
+    return '{}_{}.txt'.format(LABEL_FILE_PREFIX, label_list_idx)
+
+
+def subview_file_name(subview_idx):
+    return '{}_{}.txt'.format(SUBVIEW_FILE_PREFIX, subview_idx)
+
+
+def encoded_chunks(lines, num_lines=1000):
+    """
+    Generate the given lines joined to chunks of ``num_lines`` lines, encoded as UTF-8.
+    """
+    lines = iter(lines)
+
+    while True:
+        chunk = list(itertools.islice(lines, num_lines))
+
+        if len(chunk) == 0:
+            return
+
+        yield ''.join(chunk).encode('utf-8')
+
+
+def content_digest(lines):
+    """
+    Return the digest of a file with the given lines (see :py:func:`audiomate.utils.files.file_digest`).
+    """
+    digest = files.new_digest()
+
+    for chunk in encoded_chunks(lines):
+        digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def write_lines(file_path, lines):
+    """
+    Write the given lines to the file at the given path.
+
+    Returns:
+        str: The digest of the written content (see :py:func:`content_digest`).
+    """
+    digest = files.new_digest()
+
+    with open(file_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        for chunk in encoded_chunks(lines):
+            f.write(chunk)
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def sorted_utterances(corpus):
+    """
+    Generate the utterances of the corpus sorted by id (the order of the files of the default format).
+    The utterances are only looked up by id, if they aren't stored in sorted order already.
+    """
+    utterance_ids = list(corpus.utterances.keys())
+
+    if all(first <= second for first, second in zip(utterance_ids, itertools.islice(utterance_ids, 1, None))):
+        return iter(corpus.utterances.values())
+
+    utterance_ids.sort()
+    return (corpus.utterances[utt_idx] for utt_idx in utterance_ids)
@@ -8,6 +8,7 @@ from . import base
 from audiomate.utils import textfile
 from audiomate.utils import download
 from audiomate.utils import files
+from audiomate.utils import misc
 
 DOWNLOAD_URL = 'https://github.com/karoldvl/ESC-50/archive/master.zip'
 META_FILE_PATH = os.path.join('meta', 'esc50.csv')
@@ -67,23 +68,28 @@ class ESC50Reader(base.CorpusReader):
 
         folds = collections.defaultdict(list)
         esc10_utt_ids = []
+        utterances = []
 
-        for record in meta_data:
-            file_name = record[0]
-            file_id = os.path.splitext(file_name)[0]
-            file_path = os.path.abspath(os.path.join(path, 'audio', file_name))
-            fold = record[1]
-            category = record[3]
-            esc10 = record[4]
+        with misc.paused_garbage_collection():
+            for record in meta_data:
+                file_name = record[0]
+                file_id = os.path.splitext(file_name)[0]
+                file_path = os.path.abspath(os.path.join(path, 'audio', file_name))
+                fold = record[1]
+                category = record[3]
+                esc10 = record[4]
 
-            corpus.new_file(file_path, file_id)
-            utt = corpus.new_utterance(file_id, file_id)
-            utt.set_label_list(assets.LabelList.create_single(category, idx=audiomate.corpus.LL_SOUND_CLASS))
+                utt = assets.Utterance(file_id, assets.File(file_id, file_path))
+                utt.set_label_list(assets.LabelList.create_single(category, idx=audiomate.corpus.LL_SOUND_CLASS))
+                utterances.append(utt)
 
-            folds['fold-{}'.format(fold)].append(file_id)
+                folds['fold-{}'.format(fold)].append(file_id)
 
-            if esc10 == 'True':
-                esc10_utt_ids.append(file_id)
+                if esc10 == 'True':
+                    esc10_utt_ids.append(file_id)
+
+            corpus.import_files([utt.file for utt in utterances])
+            corpus.import_utterances(utterances)
 
         for fold_id, fold_utt_ids in folds.items():
             fold_filter = subset.MatchingUtteranceIdxFilter(utterance_idxs=set(fold_utt_ids))
@@ -1,7 +1,8 @@
 import os
-import glob
 
 import audiomate
+from audiomate.corpus import assets
+from audiomate.utils import misc
 from . import base
 
 
@@ -19,10 +20,18 @@ class FolderReader(base.CorpusReader):
 
     def _load(self, path):
         corpus = audiomate.Corpus(path=path)
+        utterances = []
 
-        for item in glob.glob('{}/*.wav'.format(path), recursive=True):
-            basename, __ = os.path.splitext(os.path.basename(item))
-            corpus.new_file(item, basename)
-            corpus.new_utterance(basename, basename)
+        with misc.paused_garbage_collection():
+            with os.scandir(path) as it:
+                for entry in it:
+                    basename, ext = os.path.splitext(entry.name)
+
+                    if ext == '.wav' and not entry.name.startswith('.'):
+                        file = assets.File(basename, os.path.abspath(entry.path))
+                        utterances.append(assets.Utterance(basename, file))
+
+            corpus.import_files([utterance.file for utterance in utterances])
+            corpus.import_utterances(utterances)
 
         return corpus
@@ -83,25 +83,17 @@ class KaldiReader(base.CorpusReader):
     def read_utterances(segments_path, corpus, utt2spk):
         # load utterances
         if os.path.isfile(segments_path):
-            utterances = textfile.read_separated_lines_with_first_key(segments_path, separator=' ',
-                                                                      max_columns=4)
-            for utt_id, utt_info in utterances.items():
-                start = 0
-                end = -1
-
-                if len(utt_info) > 1:
-                    start = float(utt_info[1])
-
-                if len(utt_info) > 2:
-                    end = float(utt_info[2])
+            utt_ids, file_ids, starts, ends = textfile.read_separated_columns(segments_path, 4, separator=' ',
+                                                                              fill_values=['', '', '0', '-1'],
+                                                                              float_columns=[2, 3])
 
+            for utt_id, file_idx, start, end in zip(utt_ids, file_ids, starts.tolist(), ends.tolist()):
                 speaker_idx = None
 
-                if utt_id in utt2spk.keys():
+                if utt_id in utt2spk:
                     speaker_idx = utt2spk[utt_id].idx
 
-                corpus.new_utterance(utt_id, utt_info[0], issuer_idx=speaker_idx, start=start,
-                                     end=end)
+                corpus.new_utterance(utt_id, file_idx, issuer_idx=speaker_idx, start=start, end=end)
         else:
             for file_idx in corpus.files.keys():
                 speaker_idx = None
@@ -138,7 +130,13 @@ class KaldiWriter(base.CorpusWriter):
     def type(cls):
         return 'kaldi'
 
+    @classmethod
+    def supports_streaming(cls):
+        return True
+
     def _save(self, corpus, path):
+        os.makedirs(path, exist_ok=True)
+
         wav_file_path = os.path.join(path, WAV_FILE_NAME)
         spk2gender_path = os.path.join(path, SPK2GENDER_FILE_NAME)
         utt2spk_path = os.path.join(path, UTT2SPK_FILE_NAME)
@@ -153,19 +151,78 @@ class KaldiWriter(base.CorpusWriter):
         self._write_transcriptions(text_path, corpus)
         self._write_features(path, corpus)
 
+    def _save_stream(self, records, path):
+        os.makedirs(path, exist_ok=True)
+
+        wav_lines = textfile.SortedLines()
+        segment_lines = textfile.SortedLines()
+        utt2spk_lines = textfile.SortedLines()
+        gender_lines = textfile.SortedLines()
+        text_lines = textfile.SortedLines()
+        file_ids = set()
+        issuer_ids = set()
+
+        try:
+            for utterance, _ in records:
+                file = utterance.file
+                issuer = utterance.issuer
+
+                if file.idx not in file_ids:
+                    file_ids.add(file.idx)
+                    wav_lines.add(file.idx, '{} {}'.format(file.idx, os.path.relpath(file.path, path)))
+
+                segment_lines.add(utterance.idx, '{} {} {} {}'.format(utterance.idx, file.idx,
+                                                                      utterance.start, utterance.end))
+
+                if issuer is not None:
+                    utt2spk_lines.add(utterance.idx, '{} {}'.format(utterance.idx, issuer.idx))
+
+                    if issuer.idx not in issuer_ids:
+                        issuer_ids.add(issuer.idx)
+                        gender = KaldiWriter._gender(issuer)
+
+                        if gender is not None:
+                            gender_lines.add(issuer.idx, '{} {}'.format(issuer.idx, gender))
+
+                label_list = utterance.label_lists.get(self.main_label_list_idx)
+
+                if label_list is not None:
+                    text = ' '.join([label.value for label in label_list])
+                    text_lines.add(utterance.idx, '{} {}'.format(utterance.idx, text))
+
+            wav_lines.write(os.path.join(path, WAV_FILE_NAME))
+            segment_lines.write(os.path.join(path, SEGMENTS_FILE_NAME))
+            utt2spk_lines.write(os.path.join(path, UTT2SPK_FILE_NAME))
+
+            if len(gender_lines) > 0:
+                gender_lines.write(os.path.join(path, SPK2GENDER_FILE_NAME))
+
+            text_lines.write(os.path.join(path, TRANSCRIPTION_FILE_NAME))
+        finally:
+            for lines in [wav_lines, segment_lines, utt2spk_lines, gender_lines, text_lines]:
+                lines.close()
+
     def _write_genders(self, gender_path, corpus):
         genders = {}
 
         for issuer in corpus.issuers.values():
-            if type(issuer) == assets.Speaker:
-                if issuer.gender == assets.Gender.MALE:
-                    genders[issuer.idx] = 'm'
-                elif issuer.gender == assets.Gender.FEMALE:
-                    genders[issuer.idx] = 'f'
+            gender = KaldiWriter._gender(issuer)
+
+            if gender is not None:
+                genders[issuer.idx] = gender
 
         if len(genders) > 0:
             textfile.write_separated_lines(gender_path, genders, separator=' ', sort_by_column=0)
 
+    @staticmethod
+    def _gender(issuer):
+        """ Return the gender of the issuer as written in the spk2gender file (``None`` if unknown). """
+        if type(issuer) == assets.Speaker:
+            if issuer.gender == assets.Gender.MALE:
+                return 'm'
+            elif issuer.gender == assets.Gender.FEMALE:
+                return 'f'
+
     def _write_transcriptions(self, text_path, corpus):
         transcriptions = {}
 
@@ -8,6 +8,8 @@ import audiomate
 from . import base
 from audiomate.utils import textfile
 
+HEADER = ['wav_filename', 'wav_filesize', 'transcript']
+
 
 class MozillaDeepSpeechWriter(base.CorpusWriter):
     """
@@ -28,9 +30,13 @@ class MozillaDeepSpeechWriter(base.CorpusWriter):
     def type(cls):
         return 'mozilla-deepspeech'
 
+    @classmethod
+    def supports_streaming(cls):
+        return True
+
     def _save(self, corpus, path):
         records = []
-        subset_utterance_ids = {idx: list(subset.utterances.keys()) for idx, subset in corpus.subviews.items()}
+        subset_utterance_ids = {idx: set(subset.utterances.keys()) for idx, subset in corpus.subviews.items()}
         subset_records = collections.defaultdict(list)
 
         audio_folder = os.path.join(path, 'audio')
@@ -38,23 +44,9 @@ class MozillaDeepSpeechWriter(base.CorpusWriter):
 
         for utterance_idx in sorted(corpus.utterances.keys()):
             utterance = corpus.utterances[utterance_idx]
-
-            if utterance.start == 0 and utterance.end == -1:
-                audio_path = utterance.file.path
-            else:
-                audio_path = os.path.join(audio_folder, '{}.wav'.format(utterance.idx))
-                sampling_rate = utterance.sampling_rate
-                data = utterance.read_samples()
-
-                data = (data * 32768).astype(np.int16)
-
-                scipy.io.wavfile.write(audio_path, sampling_rate, data)
-
-            size = os.stat(audio_path).st_size
-            transcript = utterance.label_lists[self.transcription_label_list_idx][0].value
+            record = self._create_record(utterance, audio_folder)
 
             # Add to the full list
-            record = [audio_path, size, transcript]
             records.append(record)
 
             # Check / Add to subview lists
@@ -63,13 +55,60 @@ class MozillaDeepSpeechWriter(base.CorpusWriter):
                     subset_records[subset_idx].append(record)
 
         # Write full list
-        records.insert(0, ['wav_filename', 'wav_filesize', 'transcript'])
+        records.insert(0, HEADER)
         records_path = os.path.join(path, 'all.csv')
         textfile.write_separated_lines(records_path, records, separator=',', sort_by_column=-1)
 
         # Write subset lists
         for subset_idx, records in subset_records.items():
             if len(records) > 0:
-                records.insert(0, ['wav_filename', 'wav_filesize', 'transcript'])
+                records.insert(0, HEADER)
                 subset_file_path = os.path.join(path, '{}.csv'.format(subset_idx))
                 textfile.write_separated_lines(subset_file_path, records, separator=',', sort_by_column=-1)
+
+    def _save_stream(self, records, path):
+        audio_folder = os.path.join(path, 'audio')
+        os.makedirs(audio_folder, exist_ok=True)
+
+        # The lines are sorted by utterance-idx
+        all_lines = textfile.SortedLines()
+        subset_lines = collections.defaultdict(textfile.SortedLines)
+
+        try:
+            for utterance, subview_ids in records:
+                record = self._create_record(utterance, audio_folder)
+                line = ','.join([str(value) for value in record])
+
+                all_lines.add(utterance.idx, line)
+
+                for subset_idx in subview_ids:
+                    subset_lines[subset_idx].add(utterance.idx, line)
+
+            all_lines.write(os.path.join(path, 'all.csv'), header=','.join(HEADER))
+
+            for subset_idx, lines in subset_lines.items():
+                lines.write(os.path.join(path, '{}.csv'.format(subset_idx)), header=','.join(HEADER))
+        finally:
+            for lines in [all_lines] + list(subset_lines.values()):
+                lines.close()
+
+    def _create_record(self, utterance, audio_folder):
+        """
+        Return the record (audio path, file size, transcript) of the given utterance.
+        If the utterance doesn't span a whole file, its samples are written into a separate file.
+        """
+        if utterance.start == 0 and utterance.end == -1:
+            audio_path = utterance.file.path
+        else:
+            audio_path = os.path.join(audio_folder, '{}.wav'.format(utterance.idx))
+            sampling_rate = utterance.sampling_rate
+            data = utterance.read_samples()
+
+            data = (data * 32768).astype(np.int16)
+
+            scipy.io.wavfile.write(audio_path, sampling_rate, data)
+
+        size = os.stat(audio_path).st_size
+        transcript = utterance.label_lists[self.transcription_label_list_idx][0].value
+
+        return [audio_path, size, transcript]
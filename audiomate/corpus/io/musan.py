@@ -5,6 +5,7 @@ from audiomate.corpus import assets
 from audiomate.utils import textfile
 from audiomate.utils import download
 from audiomate.utils import files
+from audiomate.utils import misc
 from . import base
 
 DOWNLOAD_URL = 'http://www.openslr.org/resources/17/musan.tar.gz'
@@ -50,6 +51,10 @@ class MusanDownloader(base.CorpusDownloader):
 class MusanReader(base.CorpusReader):
     """
     Reader for the MUSAN corpus. MUSAN is a corpus of music, speech, and noise recordings.
+    The source directories are listed and their annotations are read by a pool of threads.
+
+    Args:
+        num_threads (int): Number of source directories read at once.
 
     .. seealso::
 
@@ -60,6 +65,9 @@ class MusanReader(base.CorpusReader):
           Download page
     """
 
+    def __init__(self, num_threads=files.NUM_SCAN_THREADS):
+        self.num_threads = num_threads
+
     @classmethod
     def type(cls):
         return 'musan'
@@ -76,31 +84,34 @@ class MusanReader(base.CorpusReader):
             'speech': self._create_or_get_speech_issuer,
         }
 
-        corpus = audiomate.Corpus(path=path)
-
-        for type_name, type_directory in self._directories(path).items():
-            for _, source_directory in self._directories(type_directory).items():
-                annotations_path = os.path.join(source_directory, ANN_FILE_NAME_)
-                annotations = {}
-
-                if os.path.exists(annotations_path):
-                    annotations = textfile.read_separated_lines_with_first_key(
-                        annotations_path, separator=' ', max_columns=ANN_NUM_COLUMS_[type_name])
-
-                it = os.scandir(source_directory)
+        # The source directories (e.g. music/fma) are listed and their annotations read at once
+        type_directories = self._directories(path)
+        sources = []
 
-                for entry in it:
-                    if not entry.name.endswith('.wav'):
-                        continue
+        for type_name, entries in zip(type_directories.keys(),
+                                      files.scan_directories(type_directories.values(), num_threads=self.num_threads)):
+            sources.extend((type_name, entry.path) for entry in entries if entry.is_dir())
 
-                    file_path = os.path.join(source_directory, entry.name)
-                    file_idx = entry.name[0:-4]  # chop of .wav
+        corpus = audiomate.Corpus(path=path)
+        issuers = {}
+        utterances = []
+
+        with misc.paused_garbage_collection():
+            for (type_name, source_directory), (annotations, wav_file_names) in zip(
+                    sources, files.parallel_map(MusanReader._read_source, sources, num_workers=self.num_threads)):
+                for file_name in wav_file_names:
+                    file_path = os.path.abspath(os.path.join(source_directory, file_name))
+                    file_idx = file_name[0:-4]  # chop of .wav
                     utterance_idx = file_idx  # every file is a separate utterance
-                    issuer_idx = create_or_get_issuer[type_name](corpus, file_idx, annotations)
+                    issuer = create_or_get_issuer[type_name](issuers, file_idx, annotations)
 
-                    corpus.new_file(file_path, file_idx=file_idx, copy_file=False)
-                    utterance = corpus.new_utterance(utterance_idx, file_idx, issuer_idx)
+                    utterance = assets.Utterance(utterance_idx, assets.File(file_idx, file_path), issuer)
                     utterance.set_label_list(assets.LabelList.create_single(type_name, idx=audiomate.corpus.LL_DOMAIN))
+                    utterances.append(utterance)
+
+            corpus.import_files([utterance.file for utterance in utterances])
+            corpus.import_issuers(list(issuers.values()))
+            corpus.import_utterances(utterances)
 
         return corpus
 
@@ -116,26 +127,41 @@ class MusanReader(base.CorpusReader):
 
         return directories
 
+    @staticmethod
+    def _read_source(source):
+        """ Return the annotations and the names of the wav files of a source directory. """
+        type_name, source_directory = source
+        annotations_path = os.path.join(source_directory, ANN_FILE_NAME_)
+        annotations = {}
+
+        if os.path.exists(annotations_path):
+            annotations = textfile.read_separated_lines_with_first_key(
+                annotations_path, separator=' ', max_columns=ANN_NUM_COLUMS_[type_name])
+
+        with os.scandir(source_directory) as it:
+            wav_file_names = [entry.name for entry in it if entry.name.endswith('.wav')]
+
+        return annotations, wav_file_names
+
     # noinspection PyUnusedLocal
     @staticmethod
-    def _create_or_get_noise_issuer(corpus, file_idx, annotations):
+    def _create_or_get_noise_issuer(issuers, file_idx, annotations):
         return None
 
     @staticmethod
-    def _create_or_get_music_issuer(corpus, file_idx, annotations):
+    def _create_or_get_music_issuer(issuers, file_idx, annotations):
         if file_idx not in annotations:
             return None
 
         issuer_idx = annotations[file_idx][2]
 
-        if issuer_idx not in corpus.issuers:
-            issuer = assets.Artist(issuer_idx, name=issuer_idx)
-            corpus.import_issuers(issuer)
+        if issuer_idx not in issuers:
+            issuers[issuer_idx] = assets.Artist(issuer_idx, name=issuer_idx)
 
-        return issuer_idx
+        return issuers[issuer_idx]
 
     @staticmethod
-    def _create_or_get_speech_issuer(corpus, file_idx, annotations):
+    def _create_or_get_speech_issuer(issuers, file_idx, annotations):
         if file_idx not in annotations:
             return None
 
@@ -147,6 +173,6 @@ class MusanReader(base.CorpusReader):
             elif annotations[file_idx][0] == 'f':
                 issuer.gender = assets.Gender.FEMALE
 
-        corpus.import_issuers(issuer)
+        issuers[file_idx] = issuer
 
-        return file_idx
+        return issuer
@@ -0,0 +1,333 @@
+import collections
+import json
+import os
+
+import numpy as np
+
+import audiomate
+from audiomate.corpus import assets
+from audiomate.corpus.subset import subview
+from audiomate.utils import misc
+from . import base
+from . import default
+
+SNAPSHOT_FILE_NAME = 'corpus.npz'
+
+
+class SnapshotReader(base.CorpusReader):
+    """
+    Reads corpora written with the :py:class:`SnapshotWriter`.
+
+    All data is read with bulk array reads and the objects are created with paused garbage collection.
+    The labels are loaded into one :py:class:`audiomate.corpus.assets.LabelStore` per label-list idx,
+    so label objects are only created when accessed.
+    """
+
+    @classmethod
+    def type(cls):
+        return 'snapshot'
+
+    def _check_for_missing_files(self, path):
+        if not os.path.isfile(os.path.join(path, SNAPSHOT_FILE_NAME)):
+            return [SNAPSHOT_FILE_NAME]
+
+        return []
+
+    def _load(self, path):
+        corpus = audiomate.Corpus(path=path)
+
+        snapshot = np.load(os.path.join(path, SNAPSHOT_FILE_NAME), allow_pickle=False)
+
+        with snapshot as data, misc.paused_garbage_collection():
+            files = SnapshotReader.read_files(data, corpus, path)
+            issuers = SnapshotReader.read_issuers(data, corpus)
+            utterances = SnapshotReader.read_utterances(data, corpus, files, issuers)
+            SnapshotReader.read_labels(data, utterances)
+            SnapshotReader.read_feature_containers(data, corpus, path)
+            SnapshotReader.read_subviews(data, corpus)
+
+        return corpus
+
+    @staticmethod
+    def read_files(data, corpus, path):
+        file_paths = decode_strings(data['files.paths'])
+        files = [assets.File(file_idx, os.path.abspath(os.path.join(path, file_path)))
+                 for file_idx, file_path in zip(decode_strings(data['files.ids']), file_paths)]
+
+        corpus.import_files(files)
+        return files
+
+    @staticmethod
+    def read_issuers(data, corpus):
+        issuer_data = json.loads(decode_strings(data['issuers.data'])[0])
+        issuers = [default.DefaultReader.create_issuer(issuer_idx, issuer_data[issuer_idx])
+                   for issuer_idx in decode_strings(data['issuers.ids'])]
+
+        corpus.import_issuers(issuers)
+        return issuers
+
+    @staticmethod
+    def read_utterances(data, corpus, files, issuers):
+        utterance_ids = decode_strings(data['utterances.ids'])
+        file_indices = data['utterances.files'].tolist()
+        issuer_indices = data['utterances.issuers'].tolist()
+        starts = data['utterances.starts'].tolist()
+        ends = data['utterances.ends'].tolist()
+
+        utterances = []
+
+        for utt_idx, file_index, issuer_index, start, end in zip(utterance_ids, file_indices, issuer_indices,
+                                                                 starts, ends):
+            issuer = issuers[issuer_index] if issuer_index >= 0 else None
+            utterances.append(assets.Utterance(utt_idx, files[file_index], issuer=issuer, start=start, end=end))
+
+        corpus.import_utterances(utterances)
+        return utterances
+
+    @staticmethod
+    def read_labels(data, utterances):
+        for index, label_list_idx in enumerate(decode_strings(data['labels.ids'])):
+            prefix = 'labels.{}.'.format(index)
+            list_utterances = data[prefix + 'utterances'].tolist()
+            meta = {row: json.loads(value) for row, value in zip(data[prefix + 'meta_rows'].tolist(),
+                                                                 decode_strings(data[prefix + 'meta']))}
+
+            store = assets.LabelStore(label_list_idx,
+                                      len(list_utterances),
+                                      data[prefix + 'list_indices'],
+                                      data[prefix + 'starts'],
+                                      data[prefix + 'ends'],
+                                      data[prefix + 'codes'],
+                                      decode_strings(data[prefix + 'values']),
+                                      meta=meta)
+
+            for utt_index, label_list in zip(list_utterances, store.label_lists()):
+                utterances[utt_index].set_label_list(label_list)
+
+    @staticmethod
+    def read_feature_containers(data, corpus, path):
+        container_paths = decode_strings(data['features.paths'])
+
+        for container_idx, container_path in zip(decode_strings(data['features.ids']), container_paths):
+            corpus.new_feature_container(container_idx, path=os.path.join(path, container_path))
+
+    @staticmethod
+    def read_subviews(data, corpus):
+        names = decode_strings(data['subviews.ids'])
+
+        if len(names) == 0:
+            return
+
+        utterance_table = subview.UtteranceTable(corpus.utterances.keys())
+
+        for name, representation in zip(names, decode_strings(data['subviews.data'])):
+            sv = subview.Subview.parse(representation, utterance_table=utterance_table)
+            corpus.import_subview(name, sv)
+
+
+class SnapshotWriter(base.CorpusWriter):
+    """
+    Writes the corpus into a single binary file (``corpus.npz``), which can be loaded
+    much faster than the :py:class:`audiomate.corpus.io.DefaultWriter` format.
+
+    The content is stored as columnar NumPy arrays. Utterances refer to files and issuers by their position,
+    labels are stored per label-list idx in the layout of a :py:class:`audiomate.corpus.assets.LabelStore`
+    with interned label-values. Strings (ids, paths, label-values) are stored as UTF-8 string tables.
+
+    The snapshot is meant as cache for fast loading, the readable format is the default format.
+    """
+
+    @classmethod
+    def type(cls):
+        return 'snapshot'
+
+    def _save(self, corpus, path):
+        os.makedirs(path, exist_ok=True)
+
+        data = {}
+
+        SnapshotWriter.write_files(data, corpus, path)
+        SnapshotWriter.write_issuers(data, corpus)
+        SnapshotWriter.write_utterances(data, corpus)
+        SnapshotWriter.write_labels(data, corpus)
+        SnapshotWriter.write_feature_containers(data, corpus, path)
+        SnapshotWriter.write_subviews(data, corpus)
+
+        np.savez(os.path.join(path, SNAPSHOT_FILE_NAME), **data)
+
+    @staticmethod
+    def write_files(data, corpus, path):
+        data['files.ids'] = encode_strings(corpus.files.keys())
+        data['files.paths'] = encode_strings(os.path.relpath(file.path, path) for file in corpus.files.values())
+
+    @staticmethod
+    def write_issuers(data, corpus):
+        issuer_data = {issuer.idx: default.DefaultWriter.issuer_data(issuer) for issuer in corpus.issuers.values()}
+
+        data['issuers.ids'] = encode_strings(corpus.issuers.keys())
+        data['issuers.data'] = encode_strings([json.dumps(issuer_data)])
+
+    @staticmethod
+    def write_utterances(data, corpus):
+        file_indices = {file_idx: index for index, file_idx in enumerate(corpus.files.keys())}
+        issuer_indices = {issuer_idx: index for index, issuer_idx in enumerate(corpus.issuers.keys())}
+        utterances = list(corpus.utterances.values())
+
+        data['utterances.ids'] = encode_strings(utt.idx for utt in utterances)
+        data['utterances.files'] = np.array([file_indices[utt.file.idx] for utt in utterances], dtype=np.int32)
+        data['utterances.issuers'] = np.array([issuer_indices[utt.issuer.idx] if utt.issuer is not None else -1
+                                               for utt in utterances], dtype=np.int32)
+        data['utterances.starts'] = np.array([utt.start for utt in utterances], dtype=np.float64)
+        data['utterances.ends'] = np.array([utt.end for utt in utterances], dtype=np.float64)
+
+    @staticmethod
+    def write_labels(data, corpus):
+        label_lists = collections.OrderedDict()
+
+        for utt_index, utterance in enumerate(corpus.utterances.values()):
+            for label_list_idx, label_list in utterance.label_lists.items():
+                label_lists.setdefault(label_list_idx, []).append((utt_index, label_list))
+
+        data['labels.ids'] = encode_strings(label_lists.keys())
+
+        for index, lists in enumerate(label_lists.values()):
+            prefix = 'labels.{}.'.format(index)
+            columns = LabelColumns()
+
+            for position, (_, label_list) in enumerate(lists):
+                columns.add_label_list(position, label_list)
+
+            data[prefix + 'utterances'] = np.array([utt_index for utt_index, _ in lists], dtype=np.int32)
+            columns.write(data, prefix)
+
+    @staticmethod
+    def write_feature_containers(data, corpus, path):
+        containers = corpus.feature_containers
+
+        data['features.ids'] = encode_strings(containers.keys())
+        data['features.paths'] = encode_strings(os.path.relpath(container.path, path)
+                                                for container in containers.values())
+
+    @staticmethod
+    def write_subviews(data, corpus):
+        utterance_table = subview.UtteranceTable(corpus.utterances.keys()) if len(corpus.subviews) > 0 else None
+
+        data['subviews.ids'] = encode_strings(corpus.subviews.keys())
+        data['subviews.data'] = encode_strings(sv.serialize(utterance_table=utterance_table)
+                                               for sv in corpus.subviews.values())
+
+
+class LabelColumns(object):
+    """
+    Collects the labels of label-lists (with the same idx) as columns in the layout of a
+    :py:class:`audiomate.corpus.assets.LabelStore`. Labels of label-lists backed by a store are copied
+    with vectorized operations.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.value_codes = {}
+
+        self.list_indices = []
+        self.starts = []
+        self.ends = []
+        self.codes = []
+        self.meta = {}
+
+        self.stores = collections.defaultdict(list)
+
+    def add_label_list(self, position, label_list):
+        if isinstance(label_list, assets.LabelListView) and label_list.store is not None:
+            self.stores[label_list.store].append((label_list.position, position))
+            return
+
+        for lbl in label_list:
+            if len(lbl.meta) > 0:
+                self.meta[len(self.starts)] = lbl.meta
+
+            self.list_indices.append(position)
+            self.starts.append(lbl.start)
+            self.ends.append(lbl.end)
+            self.codes.append(self._code(lbl.value))
+
+    def write(self, data, prefix):
+        list_indices = [np.array(self.list_indices, dtype=np.int32)]
+        starts = [np.array(self.starts, dtype=np.float64)]
+        ends = [np.array(self.ends, dtype=np.float64)]
+        codes = [np.array(self.codes, dtype=np.int32)]
+        meta = dict(self.meta)
+        offset = len(self.starts)
+
+        for store, positions in self.stores.items():
+            positions = np.array(positions, dtype=np.int64)
+            rows = store._selected_rows(positions[:, 0])
+
+            mapping = np.zeros(store.num_label_lists, dtype=np.int32)
+            mapping[positions[:, 0]] = positions[:, 1]
+            value_codes = np.array([self._code(value) for value in store.values], dtype=np.int32)
+
+            list_indices.append(mapping[store.list_indices[rows]])
+            starts.append(store.starts[rows])
+            ends.append(store.ends[rows])
+            codes.append(value_codes[store.codes[rows]] if rows.size > 0 else np.zeros(0, dtype=np.int32))
+
+            for row, row_meta in store.meta.items():
+                index = np.searchsorted(rows, row)
+
+                if index < rows.size and rows[index] == row and len(row_meta) > 0:
+                    meta[offset + int(index)] = row_meta
+
+            offset += rows.size
+
+        # The labels have to be sorted by label-list, the order within a label-list is kept
+        list_indices = np.concatenate(list_indices)
+        order = np.argsort(list_indices, kind='stable')
+        new_rows = np.empty_like(order)
+        new_rows[order] = np.arange(order.size)
+
+        meta_rows = sorted(meta.keys(), key=new_rows.__getitem__)
+
+        data[prefix + 'list_indices'] = list_indices[order]
+        data[prefix + 'starts'] = np.concatenate(starts)[order]
+        data[prefix + 'ends'] = np.concatenate(ends)[order]
+        data[prefix + 'codes'] = np.concatenate(codes)[order]
+        data[prefix + 'values'] = encode_strings(self.values)
+        data[prefix + 'meta_rows'] = np.array([new_rows[row] for row in meta_rows], dtype=np.int64)
+        data[prefix + 'meta'] = encode_strings(json.dumps(meta[row], sort_keys=True) for row in meta_rows)
+
+    def _code(self, value):
+        code = self.value_codes.get(value)
+
+        if code is None:
+            code = len(self.values)
+            self.value_codes[value] = code
+            self.values.append(value)
+
+        return code
+
+
+def encode_strings(strings):
+    """
+    Encode the given strings as string table (UTF-8 bytes, every string is terminated with a null-character).
+
+    Args:
+        strings (iterable): The strings to encode.
+
+    Returns:
+        numpy.ndarray: An uint8 array with the encoded strings.
+    """
+    encoded = ''.join('{}\x00'.format(value) for value in strings).encode('utf-8')
+    return np.frombuffer(encoded, dtype=np.uint8)
+
+
+def decode_strings(table):
+    """
+    Decode the strings of a string table (created with :py:func:`encode_strings`).
+
+    Args:
+        table (numpy.ndarray): The string table.
+
+    Returns:
+        list: The decoded strings.
+    """
+    return table.tobytes().decode('utf-8').split('\x00')[:-1]
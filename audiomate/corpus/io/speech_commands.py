@@ -63,8 +63,15 @@ class SpeechCommandsReader(base.CorpusReader):
         test_list_path = os.path.join(path, 'testing_list.txt')
         dev_list_path = os.path.join(path, 'validation_list.txt')
 
-        test_list = textfile.read_separated_lines(test_list_path, separator='/', max_columns=2)
-        dev_list = textfile.read_separated_lines(dev_list_path, separator='/', max_columns=2)
+        test_list = []
+        dev_list = []
+
+        # Without the lists (e.g. for a part of the corpus) all utterances are used for training
+        if os.path.isfile(test_list_path):
+            test_list = textfile.read_separated_lines(test_list_path, separator='/', max_columns=2)
+
+        if os.path.isfile(dev_list_path):
+            dev_list = textfile.read_separated_lines(dev_list_path, separator='/', max_columns=2)
 
         test_set = set(['{}_{}'.format(os.path.splitext(x[1])[0], x[0]) for x in test_list])
         dev_set = set(['{}_{}'.format(os.path.splitext(x[1])[0], x[0]) for x in dev_list])
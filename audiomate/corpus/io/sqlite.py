@@ -0,0 +1,177 @@
+import json
+import os
+import sqlite3
+
+from audiomate.corpus import sqlite_corpus
+from audiomate.corpus.subset import subview
+from . import base
+from . import default
+
+DATABASE_FILE_NAME = 'corpus.db'
+
+# Number of rows inserted with a single statement
+BATCH_SIZE = 10000
+
+
+class SqliteReader(base.CorpusReader):
+    """
+    Opens corpora written with the :py:class:`SqliteWriter`.
+
+    In contrast to the other readers, nothing is loaded into memory.
+    The returned :py:class:`audiomate.corpus.SqliteCorpus` is a readonly view, querying the database on access.
+    """
+
+    @classmethod
+    def type(cls):
+        return 'sqlite'
+
+    def _check_for_missing_files(self, path):
+        if not os.path.isfile(os.path.join(path, DATABASE_FILE_NAME)):
+            return [DATABASE_FILE_NAME]
+
+        return []
+
+    def _load(self, path):
+        return sqlite_corpus.SqliteCorpus(os.path.join(path, DATABASE_FILE_NAME), base_path=path)
+
+
+class SqliteWriter(base.CorpusWriter):
+    """
+    Writes the corpus into an SQLite database (``corpus.db``), which can be opened with the :py:class:`SqliteReader`
+    without loading the corpus into memory.
+
+    Files, issuers, utterances, label-lists and labels are stored in separate tables (see
+    :py:data:`audiomate.corpus.sqlite_corpus.SCHEMA`), label-values are interned.
+    The utterances are indexed by file and issuer, the labels by label-list and value.
+    An existing database is replaced.
+    """
+
+    @classmethod
+    def type(cls):
+        return 'sqlite'
+
+    def _save(self, corpus, path):
+        os.makedirs(path, exist_ok=True)
+
+        db_path = os.path.join(path, DATABASE_FILE_NAME)
+
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+        connection = sqlite3.connect(db_path)
+
+        try:
+            # The database is written at once, a failed write has to be repeated anyway
+            connection.execute('PRAGMA journal_mode = OFF')
+            connection.execute('PRAGMA synchronous = OFF')
+            connection.executescript(sqlite_corpus.SCHEMA)
+
+            file_ids = SqliteWriter.write_files(connection, corpus, path)
+            issuer_ids = SqliteWriter.write_issuers(connection, corpus)
+            utterance_ids = SqliteWriter.write_utterances(connection, corpus, file_ids, issuer_ids)
+            SqliteWriter.write_labels(connection, corpus, utterance_ids)
+            SqliteWriter.write_feature_containers(connection, corpus, path)
+            SqliteWriter.write_subviews(connection, corpus)
+
+            connection.executescript(sqlite_corpus.INDEXES)
+            connection.commit()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def write_files(connection, corpus, path):
+        file_ids = {}
+        rows = ((file_ids.setdefault(file.idx, len(file_ids) + 1), file.idx, os.path.relpath(file.path, path))
+                for file in corpus.files.values())
+
+        insert_batches(connection, 'INSERT INTO files (id, idx, path) VALUES (?, ?, ?)', rows)
+        return file_ids
+
+    @staticmethod
+    def write_issuers(connection, corpus):
+        issuer_ids = {}
+        rows = ((issuer_ids.setdefault(issuer.idx, len(issuer_ids) + 1), issuer.idx,
+                 json.dumps(default.DefaultWriter.issuer_data(issuer)))
+                for issuer in corpus.issuers.values())
+
+        insert_batches(connection, 'INSERT INTO issuers (id, idx, data) VALUES (?, ?, ?)', rows)
+        return issuer_ids
+
+    @staticmethod
+    def write_utterances(connection, corpus, file_ids, issuer_ids):
+        utterance_ids = {}
+        rows = ((utterance_ids.setdefault(utt.idx, len(utterance_ids) + 1), utt.idx, file_ids[utt.file.idx],
+                 issuer_ids[utt.issuer.idx] if utt.issuer is not None else None, utt.start, utt.end)
+                for utt in corpus.utterances.values())
+
+        insert_batches(connection, """
+            INSERT INTO utterances (id, idx, file_id, issuer_id, start_time, end_time) VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+
+        return utterance_ids
+
+    @staticmethod
+    def write_labels(connection, corpus, utterance_ids):
+        label_lists = []
+        labels = []
+        value_ids = {}
+        label_list_id = 0
+
+        for utterance in corpus.utterances.values():
+            for label_list_idx, label_list in utterance.label_lists.items():
+                label_list_id += 1
+                label_lists.append((label_list_id, utterance_ids[utterance.idx], label_list_idx))
+
+                for lbl in label_list:
+                    meta = json.dumps(lbl.meta, sort_keys=True) if len(lbl.meta) > 0 else None
+                    value_id = value_ids.setdefault(lbl.value, len(value_ids) + 1)
+                    labels.append((label_list_id, value_id, lbl.start, lbl.end, meta))
+
+                if len(labels) >= BATCH_SIZE:
+                    SqliteWriter._insert_labels(connection, label_lists, labels)
+                    label_lists = []
+                    labels = []
+
+        SqliteWriter._insert_labels(connection, label_lists, labels)
+
+        connection.executemany('INSERT INTO label_values (id, value) VALUES (?, ?)',
+                               ((value_id, value) for value, value_id in value_ids.items()))
+
+    @staticmethod
+    def _insert_labels(connection, label_lists, labels):
+        connection.executemany('INSERT INTO label_lists (id, utterance_id, idx) VALUES (?, ?, ?)', label_lists)
+        connection.executemany("""
+            INSERT INTO labels (label_list_id, value_id, start_time, end_time, meta) VALUES (?, ?, ?, ?, ?)
+        """, labels)
+
+    @staticmethod
+    def write_feature_containers(connection, corpus, path):
+        connection.executemany('INSERT INTO feature_containers (idx, path) VALUES (?, ?)',
+                               ((container_idx, os.path.relpath(container.path, path))
+                                for container_idx, container in corpus.feature_containers.items()))
+
+    @staticmethod
+    def write_subviews(connection, corpus):
+        if len(corpus.subviews) == 0:
+            return
+
+        utterance_table = subview.UtteranceTable(corpus.utterances.keys())
+        connection.executemany('INSERT INTO subviews (idx, definition) VALUES (?, ?)',
+                               ((subview_idx, sv.serialize(utterance_table=utterance_table))
+                                for subview_idx, sv in corpus.subviews.items()))
+
+
+def insert_batches(connection, sql, rows):
+    """
+    Insert the given rows with the given statement in batches of :py:data:`BATCH_SIZE` rows.
+    """
+    batch = []
+
+    for row in rows:
+        batch.append(row)
+
+        if len(batch) >= BATCH_SIZE:
+            connection.executemany(sql, batch)
+            batch = []
+
+    connection.executemany(sql, batch)
@@ -1,16 +1,30 @@
 import os
-import glob
 
 from bs4 import BeautifulSoup
 
 import audiomate
 from audiomate.corpus import assets
 from audiomate.corpus.subset import subview
+from audiomate.utils import files
+from audiomate.utils import misc
 from . import base
 
 SUBSETS = ['train', 'dev', 'test']
 WAV_SUFFIX = '_Kinect-Beam'
 
+# Tags of the values read from the XML file of a recording
+XML_TAGS = {
+    'transcription': 'cleaned_sentence',
+    'transcription_raw': 'sentence',
+    'gender': 'gender',
+    'is_native': 'muttersprachler',
+    'age_class': 'ageclass',
+    'speaker_idx': 'speaker_id'
+}
+
+# Number of XML files passed to a parsing process at once
+PARSE_CHUNK_SIZE = 64
+
 # Wrong transcripts, empty or to short
 BAD_FILES = {
     'train': [
@@ -220,16 +234,29 @@ BAD_FILES = {
 class TudaReader(base.CorpusReader):
     """
     Reader for the TUDA german distant speech corpus (german-speechdata-package-v2.tar.gz).
+    The XML files of the recordings are parsed by a pool of processes.
 
     Note:
         It only loads files ending in -beamformedSignal.wav
 
+    Args:
+        num_processes (int): Number of processes parsing the XML files. If ``None``, the number of CPUs is used.
+        mp_context (str): The multiprocessing start method (``fork``, ``spawn``, ``forkserver``).
+                          If ``None`` the default of the platform is used.
+
     .. seealso::
 
        `<https://www.inf.uni-hamburg.de/en/inst/ab/lt/resources/data/acoustic-models.html>`_
           Download page
     """
 
+    def __init__(self, num_processes=None, mp_context=None):
+        if num_processes is None:
+            num_processes = os.cpu_count() or 1
+
+        self.num_processes = num_processes
+        self.mp_context = mp_context
+
     @classmethod
     def type(cls):
         return 'tuda'
@@ -239,14 +266,41 @@ class TudaReader(base.CorpusReader):
 
     def _load(self, path):
         corpus = audiomate.Corpus(path=path)
+        sub_paths = [os.path.join(path, part) for part in SUBSETS]
 
-        for part in SUBSETS:
-            sub_path = os.path.join(path, part)
-            ids = TudaReader.get_ids_from_folder(sub_path, part)
+        # The folders of the subsets are listed at once
+        part_ids = list(files.parallel_map(lambda part: TudaReader.get_ids_from_folder(*part),
+                                           zip(sub_paths, SUBSETS), num_workers=len(SUBSETS)))
 
-            for idx in ids:
-                TudaReader.load_file(sub_path, idx, corpus)
+        recordings = [(sub_path, idx) for sub_path, ids in zip(sub_paths, part_ids) for idx in sorted(ids)]
+        xml_paths = [os.path.join(sub_path, '{}.xml'.format(idx)) for sub_path, idx in recordings]
 
+        issuers = {}
+        utterances = []
+
+        with misc.paused_garbage_collection():
+            for (sub_path, idx), info in zip(recordings, files.parallel_map(
+                    TudaReader.parse_xml, xml_paths, num_workers=self.num_processes, processes=True,
+                    chunk_size=PARSE_CHUNK_SIZE, mp_context=self.mp_context)):
+                speaker_idx = info['speaker_idx']
+
+                if speaker_idx not in issuers:
+                    issuers[speaker_idx] = TudaReader.create_speaker(info)
+
+                wav_path = os.path.join(sub_path, '{}{}.wav'.format(idx, WAV_SUFFIX))
+                file = assets.File(idx, os.path.abspath(wav_path))
+                utt = assets.Utterance(idx, file, issuers[speaker_idx])
+                utt.set_label_list(assets.LabelList.create_single(info['transcription'],
+                                                                  idx=audiomate.corpus.LL_WORD_TRANSCRIPT))
+                utt.set_label_list(assets.LabelList.create_single(info['transcription_raw'],
+                                                                  idx=audiomate.corpus.LL_WORD_TRANSCRIPT_RAW))
+                utterances.append(utt)
+
+            corpus.import_files([utt.file for utt in utterances])
+            corpus.import_issuers(list(issuers.values()))
+            corpus.import_utterances(utterances)
+
+        for part, ids in zip(SUBSETS, part_ids):
             subview_filter = subview.MatchingUtteranceIdxFilter(utterance_idxs=ids)
             subview_corpus = subview.Subview(corpus, filter_criteria=[subview_filter])
             corpus.import_subview(part, subview_corpus)
@@ -260,61 +314,63 @@ class TudaReader(base.CorpusReader):
         """
         valid_ids = set({})
 
-        for xml_file in glob.glob(os.path.join(path, '*.xml')):
-            idx = os.path.splitext(os.path.basename(xml_file))[0]
+        try:
+            with os.scandir(path) as it:
+                file_names = {entry.name for entry in it if entry.is_file()}
+        except FileNotFoundError:
+            return valid_ids
 
-            if idx not in BAD_FILES[part_name]:
-                beamformed_path = os.path.join(path, '{}{}.wav'.format(idx, WAV_SUFFIX))
+        for file_name in file_names:
+            idx, ext = os.path.splitext(file_name)
 
-                if os.path.isfile(beamformed_path):
+            if ext == '.xml' and idx not in BAD_FILES[part_name]:
+                if '{}{}.wav'.format(idx, WAV_SUFFIX) in file_names:
                     valid_ids.add(idx)
 
         return valid_ids
 
     @staticmethod
-    def load_file(folder_path, idx, corpus):
+    def parse_xml(xml_path):
         """
-        Load speaker, file, utterance, labels for the file with the given id.
+        Parse the XML file of a recording.
+
+        Returns:
+            dict: The transcriptions and the speaker info of the recording (as strings).
         """
-        xml_path = os.path.join(folder_path, '{}.xml'.format(idx))
-        wav_path = os.path.join(folder_path, '{}{}.wav'.format(idx, WAV_SUFFIX))
-
-        xml_file = open(xml_path, 'r', encoding='utf-8')
-        soup = BeautifulSoup(xml_file, 'lxml')
-
-        transcription = soup.recording.cleaned_sentence.string
-        transcription_raw = soup.recording.sentence.string
-        gender = soup.recording.gender.string
-        is_native = soup.recording.muttersprachler.string
-        age_class = soup.recording.ageclass.string
-        speaker_idx = soup.recording.speaker_id.string
-
-        if speaker_idx not in corpus.issuers.keys():
-            start_age_class = int(age_class.split('-')[0])
-
-            if start_age_class < 12:
-                age_group = assets.AgeGroup.CHILD
-            elif start_age_class < 18:
-                age_group = assets.AgeGroup.YOUTH
-            elif start_age_class < 65:
-                age_group = assets.AgeGroup.ADULT
-            else:
-                age_group = assets.AgeGroup.SENIOR
-
-            native_lang = None
-
-            if is_native == 'Ja':
-                native_lang = 'deu'
-
-            issuer = assets.Speaker(speaker_idx,
-                                    gender=assets.Gender(gender),
-                                    age_group=age_group,
-                                    native_language=native_lang)
-            corpus.import_issuers(issuer)
-
-        corpus.new_file(wav_path, idx)
-        utt = corpus.new_utterance(idx, idx, speaker_idx)
-        utt.set_label_list(assets.LabelList.create_single(transcription,
-                                                          idx=audiomate.corpus.LL_WORD_TRANSCRIPT))
-        utt.set_label_list(assets.LabelList.create_single(transcription_raw,
-                                                          idx=audiomate.corpus.LL_WORD_TRANSCRIPT_RAW))
+        with open(xml_path, 'r', encoding='utf-8') as xml_file:
+            soup = BeautifulSoup(xml_file, 'lxml')
+
+        # Plain strings, the parsed tree isn't needed anymore (and may be passed between processes)
+        info = {}
+
+        for key, tag in XML_TAGS.items():
+            value = soup.recording.find(tag).string
+            info[key] = None if value is None else str(value)
+
+        return info
+
+    @staticmethod
+    def create_speaker(info):
+        """
+        Create the speaker of a recording from the info returned by :py:meth:`parse_xml`.
+        """
+        start_age_class = int(info['age_class'].split('-')[0])
+
+        if start_age_class < 12:
+            age_group = assets.AgeGroup.CHILD
+        elif start_age_class < 18:
+            age_group = assets.AgeGroup.YOUTH
+        elif start_age_class < 65:
+            age_group = assets.AgeGroup.ADULT
+        else:
+            age_group = assets.AgeGroup.SENIOR
+
+        native_lang = None
+
+        if info['is_native'] == 'Ja':
+            native_lang = 'deu'
+
+        return assets.Speaker(info['speaker_idx'],
+                              gender=assets.Gender(info['gender']),
+                              age_group=age_group,
+                              native_language=native_lang)
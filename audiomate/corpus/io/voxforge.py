@@ -8,6 +8,7 @@ import requests
 import audiomate
 from . import base
 from audiomate.corpus import assets
+from audiomate.utils import files
 from audiomate.utils import textfile
 
 DOWNLOAD_URL = {
@@ -117,52 +118,59 @@ class VoxforgeReader(base.CorpusReader):
     """
     Reader for collections of voxforge audio data. The reader expects extracted .tgz files in the given folder.
 
+    The data directories are read by a pool of threads, since reading the many small files
+    mostly waits for the file system (especially on network storage).
+
+    Args:
+        num_threads (int): Number of data directories read at once.
+
     .. seealso::
 
        `<http://www.voxforge.org/>`_
           Download page
     """
 
+    def __init__(self, num_threads=files.NUM_SCAN_THREADS):
+        self.num_threads = num_threads
+
     @classmethod
     def type(cls):
         return 'voxforge'
 
+    @classmethod
+    def supports_streaming(cls):
+        return True
+
     def _check_for_missing_files(self, path):
         return []
 
     def _load(self, path):
-        corpus = audiomate.Corpus(path=path)
+        return base.corpus_from_records(self._stream(path), path=path)
 
-        for dir_path in VoxforgeReader.data_folders(path):
-            item = os.path.basename(dir_path)
-            etc_folder = os.path.join(dir_path, 'etc')
-            wav_folder = os.path.join(dir_path, 'wav')
-            readme_path = os.path.join(etc_folder, 'README')
-
-            # LOAD ISSUER
-            issuer = VoxforgeReader.parse_speaker_info(readme_path)
+    def _stream(self, path):
+        data_folders = VoxforgeReader.data_folders(path)
 
-            if issuer.idx is None or issuer.idx == 'anonymous':
-                issuer.idx = item
+        for dir_path, folder in zip(data_folders, files.parallel_map(VoxforgeReader.scan_folder, data_folders,
+                                                                     num_workers=self.num_threads)):
+            if folder is None:
+                continue
 
-            # LOAD TRANSCRIPTIONS
-            prompts, prompts_orig = VoxforgeReader.parse_prompts(etc_folder)
+            item = os.path.basename(dir_path)
+            wav_folder = os.path.join(dir_path, 'wav')
+            issuer, prompts, prompts_orig, wav_file_names = folder
 
             # LOAD FILES/UTTS
-            for file_name in os.listdir(wav_folder):
+            for file_name in wav_file_names:
                 wav_path = os.path.join(wav_folder, file_name)
                 basename, ext = os.path.splitext(file_name)
                 idx = '{}-{}'.format(item, basename)
 
-                is_valid_wav = os.path.isfile(wav_path) and ext == '.wav' and idx not in BAD_UTTERANCES
+                is_valid_wav = ext == '.wav' and idx not in BAD_UTTERANCES
                 has_transcription = basename in prompts.keys()
 
                 if is_valid_wav and has_transcription:
-                    if issuer.idx not in corpus.issuers.keys():
-                        corpus.import_issuers([issuer])
-
-                    corpus.new_file(wav_path, idx)
-                    utt = corpus.new_utterance(idx, idx, issuer.idx)
+                    file = assets.File(idx, os.path.abspath(wav_path))
+                    utt = assets.Utterance(idx, file, issuer)
                     utt.set_label_list(assets.LabelList.create_single(prompts[basename],
                                                                       idx=audiomate.corpus.LL_WORD_TRANSCRIPT))
 
@@ -171,17 +179,42 @@ class VoxforgeReader(base.CorpusReader):
                                                              idx=audiomate.corpus.LL_WORD_TRANSCRIPT_RAW)
                         utt.set_label_list(raw)
 
-        return corpus
+                    yield base.UtteranceRecord(utt, [])
 
     @staticmethod
     def data_folders(path):
-        """ Generator which yields a list of valid data directories (corresponds to the content of one .tgz). """
-        for item in os.listdir(path):
-            dir_path = os.path.join(path, item)
-            wav_folder = os.path.join(dir_path, 'wav')
+        """ Return the paths of all folders, which may be data directories (content of one .tgz). """
+        with os.scandir(path) as it:
+            return [os.path.join(path, entry.name) for entry in it if entry.is_dir()]
+
+    @staticmethod
+    def scan_folder(dir_path):
+        """
+        Read the speaker info and the prompts of a data directory and list its wav folder.
+
+        Returns:
+            tuple: The issuer, the prompts, the original prompts and the names of the files in the wav folder.
+            ``None`` if the directory has no wav folder.
+        """
+        etc_folder = os.path.join(dir_path, 'etc')
+        wav_folder = os.path.join(dir_path, 'wav')
+
+        try:
+            with os.scandir(wav_folder) as it:
+                wav_file_names = [entry.name for entry in it if entry.is_file()]
+        except (FileNotFoundError, NotADirectoryError):
+            return None
 
-            if os.path.isdir(dir_path) and os.path.isdir(wav_folder):
-                yield dir_path
+        # LOAD ISSUER
+        issuer = VoxforgeReader.parse_speaker_info(os.path.join(etc_folder, 'README'))
+
+        if issuer.idx is None or issuer.idx == 'anonymous':
+            issuer.idx = os.path.basename(dir_path)
+
+        # LOAD TRANSCRIPTIONS
+        prompts, prompts_orig = VoxforgeReader.parse_prompts(etc_folder)
+
+        return issuer, prompts, prompts_orig, wav_file_names
 
     @staticmethod
     def parse_speaker_info(readme_path):
@@ -238,8 +271,15 @@ class VoxforgeReader(base.CorpusReader):
         prompts_path = os.path.join(etc_folder, 'PROMPTS')
         prompts_orig_path = os.path.join(etc_folder, 'prompts-original')
 
-        prompts = textfile.read_key_value_lines(prompts_path, separator=' ')
-        prompts_orig = textfile.read_key_value_lines(prompts_orig_path, separator=' ')
+        prompts = {}
+        prompts_orig = {}
+
+        # Not every folder contains both prompt files
+        if os.path.isfile(prompts_path):
+            prompts = textfile.read_key_value_lines(prompts_path, separator=' ')
+
+        if os.path.isfile(prompts_orig_path):
+            prompts_orig = textfile.read_key_value_lines(prompts_orig_path, separator=' ')
 
         prompts_key_fixed = {}
 
@@ -0,0 +1,497 @@
+import collections
+import json
+import os
+import sqlite3
+from urllib import request
+
+from audiomate.corpus import assets
+from audiomate.corpus.assets import label as label_module
+from . import base
+
+SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    idx TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL
+);
+CREATE TABLE issuers (
+    id INTEGER PRIMARY KEY,
+    idx TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE TABLE utterances (
+    id INTEGER PRIMARY KEY,
+    idx TEXT NOT NULL UNIQUE,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    issuer_id INTEGER REFERENCES issuers(id),
+    start_time REAL NOT NULL,
+    end_time REAL NOT NULL
+);
+CREATE TABLE label_lists (
+    id INTEGER PRIMARY KEY,
+    utterance_id INTEGER NOT NULL REFERENCES utterances(id),
+    idx TEXT NOT NULL
+);
+CREATE TABLE label_values (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+CREATE TABLE labels (
+    id INTEGER PRIMARY KEY,
+    label_list_id INTEGER NOT NULL REFERENCES label_lists(id),
+    value_id INTEGER NOT NULL REFERENCES label_values(id),
+    start_time REAL NOT NULL,
+    end_time REAL NOT NULL,
+    meta TEXT
+);
+CREATE TABLE feature_containers (
+    idx TEXT PRIMARY KEY,
+    path TEXT NOT NULL
+);
+CREATE TABLE subviews (
+    idx TEXT PRIMARY KEY,
+    definition TEXT NOT NULL
+);
+"""
+
+# Created after the tables are filled
+INDEXES = """
+CREATE INDEX utterances_file ON utterances(file_id);
+CREATE INDEX utterances_issuer ON utterances(issuer_id);
+CREATE INDEX label_lists_utterance ON label_lists(utterance_id);
+CREATE INDEX label_lists_idx ON label_lists(idx);
+CREATE INDEX labels_label_list ON labels(label_list_id);
+CREATE INDEX labels_value ON labels(value_id);
+"""
+
+UTTERANCE_QUERY = """
+SELECT u.id, u.idx, u.start_time, u.end_time, f.idx, f.path, i.idx, i.data
+FROM utterances u
+JOIN files f ON f.id = u.file_id
+LEFT JOIN issuers i ON i.id = u.issuer_id
+{where}
+ORDER BY u.id
+"""
+
+LABEL_QUERY = """
+SELECT ll.utterance_id, ll.id, ll.idx, v.value, l.start_time, l.end_time, l.meta
+FROM label_lists ll
+LEFT JOIN labels l ON l.label_list_id = ll.id
+LEFT JOIN label_values v ON v.id = l.value_id
+{where}
+ORDER BY ll.utterance_id, ll.id, l.id
+"""
+
+# Maximal number of parameters per query
+MAX_PARAMETERS = 900
+
+
+class SqliteCorpus(base.CorpusView):
+    """
+    A readonly corpus stored in an SQLite database (written with :py:class:`audiomate.corpus.io.SqliteWriter`).
+
+    Nothing is held in memory. The properties (e.g. :py:attr:`utterances`) return mappings, which query the
+    database and create the assets on access. Queries (e.g. :py:meth:`utterance_ids_with_label`) and label
+    statistics (:py:meth:`label_count`, ...) run as SQL queries using the indexes of the database.
+    Hence :py:class:`audiomate.corpus.subset.Subview` filters based on ids or labels are resolved without
+    loading the utterances of the corpus.
+
+    The database is opened readonly, so it can be used by multiple processes at the same time.
+    The corpus can be pickled, every process opens its own connection.
+
+    Notes:
+        Every access creates new asset objects, changes to them are not stored.
+        For memory reasons, :py:attr:`audiomate.corpus.assets.Issuer.utterances` isn't populated.
+
+    Args:
+        path (str): Path to the database.
+        base_path (str): Path relative file paths are based on. If ``None`` the folder of the database is used.
+
+    Example::
+
+        >>> corpus = audiomate.Corpus.load('/path/to/corpus', reader='sqlite')
+        >>> corpus.label_count(label_list_ids=['phones'])
+        {'a': 231231, 'b': 42421, ...}
+    """
+
+    def __init__(self, path, base_path=None):
+        self.path = path
+        self.base_path = base_path if base_path is not None else os.path.dirname(os.path.abspath(path))
+
+        self._connection = None
+        self._connection_pid = None
+        self._subviews = None
+        self._feature_containers = None
+
+        self._files = SqliteMapping(self, 'files', self._files_with_ids)
+        self._issuers = SqliteMapping(self, 'issuers', self._issuers_with_ids)
+        self._utterances = SqliteMapping(self, 'utterances', self._utterances_with_ids)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(_connection=None, _connection_pid=None, _subviews=None)
+        return state
+
+    @property
+    def name(self):
+        return os.path.basename(self.base_path)
+
+    @property
+    def num_changes(self):
+        # The database isn't modified through the view
+        return 0
+
+    @property
+    def files(self):
+        return self._files
+
+    @property
+    def utterances(self):
+        return self._utterances
+
+    @property
+    def issuers(self):
+        return self._issuers
+
+    @property
+    def feature_containers(self):
+        if self._feature_containers is None:
+            rows = self.query('SELECT idx, path FROM feature_containers')
+            self._feature_containers = {idx: assets.FeatureContainer(self._absolute_path(path)) for idx, path in rows}
+
+        return self._feature_containers
+
+    @property
+    def subviews(self):
+        if self._subviews is None:
+            from audiomate.corpus.subset import subview
+
+            rows = self.query('SELECT idx, definition FROM subviews').fetchall()
+            utterance_table = None
+            self._subviews = {}
+
+            if len(rows) > 0:
+                utterance_table = subview.UtteranceTable(row[0] for row in self.query('SELECT idx FROM utterances'))
+
+            for idx, definition in rows:
+                self._subviews[idx] = subview.Subview.parse(definition, corpus=self, utterance_table=utterance_table)
+
+        return self._subviews
+
+    #
+    #   Database
+    #
+
+    def connection(self):
+        """
+        Return the (readonly) connection to the database of the current process.
+        """
+        if self._connection is None or self._connection_pid != os.getpid():
+            uri = 'file:{}?mode=ro'.format(request.pathname2url(os.path.abspath(self.path)))
+            self._connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._connection_pid = os.getpid()
+
+        return self._connection
+
+    def query(self, sql, parameters=()):
+        """
+        Execute the given SQL query and return the cursor.
+        """
+        return self.connection().execute(sql, parameters)
+
+    #
+    #   Queries
+    #
+
+    def utterance_ids_of_file(self, file_idx):
+        return self._utterance_ids("""
+            SELECT u.idx FROM utterances u JOIN files f ON f.id = u.file_id WHERE f.idx = ?
+        """, [file_idx])
+
+    def utterance_ids_of_issuer(self, issuer_idx):
+        return self._utterance_ids("""
+            SELECT u.idx FROM utterances u JOIN issuers i ON i.id = u.issuer_id WHERE i.idx = ?
+        """, [issuer_idx])
+
+    def utterance_ids_with_label_list(self, label_list_idx):
+        return self._utterance_ids("""
+            SELECT u.idx FROM label_lists ll JOIN utterances u ON u.id = ll.utterance_id WHERE ll.idx = ?
+        """, [label_list_idx])
+
+    def utterance_ids_with_label(self, value, label_list_ids=None):
+        condition, parameters = self._label_list_condition(label_list_ids)
+        return self._utterance_ids("""
+            SELECT u.idx
+            FROM label_values v
+            JOIN labels l ON l.value_id = v.id
+            JOIN label_lists ll ON ll.id = l.label_list_id
+            JOIN utterances u ON u.id = ll.utterance_id
+            WHERE v.value = ? {}
+        """.format(condition), [value] + parameters)
+
+    def _utterance_ids(self, sql, parameters):
+        return {row[0] for row in self.query(sql, parameters)}
+
+    #
+    #   Labels
+    #
+
+    def all_label_values(self, label_list_ids=None):
+        condition, parameters = self._label_list_condition(label_list_ids)
+        rows = self.query("""
+            SELECT v.value FROM label_values v WHERE EXISTS (
+                SELECT 1 FROM labels l JOIN label_lists ll ON ll.id = l.label_list_id
+                WHERE l.value_id = v.id {}
+            )
+        """.format(condition), parameters)
+
+        return {row[0] for row in rows}
+
+    def label_count(self, label_list_ids=None):
+        condition, parameters = self._label_list_condition(label_list_ids)
+        rows = self.query("""
+            SELECT v.value, COUNT(*)
+            FROM labels l
+            JOIN label_lists ll ON ll.id = l.label_list_id
+            JOIN label_values v ON v.id = l.value_id
+            WHERE 1 {}
+            GROUP BY l.value_id
+        """.format(condition), parameters)
+
+        return collections.defaultdict(int, rows)
+
+    def label_durations(self, label_list_ids=None):
+        condition, parameters = self._label_list_condition(label_list_ids)
+        durations = collections.defaultdict(int)
+
+        rows = self.query("""
+            SELECT v.value, SUM(l.end_time - l.start_time)
+            FROM labels l
+            JOIN label_lists ll ON ll.id = l.label_list_id
+            JOIN label_values v ON v.id = l.value_id
+            WHERE l.end_time != -1 {}
+            GROUP BY l.value_id
+        """.format(condition), parameters)
+
+        for value, duration in rows:
+            durations[value] += duration
+
+        # Labels until the end of the utterance, the duration of the utterance is needed
+        rows = self.query("""
+            SELECT v.value, u.start_time, u.end_time, f.path, COUNT(*), SUM(l.start_time)
+            FROM labels l
+            JOIN label_lists ll ON ll.id = l.label_list_id
+            JOIN label_values v ON v.id = l.value_id
+            JOIN utterances u ON u.id = ll.utterance_id
+            JOIN files f ON f.id = u.file_id
+            WHERE l.end_time = -1 {}
+            GROUP BY u.id, l.value_id
+        """.format(condition), parameters)
+
+        file_durations = {}
+
+        for value, utt_start, utt_end, file_path, count, sum_of_starts in rows:
+            if utt_end == -1:
+                if file_path not in file_durations:
+                    file_durations[file_path] = assets.File(None, self._absolute_path(file_path)).duration
+
+                utt_end = file_durations[file_path]
+
+            durations[value] += count * (utt_end - utt_start) - sum_of_starts
+
+        return durations
+
+    def _label_list_condition(self, label_list_ids):
+        if label_list_ids is None:
+            return '', []
+
+        label_list_ids = list(label_list_ids)
+        return 'AND ll.idx IN ({})'.format(','.join('?' * len(label_list_ids))), label_list_ids
+
+    #
+    #   Assets
+    #
+
+    def _files_with_ids(self, file_ids):
+        files = {}
+
+        for chunk in _chunks(file_ids):
+            rows = self.query('SELECT id, idx, path FROM files WHERE idx IN ({}) ORDER BY id'.format(
+                ','.join('?' * len(chunk))), chunk)
+
+            files.update((row[0], assets.File(row[1], self._absolute_path(row[2]))) for row in rows)
+
+        return {file.idx: file for _, file in sorted(files.items())}
+
+    def _issuers_with_ids(self, issuer_ids):
+        issuers = {}
+
+        for chunk in _chunks(issuer_ids):
+            rows = self.query('SELECT id, idx, data FROM issuers WHERE idx IN ({}) ORDER BY id'.format(
+                ','.join('?' * len(chunk))), chunk)
+
+            issuers.update((row[0], self._create_issuer(row[1], row[2])) for row in rows)
+
+        return {issuer.idx: issuer for _, issuer in sorted(issuers.items())}
+
+    def _utterances_with_ids(self, utterance_ids):
+        utterances = {}
+
+        for chunk in _chunks(utterance_ids):
+            condition = 'WHERE u.idx IN ({})'.format(','.join('?' * len(chunk)))
+            utterances.update(self._iter_utterances(condition, chunk))
+
+        return {utterance.idx: utterance for _, utterance in sorted(utterances.items())}
+
+    def _iter_files(self):
+        for row in self.query('SELECT idx, path FROM files ORDER BY id'):
+            yield assets.File(row[0], self._absolute_path(row[1]))
+
+    def _iter_issuers(self):
+        for row in self.query('SELECT idx, data FROM issuers ORDER BY id'):
+            yield self._create_issuer(row[0], row[1])
+
+    def _iter_utterances(self, condition='', parameters=()):
+        """
+        Generate tuples (database-id, utterance) for the utterances matching the given condition (SQL).
+        The utterances and their labels are read with two queries ordered by utterance, which are merged.
+        """
+        label_condition = ''
+
+        if condition != '':
+            label_condition = 'WHERE ll.utterance_id IN (SELECT u.id FROM utterances u {})'.format(condition)
+
+        utterance_rows = self.query(UTTERANCE_QUERY.format(where=condition), parameters)
+        label_rows = self.query(LABEL_QUERY.format(where=label_condition), parameters)
+        label_row = next(label_rows, None)
+
+        files = {}
+        issuers = {}
+
+        for utt_id, utt_idx, start, end, file_idx, file_path, issuer_idx, issuer_data in utterance_rows:
+            file = files.get(file_idx)
+
+            if file is None:
+                file = assets.File(file_idx, self._absolute_path(file_path))
+                files[file_idx] = file
+
+            utterance = assets.Utterance(utt_idx, file, start=start, end=end)
+
+            if issuer_idx is not None:
+                if issuer_idx not in issuers:
+                    issuers[issuer_idx] = self._create_issuer(issuer_idx, issuer_data)
+
+                # Not added to ``issuer.utterances``, so the utterances aren't kept in memory
+                utterance.issuer = issuers[issuer_idx]
+
+            while label_row is not None and label_row[0] == utt_id:
+                label_row = self._read_label_list(label_row, label_rows, utterance)
+
+            yield utt_id, utterance
+
+    @staticmethod
+    def _read_label_list(label_row, label_rows, utterance):
+        """
+        Create the label-list of the given row and add all labels of the following rows,
+        return the first row of the next label-list.
+        """
+        label_list_id = label_row[1]
+        label_list = assets.LabelList(idx=label_row[2])
+        labels = label_list.labels
+
+        while label_row is not None and label_row[1] == label_list_id:
+            value, start, end, meta = label_row[3:]
+
+            if value is not None:
+                lbl = label_module.Label(value, start, end, meta=json.loads(meta) if meta is not None else None)
+                lbl.label_list = label_list
+                labels.append(lbl)
+
+            label_row = next(label_rows, None)
+
+        # The labels are added directly, since the new objects don't affect any data derived from labels
+        label_list.utterance = utterance
+        utterance.label_lists[label_list.idx] = label_list
+
+        return label_row
+
+    def _create_issuer(self, issuer_idx, data):
+        from audiomate.corpus.io import default
+        return default.DefaultReader.create_issuer(issuer_idx, json.loads(data))
+
+    def _absolute_path(self, path):
+        return os.path.abspath(os.path.join(self.base_path, path))
+
+
+class SqliteMapping(collections.abc.Mapping):
+    """
+    Readonly mapping of the assets in a table of a :py:class:`SqliteCorpus`.
+    The assets are created from the database on access.
+
+    Args:
+        corpus (SqliteCorpus): The corpus.
+        table (str): The name of the table.
+        with_ids (func): Function returning a dictionary of the assets with the given ids.
+    """
+
+    def __init__(self, corpus, table, with_ids):
+        self.corpus = corpus
+        self.table = table
+        self.with_ids = with_ids
+        self._length = None
+
+    def __getitem__(self, key):
+        assets_with_ids = self.with_ids([key])
+
+        if key not in assets_with_ids:
+            raise KeyError(key)
+
+        return assets_with_ids[key]
+
+    def __contains__(self, key):
+        return self.corpus.query('SELECT 1 FROM {} WHERE idx = ?'.format(self.table), [key]).fetchone() is not None
+
+    def __iter__(self):
+        return (row[0] for row in self.corpus.query('SELECT idx FROM {} ORDER BY id'.format(self.table)))
+
+    def __len__(self):
+        # The database is readonly
+        if self._length is None:
+            self._length = self.corpus.query('SELECT COUNT(*) FROM {}'.format(self.table)).fetchone()[0]
+
+        return self._length
+
+    def values(self):
+        return SqliteValuesView(self)
+
+    def items(self):
+        return SqliteItemsView(self)
+
+    def _iter_assets(self):
+        if self.table == 'files':
+            return self.corpus._iter_files()
+        elif self.table == 'issuers':
+            return self.corpus._iter_issuers()
+        else:
+            return (utterance for _, utterance in self.corpus._iter_utterances())
+
+
+class SqliteValuesView(collections.abc.ValuesView):
+    """ Values of a :py:class:`SqliteMapping`, streamed with a single query. """
+
+    def __iter__(self):
+        return self._mapping._iter_assets()
+
+
+class SqliteItemsView(collections.abc.ItemsView):
+    """ Items of a :py:class:`SqliteMapping`, streamed with a single query. """
+
+    def __iter__(self):
+        return ((asset.idx, asset) for asset in self._mapping._iter_assets())
+
+
+def _chunks(values):
+    values = list(values)
+
+    for index in range(0, len(values), MAX_PARAMETERS):
+        yield values[index:index + MAX_PARAMETERS]
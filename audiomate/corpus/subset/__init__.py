@@ -60,6 +60,7 @@ from .subview import MatchingUtteranceIdxFilter  # noqa: F401
 from .subview import MatchingLabelFilter  # noqa: F401
 
 from .subview import Subview  # noqa: F401
+from .subview import UtteranceTable  # noqa: F401
 
 from .splitting import Splitter  # noqa: F401
 from .selection import SubsetGenerator  # noqa: F401
@@ -1,4 +1,3 @@
-import collections
 import random
 
 from . import subview
@@ -41,11 +40,9 @@ class SubsetGenerator(object):
         all_utterance_ids = sorted(list(self.corpus.utterances.keys()))
 
         if balance_labels:
-            all_label_values = self.corpus.all_label_values(label_list_ids=label_list_ids)
-            utterance_with_label_counts = collections.defaultdict(dict)
-
-            for utterance_idx, utterance in self.corpus.utterances.items():
-                utterance_with_label_counts[utterance_idx] = utterance.label_count(label_list_ids=label_list_ids)
+            label_stats = self.corpus.label_statistics()
+            all_label_values = label_stats.label_values(label_list_ids=label_list_ids)
+            utterance_with_label_counts = label_stats.label_count_per_utterance(label_list_ids=label_list_ids)
 
             subset_utterance_ids = utils.select_balanced_subset(utterance_with_label_counts,
                                                                 num_utterances_in_subset,
@@ -81,11 +78,9 @@ class SubsetGenerator(object):
         utterance_durations = {utt_idx: utt.duration for utt_idx, utt in self.corpus.utterances.items()}
 
         if balance_labels:
-            all_label_values = self.corpus.all_label_values(label_list_ids=label_list_ids)
-
-            label_durations = {}
-            for utt_idx, utt in self.corpus.utterances.items():
-                label_durations[utt_idx] = utt.label_total_duration(label_list_ids)
+            label_stats = self.corpus.label_statistics()
+            all_label_values = label_stats.label_values(label_list_ids=label_list_ids)
+            label_durations = label_stats.label_durations_per_utterance(label_list_ids=label_list_ids)
 
             subset_utterance_ids = utils.select_balanced_subset(label_durations,
                                                                 subset_duration,
@@ -154,17 +149,16 @@ class SubsetGenerator(object):
         Returns:
             Subview: The subview representing the subset.
         """
-        all_label_values = self.corpus.all_label_values(label_list_ids=label_list_ids)
+        label_stats = self.corpus.label_statistics()
+        all_label_values = label_stats.label_values(label_list_ids=label_list_ids)
 
         if by_duration:
             utterance_durations = {utt_idx: utt.duration for utt_idx, utt in self.corpus.utterances.items()}
-            total_duration_per_label = self.corpus.label_durations(label_list_ids=label_list_ids)
+            total_duration_per_label = label_stats.label_durations(label_list_ids=label_list_ids)
             rarest_label_duration = sorted(total_duration_per_label.values())[0]
             target_duration = len(all_label_values) * rarest_label_duration
 
-            label_durations_per_utterance = {}
-            for utt_idx, utt in self.corpus.utterances.items():
-                label_durations_per_utterance[utt_idx] = utt.label_total_duration(label_list_ids)
+            label_durations_per_utterance = label_stats.label_durations_per_utterance(label_list_ids=label_list_ids)
 
             subset_utterance_ids = utils.select_balanced_subset(label_durations_per_utterance,
                                                                 target_duration,
@@ -173,13 +167,10 @@ class SubsetGenerator(object):
                                                                 seed=self.rand.random())
 
         else:
-            total_count_per_label = self.corpus.label_count(label_list_ids=label_list_ids)
+            total_count_per_label = label_stats.label_count(label_list_ids=label_list_ids)
             lowest_label_count = sorted(total_count_per_label.values())[0]
             target_label_count = lowest_label_count * len(all_label_values)
-            utterance_with_label_counts = collections.defaultdict(dict)
-
-            for utterance_idx, utterance in self.corpus.utterances.items():
-                utterance_with_label_counts[utterance_idx] = utterance.label_count(label_list_ids=label_list_ids)
+            utterance_with_label_counts = label_stats.label_count_per_utterance(label_list_ids=label_list_ids)
 
             subset_utterance_ids = utils.select_balanced_subset(utterance_with_label_counts,
                                                                 target_label_count,
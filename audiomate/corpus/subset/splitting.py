@@ -165,13 +165,15 @@ class Splitter(object):
             (dict): A dictionary containing the subsets with the identifier from the input as key.
         """
 
-        identifiers = {}
+        label_stats = self.corpus.label_statistics()
 
-        for utterance in self.corpus.utterances.values():
-            if use_lengths:
-                identifiers[utterance.idx] = {l: int(d * 100) for l, d in utterance.label_total_duration().items()}
-            else:
-                identifiers[utterance.idx] = utterance.label_count()
+        if use_lengths:
+            identifiers = {}
+
+            for utt_idx, durations in label_stats.label_durations_per_utterance().items():
+                identifiers[utt_idx] = {value: int(d * 100) for value, d in durations.items()}
+        else:
+            identifiers = label_stats.label_count_per_utterance()
 
         splits = utils.get_identifiers_splitted_by_weights(identifiers, proportions)
 
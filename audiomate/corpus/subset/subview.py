@@ -1,7 +1,53 @@
 import abc
+import base64
+import zlib
+
+import numpy as np
 
 from audiomate.corpus import base
 
+# Minimal number of utterance-ids, for which a MatchingUtteranceIdxFilter is serialized as bitmap
+# (if an utterance table is given)
+BITMAP_THRESHOLD = 1000
+
+
+class UtteranceTable(list):
+    """
+    Sorted list of all utterance-ids of a corpus, over which the ids of a :py:class:`MatchingUtteranceIdxFilter`
+    are encoded as bitmap. The checksum of the ids is only computed once per table,
+    so the table shouldn't be changed after it was created.
+
+    Args:
+        utterance_ids (iterable): The utterance-ids of the corpus (in any order).
+    """
+
+    def __init__(self, utterance_ids=()):
+        super(UtteranceTable, self).__init__(sorted(utterance_ids))
+        self._checksum = None
+
+    @property
+    def checksum(self):
+        """ Return the CRC-32 of the utterance-ids (one per line) as hex string. """
+        if self._checksum is None:
+            self._checksum = table_checksum(self)
+
+        return self._checksum
+
+
+def table_checksum(utterance_ids):
+    """
+    Return the CRC-32 of the given utterance-ids (one per line) as hex string,
+    so a bitmap isn't applied to another utterance table.
+
+    Args:
+        utterance_ids (list): The utterance-ids in the order of the table.
+
+    Returns:
+        str: The checksum.
+    """
+    data = ''.join(('\n'.join(utterance_ids), '\n' if len(utterance_ids) > 0 else ''))
+    return '{:08x}'.format(zlib.crc32(data.encode('utf-8')))
+
 
 class FilterCriterion(metaclass=abc.ABCMeta):
     """
@@ -22,6 +68,33 @@ class FilterCriterion(metaclass=abc.ABCMeta):
         """
         pass
 
+    def matching_utterance_ids(self, corpus):
+        """
+        Return the ids of all utterances of the given corpus that match the filter, if they can be determined
+        with the indexes of the corpus (e.g. :py:meth:`audiomate.corpus.CorpusView.utterance_ids_with_label`)
+        without checking every utterance.
+
+        Args:
+            corpus (CorpusView): The corpus to filter.
+
+        Returns:
+            set: The ids of the matching utterances or ``None``, if every utterance has to be checked
+            with :py:meth:`match`.
+        """
+        return None
+
+    @property
+    def version(self):
+        """
+        Return a number that changes whenever the filter criterion is modified.
+        Subviews cache the utterances matching their criteria as long as the versions are unchanged.
+        If ``None``, the modifications aren't tracked and subviews check the criterion on every access.
+        """
+        return None
+
+    def _register_change(self):
+        self._version += 1
+
     @abc.abstractmethod
     def serialize(self):
         """
@@ -60,6 +133,10 @@ class MatchingUtteranceIdxFilter(FilterCriterion):
     """
     A filter criterion that matches utterances based on utterance-ids.
 
+    Large sets of utterance-ids can be serialized as compressed bitmap over an utterance table
+    (sorted list of all utterance-ids of the corpus), instead of listing all ids
+    (see :py:meth:`serialize` and :py:meth:`parse`).
+
     Args:
         utterance_idxs (set): A list of utterance-ids. Only utterances in the list will pass the
                                filter
@@ -67,25 +144,130 @@ class MatchingUtteranceIdxFilter(FilterCriterion):
     """
 
     def __init__(self, utterance_idxs=set(), inverse=False):
+        self._version = 0
         self.utterance_idxs = utterance_idxs
         self.inverse = inverse
 
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def utterance_idxs(self):
+        """ The set of utterance-ids, it can be edited in place. """
+        return self._utterance_idxs
+
+    @utterance_idxs.setter
+    def utterance_idxs(self, value):
+        self._utterance_idxs = CriterionSet(self, value)
+        self._register_change()
+
+    @property
+    def inverse(self):
+        """ If True only utterance not in the list pass the filter. """
+        return self._inverse
+
+    @inverse.setter
+    def inverse(self, value):
+        self._inverse = value
+        self._register_change()
+
     def match(self, utterance, corpus):
         return (utterance.idx in self.utterance_idxs and not self.inverse) \
                or (utterance.idx not in self.utterance_idxs and self.inverse)
 
-    def serialize(self):
+    def matching_utterance_ids(self, corpus):
+        if self.inverse:
+            return corpus.utterances.keys() - self.utterance_idxs
+
+        return set(self.utterance_idxs)
+
+    def serialize(self, utterance_table=None):
+        """
+        Serialize this filter criterion to write to a file.
+
+        Args:
+            utterance_table (list): Sorted list of all utterance-ids of the corpus. If given and the filter
+                                    contains at least :py:data:`BITMAP_THRESHOLD` ids (all contained in the table),
+                                    the ids are encoded as compressed bitmap over the table.
+                                    With an :py:class:`UtteranceTable` the checksum of the table
+                                    is computed only once for all filters.
+
+        Returns:
+            str: A string representing this filter criterion.
+        """
         inverse_indication = 'exclude' if self.inverse else 'include'
+
+        if utterance_table is not None and len(self.utterance_idxs) >= BITMAP_THRESHOLD:
+            bitmap = self._encode_bitmap(self.utterance_idxs, utterance_table)
+
+            if bitmap is not None:
+                return '{}-bitmap,{},{},{}'.format(inverse_indication, len(utterance_table),
+                                                   self._table_checksum(utterance_table), bitmap)
+
         id_string = ','.join(sorted(self.utterance_idxs))
         return '{},{}'.format(inverse_indication, id_string)
 
     @classmethod
-    def parse(cls, representation):
+    def parse(cls, representation, utterance_table=None):
+        """
+        Create a filter criterion based on a string representation (created with ``serialize``).
+
+        Args:
+            representation (str): The string representation.
+            utterance_table (list): Sorted list of all utterance-ids of the corpus,
+                                    needed if the ids are encoded as bitmap.
+
+        Returns:
+            MatchingUtteranceIdxFilter: The filter criterion from that representation.
+        """
         items = representation.strip().split(',')
         inverse_indication = items.pop(0)
+
+        if inverse_indication.endswith('-bitmap'):
+            inverse_indication = inverse_indication[:-len('-bitmap')]
+            num_utterances = int(items[0])
+
+            if utterance_table is None or len(utterance_table) != num_utterances:
+                raise ValueError('The utterance-ids are encoded as bitmap over {} utterances, '
+                                 'this requires an utterance table of the same size'.format(num_utterances))
+
+            if items[1] != cls._table_checksum(utterance_table):
+                raise ValueError('The utterance-ids are encoded as bitmap over other utterances '
+                                 'than the ones of the utterance table (checksum mismatch)')
+
+            utterance_idxs = cls._decode_bitmap(items[2], utterance_table)
+        else:
+            utterance_idxs = set(items)
+
         inverse = inverse_indication == 'exclude'
 
-        return cls(utterance_idxs=set(items), inverse=inverse)
+        return cls(utterance_idxs=utterance_idxs, inverse=inverse)
+
+    @staticmethod
+    def _encode_bitmap(utterance_idxs, utterance_table):
+        selected = np.fromiter((utt_idx in utterance_idxs for utt_idx in utterance_table),
+                               dtype=bool, count=len(utterance_table))
+
+        # Ids missing in the table can't be encoded
+        if np.count_nonzero(selected) != len(utterance_idxs):
+            return None
+
+        return base64.b64encode(zlib.compress(np.packbits(selected).tobytes())).decode('ascii')
+
+    @staticmethod
+    def _table_checksum(utterance_table):
+        if isinstance(utterance_table, UtteranceTable):
+            return utterance_table.checksum
+
+        return table_checksum(utterance_table)
+
+    @staticmethod
+    def _decode_bitmap(data, utterance_table):
+        packed = np.frombuffer(zlib.decompress(base64.b64decode(data)), dtype=np.uint8)
+        selected = np.unpackbits(packed)[:len(utterance_table)]
+
+        return {utterance_table[ordinal] for ordinal in np.flatnonzero(selected).tolist()}
 
     @classmethod
     def name(cls):
@@ -102,9 +284,34 @@ class MatchingLabelFilter(FilterCriterion):
     """
 
     def __init__(self, labels=set(), label_list_ids=set()):
+        self._version = 0
         self.labels = labels
         self.label_list_ids = label_list_ids
 
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def labels(self):
+        """ The set of accepted labels, it can be edited in place. """
+        return self._labels
+
+    @labels.setter
+    def labels(self, value):
+        self._labels = CriterionSet(self, value)
+        self._register_change()
+
+    @property
+    def label_list_ids(self):
+        """ The set of ids of the checked label-lists, it can be edited in place. """
+        return self._label_list_ids
+
+    @label_list_ids.setter
+    def label_list_ids(self, value):
+        self._label_list_ids = CriterionSet(self, value)
+        self._register_change()
+
     def match(self, utterance, corpus):
         for label_list_idx, label_list in utterance.label_lists.items():
             if len(self.label_list_ids) == 0 or label_list_idx in self.label_list_ids:
@@ -114,6 +321,16 @@ class MatchingLabelFilter(FilterCriterion):
 
         return True
 
+    def matching_utterance_ids(self, corpus):
+        label_list_ids = self.label_list_ids if len(self.label_list_ids) > 0 else None
+        rejected = set()
+
+        for value in corpus.all_label_values(label_list_ids=label_list_ids):
+            if value not in self.labels:
+                rejected.update(corpus.utterance_ids_with_label(value, label_list_ids=label_list_ids))
+
+        return corpus.utterances.keys() - rejected
+
     def serialize(self):
         ll_ids = ','.join(sorted(self.label_list_ids))
         labels = ','.join(sorted(self.labels))
@@ -137,6 +354,79 @@ class MatchingLabelFilter(FilterCriterion):
         return 'matching_labels'
 
 
+class CriterionSet(set):
+    """
+    A set of a filter criterion (e.g. :py:attr:`MatchingUtteranceIdxFilter.utterance_idxs`).
+    It behaves like an ordinary set, but every modification is registered at the filter criterion
+    (see :py:attr:`FilterCriterion.version`), so subviews using the criterion are resolved again.
+
+    Args:
+        criterion (FilterCriterion): The filter criterion the set belongs to.
+        items (iterable): The items of the set.
+    """
+
+    __slots__ = ['_criterion']
+
+    def __init__(self, criterion, items=()):
+        super(CriterionSet, self).__init__(items)
+        self._criterion = criterion
+
+    def __reduce_ex__(self, protocol):
+        return CriterionSet, (self._criterion, list(self))
+
+    def __ior__(self, other):
+        self._criterion._register_change()
+        return super(CriterionSet, self).__ior__(other)
+
+    def __iand__(self, other):
+        self._criterion._register_change()
+        return super(CriterionSet, self).__iand__(other)
+
+    def __isub__(self, other):
+        self._criterion._register_change()
+        return super(CriterionSet, self).__isub__(other)
+
+    def __ixor__(self, other):
+        self._criterion._register_change()
+        return super(CriterionSet, self).__ixor__(other)
+
+    def add(self, item):
+        self._criterion._register_change()
+        super(CriterionSet, self).add(item)
+
+    def discard(self, item):
+        self._criterion._register_change()
+        super(CriterionSet, self).discard(item)
+
+    def remove(self, item):
+        self._criterion._register_change()
+        super(CriterionSet, self).remove(item)
+
+    def pop(self):
+        self._criterion._register_change()
+        return super(CriterionSet, self).pop()
+
+    def clear(self):
+        self._criterion._register_change()
+        super(CriterionSet, self).clear()
+
+    def update(self, *others):
+        self._criterion._register_change()
+        super(CriterionSet, self).update(*others)
+
+    def difference_update(self, *others):
+        self._criterion._register_change()
+        super(CriterionSet, self).difference_update(*others)
+
+    def intersection_update(self, *others):
+        self._criterion._register_change()
+        super(CriterionSet, self).intersection_update(*others)
+
+    def symmetric_difference_update(self, other):
+        self._criterion._register_change()
+        super(CriterionSet, self).symmetric_difference_update(other)
+
+
 __filter_criteria = {}
 for cls in FilterCriterion.__subclasses__():
     __filter_criteria[cls.name()] = cls
@@ -169,6 +459,14 @@ class Subview(base.CorpusView):
     The assets the subview contains are defined by filter criteria.
     Only if an utterance passes all filter criteria it is contained in the subview.
 
+    The utterances of the subview (and the files/issuers derived from them) are resolved once and cached,
+    until the underlying corpus changes (see :py:attr:`audiomate.corpus.CorpusView.num_changes`),
+    filter criteria are added/removed or a filter criterion is modified (see :py:attr:`FilterCriterion.version`).
+
+    Subviews of the same corpus can be combined with :py:meth:`intersection` (``&``), :py:meth:`union` (``|``)
+    and :py:meth:`difference` (``-``). The result is a subview of the corpus,
+    that directly selects the utterances resolved at the time of the operation.
+
     Args:
         corpus (CorpusView): The corpus this subview is based on.
         filter_criteria (list, FilterCriterion): List of :py:class:`FilterCriterion`
@@ -182,6 +480,8 @@ class Subview(base.CorpusView):
         >>> subset = subview.Subview(self.corpus, filter_criteria=[filter])
         >>> subset.num_utterances
         2
+        >>> (train & male_speakers).num_utterances
+        7
     """
 
     def __init__(self, corpus, filter_criteria=[]):
@@ -192,48 +492,251 @@ class Subview(base.CorpusView):
         else:
             self.filter_criteria = [filter_criteria]
 
+        self._num_resolutions = 0
+        self._clear_cache()
+
+    def __getstate__(self):
+        # The cached assets are not copied/pickled, they are resolved again when needed
+        state = self.__dict__.copy()
+        state.update(_cache_key=None, _utterances=None, _files=None, _issuers=None, _label_statistics=None)
+        return state
+
     @property
     def name(self):
         return 'subview of {}'.format(self.corpus.name)
 
     @property
-    def files(self):
-        return {utterance.file.idx: utterance.file for utterance in self.utterances.values()}
+    def num_changes(self):
+        # Changes whenever the utterances are resolved again (the corpus or the filter criteria changed)
+        self._resolve()
 
-    @property
-    def utterances(self):
-        filtered_utterances = {}
+        if self._cache_key is not None:
+            return self._num_resolutions
 
-        for utt_idx, utterance in self.corpus.utterances.items():
-            matches = True
+    @property
+    def files(self):
+        self._resolve()
 
-            for criterion in self.filter_criteria:
-                if not criterion.match(utterance, self.corpus):
-                    matches = False
+        if self._files is None:
+            self._files = {utterance.file.idx: utterance.file for utterance in self._utterances.values()}
 
-            if matches:
-                filtered_utterances[utt_idx] = utterance
+        return self._files
 
-        return filtered_utterances
+    @property
+    def utterances(self):
+        self._resolve()
+        return self._utterances
 
     @property
     def issuers(self):
-        issuers = {}
+        self._resolve()
+
+        if self._issuers is None:
+            issuers = {}
+
+            for utterance in self._utterances.values():
+                if utterance.issuer is not None:
+                    issuers[utterance.issuer.idx] = utterance.issuer
 
-        for utterance in self.utterances.values():
-            if utterance.issuer is not None:
-                issuers[utterance.issuer.idx] = utterance.issuer
+            self._issuers = issuers
 
-        return issuers
+        return self._issuers
 
     @property
     def feature_containers(self):
         return self.corpus.feature_containers
 
-    def serialize(self):
+    # The utterances of a subview are a subset of the utterances of the root corpus (in the same order),
+    # hence queries are answered with the indexes of the root corpus, no matter how deep the chain of subviews is.
+
+    def utterance_ids_of_file(self, file_idx):
+        return self._own_utterance_ids(self.root_corpus().utterance_ids_of_file(file_idx))
+
+    def utterance_ids_of_issuer(self, issuer_idx):
+        return self._own_utterance_ids(self.root_corpus().utterance_ids_of_issuer(issuer_idx))
+
+    def utterance_ids_with_label_list(self, label_list_idx):
+        return self._own_utterance_ids(self.root_corpus().utterance_ids_with_label_list(label_list_idx))
+
+    def utterance_ids_with_label(self, value, label_list_ids=None):
+        root = self.root_corpus()
+        return self._own_utterance_ids(root.utterance_ids_with_label(value, label_list_ids=label_list_ids))
+
+    def all_label_values(self, label_list_ids=None):
+        # Resolved with the indexes of the corpus, so no durations (file-access) are needed
+        return {value for value in self.root_corpus().all_label_values(label_list_ids=label_list_ids)
+                if len(self.utterance_ids_with_label(value, label_list_ids=label_list_ids)) > 0}
+
+    def _own_utterance_ids(self, utterance_ids):
+        utterances = self.utterances
+
+        if len(utterance_ids) <= len(utterances):
+            return {utt_idx for utt_idx in utterance_ids if utt_idx in utterances}
+
+        return {utt_idx for utt_idx in utterances.keys() if utt_idx in utterance_ids}
+
+    def _utterances_with_ids(self, utterance_ids):
+        utterances = self.utterances
+
+        if len(utterance_ids) * 4 > len(utterances):
+            return {utt_idx: utterance for utt_idx, utterance in utterances.items() if utt_idx in utterance_ids}
+
+        return self.root_corpus()._utterances_with_ids(self._own_utterance_ids(utterance_ids))
+
+    #
+    #   Set operations
+    #
+
+    def intersection(self, other):
+        """
+        Return a subview with the utterances contained in this and the other subview.
+
+        Args:
+            other (Subview): A subview of the same corpus.
+
+        Returns:
+            Subview: The intersection of both subviews.
+        """
+        return self._combine(other, self.utterances.keys() & other.utterances.keys())
+
+    def union(self, other):
+        """
+        Return a subview with the utterances contained in this or the other subview.
+
+        Args:
+            other (Subview): A subview of the same corpus.
+
+        Returns:
+            Subview: The union of both subviews.
+        """
+        return self._combine(other, self.utterances.keys() | other.utterances.keys())
+
+    def difference(self, other):
+        """
+        Return a subview with the utterances contained in this but not in the other subview.
+
+        Args:
+            other (Subview): A subview of the same corpus.
+
+        Returns:
+            Subview: The difference of both subviews.
+        """
+        return self._combine(other, self.utterances.keys() - other.utterances.keys())
+
+    def __and__(self, other):
+        if not isinstance(other, Subview):
+            return NotImplemented
+
+        return self.intersection(other)
+
+    def __or__(self, other):
+        if not isinstance(other, Subview):
+            return NotImplemented
+
+        return self.union(other)
+
+    def __sub__(self, other):
+        if not isinstance(other, Subview):
+            return NotImplemented
+
+        return self.difference(other)
+
+    def root_corpus(self):
+        """
+        Return the corpus at the end of the chain of subviews.
+        """
+        corpus = self.corpus
+
+        while isinstance(corpus, Subview):
+            corpus = corpus.corpus
+
+        return corpus
+
+    def _combine(self, other, utterance_ids):
+        corpus = self.root_corpus()
+
+        if other.root_corpus() is not corpus:
+            raise ValueError('Only subviews of the same corpus can be combined')
+
+        return Subview(corpus, filter_criteria=[MatchingUtteranceIdxFilter(utterance_idxs=utterance_ids)])
+
+    def label_statistics(self):
+        """
+        Return the label statistics of the utterances of the subview,
+        derived from the (cached) statistics of the corpus.
+        """
+        corpus_statistics = self.corpus.label_statistics()
+        self._resolve()
+
+        if self._label_statistics is None or self._label_statistics[0] is not corpus_statistics:
+            self._label_statistics = (corpus_statistics, corpus_statistics.subset(self._utterances.keys()))
+
+        return self._label_statistics[1]
+
+    def _resolve(self):
+        """
+        Resolve the utterances of the subview, if the cached ones aren't valid anymore.
+        The cache is valid as long as the corpus (see :py:attr:`audiomate.corpus.CorpusView.num_changes`),
+        the list of filter criteria and the filter criteria themselves (see :py:attr:`FilterCriterion.version`)
+        are unchanged.
+        """
+        num_changes = self.corpus.num_changes
+        versions = tuple(criterion.version for criterion in self.filter_criteria)
+        key = None
+
+        if num_changes is not None and None not in versions:
+            key = (id(self.corpus), num_changes, len(self.corpus.utterances), tuple(map(id, self.filter_criteria)),
+                   versions)
+
+        if key is None or key != self._cache_key:
+            self._clear_cache()
+            self._utterances = self._filter_utterances()
+            self._cache_key = key
+            self._num_resolutions += 1
+
+    def _clear_cache(self):
+        self._cache_key = None
+        self._utterances = None
+        self._files = None
+        self._issuers = None
+        self._label_statistics = None
+
+    def _filter_utterances(self):
+        # Criteria that can be resolved with the indexes of the corpus select the candidates,
+        # only the remaining criteria are checked for every candidate.
+        candidates = None
+        remaining_criteria = []
+
+        for criterion in self.filter_criteria:
+            utterance_ids = criterion.matching_utterance_ids(self.corpus)
+
+            if utterance_ids is None:
+                remaining_criteria.append(criterion)
+            elif candidates is None:
+                candidates = utterance_ids
+            else:
+                candidates = candidates & utterance_ids
+
+        if candidates is None:
+            utterances = self.corpus.utterances
+        else:
+            utterances = self.corpus._utterances_with_ids(candidates)
+
+        if len(remaining_criteria) == 0:
+            return dict(utterances)
+
+        return {utt_idx: utterance for utt_idx, utterance in utterances.items()
+                if all(criterion.match(utterance, self.corpus) for criterion in remaining_criteria)}
+
+    def serialize(self, utterance_table=None):
         """
         Return a string representing the subview with all of its filter criteria.
 
+        Args:
+            utterance_table (list): Sorted list of all utterance-ids of the corpus.
+                                    If given, large utterance-id filters are encoded as bitmap
+                                    (see :py:meth:`MatchingUtteranceIdxFilter.serialize`).
+
         Returns:
             str: String with subview definition.
         """
@@ -241,17 +744,24 @@ class Subview(base.CorpusView):
 
         for criterion in self.filter_criteria:
             lines.append(criterion.name())
-            lines.append(criterion.serialize())
+
+            if isinstance(criterion, MatchingUtteranceIdxFilter):
+                lines.append(criterion.serialize(utterance_table=utterance_table))
+            else:
+                lines.append(criterion.serialize())
 
         return '\n'.join(lines)
 
     @classmethod
-    def parse(cls, representation, corpus=None):
+    def parse(cls, representation, corpus=None, utterance_table=None):
         """
         Creates a subview from a string representation (created with ``self.serialize``).
 
         Args:
             representation (str): The representation.
+            corpus (CorpusView): The corpus the subview is based on.
+            utterance_table (list): Sorted list of all utterance-ids of the corpus,
+                                    needed if utterance-ids are encoded as bitmap.
 
         Returns:
             Subview: The created subview.
@@ -267,7 +777,13 @@ class Subview(base.CorpusView):
             if filter_name not in available_filter_criteria():
                 raise UnknownFilterCriteriaException('Unknown filter-criterion {}'.format(filter_name))
 
-            criterion = available_filter_criteria()[filter_name].parse(filter_repr)
+            criterion_cls = available_filter_criteria()[filter_name]
+
+            if criterion_cls is MatchingUtteranceIdxFilter:
+                criterion = criterion_cls.parse(filter_repr, utterance_table=utterance_table)
+            else:
+                criterion = criterion_cls.parse(filter_repr)
+
             criteria.append(criterion)
 
         return cls(corpus, criteria)
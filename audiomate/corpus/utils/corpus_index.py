@@ -0,0 +1,199 @@
+"""
+Module for the inverted indexes of a corpus (utterances by file, issuer, label-list and label-value).
+"""
+
+import collections
+
+import numpy as np
+
+from audiomate.corpus.assets import label_store
+
+
+class CorpusIndex(object):
+    """
+    Inverted indexes mapping files, issuers, label-lists and label-values to the ids of the utterances referring
+    to them. The indexes are used by :py:class:`audiomate.corpus.Corpus` to answer queries like
+    "all utterances of this file" in the size of the result instead of the size of the corpus.
+
+    The file and issuer indexes are updated whenever an utterance is added (:py:meth:`add`) or its file/issuer
+    is reassigned (:py:meth:`reassign`). The label indexes are built in a single pass over all label-lists
+    on first use (:py:meth:`update_labels`), afterwards only the utterances whose labels or label-lists changed
+    (:py:meth:`invalidate_labels`) are indexed again. Label-lists backed by a
+    :py:class:`audiomate.corpus.assets.LabelStore` are indexed with vectorized operations.
+
+    Attributes:
+        num_utterances (int): The number of indexed utterances.
+    """
+
+    def __init__(self):
+        self.num_utterances = 0
+
+        self._positions = {}
+        self._by_file = collections.defaultdict(set)
+        self._by_issuer = collections.defaultdict(set)
+
+        # Label-list ids and (value, label-list idx) pairs indexed per utterance-idx, to remove them again
+        self._label_entries = None
+        self._dirty = set()
+        self._by_label_list = collections.defaultdict(set)
+        self._by_label = collections.defaultdict(lambda: collections.defaultdict(set))
+
+    def add(self, utterance):
+        """
+        Add the given utterance to the file and issuer indexes.
+        """
+        self._positions[utterance.idx] = self.num_utterances
+        self.num_utterances += 1
+
+        self._by_file[utterance.file.idx].add(utterance.idx)
+
+        if utterance.issuer is not None:
+            self._by_issuer[utterance.issuer.idx].add(utterance.idx)
+
+        self._dirty.add(utterance)
+
+    def reassign(self, utterance, file, issuer):
+        """
+        Move the given utterance in the file and issuer indexes from the given previous file and issuer
+        to its current ones.
+        """
+        self._discard(self._by_file, file.idx, utterance.idx)
+        self._by_file[utterance.file.idx].add(utterance.idx)
+
+        if issuer is not None:
+            self._discard(self._by_issuer, issuer.idx, utterance.idx)
+
+        if utterance.issuer is not None:
+            self._by_issuer[utterance.issuer.idx].add(utterance.idx)
+
+    def rebuild(self, utterances):
+        """
+        Discard all indexes and index the given utterances.
+        """
+        self.__init__()
+
+        for utterance in utterances:
+            self.add(utterance)
+
+    def invalidate_labels(self, utterance):
+        """
+        Mark the labels of the given utterance as changed, they are indexed again on the next :py:meth:`update_labels`.
+        """
+        self._dirty.add(utterance)
+
+    def update_labels(self, utterances):
+        """
+        Update the label indexes. On the first call all given utterances are indexed,
+        afterwards only the ones whose labels were invalidated (or that were added) since the last call.
+
+        Args:
+            utterances (iterable): All utterances of the corpus.
+        """
+        if self._label_entries is None:
+            self._label_entries = {}
+            self._dirty = set()
+            self._index_labels(utterances)
+        elif len(self._dirty) > 0:
+            dirty = self._dirty
+            self._dirty = set()
+
+            for utterance in dirty:
+                self._remove_labels(utterance.idx)
+
+            self._index_labels(dirty)
+
+    def _index_labels(self, utterances):
+        stores = collections.defaultdict(list)
+
+        for utterance in utterances:
+            label_list_ids = []
+            pairs = set()
+
+            for label_list_idx, label_list in utterance.label_lists.items():
+                self._by_label_list[label_list_idx].add(utterance.idx)
+                label_list_ids.append(label_list_idx)
+
+                if isinstance(label_list, label_store.LabelListView) and label_list.store is not None:
+                    stores[label_list.store].append((label_list.position, utterance.idx, label_list_idx))
+                    continue
+
+                for value in {label.value for label in label_list}:
+                    self._by_label[value][label_list_idx].add(utterance.idx)
+                    pairs.add((value, label_list_idx))
+
+            self._label_entries[utterance.idx] = (label_list_ids, pairs)
+
+        for store, lists in stores.items():
+            self._add_store_labels(store, lists)
+
+    def _add_store_labels(self, store, lists):
+        positions = np.array([position for position, _, _ in lists], dtype=np.int64)
+        rows = store._selected_rows(positions)
+
+        # Distinct pairs of label-list and value
+        num_values = max(len(store.values), 1)
+        keys = np.unique(store.list_indices[rows].astype(np.int64) * num_values + store.codes[rows])
+        list_positions, codes = np.divmod(keys, num_values)
+
+        by_position = {position: (utt_idx, label_list_idx) for position, utt_idx, label_list_idx in lists}
+
+        for position, code in zip(list_positions.tolist(), codes.tolist()):
+            utt_idx, label_list_idx = by_position[position]
+            value = store.values[code]
+
+            self._by_label[value][label_list_idx].add(utt_idx)
+            self._label_entries[utt_idx][1].add((value, label_list_idx))
+
+    def _remove_labels(self, utt_idx):
+        label_list_ids, pairs = self._label_entries.pop(utt_idx, ((), ()))
+
+        for label_list_idx in label_list_ids:
+            self._discard(self._by_label_list, label_list_idx, utt_idx)
+
+        for value, label_list_idx in pairs:
+            per_list = self._by_label[value]
+            self._discard(per_list, label_list_idx, utt_idx)
+
+            if len(per_list) == 0:
+                del self._by_label[value]
+
+    @staticmethod
+    def _discard(index, key, utt_idx):
+        ids = index.get(key)
+
+        if ids is not None:
+            ids.discard(utt_idx)
+
+            if len(ids) == 0:
+                del index[key]
+
+    def utterance_ids_of_file(self, file_idx):
+        return set(self._by_file.get(file_idx, ()))
+
+    def utterance_ids_of_issuer(self, issuer_idx):
+        return set(self._by_issuer.get(issuer_idx, ()))
+
+    def utterance_ids_with_label_list(self, label_list_idx):
+        return set(self._by_label_list.get(label_list_idx, ()))
+
+    def utterance_ids_with_label(self, value, label_list_ids=None):
+        per_list = self._by_label.get(value, {})
+        utterance_ids = set()
+
+        for label_list_idx, ids in per_list.items():
+            if label_list_ids is None or label_list_idx in label_list_ids:
+                utterance_ids.update(ids)
+
+        return utterance_ids
+
+    def label_values(self, label_list_ids=None):
+        return {value for value, per_list in self._by_label.items()
+                if label_list_ids is None or any(label_list_idx in label_list_ids for label_list_idx in per_list)}
+
+    def sort(self, utterance_ids):
+        """
+        Return the given utterance-ids in the order the utterances were added.
+        Ids of utterances that are not indexed are dropped.
+        """
+        positions = self._positions
+        return sorted((utt_idx for utt_idx in utterance_ids if utt_idx in positions), key=positions.__getitem__)
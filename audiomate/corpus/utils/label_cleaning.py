@@ -22,7 +22,7 @@ def merge_consecutive_labels_with_same_values(label_list, threshold=0.01):
         next_label = sorted_labels[index + 1]
 
         if current_label.value == next_label.value and (next_label.start - current_label.end) < threshold:
-            label_list.labels.remove(next_label)
+            label_list.remove(next_label)
             sorted_labels.remove(next_label)
             current_label.end = next_label.end
         else:
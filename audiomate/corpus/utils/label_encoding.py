@@ -4,9 +4,12 @@ This is for example used when training a classifier and the labels act as target
 Then they can be converted to a numerical representation using Encoders.
 """
 
+import collections
+
+import h5py
 import numpy as np
 
-from audiomate.utils import misc
+from audiomate.corpus.assets import label_store
 
 
 class Encoder(object):
@@ -14,6 +17,9 @@ class Encoder(object):
     An encoder is used to create a numerical vector representation from labels.
     """
 
+    #: Number of utterances encoded at once by :py:meth:`encode_corpus`.
+    BATCH_SIZE = 1000
+
     def encode(self, utterance, label_list_idx='default'):
         """
         Encode the given utterance.
@@ -28,8 +34,223 @@ class Encoder(object):
         """
         pass
 
+    def encode_utterances(self, utterances, label_list_idx='default'):
+        """
+        Encode all the given utterances.
+
+        Args:
+            utterances (list): The utterances to encode.
+            label_list_idx (str): The name of the label-list to use for encoding.
+
+        Returns:
+            list: The encoded labels (np.ndarray) of every utterance in the same order as ``utterances``.
+        """
+        return [self.encode(utterance, label_list_idx=label_list_idx) for utterance in utterances]
+
+    def encode_corpus(self, corpus, output_container, label_list_idx='default'):
+        """
+        Encode all utterances of the given corpus and store the encoded labels in a feature-container.
+        The utterances are encoded in batches of :py:attr:`BATCH_SIZE` utterances.
+
+        Args:
+            corpus (CorpusView): The corpus to encode.
+            output_container (FeatureContainer): The (opened) feature-container to store the encoded labels in,
+                                                 with the utterance-idx as key.
+            label_list_idx (str): The name of the label-list to use for encoding.
+        """
+        output_container._check_is_open()
+        utterances = list(corpus.utterances.values())
+
+        for batch_start in range(0, len(utterances), self.BATCH_SIZE):
+            batch = utterances[batch_start:batch_start + self.BATCH_SIZE]
+
+            for utterance, encoded in zip(batch, self.encode_utterances(batch, label_list_idx=label_list_idx)):
+                output_container.set(utterance.idx, encoded)
+
+
+class FrameEncoder(Encoder):
+    """
+    Base class for encoders creating a representation per frame.
+
+    The labels of all utterances of a batch are collected in flat arrays and the frames covered by every label are
+    computed with array operations, without a loop over the single frames. Label-lists backed by a
+    :py:class:`audiomate.corpus.assets.LabelStore` are read directly from the arrays of the store.
+
+    The number of frames of an utterance is computed from the number of samples, which requires the audio file to be
+    opened. If the durations of the utterances are known in advance, they can be passed with ``durations``.
+    Then the number of samples is computed from the duration and the sampling rate, so no file is opened
+    (unless ``sr`` is ``None``).
 
-class FrameOneHotEncoder(Encoder):
+    Arguments:
+        labels (list, dict): List of labels (str) which should be included in the vector representation.
+                             Alternatively a dictionary with the label as key and the index in the vector as value.
+        frame_settings (FrameSettings): Frame settings to use.
+        sr (int): The sampling rate used, if None it is assumed the native sampling rate from the file is used.
+        durations (dict): Durations in seconds with the utterance-idx as key. (Optional)
+    """
+
+    def __init__(self, labels, frame_settings, sr=None, durations=None):
+        self.labels = labels
+        self.frame_settings = frame_settings
+        self.sr = sr
+        self.durations = durations or {}
+
+        if isinstance(labels, dict):
+            self._label_indices = dict(labels)
+            self._num_labels = max(labels.values()) + 1 if len(labels) > 0 else 0
+        else:
+            # The first occurrence defines the index, like list.index
+            self._label_indices = {label: index for index, label in reversed(list(enumerate(labels)))}
+            self._num_labels = len(labels)
+
+        self._store_columns = {}
+
+    def encode(self, utterance, label_list_idx='default'):
+        return self.encode_utterances([utterance], label_list_idx=label_list_idx)[0]
+
+    def encode_utterances(self, utterances, label_list_idx='default'):
+        num_frames, srs, ends = self._utterance_frames(utterances)
+        frame_offsets = np.concatenate([[0], np.cumsum(num_frames)]).astype(np.int64)
+
+        utt_positions, starts, label_ends, columns = self._collect_labels(utterances, label_list_idx)
+        label_srs = srs[utt_positions]
+
+        # Same as FrameSettings.time_range_to_frame_range (int() truncates towards zero)
+        hop_size = self.frame_settings.hop_size
+        frame_size = self.frame_settings.frame_size
+        start_samples = np.round(label_srs * starts)
+        end_samples = np.round(label_srs * label_ends)
+        start_frames = np.maximum(np.trunc((start_samples - frame_size) / hop_size) + 1, 0).astype(np.int64)
+        end_frames = (np.trunc((end_samples - 1) / hop_size) + 1).astype(np.int64)
+
+        # If label ends at the end of the utterance
+        to_end = label_ends < 0
+        end_frames[to_end] = num_frames[utt_positions[to_end]]
+        label_ends = np.where(to_end, ends[utt_positions], label_ends)
+
+        end_frames = np.minimum(end_frames, num_frames[utt_positions])
+        lengths = np.maximum(end_frames - start_frames, 0)
+
+        # One entry per frame of every label
+        label_indices = np.repeat(np.arange(lengths.size), lengths)
+        frame_indices = start_frames[label_indices] + (np.arange(label_indices.size) -
+                                                       np.repeat(np.cumsum(lengths) - lengths, lengths))
+
+        encoded = self._encode_frames(frame_offsets[-1], frame_offsets[utt_positions[label_indices]] + frame_indices,
+                                      frame_indices, label_indices, columns, starts, label_ends, label_srs)
+
+        return [encoded[frame_offsets[i]:frame_offsets[i + 1]] for i in range(len(utterances))]
+
+    def _encode_frames(self, num_frames, rows, frame_indices, label_indices, columns, starts, ends, srs):
+        """
+        Create the encoded labels of all frames of the batch.
+        The first three arrays contain an entry for every frame of every label, the others an entry for every label.
+
+        Args:
+            num_frames (int): Total number of frames of all utterances.
+            rows (np.ndarray): Index of the frame within the batch.
+            frame_indices (np.ndarray): Index of the frame within its utterance.
+            label_indices (np.ndarray): Index of the label.
+            columns (np.ndarray): Index of the label-value in the vector.
+            starts (np.ndarray): Start of the label in seconds.
+            ends (np.ndarray): End of the label in seconds (the end of the utterance for labels ending with -1).
+            srs (np.ndarray): Sampling rate of the utterance.
+
+        Returns:
+            np.ndarray: The encoded labels with one row per frame.
+        """
+        raise NotImplementedError()
+
+    def _utterance_frames(self, utterances):
+        """
+        Return the number of frames, the sampling rate and the duration (end of the last sample) of every utterance.
+        """
+        srs = np.full(len(utterances), self.sr or 0, dtype=np.float64)
+        durations = np.full(len(utterances), np.nan, dtype=np.float64)
+        num_samples = np.zeros(len(utterances), dtype=np.float64)
+
+        for position, utterance in enumerate(utterances):
+            if self.sr is None:
+                srs[position] = utterance.sampling_rate
+
+            duration = self.durations.get(utterance.idx)
+
+            if duration is None:
+                num_samples[position] = utterance.num_samples(sr=srs[position])
+            else:
+                durations[position] = duration
+
+        # Same as units.seconds_to_sample and FrameSettings.num_frames
+        known = ~np.isnan(durations)
+        num_samples[known] = np.round(srs[known] * durations[known])
+        num_frames = np.ceil(np.maximum(num_samples - self.frame_settings.frame_size, 0) /
+                             self.frame_settings.hop_size).astype(np.int64) + 1
+
+        return num_frames, srs, num_samples / srs
+
+    def _collect_labels(self, utterances, label_list_idx):
+        """
+        Return the position of the utterance, the start, the end and the index of the value
+        of all labels with a value that is encoded.
+        """
+        utt_positions = []
+        starts = []
+        ends = []
+        columns = []
+        views = {}
+
+        for position, utterance in enumerate(utterances):
+            if label_list_idx not in utterance.label_lists:
+                raise ValueError('Utterance {} has no label-list with idx {}'.format(utterance.idx, label_list_idx))
+
+            label_list = utterance.label_lists[label_list_idx]
+
+            if isinstance(label_list, label_store.LabelListView) and label_list.store is not None:
+                views.setdefault(label_list.store, []).append((label_list.position, position))
+                continue
+
+            for label in label_list:
+                column = self._label_indices.get(label.value)
+
+                if column is not None:
+                    utt_positions.append(position)
+                    starts.append(label.start)
+                    ends.append(label.end)
+                    columns.append(column)
+
+        parts = [(np.array(utt_positions, dtype=np.int64), np.array(starts, dtype=np.float64),
+                  np.array(ends, dtype=np.float64), np.array(columns, dtype=np.int64))]
+
+        for store, lists in views.items():
+            parts.append(self._collect_store_labels(store, np.array(lists, dtype=np.int64)))
+
+        return tuple(np.concatenate(part) for part in zip(*parts))
+
+    def _collect_store_labels(self, store, lists):
+        offsets = store._offsets
+        lengths = offsets[lists[:, 0] + 1] - offsets[lists[:, 0]]
+        first_rows = np.repeat(offsets[lists[:, 0]] - (np.cumsum(lengths) - lengths), lengths)
+        rows = first_rows + np.arange(first_rows.size)
+
+        columns = self._columns_of_store(store)[store.codes[rows]]
+        encoded = columns >= 0
+        rows = rows[encoded]
+
+        return (np.repeat(lists[:, 1], lengths)[encoded], store.starts[rows], store.ends[rows],
+                columns[encoded].astype(np.int64))
+
+    def _columns_of_store(self, store):
+        """ Return the index in the vector (-1 if not encoded) for every value code of the store. """
+        columns = self._store_columns.get(store)
+
+        if columns is None or columns.size != len(store.values):
+            columns = np.array([self._label_indices.get(value, -1) for value in store.values], dtype=np.int64)
+            self._store_columns[store] = columns
+
+        return columns
+
+
+class FrameOneHotEncoder(FrameEncoder):
     """
     The FrameOneHotEncoder is used to encode the labels per frame.
     It creates a matrix with dimension num-frames x len(labels).
@@ -37,9 +258,11 @@ class FrameOneHotEncoder(Encoder):
     If the sequence contains a given label within a frame it is set to 1.
 
     Arguments:
-        labels (list): List of labels (str) which should be included in the vector representation.
+        labels (list, dict): List of labels (str) which should be included in the vector representation.
+                             Alternatively a dictionary with the label as key and the index in the vector as value.
         frame_settings (FrameSettings): Frame settings to use.
         sr (int): The sampling rate used, if None it is assumed the native sampling rate from the file is used.
+        durations (dict): Durations in seconds with the utterance-idx as key (see :py:class:`FrameEncoder`).
 
     Example:
         >>> from audiomate.corpus import assets
@@ -67,37 +290,14 @@ class FrameOneHotEncoder(Encoder):
 
     """
 
-    def __init__(self, labels, frame_settings, sr=None):
-        self.labels = labels
-        self.frame_settings = frame_settings
-        self.sr = sr
-
-    def encode(self, utterance, label_list_idx='default'):
-        sr = self.sr or utterance.sampling_rate
-        num_samples = utterance.num_samples(sr=sr)
-        num_frames = self.frame_settings.num_frames(num_samples)
-
-        mat = np.zeros((num_frames, len(self.labels)))
-
-        if label_list_idx not in utterance.label_lists:
-            raise ValueError('Utterance {} has no label-list with idx {}'.format(utterance.idx, label_list_idx))
-
-        label_list = utterance.label_lists[label_list_idx]
-
-        for label in label_list:
-            if label.value in self.labels:
-                start, end = self.frame_settings.time_range_to_frame_range(label.start, label.end, sr)
-
-                # If label ends at the end of the utterance
-                if label.end < 0:
-                    end = num_frames
-
-                mat[start:end, self.labels.index(label.value)] = 1
+    def _encode_frames(self, num_frames, rows, frame_indices, label_indices, columns, starts, ends, srs):
+        mat = np.zeros((num_frames, self._num_labels))
+        mat[rows, columns[label_indices]] = 1
 
         return mat
 
 
-class FrameOrdinalEncoder(Encoder):
+class FrameOrdinalEncoder(FrameEncoder):
     """
     The FrameOrdinalEncoder is used to encode the labels per frame.
     It creates a vector with length num-frames.
@@ -107,9 +307,11 @@ class FrameOrdinalEncoder(Encoder):
     the passed `labels` list acts as a priority.
 
     Arguments:
-        labels (list): List of labels (str) which should be included in the vector representation.
+        labels (list, dict): List of labels (str) which should be included in the vector representation.
+                             Alternatively a dictionary with the label as key and the index in the vector as value.
         frame_settings (FrameSettings): Frame settings to use.
         sr (int): The sampling rate used, if None it is assumed the native sampling rate from the file is used.
+        durations (dict): Durations in seconds with the utterance-idx as key (see :py:class:`FrameEncoder`).
 
     Example:
         >>> from audiomate.corpus import assets
@@ -127,37 +329,276 @@ class FrameOrdinalEncoder(Encoder):
         array([1,1,0,0,0,2,1,1])
     """
 
-    def __init__(self, labels, frame_settings, sr=None):
-        self.labels = labels
-        self.frame_settings = frame_settings
-        self.sr = sr
+    def _encode_frames(self, num_frames, rows, frame_indices, label_indices, columns, starts, ends, srs):
+        # Overlap of the frame (in seconds) with the label
+        srs = srs[label_indices]
+        frame_starts = frame_indices * self.frame_settings.hop_size / srs
+        frame_ends = (frame_indices * self.frame_settings.hop_size + self.frame_settings.frame_size) / srs
+        overlaps = np.minimum(frame_ends, ends[label_indices]) - np.maximum(frame_starts, starts[label_indices])
+        overlaps = np.maximum(overlaps, 0.0)
+
+        mat = np.zeros((num_frames, self._num_labels))
+        mat[rows, columns[label_indices]] = overlaps
+
+        return np.argmax(mat, axis=1)
+
+
+class TokenSequences(object):
+    """
+    Token sequences of many utterances, packed into a single array.
+    The sequence of the utterance at position ``i`` is ``data[offsets[i]:offsets[i + 1]]``.
+    Accessing the sequence of an utterance returns a view into the packed array, hence no data is copied.
+
+    Args:
+        utterance_ids (list): The ids of the utterances.
+        data (numpy.ndarray): The concatenated sequences of all utterances.
+        offsets (numpy.ndarray): The start of the sequence of every utterance in ``data``,
+                                 followed by the total number of tokens.
+        vocabulary (list): The tokens, the index of a token in the list is the number used in the sequences.
+
+    Example:
+        >>> sequences = TokenSequences.load('/path/to/features.tokens')
+        >>> sequences['utt-1']
+        array([12,  4,  9,  0, 27], dtype=int32)
+    """
+
+    def __init__(self, utterance_ids, data, offsets, vocabulary):
+        self.utterance_ids = list(utterance_ids)
+        self.data = np.asarray(data, dtype=np.int32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.vocabulary = list(vocabulary)
+
+        self._positions = {utt_idx: position for position, utt_idx in enumerate(self.utterance_ids)}
+
+    def __len__(self):
+        return len(self.utterance_ids)
+
+    def __contains__(self, utterance_idx):
+        return utterance_idx in self._positions
+
+    def __getitem__(self, utterance_idx):
+        position = self._positions[utterance_idx]
+        return self.data[self.offsets[position]:self.offsets[position + 1]]
+
+    def keys(self):
+        """ Return the ids of all utterances. """
+        return list(self.utterance_ids)
+
+    @property
+    def lengths(self):
+        """ Return the length of the sequence of every utterance (in the order of ``utterance_ids``). """
+        return np.diff(self.offsets)
+
+    def decode(self, utterance_idx, delimiter=''):
+        """
+        Return the tokens of the sequence of the given utterance joined with ``delimiter``.
+        """
+        return delimiter.join(self.vocabulary[code] for code in self[utterance_idx].tolist())
+
+    def save(self, path):
+        """
+        Store the sequences in a HDF5 file at the given path. Any existing file is overwritten.
+        """
+        str_type = h5py.special_dtype(vlen=str)
+
+        with h5py.File(path, 'w') as f:
+            f.create_dataset('data', data=self.data)
+            f.create_dataset('offsets', data=self.offsets)
+            f.create_dataset('utterance-ids', data=np.array(self.utterance_ids, dtype=object), dtype=str_type)
+            f.create_dataset('vocabulary', data=np.array(self.vocabulary, dtype=object), dtype=str_type)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load the sequences stored with :py:meth:`save`. The packed array is read into memory at once.
+        """
+        def strings(dset):
+            return [value.decode('utf-8') if isinstance(value, bytes) else value for value in dset[()].tolist()]
+
+        with h5py.File(path, 'r') as f:
+            return cls(strings(f['utterance-ids']), f['data'][()], f['offsets'][()], strings(f['vocabulary']))
+
+    @staticmethod
+    def path_next_to(container):
+        """
+        Return the path used to store the sequences next to the given feature-container (``<container-path>.tokens``).
+        """
+        return '{}.tokens'.format(container.path)
+
+
+class TokenSequenceEncoder(Encoder):
+    """
+    The TokenSequenceEncoder converts the label-values of a transcription (e.g.
+    :py:data:`audiomate.corpus.LL_WORD_TRANSCRIPT` or :py:data:`audiomate.corpus.LL_PHONE_TRANSCRIPT`)
+    into a sequence of token indices, e.g. as targets for CTC or sequence-to-sequence models.
+
+    The labels of a label-list are ordered by their start and split into tokens:
+
+    * ``char``: Every character is a token. The values of multiple labels are joined with a space.
+    * ``word`` / ``phone``: The values are split at whitespace.
+
+    If no vocabulary is given, it is built while encoding (or with :py:meth:`fit`). All tokens found are sorted,
+    the index of a token in the sorted list is used for encoding.
+
+    The sequences of many utterances are returned as :py:class:`TokenSequences`, which packs all sequences into a
+    single array. :py:meth:`encode_corpus` stores them in a file next to a feature-container.
+
+    Arguments:
+        unit (str): The unit of the tokens (``char``, ``word`` or ``phone``).
+        vocabulary (list): The tokens to use, the index of a token in the list is used for encoding.
+        unknown_token (str): A token of the vocabulary, that is used for tokens not in the vocabulary.
+                             If ``None``, encoding a token not in the vocabulary raises a :py:class:`ValueError`.
+
+    Example:
+        >>> encoder = TokenSequenceEncoder(unit='char')
+        >>> sequences = encoder.encode_corpus(corpus, container, label_list_idx=audiomate.corpus.LL_WORD_TRANSCRIPT)
+        >>> encoder.vocabulary
+        [' ', 'a', 'b', 'c', ...]
+        >>> sequences['utt-1']
+        array([ 8,  5, 12, 12, 15], dtype=int32)
+    """
+
+    UNITS = ('char', 'word', 'phone')
+
+    def __init__(self, unit='char', vocabulary=None, unknown_token=None):
+        if unit not in self.UNITS:
+            raise ValueError('Invalid unit {}, expected one of {}'.format(unit, ', '.join(self.UNITS)))
+
+        if unknown_token is not None and (vocabulary is None or unknown_token not in vocabulary):
+            raise ValueError('The unknown token {} is not part of the vocabulary.'.format(unknown_token))
+
+        self.unit = unit
+        self.unknown_token = unknown_token
+        self.vocabulary = None
+
+        self._token_codes = None
+
+        if vocabulary is not None:
+            self.vocabulary = list(vocabulary)
+            self._token_codes = {token: code for code, token in reversed(list(enumerate(self.vocabulary)))}
+
+    def tokenize(self, label_list):
+        """
+        Return the tokens of the given label-list.
+        """
+        return list(self._tokens(label_list))
+
+    def _tokens(self, label_list):
+        """ Return a sequence of the tokens (for characters the string itself). """
+        if len(label_list) == 1:
+            values = [label_list[0].value]
+        else:
+            values = [label.value for label in sorted(label_list)]
+
+        if self.unit == 'char':
+            return ' '.join(values)
+
+        if len(values) == 1:
+            return values[0].split()
+
+        return [token for value in values for token in value.split()]
+
+    def fit(self, corpus, label_list_idx='default'):
+        """
+        Build the vocabulary from all tokens of the given corpus.
+        """
+        tokens = set()
+
+        for utterance in corpus.utterances.values():
+            tokens.update(self._tokens(self._label_list(utterance, label_list_idx)))
+
+        self.vocabulary = sorted(tokens)
+        self._token_codes = {token: code for code, token in enumerate(self.vocabulary)}
 
     def encode(self, utterance, label_list_idx='default'):
-        sr = self.sr or utterance.sampling_rate
-        num_samples = utterance.num_samples(sr=sr)
-        num_frames = self.frame_settings.num_frames(num_samples)
+        """
+        Encode the given utterance.
 
-        mat = np.zeros((num_frames, len(self.labels)))
+        Returns:
+            np.ndarray: The array containing the index of every token.
+        """
+        return self.encode_sequences([utterance], label_list_idx=label_list_idx)[utterance.idx]
 
-        if label_list_idx not in utterance.label_lists:
-            raise ValueError('Utterance {} has no label-list with idx {}'.format(utterance.idx, label_list_idx))
+    def encode_utterances(self, utterances, label_list_idx='default'):
+        sequences = self.encode_sequences(utterances, label_list_idx=label_list_idx)
+        return [sequences.data[sequences.offsets[i]:sequences.offsets[i + 1]] for i in range(len(sequences))]
 
-        label_list = utterance.label_lists[label_list_idx]
+    def encode_sequences(self, utterances, label_list_idx='default'):
+        """
+        Encode all the given utterances in one pass. If the encoder has no vocabulary yet,
+        the vocabulary is built from the tokens of the utterances.
 
-        for label in label_list:
-            if label.value in self.labels:
-                start, end = self.frame_settings.time_range_to_frame_range(label.start, label.end, sr)
+        Args:
+            utterances (list): The utterances to encode.
+            label_list_idx (str): The name of the label-list to use for encoding.
 
-                # If label ends at the end of the utterance
-                if label.end < 0:
-                    end = num_frames
+        Returns:
+            TokenSequences: The packed sequences.
+        """
+        utterance_ids = []
+        lengths = []
+        codes = []
+
+        if self._token_codes is None:
+            # Intern the tokens while encoding, the code of a new token is the number of tokens seen before
+            token_codes = collections.defaultdict()
+            token_codes.default_factory = token_codes.__len__
+            lookup = token_codes.__getitem__
+        else:
+            token_codes = self._token_codes
+            lookup = self._lookup
+
+        for utterance in utterances:
+            tokens = self._tokens(self._label_list(utterance, label_list_idx))
+            codes.extend(map(lookup, tokens))
+            utterance_ids.append(utterance.idx)
+            lengths.append(len(tokens))
+
+        data = np.array(codes, dtype=np.int32)
+
+        if self._token_codes is None:
+            tokens = list(token_codes.keys())
+            order = sorted(range(len(tokens)), key=tokens.__getitem__)
+            ranks = np.empty(len(tokens), dtype=np.int32)
+            ranks[order] = np.arange(len(tokens), dtype=np.int32)
+
+            data = ranks[data]
+            self.vocabulary = [tokens[i] for i in order]
+            self._token_codes = {token: code for code, token in enumerate(self.vocabulary)}
+
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        return TokenSequences(utterance_ids, data, offsets, self.vocabulary)
+
+    def encode_corpus(self, corpus, output_container, label_list_idx='default'):
+        """
+        Encode all utterances of the given corpus in one pass and store the packed sequences next to the given
+        feature-container (see :py:meth:`TokenSequences.path_next_to`).
+        They can be loaded again with :py:meth:`TokenSequences.load`.
 
-                label_index = self.labels.index(label.value)
+        Returns:
+            TokenSequences: The packed sequences.
+        """
+        sequences = self.encode_sequences(list(corpus.utterances.values()), label_list_idx=label_list_idx)
+        sequences.save(TokenSequences.path_next_to(output_container))
 
-                for frame_index in range(start, min(end, num_frames)):
-                    frame_start, frame_end = self.frame_settings.frame_to_seconds(frame_index, sr=sr)
-                    overlap = misc.length_of_overlap(frame_start, frame_end, label.start, label.end)
+        return sequences
 
-                    mat[frame_index, label_index] = overlap
+    def _lookup(self, token):
+        code = self._token_codes.get(token)
 
-        return np.argmax(mat, axis=1)
+        if code is None:
+            if self.unknown_token is None:
+                raise ValueError('The token {} is not part of the vocabulary.'.format(token))
+
+            code = self._token_codes[self.unknown_token]
+
+        return code
+
+    @staticmethod
+    def _label_list(utterance, label_list_idx):
+        if label_list_idx not in utterance.label_lists:
+            raise ValueError('Utterance {} has no label-list with idx {}'.format(utterance.idx, label_list_idx))
+
+        return utterance.label_lists[label_list_idx]
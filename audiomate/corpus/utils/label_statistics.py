@@ -0,0 +1,282 @@
+"""
+Module for computing the label statistics (values, counts, durations) of a corpus.
+"""
+
+import collections
+
+import numpy as np
+
+from audiomate.corpus.assets import label_store
+
+
+class LabelStatistics(object):
+    """
+    Table with the number of occurrences and the total duration of every label-value
+    per utterance and label-list. The table is computed in a single pass over all label-lists
+    (label-lists backed by a :py:class:`audiomate.corpus.assets.LabelStore` are reduced with vectorized operations).
+    The label-values and label-list ids are interned, so every row consists of codes only.
+
+    All statistics of the corpus are reductions over the rows. Hence they can also be computed cheaply for a subset of
+    the utterances (see :py:meth:`subset`), e.g. for a subview.
+
+    Labels ending at the end of the utterance (-1) need the duration of the utterance, which may require to open
+    the audio file. Hence the durations (:py:attr:`durations`) are only computed on first use,
+    the counts and values never access the files.
+
+    Args:
+        utterances (iterable): The utterances to compute the statistics for.
+
+    Attributes:
+        utterance_ids (list): The ids of the utterances, a row refers to an utterance by its position in this list.
+        values (list): The label-values, a row refers to a value by its position in this list.
+        label_list_ids (list): The ids of the label-lists, a row refers to an id by its position in this list.
+    """
+
+    def __init__(self, utterances=()):
+        self.utterance_ids = []
+        self.values = []
+        self.label_list_ids = []
+
+        self._value_codes = {}
+        self._list_codes = {}
+
+        self._utterances = []
+        self._durations = None
+
+        rows = self._rows_of_label_lists(utterances)
+
+        self.utt_positions = np.array(rows[0], dtype=np.int64)
+        self.list_codes = np.array(rows[1], dtype=np.int64)
+        self.value_codes = np.array(rows[2], dtype=np.int64)
+        self.counts = np.array(rows[3], dtype=np.int64)
+
+        # Per row: total duration of the labels with a fixed end, number and summed starts of the labels until
+        # the end of the utterance (their duration is the duration of the utterance minus the start)
+        self._fixed_durations = np.array(rows[4], dtype=np.float64)
+        self._num_to_end = np.array(rows[5], dtype=np.int64)
+        self._to_end_starts = np.array(rows[6], dtype=np.float64)
+
+    @property
+    def durations(self):
+        """
+        Return the total duration of the labels of every row.
+        Computed on first access, the durations of utterances are only needed for labels until their end.
+        """
+        if self._durations is None:
+            durations = self._fixed_durations.copy()
+            to_end = np.flatnonzero(self._num_to_end)
+
+            if to_end.size > 0:
+                positions, inverse = np.unique(self.utt_positions[to_end], return_inverse=True)
+                utt_durations = np.array([self._utterances[p].duration for p in positions.tolist()], dtype=np.float64)
+                durations[to_end] += self._num_to_end[to_end] * utt_durations[inverse.reshape(-1)]
+                durations[to_end] -= self._to_end_starts[to_end]
+
+            self._durations = durations
+
+        return self._durations
+
+    def subset(self, utterance_ids):
+        """
+        Return the statistics restricted to the given utterances.
+
+        Args:
+            utterance_ids (iterable): The ids of the utterances to keep.
+
+        Returns:
+            LabelStatistics: The statistics of the given utterances.
+        """
+        keep = set(utterance_ids)
+        selected = np.array([utt_idx in keep for utt_idx in self.utterance_ids], dtype=bool)
+
+        new_positions = np.cumsum(selected) - 1
+        rows = selected[self.utt_positions] if self.utt_positions.size > 0 else np.zeros(0, dtype=bool)
+
+        stats = LabelStatistics()
+        stats.utterance_ids = [utt_idx for utt_idx, sel in zip(self.utterance_ids, selected) if sel]
+        stats._utterances = [utterance for utterance, sel in zip(self._utterances, selected) if sel]
+        stats.values = self.values
+        stats.label_list_ids = self.label_list_ids
+        stats._value_codes = self._value_codes
+        stats._list_codes = self._list_codes
+        stats.utt_positions = new_positions[self.utt_positions[rows]]
+        stats.list_codes = self.list_codes[rows]
+        stats.value_codes = self.value_codes[rows]
+        stats.counts = self.counts[rows]
+        stats._fixed_durations = self._fixed_durations[rows]
+        stats._num_to_end = self._num_to_end[rows]
+        stats._to_end_starts = self._to_end_starts[rows]
+
+        if self._durations is not None:
+            stats._durations = self._durations[rows]
+
+        return stats
+
+    def label_values(self, label_list_ids=None):
+        """
+        Return a set of all label-values occurring in the label-lists (with an id in ``label_list_ids``).
+        """
+        rows = self._select_rows(label_list_ids)
+        return {self.values[code] for code in np.unique(self.value_codes[rows]).tolist()}
+
+    def label_count(self, label_list_ids=None):
+        """
+        Return a dictionary with the number of occurrences of every label-value in the label-lists
+        (with an id in ``label_list_ids``).
+        """
+        rows = self._select_rows(label_list_ids)
+        counts = np.bincount(self.value_codes[rows], weights=self.counts[rows], minlength=len(self.values))
+        present = np.bincount(self.value_codes[rows], minlength=len(self.values))
+
+        count = collections.defaultdict(int)
+
+        for code in np.flatnonzero(present).tolist():
+            count[self.values[code]] = int(counts[code])
+
+        return count
+
+    def label_durations(self, label_list_ids=None):
+        """
+        Return a dictionary with the total duration of every label-value in the label-lists
+        (with an id in ``label_list_ids``).
+        """
+        rows = self._select_rows(label_list_ids)
+        durations = np.bincount(self.value_codes[rows], weights=self.durations[rows], minlength=len(self.values))
+        present = np.bincount(self.value_codes[rows], minlength=len(self.values))
+
+        duration = collections.defaultdict(int)
+
+        for code in np.flatnonzero(present).tolist():
+            duration[self.values[code]] = float(durations[code])
+
+        return duration
+
+    def label_count_per_utterance(self, label_list_ids=None):
+        """
+        Return a dictionary with a dictionary of the number of occurrences of every label-value (as in
+        :py:meth:`audiomate.corpus.assets.Utterance.label_count`) for every utterance.
+        """
+        return self._per_utterance(self.counts, int, label_list_ids)
+
+    def label_durations_per_utterance(self, label_list_ids=None):
+        """
+        Return a dictionary with a dictionary of the total duration of every label-value (as in
+        :py:meth:`audiomate.corpus.assets.Utterance.label_total_duration`) for every utterance.
+        """
+        return self._per_utterance(self.durations, float, label_list_ids)
+
+    def _per_utterance(self, data, value_type, label_list_ids):
+        rows = self._select_rows(label_list_ids)
+        num_values = max(len(self.values), 1)
+
+        # Sum rows of the same utterance and value (from different label-lists)
+        keys = self.utt_positions[rows] * num_values + self.value_codes[rows]
+        keys, inverse = np.unique(keys, return_inverse=True)
+        sums = np.bincount(inverse.reshape(-1), weights=data[rows], minlength=keys.size)
+
+        result = {utt_idx: collections.defaultdict(value_type) for utt_idx in self.utterance_ids}
+
+        for key, value in zip(keys.tolist(), sums.tolist()):
+            utt_position, code = divmod(key, num_values)
+            result[self.utterance_ids[utt_position]][self.values[code]] = value_type(value)
+
+        return result
+
+    def _select_rows(self, label_list_ids):
+        if label_list_ids is None:
+            return np.arange(self.list_codes.size)
+
+        codes = [self._list_codes[idx] for idx in label_list_ids if idx in self._list_codes]
+        return np.flatnonzero(np.isin(self.list_codes, codes))
+
+    def _code(self, codes, codes_list, key):
+        code = codes.get(key)
+
+        if code is None:
+            code = len(codes_list)
+            codes[key] = code
+            codes_list.append(key)
+
+        return code
+
+    def _rows_of_label_lists(self, utterances):
+        rows = ([], [], [], [], [], [], [])
+        stores = collections.defaultdict(list)
+
+        for utt_position, utterance in enumerate(utterances):
+            self.utterance_ids.append(utterance.idx)
+            self._utterances.append(utterance)
+
+            for label_list in utterance.label_lists.values():
+                list_code = self._code(self._list_codes, self.label_list_ids, label_list.idx)
+
+                if isinstance(label_list, label_store.LabelListView) and label_list.store is not None:
+                    stores[label_list.store].append((label_list.position, utt_position, list_code))
+                    continue
+
+                # Code -> [count, fixed duration, number of labels until the end, their summed starts]
+                sums = collections.OrderedDict()
+
+                for label in label_list:
+                    code = self._code(self._value_codes, self.values, label.value)
+                    row = sums.setdefault(code, [0, 0.0, 0, 0.0])
+                    row[0] += 1
+
+                    if label.end == -1:
+                        row[2] += 1
+                        row[3] += label.start
+                    else:
+                        row[1] += label.end - label.start
+
+                for code, (count, fixed_duration, num_to_end, to_end_starts) in sums.items():
+                    rows[0].append(utt_position)
+                    rows[1].append(list_code)
+                    rows[2].append(code)
+                    rows[3].append(count)
+                    rows[4].append(fixed_duration)
+                    rows[5].append(num_to_end)
+                    rows[6].append(to_end_starts)
+
+        for store, lists in stores.items():
+            self._rows_of_store(store, lists, rows)
+
+        return rows
+
+    def _rows_of_store(self, store, lists, rows):
+        lists = np.array(lists, dtype=np.int64)
+        store_rows = store._selected_rows(lists[:, 0])
+
+        if store_rows.size == 0:
+            return
+
+        # Map the positions in the store to the rows of the label-lists
+        utt_positions = np.zeros(store.num_label_lists, dtype=np.int64)
+        list_codes = np.zeros(store.num_label_lists, dtype=np.int64)
+        utt_positions[lists[:, 0]] = lists[:, 1]
+        list_codes[lists[:, 0]] = lists[:, 2]
+
+        value_codes = np.array([self._code(self._value_codes, self.values, value) for value in store.values],
+                               dtype=np.int64)
+
+        num_values = len(store.values)
+        keys = store.list_indices[store_rows].astype(np.int64) * num_values + store.codes[store_rows]
+        keys, inverse = np.unique(keys, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        starts = store.starts[store_rows]
+        ends = store.ends[store_rows]
+        to_end = ends == -1
+
+        counts = np.bincount(inverse, minlength=keys.size)
+        fixed_durations = np.bincount(inverse, weights=np.where(to_end, 0.0, ends - starts), minlength=keys.size)
+        num_to_end = np.bincount(inverse, weights=to_end, minlength=keys.size).astype(np.int64)
+        to_end_starts = np.bincount(inverse, weights=np.where(to_end, starts, 0.0), minlength=keys.size)
+        positions, codes = np.divmod(keys, num_values)
+
+        rows[0].extend(utt_positions[positions].tolist())
+        rows[1].extend(list_codes[positions].tolist())
+        rows[2].extend(value_codes[codes].tolist())
+        rows[3].extend(counts.tolist())
+        rows[4].extend(fixed_durations.tolist())
+        rows[5].extend(num_to_end.tolist())
+        rows[6].extend(to_end_starts.tolist())
@@ -1,3 +1,5 @@
+import numpy as np
+
 from audiomate.corpus import assets
 from audiomate.utils import textfile
 
@@ -51,21 +53,74 @@ def relabel(label_list, projections):
         >>> [l.value for l in ll]
         ['a', 'a_b', 'a_b_c', 'b_c', 'c']
     """
-    unmapped_combinations = find_missing_projections(label_list, projections)
+    return relabel_label_lists([label_list], projections)[0]
+
+
+def relabel_label_lists(label_lists, projections):
+    """
+    Relabel multiple label-lists at once (see :py:func:`relabel`).
+    The ranges and label combinations of all label-lists are computed together, hence this is much faster
+    than relabeling every label-list on its own.
+
+    Args:
+        label_lists (list): List of :py:class:`~audiomate.corpus.assets.LabelList` to relabel.
+        projections (dict): A dictionary that maps tuples of label combinations to string
+                            labels.
+
+    Returns:
+        list: New label-lists with remapped labels in the same order.
+
+    Raises:
+        UnmappedLabelsException: If a projection for one or more combinations of labels is not defined.
+                                 In this case none of the label-lists is relabeled.
+    """
+    ranges, combinations, combination_ids = _label_combinations(label_lists)
+
+    unmapped_combinations = _missing_projections(combinations, projections)
     if len(unmapped_combinations) > 0:
         raise UnmappedLabelsException('Unmapped combinations: {}'.format(unmapped_combinations))
 
-    new_labels = []
-    for labeled_segment in label_list.ranges():
-        combination = tuple(sorted([label.value for label in labeled_segment[2]]))
-        label_mapping = projections[combination] if combination in projections else projections[WILDCARD_COMBINATION]
+    label_mappings = []
+    for combination in combinations:
+        label_mappings.append(projections[combination] if combination in projections else projections[
+            WILDCARD_COMBINATION])
 
-        if label_mapping == '':
+    new_labels = [[] for _ in label_lists]
+    range_values = [label_mappings[i] for i in combination_ids.tolist()]
+
+    for start, end, group, value in zip(ranges.starts.tolist(), ranges.ends.tolist(), ranges.groups.tolist(),
+                                        range_values):
+        if value == '':
             continue
 
-        new_labels.append(assets.Label(label_mapping, labeled_segment[0], labeled_segment[1]))
+        new_labels[group].append(assets.Label(value, start, end))
 
-    return assets.LabelList(idx=label_list.idx, labels=new_labels)
+    return [assets.LabelList(idx=label_list.idx, labels=labels) for label_list, labels in zip(label_lists, new_labels)]
+
+
+def relabel_corpus(corpus, projections, label_list_idx='default'):
+    """
+    Relabel the label-lists with the given idx of all utterances of the corpus (see :py:func:`relabel`).
+    The label-lists are replaced by the relabeled ones.
+
+    Args:
+        corpus (audiomate.corpus.CorpusView): The corpus to relabel.
+        projections (dict): A dictionary that maps tuples of label combinations to string
+                            labels.
+        label_list_idx (str): The idx of the label-lists to relabel.
+
+    Raises:
+        UnmappedLabelsException: If a projection for one or more combinations of labels is not defined.
+                                 In this case no label-list is changed.
+
+    Example:
+        >>> relabel_corpus(corpus, {('music', 'speech'): 'mixed', ('**',): 'other'}, label_list_idx='default')
+    """
+    utterances = [utt for utt in corpus.utterances.values() if label_list_idx in utt.label_lists]
+    label_lists = [utt.label_lists[label_list_idx] for utt in utterances]
+
+    for utterance, label_list in zip(utterances, relabel_label_lists(label_lists, projections)):
+        utterance.set_label_list(label_list)
 
 
 def find_missing_projections(label_list, projections):
@@ -96,18 +151,78 @@ def find_missing_projections(label_list, projections):
         >>> find_missing_projections(ll, {('b',): 'new_label'})
         [('a', 'b'), ('a', 'b', 'c'), ('a', 'c'), ('c',)]
     """
-    unmapped_combinations = set()
+    if WILDCARD_COMBINATION in projections:
+        return []
+
+    _, combinations, _ = _label_combinations([label_list])
+    return _missing_projections(combinations, projections)
 
+
+def _missing_projections(combinations, projections):
     if WILDCARD_COMBINATION in projections:
         return []
 
-    for labeled_segment in label_list.ranges():
-        combination = tuple(sorted([label.value for label in labeled_segment[2]]))
+    return sorted(combination for combination in combinations if combination not in projections)
+
+
+def _label_combinations(label_lists):
+    """
+    Compute the ranges of all label-lists with :py:func:`~audiomate.corpus.assets.label.sweep_ranges`
+    and the combination of labels (naturally sorted tuple of values) of every range.
 
-        if combination not in projections:
-            unmapped_combinations.add(combination)
+    Returns:
+        tuple: The ranges, the list of distinct combinations and for every range the index of its combination.
+    """
+    starts = []
+    ends = []
+    codes = []
+    groups = []
+    value_codes = {}
 
-    return sorted(unmapped_combinations)
+    for group, label_list in enumerate(label_lists):
+        for label in label_list:
+            starts.append(label.start)
+            ends.append(label.end)
+            codes.append(value_codes.setdefault(label.value, len(value_codes)))
+            groups.append(group)
+
+    ranges = assets.label.sweep_ranges(starts, ends, groups=groups)
+
+    if len(codes) == 0:
+        return ranges, [], np.zeros(0, dtype=np.int64)
+
+    # Renumber the values in natural order, so sorted codes are sorted values
+    value_names = sorted(value_codes.keys())
+    renumbering = np.empty(len(value_names), dtype=np.int64)
+    renumbering[[value_codes[value] for value in value_names]] = np.arange(len(value_names))
+    codes = renumbering[np.array(codes, dtype=np.int64)]
+
+    # One row per range with the sorted codes of its labels (padded with -1), equal rows are equal combinations
+    range_counts = np.diff(ranges.offsets)
+    range_of_entry = np.repeat(np.arange(range_counts.size), range_counts)
+    entry_codes = codes[ranges.label_indices]
+    entry_codes = entry_codes[np.lexsort((entry_codes, range_of_entry))]
+    entry_positions = np.arange(entry_codes.size) - np.repeat(ranges.offsets[:-1], range_counts)
+
+    width = max(int(range_counts.max(initial=0)), 1)
+    rows = np.full((range_counts.size, width), -1, dtype=np.int64)
+    rows[range_of_entry, entry_positions] = entry_codes
+
+    if (len(value_names) + 1) ** width < 2 ** 62:
+        # Pack every row into a single number, which is much faster to compare than the rows
+        keys = np.zeros(range_counts.size, dtype=np.int64)
+
+        for column in range(width):
+            keys = keys * (len(value_names) + 1) + rows[:, column] + 1
+
+        _, first_rows, combination_ids = np.unique(keys, return_index=True, return_inverse=True)
+        distinct_rows = rows[first_rows]
+    else:
+        distinct_rows, combination_ids = np.unique(rows, axis=0, return_inverse=True)
+
+    combinations = [tuple(value_names[code] for code in row if code >= 0) for row in distinct_rows.tolist()]
+
+    return ranges, combinations, combination_ids.reshape(-1)
 
 
 def load_projections(projections_file):
@@ -134,6 +249,9 @@ def load_projections(projections_file):
     Returns:
         dict: Dictionary where the keys are tuples of labels to project to the key's value
 
+    Raises:
+        IOError: If the file doesn't exist.
+
     Example:
         >>> load_projections('/path/to/projections.txt')
         {('b',): 'foo', ('a', 'b'): 'a_b', ('a',): 'bar'}
@@ -52,6 +52,9 @@ def read_label_file(path):
     Returns:
         list: List of labels (start [sec], end [sec], label)
 
+    Raises:
+        IOError: If the file doesn't exist.
+
     Example::
 
         >>> read_label_file('/path/to/label/file.txt')
@@ -35,6 +35,9 @@ def read_file(path):
     Returns:
         (dict): Dictionary with entries.
 
+    Raises:
+        IOError: If the file doesn't exist.
+
     Example::
 
         >>> read_file('/path/to/file.txt')
@@ -1,5 +1,19 @@
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import itertools
+import multiprocessing
 import os
 import shutil
+import tempfile
+
+# Number of threads used to list directories by :py:func:`scan_directories`
+NUM_SCAN_THREADS = 16
+
+# Prefix of the temporary folders created by :py:func:`staged_directory`
+STAGED_PREFIX = '.staged-'
 
 
 def move_all_files_from_subfolders_to_top(folder_path, delete_subfolders=False, copy=False):
@@ -30,3 +44,172 @@ def move_all_files_from_subfolders_to_top(folder_path, delete_subfolders=False,
 
             if delete_subfolders:
                 shutil.rmtree(sub_path)
+
+
+def file_digest(path, block_size=2 ** 20):
+    """
+    Return the digest of the content of the file at the given path (see :py:func:`new_digest`).
+
+    Args:
+        path (str): Path of the file.
+        block_size (int): Number of bytes read at once.
+
+    Returns:
+        str: The digest as hex-string.
+    """
+    digest = new_digest()
+
+    with open(path, 'rb') as f:
+        for block in iter(functools.partial(f.read, block_size), b''):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def new_digest():
+    """
+    Return a new hash object to compute the digest of file contents.
+    The digest is only used to detect changes, not for security.
+    """
+    return hashlib.blake2b(digest_size=16)
+
+
+@contextlib.contextmanager
+def staged_directory(path):
+    """
+    Context manager providing a temporary directory (within ``path``) to write files to.
+    If the block completes, all files are moved from the temporary directory into ``path``, replacing existing files.
+    If the block raises an exception, the written files are discarded and ``path`` is left untouched.
+    If the process is killed, the temporary directory is left behind
+    (see :py:func:`remove_staged_directories`).
+
+    Every file is replaced atomically, so a file in ``path`` is either the old or the new version,
+    but never partially written.
+
+    Args:
+        path (str): Path of the target folder (created if it doesn't exist).
+
+    Example::
+
+        >>> with staged_directory('/path/to/corpus') as tmp_path:
+        >>>     with open(os.path.join(tmp_path, 'files.txt'), 'w') as f:
+        >>>         f.write('...')
+    """
+    os.makedirs(path, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix=STAGED_PREFIX, dir=path)
+
+    try:
+        yield tmp_path
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    for name in os.listdir(tmp_path):
+        os.replace(os.path.join(tmp_path, name), os.path.join(path, name))
+
+    os.rmdir(tmp_path)
+
+
+def remove_staged_directories(path):
+    """
+    Remove the temporary directories of :py:func:`staged_directory` within ``path``,
+    that were left behind by processes killed while writing.
+
+    Args:
+        path (str): Path of the target folder.
+    """
+    if not os.path.isdir(path):
+        return
+
+    for entry in os.scandir(path):
+        if entry.name.startswith(STAGED_PREFIX) and entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def scan_directories(paths, num_threads=NUM_SCAN_THREADS):
+    """
+    List the entries of the given directories, using a pool of threads.
+    Listing a directory mostly waits for the file system (especially on network storage),
+    so listing many directories at once hides the latency.
+
+    Args:
+        paths (list): Paths of the directories.
+        num_threads (int): Number of directories listed at once.
+
+    Returns:
+        list: A list with the entries (:py:class:`os.DirEntry`) of every directory, in the order of ``paths``.
+    """
+    return list(parallel_map(_list_directory, paths, num_workers=num_threads))
+
+
+def _list_directory(path):
+    with os.scandir(path) as it:
+        return list(it)
+
+
+def parallel_map(func, items, num_workers=NUM_SCAN_THREADS, processes=False, chunk_size=1, mp_context=None):
+    """
+    Generate ``func(item)`` for all items, computed by a pool of threads or processes.
+    Threads are suited for functions waiting for I/O (e.g. reading small files),
+    processes for CPU-bound functions (e.g. parsing). With processes the function, the items and
+    the results have to be picklable.
+
+    The results are generated in the order of the items. Only a few items per worker are in progress at once,
+    so the items are consumed lazily and the results don't pile up, if they are consumed slowly.
+    With a single worker the function is called in the current thread.
+
+    Args:
+        func (func): Function with a single argument.
+        items (iterable): The items to apply the function to.
+        num_workers (int): Number of threads/processes.
+        processes (bool): If ``True``, use processes, otherwise threads.
+        chunk_size (int): Number of items passed to a worker at once.
+                          Larger chunks reduce the overhead of passing items to processes.
+        mp_context (str): The multiprocessing start method (``fork``, ``spawn``, ``forkserver``).
+                          If ``None`` the default of the platform is used.
+
+    Example::
+
+        >>> for path, lines in zip(paths, parallel_map(read_lines, paths, num_workers=8)):
+        >>>     print(path, len(lines))
+    """
+    if num_workers < 1 or chunk_size < 1:
+        raise ValueError('At least one worker and one item per chunk are required.')
+
+    if num_workers == 1:
+        yield from map(func, items)
+        return
+
+    if processes:
+        executor = concurrent.futures.ProcessPoolExecutor(num_workers,
+                                                          mp_context=multiprocessing.get_context(mp_context))
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(num_workers)
+
+    items = iter(items)
+    pending = collections.deque()
+
+    def submit_next_chunk():
+        chunk = list(itertools.islice(items, chunk_size))
+
+        if len(chunk) > 0:
+            pending.append(executor.submit(_map_chunk, func, chunk))
+
+    try:
+        for _ in range(2 * num_workers):
+            submit_next_chunk()
+
+        while len(pending) > 0:
+            results = pending.popleft().result()
+            submit_next_chunk()
+
+            yield from results
+    finally:
+        for future in pending:
+            future.cancel()
+
+        executor.shutdown()
+
+
+def _map_chunk(func, chunk):
+    return [func(item) for item in chunk]
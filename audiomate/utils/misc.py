@@ -1,3 +1,7 @@
+import contextlib
+import gc
+
+
 def length_of_overlap(first_start, first_end, second_start, second_end):
     """
     Find the length of the overlapping part of two segments.
@@ -25,3 +29,25 @@ def length_of_overlap(first_start, first_end, second_start, second_end):
             return abs(second_end - first_start)
         else:
             return abs(first_end - first_start)
+
+
+@contextlib.contextmanager
+def paused_garbage_collection():
+    """
+    Context manager, that disables the cyclic garbage collector within the block (if it is enabled).
+    Creating many objects (e.g. when loading a large corpus) repeatedly triggers collections,
+    which have to traverse all objects created so far.
+
+    Example::
+
+        >>> with paused_garbage_collection():
+        >>>     utterances = [assets.Utterance(idx, file) for idx in utterance_ids]
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
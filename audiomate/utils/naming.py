@@ -30,6 +30,61 @@ def index_name_if_in_list(name, name_list, suffix='', prefix=''):
     return new_name
 
 
+class UniqueNames(object):
+    """
+    Finds unique names within a collection of names like :py:func:`index_name_if_in_list`,
+    but remembers the next index to try for every name. Adding many names, that already exist
+    (e.g. when merging corpora with the same ids), takes constant time per name instead of
+    trying all indices already taken.
+
+    The collection may change between calls (the found names are usually added to it).
+    If names are removed, an index may be skipped, the returned name is unique anyway.
+
+    Args:
+        name_list (container): Names that the new names must differ from (e.g. the keys of a dictionary).
+
+    Example::
+
+        >>> files = {'a': ..., 'a_1': ...}
+        >>> names = UniqueNames(files)
+        >>> names.index_name('a')
+        'a_2'
+    """
+
+    def __init__(self, name_list):
+        self.name_list = name_list
+        self.next_index = {}
+
+    def index_name(self, name, suffix='', prefix=''):
+        """
+        Find a unique name by adding an index to the name so it is unique within the collection.
+
+        Parameters:
+            name (str): Name
+            suffix (str): The suffix to append after the index.
+            prefix (str): The prefix to append in front of the index.
+
+        Returns:
+            str: A unique name within the collection.
+        """
+        new_name = '{}'.format(name)
+
+        if new_name not in self.name_list:
+            return new_name
+
+        key = (new_name, suffix, prefix)
+        index = self.next_index.get(key, 1)
+        new_name = '{}_{}{}{}'.format(name, prefix, index, suffix)
+
+        while new_name in self.name_list:
+            index += 1
+            new_name = '{}_{}{}{}'.format(name, prefix, index, suffix)
+
+        self.next_index[key] = index + 1
+
+        return new_name
+
+
 def generate_name(length=15, not_in=None):
     """
     Generates a random string of lowercase letters with the given length.
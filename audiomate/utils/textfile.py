@@ -2,9 +2,19 @@
 The textfile module contains functions for reading and writing textfiles.
 """
 
-import os
+import heapq
+import operator
+import tempfile
 
-from audiomate.utils import text
+import numpy as np
+
+from audiomate.utils import misc
+
+# Number of characters read at once by :py:func:`read_separated_columns`
+BLOCK_SIZE = 2 ** 20
+
+# Number of lines :py:class:`SortedLines` holds in memory
+SORT_BUFFER_SIZE = 100000
 
 
 def read_separated_lines(path, separator=' ', max_columns=-1):
@@ -18,6 +28,9 @@ def read_separated_lines(path, separator=' ', max_columns=-1):
 
     Returns:
         list: A list containing a list for each line read.
+
+    Raises:
+        IOError: If the file doesn't exist.
     """
 
     gen = read_separated_lines_generator(path, separator, max_columns)
@@ -36,6 +49,9 @@ def read_separated_lines_with_first_key(path: str, separator: str = ' ', max_col
 
     Returns:
         dict: Dictionary with list of column values and first column value as key.
+
+    Raises:
+        IOError: If the file doesn't exist.
     """
     gen = read_separated_lines_generator(path, separator, max_columns)
 
@@ -59,18 +75,12 @@ def read_key_value_lines(path, separator=' ', default_value=''):
 
     Returns:
         dict: A dictionary with first column as key and second as value.
-    """
-    gen = read_separated_lines_generator(path, separator, 2)
-
-    dic = {}
 
-    for record in gen:
-        if len(record) > 1:
-            dic[record[0]] = record[1]
-        elif len(record) > 0:
-            dic[record[0]] = default_value
-
-    return dic
+    Raises:
+        IOError: If the file doesn't exist.
+    """
+    keys, values = read_separated_columns(path, 2, separator=separator, fill_values=['', default_value])
+    return dict(zip(keys, values))
 
 
 def write_separated_lines(path, values, separator=' ', sort_by_column=0):
@@ -123,25 +133,199 @@ def read_separated_lines_generator(path, separator=' ', max_columns=-1,
         separator: Separator that is used to split the columns.
         max_columns: Number of max columns (if the separator occurs within the last column).
         ignore_lines_starting_with: Lines starting with a string in this list will be ignored.
-    """
-    if not os.path.isfile(path):
-        print('File doesnt exist or is no file: {}'.format(path))
-        return
-
-    f = open(path, 'r', errors='ignore', encoding='utf-8')
 
+    Raises:
+        IOError: If the file doesn't exist.
+    """
     if max_columns > -1:
         max_splits = max_columns - 1
     else:
         max_splits = -1
 
-    for line in f:
-        stripped_line = line.strip()
-        should_ignore = text.starts_with_prefix_in_list(stripped_line, ignore_lines_starting_with)
+    prefixes = tuple(ignore_lines_starting_with)
+
+    with open(path, 'r', errors='ignore', encoding='utf-8') as f:
+        for line in f:
+            stripped_line = line.strip()
+
+            if stripped_line == '' or (len(prefixes) > 0 and stripped_line.startswith(prefixes)):
+                continue
+
+            record = stripped_line.split(separator, max_splits)
+
+            if len(record) > 1:
+                record = [field.strip() for field in record]
 
-        if not should_ignore and stripped_line != '':
-            record = stripped_line.split(sep=separator, maxsplit=max_splits)
-            record = [field.strip() for field in record]
             yield record
 
-    f.close()
+
+def read_separated_columns(path, num_columns, separator=' ', fill_values=None, float_columns=(),
+                           ignore_lines_starting_with=()):
+    """
+    Reads a text file where each line represents a record with separated columns and returns the columns.
+    In contrast to :py:func:`read_separated_lines_generator`, the file is read in large blocks
+    and the lines are split and stripped with bulk operations, which is much faster for large files.
+
+    Parameters:
+        path (str): Path to the file.
+        num_columns (int): Number of columns. The separator may occur within the last column.
+        separator (str): Separator that is used to split the columns.
+        fill_values (list): Values for the columns missing in a line (one per column).
+                            If ``None``, missing columns are filled with empty strings.
+        float_columns (list): Indices of the columns that are converted to float arrays.
+        ignore_lines_starting_with (list): Lines starting with a string in this list will be ignored.
+
+    Returns:
+        list: A list with one entry per column, either a list of strings or
+        a :py:class:`numpy.ndarray` (``float64``) for columns in ``float_columns``.
+
+    Raises:
+        IOError: If the file doesn't exist.
+        ValueError: If a value of a float column can't be converted.
+
+    Example::
+
+        >>> utt_ids, starts, ends, values = read_separated_columns('labels.txt', 4, float_columns=[1, 2])
+    """
+    if fill_values is None:
+        fill_values = [''] * num_columns
+
+    split = operator.methodcaller('split', separator, num_columns - 1)
+    prefixes = tuple(ignore_lines_starting_with)
+    columns = [[] for _ in range(num_columns)]
+
+    # The lines are split block by block, so only the records of a single block are held in memory
+    with misc.paused_garbage_collection():
+        for lines in _read_line_blocks(path):
+            lines = filter(None, map(str.strip, lines))
+
+            if len(prefixes) > 0:
+                lines = (line for line in lines if not line.startswith(prefixes))
+
+            records = list(map(split, lines))
+
+            if len(records) == 0:
+                continue
+
+            if min(map(len, records)) < num_columns:
+                records = [record + fill_values[len(record):] for record in records]
+
+            for index, values in enumerate(zip(*records)):
+                if index in float_columns:
+                    columns[index].append(np.fromiter(map(float, values), dtype=np.float64, count=len(values)))
+                else:
+                    columns[index].extend(map(str.strip, values))
+
+    for index in float_columns:
+        columns[index] = np.concatenate(columns[index]) if len(columns[index]) > 0 else np.zeros(0, dtype=np.float64)
+
+    return columns
+
+
+def _read_line_blocks(path):
+    """
+    Generate the lines of the file at the given path in lists, reading :py:data:`BLOCK_SIZE` characters at once.
+    """
+    with open(path, 'r', errors='ignore', encoding='utf-8') as f:
+        rest = ''
+
+        while True:
+            block = f.read(BLOCK_SIZE)
+
+            if block == '':
+                break
+
+            lines = (rest + block).split('\n')
+            rest = lines.pop()
+
+            yield lines
+
+        yield [rest]
+
+
+class SortedLines(object):
+    """
+    Collects lines and writes them sorted by a key to a file, without holding all lines in memory.
+    If more than ``buffer_size`` lines are collected, they are sorted and moved to a temporary file.
+    When writing, the sorted temporary files are merged (external merge sort).
+    Lines with the same key keep the order they were added in.
+    The keys must not contain tabs or line breaks, the lines must not contain line breaks.
+
+    Args:
+        buffer_size (int): Maximal number of lines held in memory.
+
+    Example::
+
+        >>> lines = SortedLines()
+        >>> lines.add('utt-2', 'utt-2 spk-1')
+        >>> lines.add('utt-1', 'utt-1 spk-3')
+        >>> lines.write('utt2spk')
+    """
+
+    def __init__(self, buffer_size=SORT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.chunks = []
+        self.num_lines = 0
+
+    def __len__(self):
+        return self.num_lines
+
+    def add(self, key, line):
+        """
+        Add a line (without line break) with the given sort key.
+        """
+        self.buffer.append((key, line))
+        self.num_lines += 1
+
+        if len(self.buffer) >= self.buffer_size:
+            self._write_chunk()
+
+    def write(self, path, header=None):
+        """
+        Write all lines sorted by key to the given path and remove the temporary files.
+
+        Args:
+            path (str): Path of the file to write.
+            header (str): If not ``None``, a line written before all other lines.
+        """
+        self.buffer.sort(key=operator.itemgetter(0))
+        sorted_lines = [map(SortedLines._parse_chunk_line, chunk) for chunk in self.chunks] + [iter(self.buffer)]
+
+        for chunk in self.chunks:
+            chunk.seek(0)
+
+        try:
+            with open(path, 'w', encoding='utf-8', buffering=BLOCK_SIZE) as f:
+                if header is not None:
+                    f.write('{}\n'.format(header))
+
+                for _, line in heapq.merge(*sorted_lines, key=operator.itemgetter(0)):
+                    f.write('{}\n'.format(line))
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Discard all lines and remove the temporary files.
+        """
+        for chunk in self.chunks:
+            chunk.close()
+
+        self.buffer = []
+        self.chunks = []
+        self.num_lines = 0
+
+    def _write_chunk(self):
+        self.buffer.sort(key=operator.itemgetter(0))
+        chunk = tempfile.TemporaryFile(mode='w+', encoding='utf-8')
+
+        for key, line in self.buffer:
+            chunk.write('{}\t{}\n'.format(key, line))
+
+        self.chunks.append(chunk)
+        self.buffer = []
+
+    @staticmethod
+    def _parse_chunk_line(chunk_line):
+        return chunk_line[:-1].split('\t', 1)
@@ -6,6 +6,8 @@ import pytest
 
 from audiomate.corpus import assets
 from audiomate.corpus.assets.features import PartitioningFeatureIterator
+from audiomate.corpus.assets.features import FeatureTargetIterator
+from audiomate.corpus.utils import label_encoding
 from tests import resources
 
 
@@ -460,7 +462,279 @@ class TestPartitioningFeatureIterator(object):
         with pytest.raises(ValueError):
             PartitioningFeatureIterator(file, 1)
 
+    def test_partitioning_skips_empty_ds_within_partition(self, tmpdir):
+        ds1 = np.array([[0.1, 0.1, 0.1, 0.1, 0.1]])
+        ds3 = np.array([[0.3, 0.3, 0.3, 0.3, 0.3]])
+        file_path = os.path.join(tmpdir.strpath, 'features.h5')
+        file = h5py.File(file_path, 'w')
+        file.create_dataset('utt-1', data=ds1)
+        file.create_dataset('utt-2', data=np.array([]))
+        file.create_dataset('utt-3', data=ds3)
+
+        features = tuple(PartitioningFeatureIterator(file, 120, shuffle=False))
+
+        assert 2 == len(features)
+        self.assert_features_equal(('utt-1', 0, [0.1, 0.1, 0.1, 0.1, 0.1]), features[0])
+        self.assert_features_equal(('utt-3', 0, [0.3, 0.3, 0.3, 0.3, 0.3]), features[1])
+
+    @pytest.mark.parametrize('shuffle', [True, False])
+    def test_ranks_emit_disjoint_shares_of_all_features(self, tmpdir, shuffle):
+        file = self.create_sharding_file(tmpdir)
+
+        shares = []
+        for rank in range(3):
+            iterator = PartitioningFeatureIterator(file, 40, shuffle=shuffle, seed=7, rank=rank, world_size=3)
+            shares.append({(f[0], f[1]) for f in iterator})
+
+        assert all(len(share) > 0 for share in shares)
+        assert sum(len(share) for share in shares) == 40
+        assert set.union(*shares) == {('utt-{}'.format(i), j) for i in range(4) for j in range(10)}
+
+    def test_ranks_are_balanced_by_bytes(self, tmpdir):
+        file_path = os.path.join(tmpdir.strpath, 'features.h5')
+        file = h5py.File(file_path, 'w')
+        file.create_dataset('utt-1', data=np.ones((20, 10)))
+        file.create_dataset('utt-2', data=np.ones((40, 1)))
+        file.create_dataset('utt-3', data=np.ones((40, 1)))
+
+        num_bytes = []
+        for rank in range(2):
+            iterator = PartitioningFeatureIterator(file, 160, shuffle=True, seed=3, rank=rank, world_size=2)
+            num_bytes.append(sum(f[2].nbytes for f in iterator))
+
+        assert num_bytes == [1120, 1120]
+
+    def test_rank_reads_only_own_partitions(self, tmpdir):
+        file = self.create_sharding_file(tmpdir)
+
+        all_partitions = PartitioningFeatureIterator(file, 40, shuffle=True, seed=7)._partitions
+        rank_partitions = [PartitioningFeatureIterator(file, 40, shuffle=True, seed=7, rank=rank,
+                                                       world_size=2)._partitions for rank in range(2)]
+
+        assert len(all_partitions) == 8
+        assert len(rank_partitions[0]) == 4
+        assert len(rank_partitions[1]) == 4
+        assert sorted(rank_partitions[0] + rank_partitions[1]) == sorted(all_partitions)
+
+    def test_assignment_depends_on_epoch(self, tmpdir):
+        file = self.create_sharding_file(tmpdir)
+
+        epoch_0 = PartitioningFeatureIterator(file, 40, shuffle=True, seed=7, world_size=2, epoch=0)._partitions
+        epoch_0_again = PartitioningFeatureIterator(file, 40, shuffle=True, seed=7, world_size=2, epoch=0)._partitions
+        epoch_1 = PartitioningFeatureIterator(file, 40, shuffle=True, seed=7, world_size=2, epoch=1)._partitions
+
+        assert epoch_0 == epoch_0_again
+        assert epoch_0 != epoch_1
+
+    def test_sharding_with_shuffle_requires_seed(self, tmpdir):
+        file = self.create_sharding_file(tmpdir)
+
+        with pytest.raises(ValueError):
+            PartitioningFeatureIterator(file, 40, shuffle=True, world_size=2)
+
+    @pytest.mark.parametrize('rank,world_size', [(2, 2), (-1, 2), (0, 0)])
+    def test_invalid_rank_raises_error(self, tmpdir, rank, world_size):
+        file = self.create_sharding_file(tmpdir)
+
+        with pytest.raises(ValueError):
+            PartitioningFeatureIterator(file, 40, shuffle=False, rank=rank, world_size=world_size)
+
+    @pytest.mark.parametrize('num_consumed', [0, 3, 10, 17, 40])
+    def test_resume_from_state_dict_continues_with_same_order(self, tmpdir, num_consumed):
+        file = self.create_sharding_file(tmpdir)
+        expected = [(f[0], f[1]) for f in PartitioningFeatureIterator(file, 56, shuffle=True, seed=5)]
+
+        iterator = PartitioningFeatureIterator(file, 56, shuffle=True, seed=5)
+        consumed = [(f[0], f[1]) for _, f in zip(range(num_consumed), iterator)]
+        state = iterator.state_dict()
+
+        resumed = PartitioningFeatureIterator(file, 56, shuffle=True)
+        resumed.load_state_dict(state)
+        rest = [(f[0], f[1]) for f in resumed]
+
+        assert consumed + rest == expected
+
+    def test_state_dict_contains_current_partition_and_position(self, tmpdir):
+        file = self.create_sharding_file(tmpdir)
+        iterator = PartitioningFeatureIterator(file, 56, shuffle=False)
+
+        for _ in range(9):
+            next(iterator)
+
+        state = iterator.state_dict()
+
+        assert state['partition_idx'] == 1
+        assert state['position'] == 2
+        assert state['data_sets'] == ['utt-0', 'utt-1', 'utt-2', 'utt-3']
+        assert state['partitions'][1] == [['utt-0', 7], ['utt-1', 4]]
+
+    def test_resume_skips_consumed_partitions(self, tmpdir):
+        file = self.create_sharding_file(tmpdir)
+        iterator = PartitioningFeatureIterator(file, 56, shuffle=False)
+
+        for _ in range(9):
+            next(iterator)
+
+        resumed = PartitioningFeatureIterator(file, 56, shuffle=False)
+        resumed.load_state_dict(iterator.state_dict())
+
+        read_slices = []
+        original_read_slice = resumed._read_slice
+
+        def read_slice(dset_name, start_idx, end_idx):
+            read_slices.append((dset_name, start_idx, end_idx))
+            return original_read_slice(dset_name, start_idx, end_idx)
+
+        resumed._read_slice = read_slice
+
+        assert ('utt-0', 9) == next(resumed)[:2]
+        assert read_slices == [('utt-0', 7, 10), ('utt-1', 0, 4)]
+
+    def test_load_state_dict_with_missing_data_set_raises_error(self, tmpdir):
+        file = self.create_sharding_file(tmpdir)
+        state = PartitioningFeatureIterator(file, 56, shuffle=False).state_dict()
+        state['data_sets'].append('utt-99')
+
+        with pytest.raises(ValueError):
+            PartitioningFeatureIterator(file, 56, shuffle=False).load_state_dict(state)
+
+    @staticmethod
+    def create_sharding_file(tmpdir):
+        file_path = os.path.join(tmpdir.strpath, 'features.h5')
+        file = h5py.File(file_path, 'w')
+
+        for i in range(4):
+            file.create_dataset('utt-{}'.format(i), data=np.full((10, 1), i, dtype=np.float64))
+
+        return file
+
     @staticmethod
     def assert_features_equal(expected, actual):
         if expected[0] != actual[0] or expected[1] != actual[1] or not np.allclose(expected[2], actual[2]):
             raise AssertionError('Expected {0} but got {1} instead'.format(expected, actual))
+
+
+@pytest.fixture()
+def feature_target_container(tmpdir):
+    container = assets.FeatureContainer(os.path.join(tmpdir.strpath, 'features.h5'))
+    container.open()
+    container.frame_size = 32000
+    container.hop_size = 16000
+    container.sampling_rate = 16000
+
+    # Every frame contains the number of the utterance and the index of the frame
+    container.set('utt-6', np.array([[6, i] for i in range(14)], dtype=np.float32))
+    container.set('utt-7', np.array([[7, i] for i in range(9)], dtype=np.float32))
+
+    yield container
+    container.close()
+
+
+class TestFeatureTargetIterator(object):
+
+    def test_targets_are_computed_with_container_settings(self, feature_target_container):
+        corpus = resources.create_multi_label_corpus()
+        iterator = FeatureTargetIterator(feature_target_container, corpus, ['music', 'speech', 'noise'], 1024,
+                                         shuffle=False)
+
+        assert sorted(iterator.targets.keys()) == ['utt-6', 'utt-7']
+        assert iterator.targets['utt-6'].shape == (14, 3)
+        assert np.array_equal(iterator.targets['utt-6'][4], [1, 1, 0])
+        assert np.array_equal(iterator.targets['utt-6'][5], [0, 1, 0])
+
+    def test_next_emits_all_frames_in_sequential_order(self, feature_target_container):
+        corpus = resources.create_multi_label_corpus()
+        iterator = FeatureTargetIterator(feature_target_container, corpus, ['music', 'speech', 'noise'], 1024,
+                                         batch_size=5, shuffle=False)
+
+        batches = list(iterator)
+
+        assert [b[0].shape[0] for b in batches] == [5, 5, 5, 5, 3]
+
+        features = np.concatenate([b[0] for b in batches])
+        targets = np.concatenate([b[1] for b in batches])
+
+        assert np.array_equal(features[:14, 1], np.arange(14))
+        assert np.array_equal(features[14:, 1], np.arange(9))
+        assert np.array_equal(targets[:14], iterator.targets['utt-6'])
+        assert np.array_equal(targets[14:], iterator.targets['utt-7'])
+
+    def test_next_emits_aligned_frames_in_random_order(self, feature_target_container):
+        corpus = resources.create_multi_label_corpus()
+        iterator = FeatureTargetIterator(feature_target_container, corpus, ['music', 'speech', 'noise'], 64,
+                                         batch_size=4, shuffle=True, seed=3)
+
+        batches = list(iterator)
+        features = np.concatenate([b[0] for b in batches])
+        targets = np.concatenate([b[1] for b in batches])
+
+        assert features.shape[0] == 23
+        assert len({(int(f[0]), int(f[1])) for f in features}) == 23
+        assert not np.array_equal(features[:14, 1], np.arange(14))
+
+        for feature, target in zip(features, targets):
+            utt_targets = iterator.targets['utt-{}'.format(int(feature[0]))]
+            assert np.array_equal(utt_targets[int(feature[1])], target)
+
+    def test_ordinal_encoder(self, feature_target_container):
+        corpus = resources.create_multi_label_corpus()
+        iterator = FeatureTargetIterator(feature_target_container, corpus, ['music', 'speech', 'noise'], 1024,
+                                         batch_size=100, encoder_cls=label_encoding.FrameOrdinalEncoder,
+                                         shuffle=False, includes=['utt-7'])
+
+        features, targets = next(iterator)
+
+        assert features.shape == (9, 2)
+        assert targets.shape == (9,)
+
+        with pytest.raises(StopIteration):
+            next(iterator)
+
+    def test_frames_without_targets_are_skipped(self, feature_target_container):
+        feature_target_container.set('utt-7', np.array([[7, i] for i in range(12)], dtype=np.float32))
+        corpus = resources.create_multi_label_corpus()
+        iterator = FeatureTargetIterator(feature_target_container, corpus, ['music', 'speech', 'noise'], 1024,
+                                         batch_size=100, shuffle=False, includes=['utt-7'])
+
+        features, targets = next(iterator)
+
+        assert features.shape[0] == 9
+        assert targets.shape[0] == 9
+
+    def test_targets_are_stored_in_and_read_from_target_container(self, feature_target_container, tmpdir):
+        corpus = resources.create_multi_label_corpus()
+        target_container = assets.FeatureContainer(os.path.join(tmpdir.strpath, 'targets.h5'))
+        target_container.open()
+
+        FeatureTargetIterator(feature_target_container, corpus, ['music', 'speech', 'noise'], 1024,
+                              target_container=target_container)
+
+        assert sorted(target_container.keys()) == ['utt-6', 'utt-7']
+
+        target_container.set('utt-6', np.ones((14, 3)))
+        iterator = FeatureTargetIterator(feature_target_container, corpus, ['music', 'speech', 'noise'], 1024,
+                                         target_container=target_container)
+
+        assert np.array_equal(iterator.targets['utt-6'], np.ones((14, 3)))
+        target_container.close()
+
+    def test_resume_from_state_dict(self, feature_target_container):
+        corpus = resources.create_multi_label_corpus()
+        labels = ['music', 'speech', 'noise']
+        expected = np.concatenate([b[0] for b in FeatureTargetIterator(feature_target_container, corpus, labels, 64,
+                                                                       batch_size=3, seed=2)])
+
+        iterator = FeatureTargetIterator(feature_target_container, corpus, labels, 64, batch_size=3, seed=2)
+        consumed = [next(iterator)[0] for _ in range(4)]
+
+        resumed = FeatureTargetIterator(feature_target_container, corpus, labels, 64, batch_size=3)
+        resumed.load_state_dict(iterator.state_dict())
+        rest = [b[0] for b in resumed]
+
+        assert np.array_equal(np.concatenate(consumed + rest), expected)
+
+    def test_batch_size_smaller_than_one_raises_error(self, feature_target_container):
+        corpus = resources.create_multi_label_corpus()
+
+        with pytest.raises(ValueError):
+            FeatureTargetIterator(feature_target_container, corpus, ['music'], 1024, batch_size=0)
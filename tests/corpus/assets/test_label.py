@@ -1,3 +1,4 @@
+import copy
 import unittest
 
 import numpy as np
@@ -200,6 +201,116 @@ class TestLabelList(unittest.TestCase):
         with self.assertRaises(StopIteration):
             next(ranges)
 
+    def test_ranges_with_negative_duration(self):
+        ll = assets.LabelList(labels=[
+            assets.Label('a', 1.0, 3.0),
+            assets.Label('b', 2.0, 1.5)
+        ])
+
+        assert [(r[0], r[1], r[2]) for r in ll.ranges()] == [(1.0, 2.0, [ll[0]]), (2.0, 3.0, [ll[0]])]
+
+    def test_sweep_ranges_with_groups(self):
+        ranges = assets.label.sweep_ranges([1.0, 2.0, 0.0, 5.0], [3.0, -1, 1.0, 6.0], groups=[0, 0, 1, 1],
+                                           with_empty=True)
+
+        assert ranges.starts.tolist() == [1.0, 2.0, 3.0, 0.0, 1.0, 5.0]
+        assert ranges.ends.tolist() == [2.0, 3.0, -1, 1.0, 5.0, 6.0]
+        assert ranges.groups.tolist() == [0, 0, 0, 1, 1, 1]
+        assert ranges.offsets.tolist() == [0, 1, 3, 4, 5, 5, 6]
+        assert ranges.label_indices.tolist() == [0, 0, 1, 1, 2, 3]
+
+    def test_labels_in_range(self):
+        ll = assets.LabelList(labels=[
+            assets.Label('a', 3.2, 4.5),
+            assets.Label('b', 5.1, 8.9),
+            assets.Label('c', 7.2, 10.5),
+            assets.Label('d', 10.5, 14),
+            assets.Label('e', 12.0, -1)
+        ])
+
+        assert ll.labels_in_range(4.0, 7.5) == [ll[0], ll[1], ll[2]]
+        assert ll.labels_in_range(4.5, 5.1) == []
+        assert ll.labels_in_range(13.0) == [ll[3], ll[4]]
+        assert ll.labels_in_range(100.0, 101.0) == [ll[4]]
+
+    def test_labels_at(self):
+        ll = assets.LabelList(labels=[
+            assets.Label('a', 3.2, 4.5),
+            assets.Label('b', 4.5, 8.9),
+            assets.Label('c', 7.2, 10.5)
+        ])
+
+        assert ll.labels_at(4.5) == [ll[1]]
+        assert ll.labels_at(8.0) == [ll[1], ll[2]]
+        assert ll.labels_at(10.5) == []
+
+    def test_labels_in_range_after_modification(self):
+        ll = assets.LabelList(labels=[
+            assets.Label('a', 3.2, 4.5),
+            assets.Label('b', 5.1, 8.9)
+        ])
+
+        assert ll.labels_in_range(4.0, 6.0) == [ll[0], ll[1]]
+
+        ll.append(assets.Label('c', 5.5, 7.0))
+        assert [label.value for label in ll.labels_in_range(4.0, 6.0)] == ['a', 'b', 'c']
+
+        ll.remove(ll[0])
+        assert [label.value for label in ll.labels_in_range(4.0, 6.0)] == ['b', 'c']
+
+        ll[0].start = 6.5
+        assert [label.value for label in ll.labels_in_range(4.0, 6.0)] == ['c']
+
+    def test_labels_in_range_after_editing_labels_directly(self):
+        ll = assets.LabelList(labels=[
+            assets.Label('a', 3.2, 4.5),
+            assets.Label('b', 5.1, 8.9)
+        ])
+
+        assert ll.labels_in_range(4.0, 6.0) == [ll[0], ll[1]]
+
+        ll.labels[0] = assets.Label('c', 9.0, 10.0)
+        assert [label.value for label in ll.labels_in_range(4.0, 6.0)] == ['b']
+
+        ll.labels.append(assets.Label('d', 5.5, 7.0))
+        assert [label.value for label in ll.labels_in_range(4.0, 6.0)] == ['b', 'd']
+
+        ll.labels[2].start = 6.5
+        assert [label.value for label in ll.labels_in_range(4.0, 6.0)] == ['b']
+
+        del ll.labels[1]
+        assert ll.labels_in_range(4.0, 6.0) == []
+
+        ll.labels = [assets.Label('e', 4.5, 5.0)]
+        assert [label.value for label in ll.labels_in_range(4.0, 6.0)] == ['e']
+        assert ll[0].label_list is ll
+
+    def test_labels_in_range_of_deep_copy(self):
+        ll = assets.LabelList(labels=[
+            assets.Label('a', 3.2, 4.5),
+            assets.Label('b', 5.1, 8.9)
+        ])
+        ll.labels_in_range(4.0, 6.0)
+
+        ll_copy = copy.deepcopy(ll)
+        ll_copy.labels[0] = assets.Label('c', 9.0, 10.0)
+
+        assert [label.value for label in ll_copy.labels_in_range(4.0, 6.0)] == ['b']
+        assert [label.value for label in ll.labels_in_range(4.0, 6.0)] == ['a', 'b']
+        assert ll_copy[1].label_list is ll_copy
+
+    def test_labels_in_range_matches_brute_force(self):
+        random_state = np.random.RandomState(7)
+        starts = random_state.uniform(0, 100, size=500)
+        ends = starts + random_state.exponential(2.0, size=500)
+        ll = assets.LabelList(labels=[assets.Label('a', s, e) for s, e in zip(starts, ends)])
+
+        for start in random_state.uniform(0, 100, size=50):
+            end = start + random_state.uniform(0, 5)
+            expected = [label for label in ll if label.start < end and start < label.end]
+
+            assert sorted(map(id, ll.labels_in_range(start, end))) == sorted(map(id, expected))
+
     def test_label_count(self):
         ll = assets.LabelList(labels=[
             assets.Label('a', 3.2, 4.5),
@@ -0,0 +1,142 @@
+import pytest
+
+from audiomate.corpus import assets
+
+from tests import resources
+
+
+@pytest.fixture()
+def store():
+    label_lists = [
+        assets.LabelList(idx='phones', labels=[
+            assets.Label('a', 0.0, 1.0),
+            assets.Label('b', 1.0, 2.5, meta={'stress': 1}),
+            assets.Label('a', 2.5, 3.0)
+        ]),
+        assets.LabelList(idx='phones', labels=[]),
+        assets.LabelList(idx='phones', labels=[
+            assets.Label('c', 0.5, 1.5),
+            assets.Label('a', 1.0, 4.0)
+        ])
+    ]
+
+    return assets.LabelStore.from_label_lists(label_lists)
+
+
+class TestLabelStore(object):
+
+    def test_from_label_lists(self, store):
+        assert store.idx == 'phones'
+        assert store.num_labels == 5
+        assert store.num_label_lists == 3
+        assert store.list_indices.tolist() == [0, 0, 0, 2, 2]
+        assert store.starts.tolist() == [0.0, 1.0, 2.5, 0.5, 1.0]
+        assert store.ends.tolist() == [1.0, 2.5, 3.0, 1.5, 4.0]
+        assert [store.values[code] for code in store.codes] == ['a', 'b', 'a', 'c', 'a']
+        assert store.meta == {1: {'stress': 1}}
+
+    def test_label_count(self, store):
+        assert store.label_count() == {'a': 3, 'b': 1, 'c': 1}
+        assert store.label_count([0]) == {'a': 2, 'b': 1}
+
+    def test_label_values(self, store):
+        assert store.label_values() == {'a', 'b', 'c'}
+        assert store.label_values([1, 2]) == {'a', 'c'}
+
+    def test_label_durations(self, store):
+        durations = store.label_durations([0, 2])
+
+        assert durations['a'] == pytest.approx(4.5)
+        assert durations['b'] == pytest.approx(1.5)
+        assert durations['c'] == pytest.approx(1.0)
+
+    def test_label_durations_until_end_of_utterance(self):
+        corpus = resources.create_single_label_corpus()
+        stores = corpus.compact_labels()
+
+        # utt-3 is 15 seconds long
+        position = corpus.utterances['utt-3'].label_lists['default'].position
+
+        assert stores['default'].label_durations([position]) == {'speech': pytest.approx(15.0)}
+
+    def test_statistics_ignore_detached_label_lists(self, store):
+        store.label_lists()[0].append(assets.Label('d', 3.0, 4.0))
+
+        assert store.label_count() == {'a': 1, 'c': 1}
+
+    def test_copy_shares_arrays_until_changed(self, store):
+        store_copy = store.copy(positions=[0, 2])
+
+        assert store_copy.starts is store.starts
+        assert store_copy.meta is store.meta
+        assert store_copy.label_count() == {'a': 3, 'b': 1, 'c': 1}
+
+        store.label_lists()[0][0].value = 'x'
+        store.label_lists()[2][0].start = 0.0
+
+        assert store_copy.starts is not store.starts
+        assert [label.value for label in store_copy.label_lists()[0]] == ['a', 'b', 'a']
+        assert store_copy.label_lists()[2][0].start == 0.5
+        assert store_copy.label_count() == {'a': 3, 'b': 1, 'c': 1}
+        assert store.label_count() == {'x': 1, 'a': 2, 'b': 1, 'c': 1}
+
+    def test_copy_shares_meta_until_changed(self, store):
+        store_copy = store.copy()
+
+        store_copy.label_lists()[0][1].meta['stress'] = 2
+        store_copy.label_lists()[0][2].value = 'new'
+
+        assert store.meta == {1: {'stress': 1}}
+        assert store_copy.meta == {1: {'stress': 2}}
+        assert 'new' not in store.values
+        assert store.label_values() == {'a', 'b', 'c'}
+
+
+class TestLabelListView(object):
+
+    def test_read_labels(self, store):
+        views = store.label_lists()
+
+        assert store.label_lists() is views
+        assert [len(v) for v in views] == [3, 0, 2]
+        assert [(label.value, label.start, label.end) for label in views[0]] == [
+            ('a', 0.0, 1.0), ('b', 1.0, 2.5), ('a', 2.5, 3.0)
+        ]
+        assert views[2][-1] == assets.Label('a', 1.0, 4.0)
+        assert views[0][1].meta == {'stress': 1}
+        assert views[0][1].label_list is views[0]
+        assert views[0].label_values() == ['a', 'b']
+        assert views[0].label_count() == {'a': 2, 'b': 1}
+
+    def test_ranges_and_queries(self, store):
+        view = store.label_lists()[2]
+
+        assert [(r[0], r[1], [label.value for label in r[2]]) for r in view.ranges()] == [
+            (0.5, 1.0, ['c']), (1.0, 1.5, ['c', 'a']), (1.5, 4.0, ['a'])
+        ]
+        assert [label.value for label in view.labels_at(1.2)] == ['c', 'a']
+
+    def test_changing_a_label_writes_to_store(self, store):
+        view = store.label_lists()[0]
+
+        view[0].value = 'x'
+        view[0].end = 0.5
+        view[2].meta['stress'] = 2
+
+        assert view.store is store
+        assert store.values[store.codes[0]] == 'x'
+        assert store.ends[0] == 0.5
+        assert store.meta[2] == {'stress': 2}
+        assert [label.value for label in view.labels_in_range(0.6, 1.5)] == ['b']
+
+    def test_append_detaches_label_list(self, store):
+        view = store.label_lists()[0]
+
+        view.append(assets.Label('d', 3.0, 4.0))
+
+        assert view.store is None
+        assert not store.is_attached(0)
+        assert [type(label) for label in view] == [assets.Label] * 4
+        assert [label.value for label in view] == ['a', 'b', 'a', 'd']
+        assert view[1].meta == {'stress': 1}
+        assert view.label_count() == {'a': 2, 'b': 1, 'd': 1}
@@ -0,0 +1,87 @@
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from audiomate.corpus.assets import loader
+
+
+@pytest.fixture()
+def feature_file(tmpdir):
+    file_path = os.path.join(tmpdir.strpath, 'features.h5')
+
+    with h5py.File(file_path, 'w') as f:
+        for i in range(5):
+            f.create_dataset('utt-{}'.format(i), data=np.array([[i, j] for j in range(13)], dtype=np.float32))
+
+    return file_path
+
+
+def all_frames(batches):
+    return sorted((int(frame[0]), int(frame[1])) for batch in batches for frame in batch)
+
+
+class TestParallelFeatureLoader(object):
+
+    @pytest.mark.parametrize('num_workers', [1, 3])
+    def test_emits_all_frames(self, feature_file, num_workers):
+        with loader.ParallelFeatureLoader(feature_file, 40, batch_size=4, num_workers=num_workers, seed=1) as ldr:
+            batches = list(ldr)
+
+        assert all(batch.shape[0] <= 4 for batch in batches)
+        assert all(batch.dtype == np.float32 for batch in batches)
+        assert all_frames(batches) == [(i, j) for i in range(5) for j in range(13)]
+
+    def test_emits_frames_in_sequential_order_with_single_worker(self, feature_file):
+        ldr = loader.ParallelFeatureLoader(feature_file, 1024, batch_size=10, num_workers=1, shuffle=False)
+        batches = list(ldr)
+
+        assert [batch.shape for batch in batches] == [(10, 2)] * 6 + [(5, 2)]
+        assert np.array_equal(np.concatenate(batches)[:13, 1], np.arange(13))
+
+    def test_batches_are_independent_of_shared_memory(self, feature_file):
+        ldr = loader.ParallelFeatureLoader(feature_file, 40, batch_size=2, num_workers=2, num_slots=1, seed=4)
+        batches = list(ldr)
+
+        assert all_frames(batches) == [(i, j) for i in range(5) for j in range(13)]
+
+    def test_spawned_workers(self, feature_file):
+        ldr = loader.ParallelFeatureLoader(feature_file, 40, batch_size=8, num_workers=2, seed=2, mp_context='spawn')
+        batches = list(ldr)
+
+        assert all_frames(batches) == [(i, j) for i in range(5) for j in range(13)]
+
+    def test_close_stops_workers(self, feature_file):
+        ldr = loader.ParallelFeatureLoader(feature_file, 16, batch_size=1, num_workers=2, num_slots=1, seed=2)
+        next(iter(ldr))
+        workers = list(ldr._workers)
+
+        ldr.close()
+
+        assert all(not worker.is_alive() for worker in workers)
+
+    def test_worker_error_is_propagated(self, feature_file):
+        ldr = loader.ParallelFeatureLoader(feature_file, 40, batch_size=4, num_workers=2, seed=1)
+        ldr._iterator_args['partition_size'] = 1  # records are larger than the partition
+
+        with pytest.raises(loader.FeatureLoaderException):
+            list(ldr)
+
+        assert len(ldr._workers) == 0
+
+    def test_different_feature_dimensions_raise_error(self, tmpdir):
+        file_path = os.path.join(tmpdir.strpath, 'features.h5')
+
+        with h5py.File(file_path, 'w') as f:
+            f.create_dataset('utt-1', data=np.ones((3, 2)))
+            f.create_dataset('utt-2', data=np.ones((3, 4)))
+
+        with pytest.raises(ValueError):
+            loader.ParallelFeatureLoader(file_path, 1024, batch_size=2)
+
+    def test_empty_file_emits_nothing(self, tmpdir):
+        file_path = os.path.join(tmpdir.strpath, 'features.h5')
+        h5py.File(file_path, 'w').close()
+
+        assert list(loader.ParallelFeatureLoader(file_path, 1024, batch_size=2)) == []
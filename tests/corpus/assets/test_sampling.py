@@ -0,0 +1,146 @@
+import os
+
+import numpy as np
+import pytest
+
+from audiomate.corpus import assets
+from audiomate.corpus.assets import sampling
+from tests import resources
+
+
+def implied_distribution(table):
+    num = len(table)
+    distribution = np.zeros(num)
+    np.add.at(distribution, np.arange(num), table.prob / num)
+    np.add.at(distribution, table.alias, (1.0 - table.prob) / num)
+    return distribution
+
+
+@pytest.fixture()
+def sampling_container(tmpdir):
+    container = assets.FeatureContainer(os.path.join(tmpdir.strpath, 'features.h5'))
+    container.open()
+
+    # Every frame contains the number of the utterance and the index of the frame
+    container.set('utt-1', np.array([[1, i] for i in range(20)], dtype=np.float32))
+    container.set('utt-2', np.array([[2, i] for i in range(20)], dtype=np.float32))
+    container.set('utt-5', np.array([[5, i] for i in range(40)], dtype=np.float32))
+    container.set('utt-8', np.array([[8, i] for i in range(10)], dtype=np.float32))
+
+    yield container
+    container.close()
+
+
+class TestAliasTable(object):
+
+    @pytest.mark.parametrize('weights', [
+        [1, 1, 1, 1],
+        [1, 2, 3, 4],
+        [0, 0, 5, 0],
+        [10, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+        [0.1, 7, 0.2, 9, 0.05, 0, 3, 1e-4],
+    ])
+    def test_table_represents_weights(self, weights):
+        table = sampling.AliasTable(weights)
+
+        expected = np.array(weights, dtype=np.float64) / np.sum(weights)
+
+        assert np.all(table.prob >= 0)
+        assert np.all(table.prob <= 1)
+        assert np.allclose(implied_distribution(table), expected)
+
+    def test_table_with_many_random_weights(self):
+        weights = np.random.RandomState(1).exponential(size=100000) ** 3
+        table = sampling.AliasTable(weights)
+
+        assert np.allclose(implied_distribution(table), weights / weights.sum())
+
+    def test_sample_follows_weights(self):
+        table = sampling.AliasTable([1, 0, 3])
+        samples = table.sample(40000, np.random.RandomState(4))
+
+        assert np.count_nonzero(samples == 1) == 0
+        assert np.count_nonzero(samples == 2) / 40000 == pytest.approx(0.75, abs=0.01)
+
+    @pytest.mark.parametrize('weights', [[], [0, 0], [1, -1], [1, np.inf]])
+    def test_invalid_weights_raise_error(self, weights):
+        with pytest.raises(ValueError):
+            sampling.AliasTable(weights)
+
+
+class TestWeightedFeatureSampler(object):
+
+    def test_sample_frames_with_utterance_weights(self, sampling_container):
+        sampler = sampling.WeightedFeatureSampler(sampling_container, weights={'utt-1': 1, 'utt-5': 3}, seed=2)
+
+        features = sampler.sample(8000)
+
+        assert features.shape == (8000, 2)
+        assert set(np.unique(features[:, 0])) == {1, 5}
+        assert np.count_nonzero(features[:, 0] == 5) / 8000 == pytest.approx(0.75, abs=0.02)
+        assert set(features[features[:, 0] == 1][:, 1].astype(int)) == set(range(20))
+
+    def test_sample_frames_with_frame_weights(self, sampling_container):
+        frame_weights = np.zeros(20)
+        frame_weights[3] = 1
+        frame_weights[7] = 1
+        sampler = sampling.WeightedFeatureSampler(sampling_container, weights={'utt-2': frame_weights}, seed=2)
+
+        utt_ids, frame_indices = sampler.sample_indices(100)
+
+        assert set(utt_ids) == {'utt-2'}
+        assert set(frame_indices) == {3, 7}
+
+    def test_sample_features_match_indices(self, sampling_container):
+        weights = {'utt-1': 1, 'utt-2': 1, 'utt-5': 1, 'utt-8': 1}
+        utt_ids, frame_indices = sampling.WeightedFeatureSampler(sampling_container, weights=weights,
+                                                                 seed=9).sample_indices(50)
+        features = sampling.WeightedFeatureSampler(sampling_container, weights=weights, seed=9).sample(50)
+
+        assert np.array_equal(features[:, 0], [int(utt_idx[4:]) for utt_idx in utt_ids])
+        assert np.array_equal(features[:, 1], frame_indices)
+
+    def test_sample_reads_only_drawn_data_sets(self, sampling_container):
+        sampler = sampling.WeightedFeatureSampler(sampling_container, weights={'utt-8': 1, 'utt-2': 0}, seed=1)
+
+        assert list(sampler._utt_ids) == ['utt-8']
+        assert set(sampler.sample(20)[:, 0]) == {8}
+
+    def test_sample_utterances(self, sampling_container):
+        sampler = sampling.WeightedFeatureSampler(sampling_container, weights={'utt-1': 1, 'utt-8': 1},
+                                                  per_utterance=True, seed=3)
+
+        utterances = sampler.sample(10)
+
+        assert len(utterances) == 10
+        assert {u.shape for u in utterances} == {(20, 2), (10, 2)}
+        assert set(sampler.sample_indices(100)) == {'utt-1', 'utt-8'}
+
+    def test_balance_utterances_on_label_list(self, sampling_container):
+        corpus = resources.create_single_label_corpus()
+        sampler = sampling.WeightedFeatureSampler(sampling_container, corpus=corpus, label_list_idx='default',
+                                                  per_utterance=True, seed=5)
+
+        utt_ids = sampler.sample_indices(20000)
+
+        # 3x music (utt-1, utt-2, utt-8), 1x speech (utt-5)
+        assert np.count_nonzero(utt_ids == 'utt-5') / 20000 == pytest.approx(0.5, abs=0.02)
+        assert np.count_nonzero(utt_ids == 'utt-8') / 20000 == pytest.approx(1 / 6, abs=0.02)
+
+    def test_balance_frames_on_label_list(self, sampling_container):
+        corpus = resources.create_single_label_corpus()
+        sampler = sampling.WeightedFeatureSampler(sampling_container, corpus=corpus, label_list_idx='default', seed=5)
+
+        utt_ids, _ = sampler.sample_indices(20000)
+
+        # 50 music frames (utt-1, utt-2, utt-8), 40 speech frames (utt-5)
+        assert np.count_nonzero(utt_ids == 'utt-5') / 20000 == pytest.approx(0.5, abs=0.02)
+        assert np.count_nonzero(utt_ids == 'utt-8') / 20000 == pytest.approx(0.1, abs=0.02)
+
+    def test_invalid_frame_weights_raise_error(self, sampling_container):
+        with pytest.raises(ValueError):
+            sampling.WeightedFeatureSampler(sampling_container, weights={'utt-1': np.ones(5)})
+
+    def test_missing_weights_raise_error(self, sampling_container):
+        with pytest.raises(ValueError):
+            sampling.WeightedFeatureSampler(sampling_container)
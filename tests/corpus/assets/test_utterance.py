@@ -1,3 +1,4 @@
+import copy
 import unittest
 
 import numpy as np
@@ -125,3 +126,87 @@ class UtteranceTest(unittest.TestCase):
     def test_num_samples_matches_read_samples(self):
         assert self.utt.read_samples().shape[0] == self.utt.num_samples()
         assert self.utt.read_samples(sr=11255).shape[0] == self.utt.num_samples(sr=11255)
+
+    def test_deepcopy_excludes_corpus(self):
+        corpus = resources.create_dataset()
+        utterance = corpus.utterances['utt-1']
+
+        copied = copy.deepcopy(utterance)
+
+        assert copied._corpus is None
+        assert copied.file._corpus is None
+        assert copied.file is not utterance.file
+        assert copied.label_lists['word-transcript'][0].value == 'who am i'
+        assert corpus.num_utterances == 5
+
+    def test_deepcopy_of_corpus_keeps_corpus(self):
+        corpus = resources.create_dataset()
+
+        copied = copy.deepcopy(corpus)
+
+        assert copied.utterances['utt-1']._corpus is copied
+        assert copied.utterances['utt-1'].file._corpus is copied
+
+
+class LabelListDictTest(unittest.TestCase):
+
+    def setUp(self):
+        self.file = assets.File('wav', '/some/path')
+        self.utt_1 = assets.Utterance('utt-1', self.file)
+        self.utt_2 = assets.Utterance('utt-2', self.file)
+        self.loaded = []
+
+        self.pending = assets.PendingLabelLists()
+        self.pending.add('words', self.load_words)
+        self.pending.add('phones', self.load_phones)
+
+        for utt in [self.utt_1, self.utt_2]:
+            utt.label_lists = assets.LabelListDict(self.pending, utt.label_lists)
+
+    def load_words(self):
+        self.loaded.append('words')
+        self.utt_1.set_label_list(assets.LabelList(idx='words', labels=[assets.Label('hi')]))
+        self.utt_2.set_label_list(assets.LabelList(idx='words', labels=[assets.Label('ho')]))
+
+    def load_phones(self):
+        self.loaded.append('phones')
+        self.utt_2.set_label_list(assets.LabelList(idx='phones', labels=[assets.Label('h')]))
+
+    def test_getitem_loads_only_requested_idx(self):
+        assert self.utt_2.label_lists['words'][0].value == 'ho'
+        assert self.utt_1.label_lists['words'][0].value == 'hi'
+        assert self.loaded == ['words']
+
+    def test_contains_loads_requested_idx(self):
+        assert 'phones' not in self.utt_1.label_lists
+        assert 'phones' in self.utt_2.label_lists
+        assert self.loaded == ['phones']
+
+    def test_iterating_loads_all(self):
+        assert set(self.utt_2.label_lists.keys()) == {'words', 'phones'}
+        assert sorted(self.loaded) == ['phones', 'words']
+        assert len(self.utt_1.label_lists) == 1
+
+    def test_set_label_list_keeps_new_label_list(self):
+        ll = assets.LabelList(idx='words', labels=[assets.Label('new')])
+        self.utt_1.set_label_list(ll)
+
+        assert self.utt_1.label_lists['words'] is ll
+        assert self.loaded == ['words']
+
+    def test_pending_loaders_with_same_idx_are_all_called(self):
+        self.pending.add('words', self.load_more_words)
+
+        assert self.utt_1.label_lists['words'][0].value == 'hi'
+        assert self.utt_2.label_lists['words'][0].value == 'hey'
+        assert self.loaded == ['words', 'more words']
+
+    def load_more_words(self):
+        self.loaded.append('more words')
+        self.utt_2.set_label_list(assets.LabelList(idx='words', labels=[assets.Label('hey')]))
+
+    def test_copy_is_ordinary_dict(self):
+        copied = copy.deepcopy(self.utt_2.label_lists)
+
+        assert type(copied) == dict
+        assert set(copied.keys()) == {'words', 'phones'}
@@ -4,6 +4,7 @@ import pytest
 import requests_mock
 
 from audiomate import corpus
+from audiomate.corpus import io
 from audiomate.corpus.io import common_voice
 from audiomate.corpus import assets
 
@@ -147,3 +148,24 @@ class TestCommonVoiceReader:
         assert idx in ds.subviews.keys()
         assert ds.subviews[idx].num_utterances == len(utts)
         assert set(ds.subviews[idx].utterances.keys()) == set(utts)
+
+    def test_stream(self, reader, data_path):
+        records = list(reader.stream(data_path))
+
+        assert len(records) == 7
+
+        utterance, subview_ids = records[0]
+        assert subview_ids[0] in ['cv-valid-dev', 'cv-valid-train']
+        assert utterance.idx.startswith(subview_ids[0])
+        assert utterance.issuer.idx == utterance.idx
+        assert utterance.file.path == os.path.join(data_path, subview_ids[0], '{}.mp3'.format(
+            utterance.idx[len(subview_ids[0]) + 1:]))
+
+    def test_convert_to_kaldi(self, reader, data_path, tmpdir):
+        io.convert(data_path, tmpdir.strpath, reader, 'kaldi')
+
+        with open(os.path.join(tmpdir.strpath, 'text')) as f:
+            lines = f.read().splitlines()
+
+        assert len(lines) == 7
+        assert lines[0] == 'cv-valid-dev-sample-000000 be careful with your prognostications said the stranger'
@@ -4,8 +4,10 @@ import tempfile
 
 import pytest
 
+import audiomate
 from audiomate.corpus import io
 from audiomate.corpus import assets
+from audiomate.corpus.subset import subview
 from audiomate.utils import jsonfile
 from tests import resources
 
@@ -117,6 +119,54 @@ class TestDefaultReader:
         assert utt_4.label_lists['text'].labels[2].start == 3.5
         assert utt_4.label_lists['text'].labels[2].end == 4.2
 
+    def test_load_lazy_label_lists(self, reader, sample_corpus_path, monkeypatch):
+        loaded_files = []
+        read_label_file = io.DefaultReader.read_label_file
+
+        def record_label_file(label_file, key, corpus):
+            loaded_files.append(key)
+            read_label_file(label_file, key, corpus)
+
+        monkeypatch.setattr(io.DefaultReader, 'read_label_file', record_label_file)
+
+        ds = reader.load(sample_corpus_path, lazy=True)
+
+        assert ds.num_utterances == 5
+        assert loaded_files == []
+
+        assert ds.utterances['utt-4'].label_lists['text'][1].value == 'are'
+        assert loaded_files == ['text']
+        assert ds.utterances['utt-1'].label_lists['text'][0].value == 'who'
+        assert loaded_files == ['text']
+
+        assert set(ds.utterances['utt-3'].label_lists.keys()) == {'text', 'raw_text'}
+        assert sorted(loaded_files) == ['raw_text', 'text']
+
+    def test_load_lazy_equals_load(self, reader, sample_corpus_path):
+        lazy = reader.load(sample_corpus_path, lazy=True)
+        eager = reader.load(sample_corpus_path)
+
+        assert lazy.label_count() == eager.label_count()
+        assert lazy.utterances['utt-2'].label_lists['text'][0].meta == \
+            eager.utterances['utt-2'].label_lists['text'][0].meta
+
+    def test_load_lazy_subviews(self, reader, sample_corpus_path, monkeypatch):
+        loaded = []
+        read_subviews = io.DefaultReader.read_subviews
+
+        def record_subviews(path, corpus, utterance_ids=None):
+            loaded.append(path)
+            read_subviews(path, corpus, utterance_ids=utterance_ids)
+
+        monkeypatch.setattr(io.DefaultReader, 'read_subviews', record_subviews)
+
+        ds = audiomate.Corpus.load(sample_corpus_path, lazy=True)
+
+        assert loaded == []
+        assert ds.subviews['train'].utterances.keys() == {'utt-1', 'utt-2', 'utt-3'}
+        assert ds.subviews['dev'].num_utterances == 2
+        assert len(loaded) == 1
+
     def test_load_label_meta(self, reader, sample_corpus_path):
         ds = reader.load(sample_corpus_path)
 
@@ -217,6 +267,15 @@ class TestDefaultWriter:
 
         assert data == expected
 
+    def test_save_and_load_artists(self, writer, reader, sample_corpus, tmpdir):
+        sample_corpus.import_issuers(assets.Artist('artist-1', name='Max'))
+
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert type(corpus.issuers['artist-1']) == assets.Artist
+        assert corpus.issuers['artist-1'].name == 'Max'
+
     def test_save_utterances(self, writer, sample_corpus, tmpdir):
         writer.save(sample_corpus, tmpdir.strpath)
 
@@ -265,6 +324,53 @@ class TestDefaultWriter:
         assert sv_train_content.strip() == 'matching_utterance_ids\ninclude,utt-1,utt-2,utt-3'
         assert sv_dev_content.strip() == 'matching_utterance_ids\ninclude,utt-4,utt-5'
 
+    def test_save_and_load_large_subviews(self, writer, reader, tmpdir):
+        corpus = audiomate.Corpus()
+        corpus.new_file('/tmp/a.wav', 'a')
+
+        for index in range(2500):
+            corpus.new_utterance('utt-{}'.format(index), 'a')
+
+        train_ids = {'utt-{}'.format(index) for index in range(0, 2500, 2)}
+        corpus.import_subview('train', subview.Subview(corpus, filter_criteria=[
+            subview.MatchingUtteranceIdxFilter(utterance_idxs=train_ids)
+        ]))
+
+        writer.save(corpus, tmpdir.strpath)
+
+        with open(os.path.join(tmpdir.strpath, 'subview_train.txt'), 'r') as f:
+            assert f.read().startswith('matching_utterance_ids\ninclude-bitmap,2500,')
+
+        loaded = reader.load(tmpdir.strpath)
+
+        assert loaded.subviews['train'].filter_criteria[0].utterance_idxs == train_ids
+        assert loaded.subviews['train'].num_utterances == 1250
+
+    def test_add_utterance_to_lazily_loaded_corpus_with_large_subviews(self, writer, reader, tmpdir):
+        corpus = audiomate.Corpus()
+        corpus.new_file('/tmp/a.wav', 'a')
+
+        for index in range(1500):
+            corpus.new_utterance('utt-{}'.format(index), 'a')
+
+        train_ids = {'utt-{}'.format(index) for index in range(1200)}
+        corpus.import_subview('train', subview.Subview(corpus, filter_criteria=[
+            subview.MatchingUtteranceIdxFilter(utterance_idxs=train_ids)
+        ]))
+
+        writer.save(corpus, tmpdir.strpath)
+
+        loaded = audiomate.Corpus.load(tmpdir.strpath, lazy=True)
+        loaded.new_utterance('utt-new', 'a')
+
+        assert loaded.subviews['train'].filter_criteria[0].utterance_idxs == train_ids
+
+        loaded.save()
+        reloaded = reader.load(tmpdir.strpath)
+
+        assert reloaded.num_utterances == 1501
+        assert reloaded.subviews['train'].filter_criteria[0].utterance_idxs == train_ids
+
     def test_save_utterances_with_no_issuer(self, writer, sample_corpus, tmpdir):
         sample_corpus.utterances['utt-3'].issuer = None
         sample_corpus.utterances['utt-4'].issuer = None
@@ -286,3 +392,220 @@ class TestDefaultWriter:
 
         assert file_content.strip() == 'utt-1 spk-1\n' \
                                        'utt-2 spk-1'
+
+    def test_save_labels_sorted_by_utterance_and_start(self, writer, tmpdir):
+        corpus = audiomate.Corpus()
+        corpus.new_file('/tmp/a.wav', 'a')
+
+        for utt_idx in ['utt-b', 'utt-a']:
+            utterance = corpus.new_utterance(utt_idx, 'a')
+            utterance.set_label_list(assets.LabelList(idx='phones', labels=[
+                assets.Label('y', 0.5, 1.0),
+                assets.Label('x', 0.0, 0.5)
+            ]))
+
+        writer.save(corpus, tmpdir.strpath)
+
+        with open(os.path.join(tmpdir.strpath, 'labels_phones.txt'), 'r') as f:
+            assert f.read() == 'utt-a 0.0 0.5 x\n' \
+                               'utt-a 0.5 1.0 y\n' \
+                               'utt-b 0.0 0.5 x\n' \
+                               'utt-b 0.5 1.0 y\n'
+
+        with open(os.path.join(tmpdir.strpath, 'utterances.txt'), 'r') as f:
+            assert f.read() == 'utt-a a 0 -1\n' \
+                               'utt-b a 0 -1\n'
+
+    def test_save_removes_files_of_removed_label_lists(self, writer, reader, sample_corpus, tmpdir):
+        sample_corpus.utterances['utt-1'].set_label_list(assets.LabelList(idx='phones'))
+        writer.save(sample_corpus, tmpdir.strpath)
+
+        del sample_corpus.utterances['utt-1'].label_lists['phones']
+        sample_corpus.subviews.pop('dev')
+        writer.save(sample_corpus, tmpdir.strpath)
+
+        files = os.listdir(tmpdir.strpath)
+
+        assert 'labels_phones.txt' not in files
+        assert 'subview_dev.txt' not in files
+        assert 'subview_train.txt' in files
+        assert reader.load(tmpdir.strpath).utterance_ids_with_label_list('phones') == set()
+
+    def test_failing_save_keeps_existing_corpus(self, writer, reader, sample_corpus, tmpdir, monkeypatch):
+        writer.save(sample_corpus, tmpdir.strpath)
+        sample_corpus.new_file('/tmp/b.wav', 'new-file')
+
+        def fail(corpus, path):
+            raise RuntimeError()
+
+        monkeypatch.setattr(io.DefaultWriter, 'file_lines', staticmethod(fail))
+
+        with pytest.raises(RuntimeError):
+            writer.save(sample_corpus, tmpdir.strpath)
+
+        assert sorted(os.listdir(tmpdir.strpath)) == ['features.txt', 'files.txt', 'issuers.json',
+                                                      'labels_word-transcript.txt', 'subview_dev.txt',
+                                                      'subview_train.txt', 'utt_issuers.txt', 'utterances.txt']
+        assert 'new-file' not in reader.load(tmpdir.strpath).files
+
+    def test_save_removes_folders_of_interrupted_saves(self, writer, sample_corpus, tmpdir):
+        writer.save(sample_corpus, tmpdir.strpath)
+
+        # Left behind by a process killed while saving
+        os.makedirs(os.path.join(tmpdir.strpath, '.staged-abc'))
+
+        writer.save(sample_corpus, tmpdir.strpath)
+
+        assert not any(name.startswith('.staged-') for name in os.listdir(tmpdir.strpath))
+
+
+class TestDefaultWriterIncremental:
+
+    @staticmethod
+    def saved_corpus(writer, reader, corpus, path):
+        # Numbers are read as floats, so the first save after loading changes the files once
+        writer.save(corpus, path)
+        writer.save(reader.load(path), path)
+
+    @staticmethod
+    def mark_files(path):
+        # Files that aren't rewritten keep the old modification time
+        for file_name in os.listdir(path):
+            os.utime(os.path.join(path, file_name), (1000, 1000))
+
+    @staticmethod
+    def rewritten_files(path):
+        return {file_name for file_name in os.listdir(path)
+                if os.path.getmtime(os.path.join(path, file_name)) != 1000}
+
+    def test_save_unchanged_corpus_writes_nothing(self, writer, reader, sample_corpus, tmpdir):
+        self.saved_corpus(writer, reader, sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+        self.mark_files(tmpdir.strpath)
+
+        writer.save(corpus, tmpdir.strpath)
+        writer.save(corpus, tmpdir.strpath)
+
+        assert self.rewritten_files(tmpdir.strpath) == set()
+
+    def test_save_only_changed_label_list(self, writer, reader, sample_corpus, tmpdir):
+        sample_corpus.utterances['utt-1'].set_label_list(assets.LabelList(idx='phones', labels=[
+            assets.Label('a', 0, 1)
+        ]))
+        writer.save(sample_corpus, tmpdir.strpath)
+        self.mark_files(tmpdir.strpath)
+
+        sample_corpus.utterances['utt-1'].label_lists['phones'][0].value = 'b'
+        writer.save(sample_corpus, tmpdir.strpath)
+
+        assert self.rewritten_files(tmpdir.strpath) == {'labels_phones.txt'}
+        assert reader.load(tmpdir.strpath).utterances['utt-1'].label_lists['phones'][0].value == 'b'
+
+    def test_save_merged_corpus(self, writer, reader, sample_corpus, tmpdir):
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath, lazy=True)
+
+        corpus.merge_corpus(resources.create_dataset())
+        writer.save(corpus, tmpdir.strpath)
+
+        loaded = reader.load(tmpdir.strpath)
+        assert loaded.num_utterances == 10
+        assert loaded.utterances['utt-1_1'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].value == 'who am i'
+        assert loaded.utterances['utt-1'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].value == 'who am i'
+
+    def test_save_changed_utterances(self, writer, reader, sample_corpus, tmpdir):
+        writer.save(sample_corpus, tmpdir.strpath)
+        self.mark_files(tmpdir.strpath)
+
+        sample_corpus.utterances['utt-1'].end = 2.5
+        writer.save(sample_corpus, tmpdir.strpath)
+
+        assert self.rewritten_files(tmpdir.strpath) == {'utterances.txt'}
+        assert reader.load(tmpdir.strpath).utterances['utt-1'].end == 2.5
+
+    def test_save_at_other_path_writes_everything(self, writer, reader, sample_corpus, tmpdir):
+        first_path = os.path.join(tmpdir.strpath, 'first')
+        second_path = os.path.join(tmpdir.strpath, 'second')
+
+        writer.save(sample_corpus, first_path)
+        writer.save(sample_corpus, second_path)
+
+        assert sorted(os.listdir(first_path)) == sorted(os.listdir(second_path))
+
+    def test_save_file_changed_by_others(self, writer, reader, sample_corpus, tmpdir):
+        writer.save(sample_corpus, tmpdir.strpath)
+
+        with open(os.path.join(tmpdir.strpath, 'utterances.txt'), 'w') as f:
+            f.write('utt-1 wav-1 0 -1\n')
+
+        writer.save(sample_corpus, tmpdir.strpath)
+
+        assert reader.load(tmpdir.strpath).num_utterances == 5
+
+    @pytest.mark.parametrize('edit,check', [
+        (lambda c: setattr(c.issuers['speaker-1'], 'gender', assets.Gender.FEMALE),
+         lambda c: c.issuers['speaker-1'].gender == assets.Gender.FEMALE),
+        (lambda c: c.issuers['speaker-3'].info.update(region='be'),
+         lambda c: c.issuers['speaker-3'].info == {'region': 'be'}),
+        (lambda c: setattr(c.files['file-1'], 'path', c.files['file-2'].path),
+         lambda c: c.files['file-1'].path == c.files['file-2'].path),
+        (lambda c: setattr(c.utterances['utt-1'], 'file', c.files['file-2']),
+         lambda c: c.utterances['utt-1'].file.idx == 'file-2'),
+        (lambda c: setattr(c.utterances['utt-1'], 'issuer', c.issuers['speaker-3']),
+         lambda c: c.utterances['utt-1'].issuer.idx == 'speaker-3'),
+        (lambda c: c.utterances['utt-1'].label_lists['text'][0].meta.update(k=99),
+         lambda c: [label.meta for label in c.utterances['utt-1'].label_lists['text']].count({'k': 99}) == 1),
+        (lambda c: c.utterances['utt-1'].label_lists['text'].labels.append(assets.Label('new', 5, 6)),
+         lambda c: 'new' in c.utterances['utt-1'].label_lists['text'].label_values())
+    ])
+    @pytest.mark.parametrize('lazy', [False, True])
+    def test_save_edits_of_loaded_corpus(self, edit, check, lazy, sample_corpus_path, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'corpus')
+        shutil.copytree(sample_corpus_path, path)
+
+        corpus = audiomate.Corpus.load(path, lazy=lazy)
+        corpus.save()
+
+        edit(corpus)
+        corpus.save()
+
+        assert check(audiomate.Corpus.load(path))
+
+    def test_add_label_list_to_lazily_loaded_corpus(self, writer, reader, sample_corpus, tmpdir, monkeypatch):
+        self.saved_corpus(writer, reader, sample_corpus, tmpdir.strpath)
+        self.mark_files(tmpdir.strpath)
+
+        def fail(*args):
+            raise AssertionError('Existing label files must not be parsed')
+
+        monkeypatch.setattr(io.DefaultReader, 'read_label_file', staticmethod(fail))
+        monkeypatch.setattr(io.DefaultReader, 'read_subviews', staticmethod(fail))
+
+        corpus = audiomate.Corpus.load(tmpdir.strpath, lazy=True)
+        corpus.utterances['utt-2'].set_label_list(assets.LabelList(idx='vad', labels=[assets.Label('speech', 0, 1)]))
+        corpus.save()
+
+        assert self.rewritten_files(tmpdir.strpath) == {'labels_vad.txt'}
+
+        monkeypatch.undo()
+        loaded = reader.load(tmpdir.strpath)
+
+        assert loaded.utterance_ids_with_label_list('vad') == {'utt-2'}
+        assert loaded.utterance_ids_with_label_list(audiomate.corpus.LL_WORD_TRANSCRIPT) == {
+            'utt-1', 'utt-2', 'utt-3', 'utt-4', 'utt-5'
+        }
+
+    def test_save_lazily_loaded_label_list_after_access(self, writer, reader, sample_corpus, tmpdir):
+        self.saved_corpus(writer, reader, sample_corpus, tmpdir.strpath)
+        self.mark_files(tmpdir.strpath)
+
+        corpus = audiomate.Corpus.load(tmpdir.strpath, lazy=True)
+        label_list = corpus.utterances['utt-1'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT]
+        corpus.save()
+
+        assert self.rewritten_files(tmpdir.strpath) == set()
+
+        label_list[0].value = 'changed'
+        corpus.save()
+
+        assert self.rewritten_files(tmpdir.strpath) == {'labels_word-transcript.txt'}
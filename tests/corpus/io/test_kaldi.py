@@ -124,3 +124,20 @@ class KaldiWriterTest(unittest.TestCase):
         assert 'wav.scp' in os.listdir(path)
 
         shutil.rmtree(path, ignore_errors=True)
+
+    def test_save_stream_writes_same_files_as_save(self):
+        ds = resources.create_dataset()
+        path = tempfile.mkdtemp()
+        stream_path = tempfile.mkdtemp()
+
+        self.writer.save(ds, path)
+        self.writer.save_stream(io.base.records_of_corpus(ds), stream_path)
+
+        assert sorted(os.listdir(stream_path)) == sorted(os.listdir(path))
+
+        for file_name in os.listdir(path):
+            with open(os.path.join(path, file_name)) as f, open(os.path.join(stream_path, file_name)) as f_stream:
+                assert f_stream.read() == f.read().replace(path, stream_path)
+
+        shutil.rmtree(path, ignore_errors=True)
+        shutil.rmtree(stream_path, ignore_errors=True)
@@ -130,3 +130,19 @@ class TestMozillaDeepSpeechWriter:
         assert len(utts[path]) == 2
         assert utts[path][0] == '83090'
         assert utts[path][1] == ds.utterances['utt-5'].label_lists[corpus.LL_WORD_TRANSCRIPT].labels[0].value
+
+    def test_save_stream_writes_same_files_as_save(self, writer, tmpdir):
+        ds = resources.create_dataset()
+        path = os.path.join(tmpdir.strpath, 'all')
+        stream_path = os.path.join(tmpdir.strpath, 'stream')
+
+        writer.save(ds, path)
+        writer.save_stream(io.base.records_of_corpus(ds), stream_path)
+
+        for file_name in ['all.csv', 'train.csv', 'dev.csv']:
+            records = textfile.read_separated_lines(os.path.join(path, file_name), separator=',')
+            stream_records = textfile.read_separated_lines(os.path.join(stream_path, file_name), separator=',')
+
+            assert [record[0].replace(path, stream_path) for record in records] == \
+                [record[0] for record in stream_records]
+            assert [record[2] for record in records] == [record[2] for record in stream_records]
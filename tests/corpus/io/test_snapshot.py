@@ -0,0 +1,170 @@
+import os
+
+import numpy as np
+import pytest
+
+import audiomate
+from audiomate.corpus import io
+from audiomate.corpus import assets
+from audiomate.corpus.io import snapshot
+from audiomate.corpus.subset import subview
+from tests import resources
+
+
+@pytest.fixture()
+def reader():
+    return io.SnapshotReader()
+
+
+@pytest.fixture()
+def writer():
+    return io.SnapshotWriter()
+
+
+@pytest.fixture()
+def sample_corpus():
+    return resources.create_dataset()
+
+
+def label_tuples(corpus):
+    return {utt.idx: {idx: [(label.value, label.start, label.end, label.meta) for label in ll]
+                      for idx, ll in utt.label_lists.items()}
+            for utt in corpus.utterances.values()}
+
+
+class TestSnapshotReaderWriter:
+
+    def test_save_creates_single_file(self, writer, sample_corpus, tmpdir):
+        writer.save(sample_corpus, tmpdir.strpath)
+
+        assert os.listdir(tmpdir.strpath) == ['corpus.npz']
+
+    def test_load_missing_snapshot_raises_error(self, reader, tmpdir):
+        with pytest.raises(IOError):
+            reader.load(tmpdir.strpath)
+
+    def test_load_files(self, writer, reader, sample_corpus, tmpdir):
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert list(corpus.files.keys()) == list(sample_corpus.files.keys())
+
+        for file_idx, file in sample_corpus.files.items():
+            assert corpus.files[file_idx].path == file.path
+
+    def test_load_issuers(self, writer, reader, sample_corpus, tmpdir):
+        sample_corpus.import_issuers(assets.Artist('artist-1', name='Max', info={'genre': 'rock'}))
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert corpus.num_issuers == 4
+        assert type(corpus.issuers['spk-1']) == assets.Speaker
+        assert corpus.issuers['spk-1'].gender == assets.Gender.MALE
+        assert type(corpus.issuers['spk-3']) == assets.Issuer
+        assert type(corpus.issuers['artist-1']) == assets.Artist
+        assert corpus.issuers['artist-1'].name == 'Max'
+        assert corpus.issuers['artist-1'].info == {'genre': 'rock'}
+
+        assert {utt.idx for utt in corpus.issuers['spk-2'].utterances} == {'utt-3', 'utt-4'}
+
+    def test_load_utterances(self, writer, reader, sample_corpus, tmpdir):
+        sample_corpus.utterances['utt-5'].issuer = None
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert list(corpus.utterances.keys()) == ['utt-1', 'utt-2', 'utt-3', 'utt-4', 'utt-5']
+
+        utt = corpus.utterances['utt-4']
+        assert utt.file is corpus.files['wav_3']
+        assert utt.issuer is corpus.issuers['spk-2']
+        assert utt.start == 1.5
+        assert utt.end == 2.5
+
+        assert corpus.utterances['utt-5'].issuer is None
+
+    def test_load_labels(self, writer, reader, sample_corpus, tmpdir):
+        ll = assets.LabelList(idx='phones', labels=[
+            assets.Label('a', 0.0, 0.3, meta={'stress': True}),
+            assets.Label('b', 0.3, -1)
+        ])
+        sample_corpus.utterances['utt-2'].set_label_list(ll)
+
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert label_tuples(corpus) == label_tuples(sample_corpus)
+        assert isinstance(corpus.utterances['utt-2'].label_lists['phones'], assets.LabelListView)
+        assert corpus.label_count() == sample_corpus.label_count()
+
+    def test_save_labels_of_stores(self, writer, reader, tmpdir):
+        corpus = resources.create_multi_label_corpus()
+        corpus.utterances['utt-3'].label_lists['default'][0].meta['a'] = 1
+        expected = label_tuples(corpus)
+
+        corpus.compact_labels()
+        # Mix of label-lists backed by the store and detached ones
+        corpus.utterances['utt-2'].label_lists['default'].append(assets.Label('noise', 1, 2))
+        expected['utt-2']['default'].append(('noise', 1, 2, {}))
+
+        writer.save(corpus, tmpdir.strpath)
+        loaded = reader.load(tmpdir.strpath)
+
+        assert label_tuples(loaded) == expected
+
+    def test_load_feature_containers(self, writer, reader, sample_corpus, tmpdir):
+        sample_corpus.new_feature_container('fbank', os.path.join(tmpdir.strpath, 'fbank_feats'))
+
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert corpus.feature_containers['fbank'].path == os.path.join(tmpdir.strpath, 'fbank_feats')
+
+    def test_load_subviews(self, writer, reader, sample_corpus, tmpdir):
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert corpus.subviews['train'].corpus is corpus
+        assert corpus.subviews['train'].utterances.keys() == {'utt-1', 'utt-2', 'utt-3'}
+        assert corpus.subviews['dev'].utterances.keys() == {'utt-4', 'utt-5'}
+
+    def test_load_large_subviews(self, writer, reader, tmpdir):
+        corpus = audiomate.Corpus()
+        corpus.new_file('/tmp/a.wav', 'a')
+
+        for index in range(1500):
+            corpus.new_utterance('utt-{}'.format(index), 'a')
+
+        ids = {'utt-{}'.format(index) for index in range(1500)}
+        corpus.import_subview('all', subview.Subview(corpus, subview.MatchingUtteranceIdxFilter(ids)))
+
+        writer.save(corpus, tmpdir.strpath)
+        loaded = reader.load(tmpdir.strpath)
+
+        assert loaded.subviews['all'].num_utterances == 1500
+
+    def test_save_and_load_empty_corpus(self, writer, reader, tmpdir):
+        writer.save(audiomate.Corpus(), tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert corpus.num_files == 0
+        assert corpus.num_utterances == 0
+
+    def test_load_with_corpus_load(self, writer, sample_corpus, tmpdir):
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = audiomate.Corpus.load(tmpdir.strpath, reader='snapshot')
+
+        assert corpus.num_utterances == 5
+
+
+class TestStringTable:
+
+    @pytest.mark.parametrize('strings', [
+        [],
+        [''],
+        ['a', '', 'b c', 'ä\nö'],
+    ])
+    def test_encode_decode(self, strings):
+        table = snapshot.encode_strings(strings)
+
+        assert table.dtype == np.uint8
+        assert snapshot.decode_strings(table) == strings
@@ -1,4 +1,6 @@
 import os
+import shutil
+import tempfile
 import unittest
 
 from audiomate import corpus
@@ -200,3 +202,20 @@ class SpeechCommandsReaderTest(unittest.TestCase):
         assert '0bde966a_nohash_1_bed' in ds.subviews['test'].utterances.keys()
         assert 'd7a58714_nohash_0_marvin' in ds.subviews['test'].utterances.keys()
         assert '0b77ee66_nohash_0_one' in ds.subviews['test'].utterances.keys()
+
+    def test_read_subviews_without_lists(self):
+        tmp_path = tempfile.mkdtemp()
+        ds_path = os.path.join(tmp_path, 'speech_commands')
+
+        try:
+            shutil.copytree(self.ds_path, ds_path)
+            os.remove(os.path.join(ds_path, 'testing_list.txt'))
+            os.remove(os.path.join(ds_path, 'validation_list.txt'))
+
+            ds = self.reader.load(ds_path)
+
+            assert ds.subviews['train'].num_utterances == 13
+            assert ds.subviews['dev'].num_utterances == 0
+            assert ds.subviews['test'].num_utterances == 0
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
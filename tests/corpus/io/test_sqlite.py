@@ -0,0 +1,145 @@
+import os
+
+import pytest
+
+import audiomate
+from audiomate.corpus import io
+from audiomate.corpus import assets
+from audiomate.corpus.subset import subview
+from tests import resources
+
+
+@pytest.fixture()
+def reader():
+    return io.SqliteReader()
+
+
+@pytest.fixture()
+def writer():
+    return io.SqliteWriter()
+
+
+@pytest.fixture()
+def sample_corpus():
+    return resources.create_dataset()
+
+
+def label_tuples(corpus):
+    return {utt.idx: {idx: [(label.value, label.start, label.end, label.meta) for label in ll]
+                      for idx, ll in utt.label_lists.items()}
+            for utt in corpus.utterances.values()}
+
+
+class TestSqliteReaderWriter:
+
+    def test_save_creates_database(self, writer, sample_corpus, tmpdir):
+        writer.save(sample_corpus, tmpdir.strpath)
+
+        assert os.listdir(tmpdir.strpath) == ['corpus.db']
+
+    def test_save_replaces_existing_database(self, writer, reader, sample_corpus, tmpdir):
+        writer.save(sample_corpus, tmpdir.strpath)
+        writer.save(audiomate.Corpus(), tmpdir.strpath)
+
+        assert reader.load(tmpdir.strpath).num_utterances == 0
+
+    def test_load_missing_database_raises_error(self, reader, tmpdir):
+        with pytest.raises(IOError):
+            reader.load(tmpdir.strpath)
+
+    def test_load_returns_sqlite_corpus(self, writer, sample_corpus, tmpdir):
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = audiomate.Corpus.load(tmpdir.strpath, reader='sqlite')
+
+        assert isinstance(corpus, audiomate.corpus.SqliteCorpus)
+        assert corpus.name == os.path.basename(tmpdir.strpath)
+
+    def test_load_files(self, writer, reader, sample_corpus, tmpdir):
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert list(corpus.files.keys()) == list(sample_corpus.files.keys())
+
+        for file_idx, file in sample_corpus.files.items():
+            assert corpus.files[file_idx].path == file.path
+
+    def test_load_issuers(self, writer, reader, sample_corpus, tmpdir):
+        sample_corpus.import_issuers(assets.Artist('artist-1', name='Max', info={'genre': 'rock'}))
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert corpus.num_issuers == 4
+        assert type(corpus.issuers['spk-1']) == assets.Speaker
+        assert corpus.issuers['spk-1'].gender == assets.Gender.MALE
+        assert type(corpus.issuers['spk-3']) == assets.Issuer
+        assert corpus.issuers['artist-1'].name == 'Max'
+        assert corpus.issuers['artist-1'].info == {'genre': 'rock'}
+
+    def test_load_utterances(self, writer, reader, sample_corpus, tmpdir):
+        sample_corpus.utterances['utt-5'].issuer = None
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert list(corpus.utterances.keys()) == ['utt-1', 'utt-2', 'utt-3', 'utt-4', 'utt-5']
+
+        utt = corpus.utterances['utt-4']
+        assert utt.file.idx == 'wav_3'
+        assert utt.issuer.idx == 'spk-2'
+        assert utt.start == 1.5
+        assert utt.end == 2.5
+
+        assert corpus.utterances['utt-5'].issuer is None
+
+    def test_load_labels(self, writer, reader, sample_corpus, tmpdir):
+        sample_corpus.utterances['utt-2'].set_label_list(assets.LabelList(idx='phones', labels=[
+            assets.Label('a', 0.0, 0.3, meta={'stress': True}),
+            assets.Label('b', 0.3, -1)
+        ]))
+        sample_corpus.utterances['utt-3'].set_label_list(assets.LabelList(idx='empty'))
+
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert label_tuples(corpus) == label_tuples(sample_corpus)
+        assert corpus.utterances['utt-2'].label_lists['phones'][0].label_list.utterance.idx == 'utt-2'
+
+    def test_save_labels_of_stores(self, writer, reader, tmpdir):
+        corpus = resources.create_multi_label_corpus()
+        expected = label_tuples(corpus)
+        corpus.compact_labels()
+
+        writer.save(corpus, tmpdir.strpath)
+        loaded = reader.load(tmpdir.strpath)
+
+        assert label_tuples(loaded) == expected
+
+    def test_load_feature_containers(self, writer, reader, sample_corpus, tmpdir):
+        sample_corpus.new_feature_container('fbank', os.path.join(tmpdir.strpath, 'fbank_feats'))
+
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert corpus.feature_containers['fbank'].path == os.path.join(tmpdir.strpath, 'fbank_feats')
+
+    def test_load_subviews(self, writer, reader, sample_corpus, tmpdir):
+        writer.save(sample_corpus, tmpdir.strpath)
+        corpus = reader.load(tmpdir.strpath)
+
+        assert corpus.subviews['train'].corpus is corpus
+        assert corpus.subviews['train'].utterances.keys() == {'utt-1', 'utt-2', 'utt-3'}
+        assert corpus.subviews['dev'].utterances.keys() == {'utt-4', 'utt-5'}
+
+    def test_load_large_subviews(self, writer, reader, tmpdir):
+        corpus = audiomate.Corpus()
+        corpus.new_file('/tmp/a.wav', 'a')
+
+        for index in range(1500):
+            corpus.new_utterance('utt-{}'.format(index), 'a')
+
+        ids = {'utt-{}'.format(index) for index in range(0, 1500, 2)}
+        corpus.import_subview('even', subview.Subview(corpus, subview.MatchingUtteranceIdxFilter(ids)))
+
+        writer.save(corpus, tmpdir.strpath)
+        loaded = reader.load(tmpdir.strpath)
+
+        assert loaded.subviews['even'].utterances.keys() == ids
@@ -211,3 +211,16 @@ class TestTudaReader:
         assert ds.subviews['train'].num_utterances == 4
         assert ds.subviews['dev'].num_utterances == 3
         assert ds.subviews['test'].num_utterances == 3
+
+    def test_load_with_multiple_processes(self, data_path):
+        ds = io.TudaReader(num_processes=1).load(data_path)
+        ds_parallel = io.TudaReader(num_processes=3).load(data_path)
+
+        assert list(ds_parallel.utterances.keys()) == list(ds.utterances.keys())
+        assert list(ds_parallel.issuers.keys()) == list(ds.issuers.keys())
+        assert set(ds_parallel.subviews['train'].utterances.keys()) == set(ds.subviews['train'].utterances.keys())
+
+        for utt_idx, utt in ds.utterances.items():
+            utt_parallel = ds_parallel.utterances[utt_idx]
+            assert utt_parallel.label_lists[corpus.LL_WORD_TRANSCRIPT][0].value == \
+                utt.label_lists[corpus.LL_WORD_TRANSCRIPT][0].value
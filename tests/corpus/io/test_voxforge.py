@@ -248,3 +248,10 @@ class TestVoxforgeReader:
             'I TRIED TO READ GEORGE MOORE LAST NIGHT AND WAS DREADFULLY BORED'
         assert ds.utterances['anonymous-20081027-njq-a0479'].label_lists[corpus.LL_WORD_TRANSCRIPT_RAW][0].value == \
             'I tried to read George Moore last night, and was dreadfully bored.'
+
+    def test_load_with_single_thread(self, reader, sample_corpus_path):
+        ds = reader.load(sample_corpus_path)
+        ds_serial = voxforge.VoxforgeReader(num_threads=1).load(sample_corpus_path)
+
+        assert list(ds_serial.utterances.keys()) == list(ds.utterances.keys())
+        assert list(ds_serial.issuers.keys()) == list(ds.issuers.keys())
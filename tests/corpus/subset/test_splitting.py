@@ -84,6 +84,15 @@ class SplitterTest(unittest.TestCase):
         for issuer_idx, subset_list in subsets_of_issuers.items():
             self.assertEqual(1, len(subset_list))
 
+    def test_split_by_number_of_utterances_issuer_separated_requires_issuers(self):
+        self.corpus.new_utterance('utt-no-issuer', 'wav-1')
+
+        with pytest.raises(AttributeError):
+            self.splitter.split_by_number_of_utterances({
+                'train': 0.6,
+                'test': 0.2
+            }, separate_issuers=True)
+
     def test_split_by_number_of_utterances_seed(self):
         self.corpus = resources.create_multi_label_corpus()
         res1 = splitting.Splitter(self.corpus, random_seed=15).split_by_number_of_utterances({
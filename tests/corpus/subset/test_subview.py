@@ -1,5 +1,8 @@
+import copy
 import unittest
+import zlib
 
+import audiomate
 from audiomate.corpus import assets
 from audiomate.corpus.subset import subview
 
@@ -45,6 +48,73 @@ class MatchingUtteranceIdxFilterTest(unittest.TestCase):
         assert f.utterance_idxs == {'a', 'b', 'd'}
         assert f.inverse
 
+    def test_serialize_bitmap(self):
+        table = ['utt-{:04d}'.format(i) for i in range(3000)]
+        f = subview.MatchingUtteranceIdxFilter(utterance_idxs=set(table[500:1700]))
+
+        representation = f.serialize(utterance_table=table)
+
+        assert representation.startswith('include-bitmap,3000,')
+        assert len(representation) < 200
+
+    def test_serialize_bitmap_below_threshold(self):
+        table = ['a', 'b', 'c', 'd']
+        f = subview.MatchingUtteranceIdxFilter(utterance_idxs={'a', 'b', 'd'})
+
+        assert f.serialize(utterance_table=table) == 'include,a,b,d'
+
+    def test_serialize_bitmap_with_unknown_ids(self):
+        table = ['utt-{:04d}'.format(i) for i in range(3000)]
+        f = subview.MatchingUtteranceIdxFilter(utterance_idxs=set(table[:1500]) | {'unknown'})
+
+        assert f.serialize(utterance_table=table).startswith('include,')
+
+    def test_parse_bitmap(self):
+        table = ['utt-{:04d}'.format(i) for i in range(3001)]
+        ids = set(table[::3])
+        f = subview.MatchingUtteranceIdxFilter(utterance_idxs=ids, inverse=True)
+
+        parsed = subview.MatchingUtteranceIdxFilter.parse(f.serialize(utterance_table=table), utterance_table=table)
+
+        assert parsed.utterance_idxs == ids
+        assert parsed.inverse
+
+    def test_parse_bitmap_without_matching_table_raises_error(self):
+        table = ['utt-{:04d}'.format(i) for i in range(3000)]
+        representation = subview.MatchingUtteranceIdxFilter(utterance_idxs=set(table)).serialize(utterance_table=table)
+
+        with self.assertRaises(ValueError):
+            subview.MatchingUtteranceIdxFilter.parse(representation)
+
+        with self.assertRaises(ValueError):
+            subview.MatchingUtteranceIdxFilter.parse(representation, utterance_table=table[1:])
+
+    def test_parse_bitmap_with_other_utterances_raises_error(self):
+        table = ['utt-{:04d}'.format(i) for i in range(3000)]
+        representation = subview.MatchingUtteranceIdxFilter(utterance_idxs=set(table[:1500])).serialize(
+            utterance_table=table)
+
+        other_table = sorted(table[1:] + ['utt-x'])
+
+        with self.assertRaises(ValueError):
+            subview.MatchingUtteranceIdxFilter.parse(representation, utterance_table=other_table)
+
+    def test_bitmap_with_utterance_table(self):
+        ids = ['utt-{:04d}'.format(i) for i in range(3000)]
+        table = subview.UtteranceTable(reversed(ids))
+        f = subview.MatchingUtteranceIdxFilter(utterance_idxs=set(ids[:1500]))
+
+        representation = f.serialize(utterance_table=table)
+
+        assert table == ids
+        assert representation == f.serialize(utterance_table=ids)
+        assert subview.MatchingUtteranceIdxFilter.parse(representation, utterance_table=table).utterance_idxs == set(
+            ids[:1500])
+
+    def test_table_checksum(self):
+        assert subview.UtteranceTable(['b', 'a']).checksum == '{:08x}'.format(zlib.crc32(b'a\nb\n'))
+        assert subview.table_checksum([]) == '00000000'
+
 
 class MatchingLabelFilterTest(unittest.TestCase):
 
@@ -114,6 +184,16 @@ class MatchingLabelFilterTest(unittest.TestCase):
         assert filter.labels == {'music', 'speech'}
         assert filter.label_list_ids == set()
 
+    def test_matching_utterance_ids(self):
+        corpus = resources.create_multi_label_corpus()
+        corpus.utterances['utt-3'].set_label_list(assets.LabelList(idx='other', labels=[assets.Label('noise')]))
+
+        filter = subview.MatchingLabelFilter(labels={'music', 'speech'})
+        assert filter.matching_utterance_ids(corpus) == set(corpus.utterances) - {'utt-3'}
+
+        filter = subview.MatchingLabelFilter(labels={'music'}, label_list_ids={'default'})
+        assert filter.matching_utterance_ids(corpus) == {'utt-8'}
+
 
 class SubviewTest(unittest.TestCase):
 
@@ -137,6 +217,13 @@ class SubviewTest(unittest.TestCase):
         assert 'spk-1' in self.subview.issuers.keys()
         assert 'spk-2' in self.subview.issuers.keys()
 
+    def test_label_statistics(self):
+        stats = self.subview.label_statistics()
+
+        assert stats.utterance_ids == ['utt-1', 'utt-3']
+        assert self.subview.label_count() == {'who am i': 1, 'who is he': 1}
+        assert self.subview.all_label_values() == {'who am i', 'who is he'}
+
     def test_serialize(self):
         repr = self.subview.serialize()
 
@@ -149,6 +236,29 @@ class SubviewTest(unittest.TestCase):
         assert len(sv.filter_criteria) == 1
         assert sv.filter_criteria[0].utterance_idxs == {'utt-1', 'utt-3'}
 
+    def test_utterances_keep_order_of_corpus(self):
+        sv = subview.Subview(self.corpus, filter_criteria=[
+            subview.MatchingUtteranceIdxFilter(utterance_idxs={'utt-5', 'utt-2', 'utt-4'})
+        ])
+
+        assert list(sv.utterances.keys()) == ['utt-2', 'utt-4', 'utt-5']
+
+    def test_utterances_with_indexed_and_other_criteria(self):
+        sv = subview.Subview(self.corpus, filter_criteria=[
+            subview.MatchingUtteranceIdxFilter(utterance_idxs={'utt-1', 'utt-2', 'utt-3', 'unknown'}),
+            subview.MatchingUtteranceIdxFilter(utterance_idxs={'utt-3'}, inverse=True),
+            subview.MatchingLabelFilter(labels={'who am i', 'who are you', 'who is he'})
+        ])
+
+        assert list(sv.utterances.keys()) == ['utt-1', 'utt-2']
+
+    def test_queries(self):
+        assert self.subview.utterance_ids_of_file('wav_3') == {'utt-3'}
+        assert self.subview.utterance_ids_of_issuer('spk-1') == {'utt-1'}
+        assert self.subview.utterance_ids_with_label_list(audiomate.corpus.LL_WORD_TRANSCRIPT) == {'utt-1', 'utt-3'}
+        assert self.subview.utterance_ids_with_label('who is he') == {'utt-3'}
+        assert self.subview.utterance_ids_with_label('who is she') == set()
+
     def test_utterances_without_issuers(self):
         self.corpus.utterances['utt-3'].issuer = None
         self.corpus.utterances['utt-4'].issuer = None
@@ -156,3 +266,195 @@ class SubviewTest(unittest.TestCase):
 
         assert self.subview.num_utterances == 2
         assert self.subview.num_issuers == 1
+
+    def test_utterances_are_cached(self):
+        utterances = self.subview.utterances
+
+        assert self.subview.utterances is utterances
+        assert self.subview.files is self.subview.files
+        assert self.subview.issuers is self.subview.issuers
+
+    def test_utterances_are_resolved_again_after_corpus_changes(self):
+        self.subview.filter_criteria[0].utterance_idxs.add('utt-new')
+
+        assert self.subview.num_utterances == 2
+        assert self.subview.num_files == 2
+
+        self.corpus.new_utterance('utt-new', 'wav_4')
+
+        assert self.subview.num_utterances == 3
+        assert self.subview.num_files == 3
+
+    def test_utterances_are_resolved_again_after_label_changes(self):
+        sv = subview.Subview(self.corpus, filter_criteria=[
+            subview.MatchingLabelFilter(labels={'who am i'})
+        ])
+
+        assert sv.utterances.keys() == {'utt-1'}
+
+        self.corpus.utterances['utt-2'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].value = 'who am i'
+
+        assert sv.utterances.keys() == {'utt-1', 'utt-2'}
+        assert sv.label_count() == {'who am i': 2}
+
+    def test_utterances_are_resolved_again_after_criteria_changes(self):
+        assert self.subview.utterances.keys() == {'utt-1', 'utt-3'}
+
+        self.subview.filter_criteria[0].utterance_idxs.add('utt-2')
+        assert self.subview.utterances.keys() == {'utt-1', 'utt-2', 'utt-3'}
+
+        self.subview.filter_criteria[0].utterance_idxs -= {'utt-1'}
+        assert self.subview.utterances.keys() == {'utt-2', 'utt-3'}
+
+        self.subview.filter_criteria[0].inverse = True
+        assert self.subview.utterances.keys() == {'utt-1', 'utt-4', 'utt-5'}
+
+    def test_utterances_are_resolved_again_after_label_criteria_changes(self):
+        criterion = subview.MatchingLabelFilter(labels={'who am i'})
+        sv = subview.Subview(self.corpus, filter_criteria=[criterion])
+
+        assert sv.utterances.keys() == {'utt-1'}
+
+        criterion.labels.add('who is he')
+        assert sv.utterances.keys() == {'utt-1', 'utt-3'}
+
+        criterion.label_list_ids.add('other')
+        assert sv.num_utterances == 5
+
+    def test_files_and_issuers_after_reassignment(self):
+        assert self.subview.files.keys() == {'wav-1', 'wav_3'}
+        assert self.subview.issuers.keys() == {'spk-1', 'spk-2'}
+
+        self.corpus.utterances['utt-1'].file = self.corpus.files['wav_4']
+        self.corpus.utterances['utt-1'].issuer = self.corpus.issuers['spk-3']
+
+        assert self.subview.files.keys() == {'wav_3', 'wav_4'}
+        assert self.subview.issuers.keys() == {'spk-2', 'spk-3'}
+
+    def test_copied_criteria_track_changes(self):
+        sv = copy.deepcopy(self.subview)
+        assert sv.utterances.keys() == {'utt-1', 'utt-3'}
+
+        sv.filter_criteria[0].utterance_idxs.add('utt-2')
+
+        assert sv.utterances.keys() == {'utt-1', 'utt-2', 'utt-3'}
+        assert self.subview.utterances.keys() == {'utt-1', 'utt-3'}
+
+    def test_utterances_are_resolved_again_after_adding_criteria(self):
+        assert self.subview.num_utterances == 2
+
+        self.subview.filter_criteria.append(subview.MatchingUtteranceIdxFilter(utterance_idxs={'utt-3'}))
+
+        assert self.subview.utterances.keys() == {'utt-3'}
+
+    def test_utterances_stop_at_first_failing_criterion(self):
+        class CountingFilter(subview.FilterCriterion):
+            def __init__(self, result):
+                self.result = result
+                self.num_calls = 0
+
+            def match(self, utterance, corpus):
+                self.num_calls += 1
+                return self.result
+
+            def serialize(self):
+                return ''
+
+            @staticmethod
+            def name():
+                return 'counting'
+
+            @classmethod
+            def parse(cls, representation):
+                return cls(True)
+
+        failing = CountingFilter(False)
+        other = CountingFilter(True)
+        sv = subview.Subview(self.corpus, filter_criteria=[failing, other])
+
+        assert sv.num_utterances == 0
+        assert failing.num_calls == 5
+        assert other.num_calls == 0
+
+    def test_subview_of_subview_is_resolved_again(self):
+        sv = subview.Subview(self.subview, filter_criteria=[
+            subview.MatchingUtteranceIdxFilter(utterance_idxs={'utt-3', 'utt-4'})
+        ])
+
+        assert sv.utterances.keys() == {'utt-3'}
+
+        self.subview.filter_criteria[0].utterance_idxs.add('utt-4')
+
+        assert sv.utterances.keys() == {'utt-3', 'utt-4'}
+
+    def test_subview_of_subview_with_label_filter(self):
+        sv = subview.Subview(self.subview, filter_criteria=[
+            subview.MatchingLabelFilter(labels={'who is he'})
+        ])
+
+        assert sv.utterances.keys() == {'utt-3'}
+        assert sv.all_label_values() == {'who is he'}
+        assert self.subview.all_label_values() == {'who am i', 'who is he'}
+
+    def test_inverse_utterance_idx_filter(self):
+        sv = subview.Subview(self.corpus, filter_criteria=[
+            subview.MatchingUtteranceIdxFilter(utterance_idxs={'utt-1', 'utt-3'}, inverse=True)
+        ])
+
+        assert list(sv.utterances.keys()) == ['utt-2', 'utt-4', 'utt-5']
+
+
+class SubviewSetOperationsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = resources.create_dataset()
+        self.first = subview.Subview(self.corpus, filter_criteria=[
+            subview.MatchingUtteranceIdxFilter(utterance_idxs={'utt-1', 'utt-2', 'utt-3'})
+        ])
+        self.second = subview.Subview(self.corpus, filter_criteria=[
+            subview.MatchingUtteranceIdxFilter(utterance_idxs={'utt-3', 'utt-5'})
+        ])
+
+    def test_intersection(self):
+        result = self.first & self.second
+
+        assert result.corpus is self.corpus
+        assert list(result.utterances.keys()) == ['utt-3']
+        assert self.first.intersection(self.second).utterances.keys() == {'utt-3'}
+
+    def test_union(self):
+        result = self.first | self.second
+
+        assert list(result.utterances.keys()) == ['utt-1', 'utt-2', 'utt-3', 'utt-5']
+        assert self.first.union(self.second).utterances.keys() == {'utt-1', 'utt-2', 'utt-3', 'utt-5'}
+
+    def test_difference(self):
+        result = self.first - self.second
+
+        assert list(result.utterances.keys()) == ['utt-1', 'utt-2']
+        assert self.first.difference(self.second).utterances.keys() == {'utt-1', 'utt-2'}
+
+    def test_combine_nested_subviews(self):
+        nested = subview.Subview(self.first, filter_criteria=[
+            subview.MatchingUtteranceIdxFilter(utterance_idxs={'utt-2', 'utt-3', 'utt-4'})
+        ])
+
+        result = nested - self.second
+
+        assert result.corpus is self.corpus
+        assert list(result.utterances.keys()) == ['utt-2']
+
+    def test_combine_subviews_of_different_corpora_raises_error(self):
+        other = subview.Subview(resources.create_dataset(), filter_criteria=[])
+
+        with self.assertRaises(ValueError):
+            self.first | other
+
+    def test_combine_with_other_type_raises_error(self):
+        with self.assertRaises(TypeError):
+            self.first & {'utt-1'}
+
+    def test_result_can_be_serialized(self):
+        result = self.first - self.second
+
+        assert result.serialize() == 'matching_utterance_ids\ninclude,utt-1,utt-2'
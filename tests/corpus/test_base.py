@@ -3,6 +3,7 @@ import unittest
 import pytest
 
 import audiomate
+from audiomate.corpus import assets
 
 from tests import resources
 
@@ -50,6 +51,20 @@ class CorpusViewTest(unittest.TestCase):
         assert durations['music'] == pytest.approx(44.0)
         assert durations['speech'] == pytest.approx(45.0)
 
+    def test_label_statistics_of_compacted_corpus(self):
+        self.ds.compact_labels()
+
+        assert self.ds.all_label_values() == {'music', 'speech'}
+        assert self.ds.label_count() == {'music': 11, 'speech': 7}
+        assert self.ds.label_durations()['music'] == pytest.approx(44.0)
+        assert self.ds.label_durations()['speech'] == pytest.approx(45.0)
+
+    def test_label_statistics_with_detached_label_list(self):
+        self.ds.compact_labels()
+        self.ds.utterances['utt-1'].label_lists['default'].append(assets.Label('noise', 0, 1))
+
+        assert self.ds.label_count() == {'music': 11, 'speech': 7, 'noise': 1}
+
     def test_duration(self):
         duration = self.ds.total_duration
 
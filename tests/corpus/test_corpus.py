@@ -145,6 +145,22 @@ class CorpusTest(unittest.TestCase):
         with pytest.raises(ValueError):
             self.corpus.import_utterances(importing_utterances)
 
+    def test_import_utterance_other_file_with_existing_idx(self):
+        importing_utterances = [
+            assets.Utterance('a', assets.File(self.ex_file.idx, self.ex_file.path), self.ex_issuer, 0, 10)
+        ]
+
+        with pytest.raises(ValueError):
+            self.corpus.import_utterances(importing_utterances)
+
+    def test_import_utterance_other_issuer_with_existing_idx(self):
+        importing_utterances = [
+            assets.Utterance('a', self.ex_file, assets.Issuer(self.ex_issuer.idx), 0, 10)
+        ]
+
+        with pytest.raises(ValueError):
+            self.corpus.import_utterances(importing_utterances)
+
     #
     #   ISSUER ADD
     #
@@ -192,9 +208,269 @@ class CorpusTest(unittest.TestCase):
         assert self.corpus.num_feature_containers == 1
         assert self.corpus.feature_containers['mfcc'].path == os.path.join(self.tempdir, 'features', 'mfcc')
 
+    #
+    #   LABELS
+    #
+
+    def test_compact_labels(self):
+        corpus = resources.create_multi_label_corpus()
+        labels = [(label.value, label.start, label.end) for label in corpus.utterances['utt-4'].label_lists['default']]
+
+        stores = corpus.compact_labels()
+
+        assert set(stores.keys()) == {'default'}
+        assert stores['default'].num_labels == 18
+
+        label_list = corpus.utterances['utt-4'].label_lists['default']
+
+        assert isinstance(label_list, assets.LabelListView)
+        assert label_list.utterance == corpus.utterances['utt-4']
+        assert [(label.value, label.start, label.end) for label in label_list] == labels
+
+    def test_label_statistics_are_cached(self):
+        corpus = resources.create_multi_label_corpus()
+
+        assert corpus.label_statistics() is corpus.label_statistics()
+
+    def test_label_statistics_are_recomputed_after_changes(self):
+        corpus = resources.create_multi_label_corpus()
+        assert corpus.label_count() == {'music': 11, 'speech': 7}
+
+        corpus.utterances['utt-1'].label_lists['default'][0].value = 'noise'
+        assert corpus.label_count() == {'music': 10, 'speech': 7, 'noise': 1}
+
+        corpus.utterances['utt-1'].label_lists['default'].append(assets.Label('noise', 1, 2))
+        assert corpus.label_count() == {'music': 10, 'speech': 7, 'noise': 2}
+
+        utt = corpus.new_utterance('utt-new', 'wav_2')
+        utt.set_label_list(assets.LabelList(labels=[assets.Label('speech', 0, 1)]))
+        assert corpus.label_count() == {'music': 10, 'speech': 8, 'noise': 2}
+
+    def test_num_changes(self):
+        corpus = resources.create_dataset()
+        num_changes = corpus.num_changes
+
+        corpus.new_file('/tmp/a.wav', 'a')
+        assert corpus.num_changes > num_changes
+        num_changes = corpus.num_changes
+
+        corpus.new_utterance('utt-new', 'a')
+        assert corpus.num_changes > num_changes
+        num_changes = corpus.num_changes
+
+        corpus.utterances['utt-1'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].value = 'who'
+        assert corpus.num_changes > num_changes
+        num_changes = corpus.num_changes
+
+        assert corpus.num_changes == num_changes
+
+    def test_num_changes_of_other_corpus_unaffected(self):
+        corpus = resources.create_dataset()
+        other = resources.create_dataset()
+        num_changes = other.num_changes
+
+        corpus.utterances['utt-1'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].value = 'who'
+        corpus.utterances['utt-1'].end = 2
+        corpus.utterances['utt-1'].file = corpus.files['wav_2']
+
+        assert other.num_changes == num_changes
+
+    def test_num_changes_of_reassigned_file_and_issuer(self):
+        corpus = resources.create_dataset()
+        num_changes = corpus.num_changes
+
+        corpus.utterances['utt-1'].file = corpus.files['wav_2']
+        assert corpus.num_changes > num_changes
+        num_changes = corpus.num_changes
+
+        corpus.utterances['utt-1'].issuer = corpus.issuers['spk-3']
+        assert corpus.num_changes > num_changes
+        num_changes = corpus.num_changes
+
+        corpus.files['wav_2'].path = '/tmp/other.wav'
+        assert corpus.num_changes > num_changes
+
+    def test_label_statistics_after_file_reassignment(self):
+        corpus = resources.create_dataset()
+        corpus.new_file(resources.sample_wav_file('wav_200_samples.wav'), 'short')
+        utterance = corpus.utterances['utt-5']
+        utterance.set_label_list(assets.LabelList(idx='vad', labels=[assets.Label('speech', 0, -1)]))
+
+        assert corpus.label_durations(label_list_ids=['vad'])['speech'] == pytest.approx(2.5951875)
+
+        utterance.file = corpus.files['short']
+
+        assert corpus.label_durations(label_list_ids=['vad'])['speech'] == pytest.approx(0.0125)
+
+    def test_label_statistics_after_file_path_change(self):
+        corpus = resources.create_dataset()
+        utterance = corpus.utterances['utt-5']
+        utterance.set_label_list(assets.LabelList(idx='vad', labels=[assets.Label('speech', 0, -1)]))
+
+        assert corpus.label_durations(label_list_ids=['vad'])['speech'] == pytest.approx(2.5951875)
+
+        utterance.file.path = resources.sample_wav_file('wav_200_samples.wav')
+
+        assert corpus.label_durations(label_list_ids=['vad'])['speech'] == pytest.approx(0.0125)
+
+    def test_saved_state(self):
+        corpus = resources.create_dataset()
+        corpus.mark_saved('/tmp/corpus')
+
+        assert corpus.saved_state('/tmp/corpus/') == {}
+        assert corpus.saved_state('/tmp/other') is None
+
+    def test_pending_label_list_ids(self):
+        corpus = resources.create_dataset()
+        corpus.defer_label_lists('phones', lambda: None)
+
+        assert corpus.pending_label_list_ids() == {'phones'}
+        assert not corpus.has_pending_subviews()
+
+    def test_compact_labels_only_given_ids(self):
+        corpus = resources.create_multi_label_corpus()
+
+        assert corpus.compact_labels(label_list_ids=['other']) == {}
+        assert not isinstance(corpus.utterances['utt-4'].label_lists['default'], assets.LabelListView)
+
+    #
+    #   QUERIES
+    #
+
+    def test_utterance_ids_of_file(self):
+        corpus = resources.create_dataset()
+
+        assert corpus.utterance_ids_of_file('wav_3') == {'utt-3', 'utt-4'}
+        assert corpus.utterance_ids_of_file('unknown') == set()
+
+        corpus.new_utterance('utt-6', 'wav_3')
+
+        assert corpus.utterance_ids_of_file('wav_3') == {'utt-3', 'utt-4', 'utt-6'}
+
+    def test_utterance_ids_of_issuer(self):
+        corpus = resources.create_dataset()
+
+        assert corpus.utterance_ids_of_issuer('spk-1') == {'utt-1', 'utt-2'}
+        assert corpus.utterance_ids_of_issuer('spk-3') == {'utt-5'}
+
+    def test_utterance_ids_with_label_list(self):
+        corpus = resources.create_dataset()
+        corpus.utterances['utt-2'].set_label_list(assets.LabelList(idx='raw', labels=[assets.Label('a')]))
+
+        assert corpus.utterance_ids_with_label_list(audiomate.corpus.LL_WORD_TRANSCRIPT) == set(corpus.utterances)
+        assert corpus.utterance_ids_with_label_list('raw') == {'utt-2'}
+
+    def test_utterance_ids_with_label(self):
+        corpus = resources.create_multi_label_corpus()
+        corpus.utterances['utt-3'].set_label_list(assets.LabelList(idx='other', labels=[assets.Label('noise')]))
+
+        assert corpus.utterance_ids_with_label('noise') == {'utt-3'}
+        assert corpus.utterance_ids_with_label('noise', label_list_ids=['default']) == set()
+        assert corpus.utterance_ids_with_label('speech') == {'utt-1', 'utt-2', 'utt-3', 'utt-4', 'utt-5', 'utt-6',
+                                                             'utt-7'}
+
+    def test_utterance_ids_with_label_after_changes(self):
+        corpus = resources.create_multi_label_corpus()
+        assert corpus.utterance_ids_with_label('noise') == set()
+
+        corpus.utterances['utt-8'].label_lists['default'][0].value = 'noise'
+        assert corpus.utterance_ids_with_label('noise') == {'utt-8'}
+
+        utt = corpus.new_utterance('utt-new', 'wav_2')
+        utt.set_label_list(assets.LabelList(labels=[assets.Label('noise', 0, 1)]))
+        assert corpus.utterance_ids_with_label('noise') == {'utt-8', 'utt-new'}
+
+    def test_utterance_ids_with_label_removed_value(self):
+        corpus = resources.create_dataset()
+        assert 'who am i' in corpus.all_label_values()
+
+        corpus.utterances['utt-1'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].value = 'changed'
+
+        assert corpus.utterance_ids_with_label('who am i') == set()
+        assert corpus.utterance_ids_with_label('changed') == {'utt-1'}
+        assert 'who am i' not in corpus.all_label_values()
+
+    def test_utterance_ids_with_label_only_indexes_changed_utterances(self):
+        corpus = resources.create_multi_label_corpus()
+        corpus.utterance_ids_with_label('noise')
+
+        utterance = corpus.utterances['utt-8']
+        utterance.label_lists['default'][0].value = 'noise'
+
+        for utt in corpus.utterances.values():
+            if utt is not utterance:
+                utt.label_lists = None
+
+        assert corpus.utterance_ids_with_label('noise') == {'utt-8'}
+
+    def test_utterance_ids_of_file_after_reassignment(self):
+        corpus = resources.create_dataset()
+        corpus.utterance_ids_of_file('wav_3')
+
+        corpus.utterances['utt-3'].file = corpus.files['wav-1']
+
+        assert corpus.utterance_ids_of_file('wav_3') == {'utt-4'}
+        assert corpus.utterance_ids_of_file('wav-1') == {'utt-1', 'utt-3'}
+
+    def test_utterance_ids_of_issuer_after_reassignment(self):
+        corpus = resources.create_dataset()
+        corpus.utterance_ids_of_issuer('spk-1')
+
+        corpus.utterances['utt-1'].issuer = corpus.issuers['spk-3']
+        corpus.utterances['utt-2'].issuer = None
+
+        assert corpus.utterance_ids_of_issuer('spk-1') == set()
+        assert corpus.utterance_ids_of_issuer('spk-3') == {'utt-1', 'utt-5'}
+
+    def test_queries_after_merge(self):
+        corpus = resources.create_dataset()
+        corpus.merge_corpus(resources.create_dataset())
+
+        assert corpus.utterance_ids_of_issuer('spk-1_1') == {'utt-1_1', 'utt-2_1'}
+        assert corpus.utterance_ids_with_label('who am i') == {'utt-1', 'utt-1_1'}
+
+    def test_queries_with_utterances_added_directly(self):
+        assert self.corpus.utterance_ids_of_file('existing_file') == {'existing_utt'}
+        assert self.corpus.utterance_ids_of_issuer('existing_issuer') == {'existing_utt'}
+
     #
     #   SUBVIEW ADD
     #
+    def test_defer_label_lists(self):
+        corpus = resources.create_dataset()
+
+        def load():
+            for utt in corpus.utterances.values():
+                utt.set_label_list(assets.LabelList(idx='lazy', labels=[assets.Label(utt.idx)]))
+
+        corpus.defer_label_lists('lazy', load)
+
+        assert corpus.utterances['utt-3'].label_lists['lazy'][0].value == 'utt-3'
+        assert corpus.label_count(label_list_ids=['lazy'])['utt-5'] == 1
+
+    def test_defer_subviews(self):
+        corpus = resources.create_dataset()
+        loaded = []
+
+        def load():
+            loaded.append(True)
+            corpus.import_subview('lazy', subview.Subview(corpus))
+
+        corpus.defer_subviews(load)
+        assert loaded == []
+
+        assert 'lazy' in corpus.subviews.keys()
+        assert 'train' in corpus.subviews.keys()
+        assert len(loaded) == 1
+
+    def test_import_subview_loads_deferred_subviews_first(self):
+        self.corpus.defer_subviews(lambda: self.corpus.import_subview('lazy', subview.Subview(self.corpus)))
+
+        sv = subview.Subview(self.corpus)
+        self.corpus.import_subview('lazy', sv)
+
+        assert self.corpus.subviews['lazy'] is sv
+
     def test_import_subview(self):
         train_set = subview.Subview(None, filter_criteria=[
             subview.MatchingUtteranceIdxFilter(utterance_idxs={'existing_utt'})
@@ -223,6 +499,55 @@ class CorpusTest(unittest.TestCase):
         original.files['wav-1'].path = '/changed/path.wav'
         assert original.files['wav-1'].path != copy.files['wav-1'].path
 
+    def test_from_corpus_copies_label_lists(self):
+        original = resources.create_dataset()
+        copy = audiomate.Corpus.from_corpus(original)
+
+        original.utterances['utt-1'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].value = 'changed'
+        copy.utterances['utt-2'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].meta['a'] = 'ho'
+
+        assert copy.utterances['utt-1'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].value == 'who am i'
+        assert original.utterances['utt-2'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].meta['a'] == 'hey'
+
+        ll = copy.utterances['utt-2'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT]
+        assert ll.utterance is copy.utterances['utt-2']
+        assert ll[0].label_list is ll
+
+    def test_from_corpus_copies_label_lists_not_accessed(self):
+        original = resources.create_dataset()
+        copy = audiomate.Corpus.from_corpus(original)
+
+        original.utterances['utt-3'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT].append(assets.Label('new'))
+
+        assert len(copy.utterances['utt-3'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT]) == 1
+        assert 'new' not in copy.all_label_values()
+
+    def test_from_corpus_independent_of_edits_bypassing_the_api(self):
+        original = resources.create_dataset()
+        copy = audiomate.Corpus.from_corpus(original)
+
+        original.utterances['utt-2'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].meta['a'] = 'changed'
+        original.utterances['utt-3'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT].labels.append(
+            assets.Label('new'))
+
+        assert copy.utterances['utt-2'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].meta['a'] == 'hey'
+        assert len(copy.utterances['utt-3'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT]) == 1
+
+    def test_from_corpus_copies_compacted_labels(self):
+        original = resources.create_dataset()
+        original.compact_labels()
+        copy = audiomate.Corpus.from_corpus(original.subviews['train'])
+
+        original.utterances['utt-1'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].value = 'changed'
+        original.utterances['utt-2'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].meta['a'] = 'changed'
+
+        ll = copy.utterances['utt-1'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT]
+        assert isinstance(ll, assets.LabelListView)
+        assert ll.store is not original.utterances['utt-1'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT].store
+        assert ll[0].value == 'who am i'
+        assert copy.utterances['utt-2'].label_lists[audiomate.corpus.LL_WORD_TRANSCRIPT][0].meta['a'] == 'hey'
+        assert copy.all_label_values() == {'who am i', 'who are you', 'who is he'}
+
     def test_from_corpus_only_utterances_and_files(self):
         ds = audiomate.Corpus()
         ds.new_file('/random/path', 'file_1')
@@ -534,6 +859,32 @@ class CorpusTest(unittest.TestCase):
         assert ll.labels[1].meta == {}
         assert ll.labels[1].label_list == ll
 
+    def test_merge_same_corpus_multiple_times(self):
+        main_corpus = resources.create_dataset()
+
+        for _ in range(3):
+            main_corpus.merge_corpus(resources.create_dataset())
+
+        assert main_corpus.num_utterances == 20
+        assert {'utt-1', 'utt-1_1', 'utt-1_2', 'utt-1_3'} <= set(main_corpus.utterances.keys())
+        assert {'wav-1', 'wav-1_1', 'wav-1_2', 'wav-1_3'} <= set(main_corpus.files.keys())
+        assert main_corpus.utterances['utt-1_3'].file is main_corpus.files['wav-1_3']
+        assert main_corpus.new_utterance('utt-1', 'wav-1').idx == 'utt-1_4'
+
+    def test_merge_corpus_keeps_merging_corpus_unchanged(self):
+        main_corpus = resources.create_dataset()
+        merging_corpus = resources.create_multi_label_corpus()
+
+        main_corpus.merge_corpus(merging_corpus)
+
+        assert merging_corpus.files['wav-1'].idx == 'wav-1'
+        assert merging_corpus.issuers['spk-1'].idx == 'spk-1'
+        assert merging_corpus.utterances['utt-2'].idx == 'utt-2'
+        assert merging_corpus.utterances['utt-2'].issuer is merging_corpus.issuers['spk-1']
+        assert merging_corpus.issuers['spk-1'].utterances == {merging_corpus.utterances['utt-1'],
+                                                              merging_corpus.utterances['utt-2']}
+        assert merging_corpus.subviews['train'].corpus is merging_corpus
+
     def test_merge_corpus_subviews(self):
         main_corpus = resources.create_dataset()
         merging_corpus = resources.create_multi_label_corpus()
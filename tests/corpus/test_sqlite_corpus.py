@@ -0,0 +1,68 @@
+import pickle
+
+import pytest
+
+from audiomate.corpus import io
+from audiomate.corpus.subset import subview
+from tests import resources
+
+
+@pytest.fixture()
+def corpora(tmpdir):
+    corpus = resources.create_dataset()
+    io.SqliteWriter().save(corpus, tmpdir.strpath)
+
+    return corpus, io.SqliteReader().load(tmpdir.strpath)
+
+
+class TestSqliteCorpus:
+
+    def test_mappings(self, corpora):
+        corpus, sqlite_corpus = corpora
+
+        assert sqlite_corpus.num_utterances == 5
+        assert 'utt-3' in sqlite_corpus.utterances
+        assert 'utt-9' not in sqlite_corpus.utterances
+        assert list(sqlite_corpus.issuers.keys()) == list(corpus.issuers.keys())
+        assert [utt.idx for utt in sqlite_corpus.utterances.values()] == list(corpus.utterances.keys())
+        assert [idx for idx, _ in sqlite_corpus.files.items()] == list(corpus.files.keys())
+
+    def test_get_missing_asset_raises_key_error(self, corpora):
+        with pytest.raises(KeyError):
+            corpora[1].utterances['utt-9']
+
+    def test_queries(self, corpora):
+        corpus, sqlite_corpus = corpora
+
+        assert sqlite_corpus.utterance_ids_of_file('wav_3') == corpus.utterance_ids_of_file('wav_3')
+        assert sqlite_corpus.utterance_ids_of_issuer('spk-2') == corpus.utterance_ids_of_issuer('spk-2')
+        assert sqlite_corpus.utterance_ids_with_label_list('word-transcript') == {'utt-1', 'utt-2', 'utt-3',
+                                                                                  'utt-4', 'utt-5'}
+        assert sqlite_corpus.utterance_ids_with_label('who am i') == {'utt-1'}
+        assert sqlite_corpus.utterance_ids_with_label('who am i', label_list_ids=['other']) == set()
+
+    def test_label_statistics(self, corpora):
+        corpus, sqlite_corpus = corpora
+
+        assert sqlite_corpus.all_label_values() == corpus.all_label_values()
+        assert sqlite_corpus.all_label_values(label_list_ids=['other']) == set()
+        assert sqlite_corpus.label_count() == corpus.label_count()
+        assert sqlite_corpus.label_durations() == pytest.approx(corpus.label_durations())
+        assert sqlite_corpus.total_duration == pytest.approx(corpus.total_duration)
+
+    def test_subview_with_label_filter(self, corpora):
+        sqlite_corpus = corpora[1]
+        sv = subview.Subview(sqlite_corpus, filter_criteria=[
+            subview.MatchingLabelFilter(labels={'who am i', 'who is he'})
+        ])
+
+        assert sv.utterances.keys() == {'utt-1', 'utt-3'}
+
+    def test_pickle(self, corpora):
+        sqlite_corpus = corpora[1]
+        sqlite_corpus.num_utterances
+
+        loaded = pickle.loads(pickle.dumps(sqlite_corpus))
+
+        assert loaded.num_utterances == 5
+        assert loaded.utterances['utt-1'].file.idx == 'wav-1'
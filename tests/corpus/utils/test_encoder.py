@@ -1,7 +1,11 @@
+import os
+import tempfile
 import unittest
 
 import numpy as np
+import pytest
 
+import audiomate
 from audiomate.corpus.utils import label_encoding
 from audiomate.corpus import assets
 from audiomate.utils import units
@@ -37,6 +41,76 @@ class TestFrameOneHotEncoder(unittest.TestCase):
 
         assert np.array_equal(expected, actual)
 
+    def test_encode_with_label_dict(self):
+        ds = resources.create_multi_label_corpus()
+        enc = label_encoding.FrameOneHotEncoder({'speech': 0, 'music': 2},
+                                                frame_settings=units.FrameSettings(32000, 16000),
+                                                sr=16000)
+
+        actual = enc.encode(ds.utterances['utt-6'])
+
+        assert actual.shape == (14, 3)
+        assert np.array_equal(actual[:, 0], [0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0])
+        assert np.array_equal(actual[:, 1], np.zeros(14))
+        assert np.array_equal(actual[:, 2], [1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1])
+
+    def test_encode_with_durations_does_not_open_file(self):
+        file = assets.File('file-idx', '/not/existing.wav')
+        utt = assets.Utterance('utt-idx', file, start=0, end=-1)
+        utt.set_label_list(assets.LabelList(labels=[
+            assets.Label('music', 0, 2),
+            assets.Label('speech', 1.5, -1)
+        ]))
+
+        enc = label_encoding.FrameOneHotEncoder(['music', 'speech'],
+                                                frame_settings=units.FrameSettings(16000, 16000),
+                                                sr=16000, durations={'utt-idx': 4})
+
+        actual = enc.encode(utt)
+
+        assert np.array_equal(actual, [[1, 0], [1, 1], [0, 1], [0, 1]])
+
+    def test_encode_utterances_equals_single_encoding(self):
+        ds = resources.create_multi_label_corpus()
+        enc = label_encoding.FrameOneHotEncoder(['music', 'speech'],
+                                                frame_settings=units.FrameSettings(32000, 16000),
+                                                sr=16000)
+
+        utterances = sorted(ds.utterances.values(), key=lambda u: u.idx)
+        actual = enc.encode_utterances(utterances)
+
+        assert len(actual) == len(utterances)
+
+        for utterance, encoded in zip(utterances, actual):
+            assert np.array_equal(encoded, enc.encode(utterance))
+
+    def test_encode_compacted_label_lists(self):
+        ds = resources.create_multi_label_corpus()
+        enc = label_encoding.FrameOneHotEncoder(['music', 'speech'],
+                                                frame_settings=units.FrameSettings(32000, 16000),
+                                                sr=16000)
+        utterances = sorted(ds.utterances.values(), key=lambda u: u.idx)
+        expected = enc.encode_utterances(utterances)
+
+        ds.compact_labels()
+        actual = enc.encode_utterances(utterances)
+
+        for expected_encoded, actual_encoded in zip(expected, actual):
+            assert np.array_equal(expected_encoded, actual_encoded)
+
+    def test_encode_corpus(self):
+        ds = resources.create_multi_label_corpus()
+        enc = label_encoding.FrameOneHotEncoder(['music', 'speech'],
+                                                frame_settings=units.FrameSettings(32000, 16000),
+                                                sr=16000)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with assets.FeatureContainer(os.path.join(tmp_dir, 'targets.h5')) as container:
+                enc.encode_corpus(ds, container)
+
+                assert set(container.keys()) == set(ds.utterances.keys())
+                assert np.array_equal(container.get('utt-6', mem_map=False), enc.encode(ds.utterances['utt-6']))
+
 
 class TestFrameOrdinalEncoder:
 
@@ -47,7 +121,7 @@ class TestFrameOrdinalEncoder:
                                                  sr=16000)
 
         actual = enc.encode(ds.utterances['utt-6'])
-        expected = np.array([0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0, 0]).astype(np.int)
+        expected = np.array([0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0, 0]).astype(int)
 
         assert np.array_equal(expected, actual)
 
@@ -65,7 +139,7 @@ class TestFrameOrdinalEncoder:
                                                  sr=16000)
 
         actual = enc.encode(utt)
-        expected = np.array([0, 0, 0, 0, 1, 1, 1]).astype(np.int)
+        expected = np.array([0, 0, 0, 0, 1, 1, 1]).astype(int)
 
         assert np.array_equal(expected, actual)
 
@@ -83,6 +157,124 @@ class TestFrameOrdinalEncoder:
                                                  sr=16000)
 
         actual = enc.encode(utt)
-        expected = np.array([1, 1, 0, 0]).astype(np.int)
+        expected = np.array([1, 1, 0, 0]).astype(int)
 
         assert np.array_equal(expected, actual)
+
+    def test_encode_label_starting_at_frame_start(self):
+        file = assets.File('file-idx', resources.sample_wav_file('wav_1.wav'))
+        utt = assets.Utterance('utt-idx', file, start=0, end=4)
+        ll = assets.LabelList(labels=[
+            assets.Label('music', 0, 4),
+            assets.Label('speech', 1, 1.2)
+        ])
+        utt.set_label_list(ll)
+
+        enc = label_encoding.FrameOrdinalEncoder(['music', 'speech'],
+                                                 frame_settings=units.FrameSettings(16000, 16000),
+                                                 sr=16000)
+
+        actual = enc.encode(utt)
+
+        assert np.array_equal(actual, [0, 0, 0, 0])
+
+    def test_encode_label_until_end_of_utterance(self):
+        file = assets.File('file-idx', resources.sample_wav_file('wav_1.wav'))
+        utt = assets.Utterance('utt-idx', file, start=0, end=4)
+        ll = assets.LabelList(labels=[
+            assets.Label('music', 0, 2.6),
+            assets.Label('speech', 2.4, -1)
+        ])
+        utt.set_label_list(ll)
+
+        enc = label_encoding.FrameOrdinalEncoder(['music', 'speech'],
+                                                 frame_settings=units.FrameSettings(16000, 16000),
+                                                 sr=16000)
+
+        actual = enc.encode(utt)
+
+        assert np.array_equal(actual, [0, 0, 0, 1])
+
+
+class TestTokenSequenceEncoder:
+
+    def test_encode_words_builds_vocabulary(self):
+        ds = resources.create_dataset()
+        enc = label_encoding.TokenSequenceEncoder(unit='word')
+
+        sequences = enc.encode_sequences(sorted(ds.utterances.values(), key=lambda u: u.idx),
+                                         label_list_idx=audiomate.corpus.LL_WORD_TRANSCRIPT)
+
+        assert enc.vocabulary == ['am', 'are', 'he', 'i', 'is', 'she', 'they', 'who', 'you']
+        assert sequences.utterance_ids == ['utt-1', 'utt-2', 'utt-3', 'utt-4', 'utt-5']
+        assert np.array_equal(sequences.offsets, [0, 3, 6, 9, 12, 15])
+        assert np.array_equal(sequences['utt-2'], [7, 1, 8])
+        assert sequences.decode('utt-4', delimiter=' ') == 'who are they'
+
+    def test_encode_characters(self):
+        ds = resources.create_dataset()
+        enc = label_encoding.TokenSequenceEncoder(unit='char')
+        enc.fit(ds, label_list_idx=audiomate.corpus.LL_WORD_TRANSCRIPT)
+
+        actual = enc.encode(ds.utterances['utt-1'], label_list_idx=audiomate.corpus.LL_WORD_TRANSCRIPT)
+
+        assert enc.vocabulary[0] == ' '
+        assert ''.join(enc.vocabulary[code] for code in actual) == 'who am i'
+
+    def test_encode_multiple_labels_in_order(self):
+        file = assets.File('file-idx', resources.sample_wav_file('wav_1.wav'))
+        utt = assets.Utterance('utt-idx', file)
+        utt.set_label_list(assets.LabelList(idx='phones', labels=[
+            assets.Label('l o', 0.4, 0.9),
+            assets.Label('h e', 0, 0.4),
+        ]))
+
+        enc = label_encoding.TokenSequenceEncoder(unit='phone', vocabulary=['e', 'h', 'l', 'o'])
+
+        actual = enc.encode(utt, label_list_idx='phones')
+
+        assert np.array_equal(actual, [1, 0, 2, 3])
+
+    def test_encode_unknown_token(self):
+        ds = resources.create_dataset()
+        enc = label_encoding.TokenSequenceEncoder(unit='word', vocabulary=['<unk>', 'who', 'am'], unknown_token='<unk>')
+
+        actual = enc.encode(ds.utterances['utt-1'], label_list_idx=audiomate.corpus.LL_WORD_TRANSCRIPT)
+
+        assert np.array_equal(actual, [1, 2, 0])
+
+    def test_encode_unknown_token_without_fallback_raises_error(self):
+        ds = resources.create_dataset()
+        enc = label_encoding.TokenSequenceEncoder(unit='word', vocabulary=['who', 'am'])
+
+        with pytest.raises(ValueError):
+            enc.encode(ds.utterances['utt-1'], label_list_idx=audiomate.corpus.LL_WORD_TRANSCRIPT)
+
+    def test_invalid_unit_raises_error(self):
+        with pytest.raises(ValueError):
+            label_encoding.TokenSequenceEncoder(unit='syllable')
+
+    def test_encode_corpus_stores_sequences_next_to_container(self, tmpdir):
+        ds = resources.create_dataset()
+        enc = label_encoding.TokenSequenceEncoder(unit='word')
+        container = assets.FeatureContainer(os.path.join(tmpdir.strpath, 'features.h5'))
+
+        sequences = enc.encode_corpus(ds, container, label_list_idx=audiomate.corpus.LL_WORD_TRANSCRIPT)
+        loaded = label_encoding.TokenSequences.load(label_encoding.TokenSequences.path_next_to(container))
+
+        assert os.path.isfile(os.path.join(tmpdir.strpath, 'features.h5.tokens'))
+        assert loaded.utterance_ids == sequences.utterance_ids
+        assert loaded.vocabulary == enc.vocabulary
+        assert np.array_equal(loaded.data, sequences.data)
+        assert np.array_equal(loaded.offsets, sequences.offsets)
+        assert loaded.decode('utt-5', delimiter=' ') == 'who is she'
+
+    def test_sequences_are_views_of_packed_data(self):
+        ds = resources.create_dataset()
+        enc = label_encoding.TokenSequenceEncoder(unit='word')
+
+        sequences = enc.encode_sequences(list(ds.utterances.values()),
+                                         label_list_idx=audiomate.corpus.LL_WORD_TRANSCRIPT)
+
+        assert sequences['utt-3'].base is sequences.data
+        assert np.array_equal(sequences.lengths, [3, 3, 3, 3, 3])
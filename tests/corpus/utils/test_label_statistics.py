@@ -0,0 +1,87 @@
+import pytest
+
+import audiomate
+from audiomate.corpus import assets
+from audiomate.corpus import subset
+from audiomate.corpus.utils import label_statistics
+
+from tests import resources
+
+
+@pytest.fixture()
+def corpus():
+    return resources.create_multi_label_corpus()
+
+
+class TestLabelStatistics(object):
+
+    def test_label_values(self, corpus):
+        stats = label_statistics.LabelStatistics(corpus.utterances.values())
+
+        assert stats.label_values() == {'music', 'speech'}
+        assert stats.label_values(label_list_ids=['unknown']) == set()
+
+    def test_label_count(self, corpus):
+        stats = label_statistics.LabelStatistics(corpus.utterances.values())
+
+        assert stats.label_count() == {'music': 11, 'speech': 7}
+
+    def test_label_durations(self, corpus):
+        stats = label_statistics.LabelStatistics(corpus.utterances.values())
+        durations = stats.label_durations()
+
+        assert durations['music'] == pytest.approx(44.0)
+        assert durations['speech'] == pytest.approx(45.0)
+
+    @pytest.mark.parametrize('compact', [False, True])
+    def test_per_utterance_matches_utterances(self, corpus, compact):
+        if compact:
+            corpus.compact_labels()
+
+        stats = label_statistics.LabelStatistics(corpus.utterances.values())
+        counts = stats.label_count_per_utterance()
+        durations = stats.label_durations_per_utterance()
+
+        assert set(counts.keys()) == set(corpus.utterances.keys())
+
+        for utt_idx, utterance in corpus.utterances.items():
+            assert counts[utt_idx] == utterance.label_count()
+            assert durations[utt_idx] == pytest.approx(utterance.label_total_duration())
+
+    def test_subset(self, corpus):
+        stats = label_statistics.LabelStatistics(corpus.utterances.values()).subset(['utt-4', 'utt-5'])
+
+        assert stats.utterance_ids == ['utt-4', 'utt-5']
+        assert stats.label_count() == {'music': 2, 'speech': 2}
+        assert set(stats.label_count_per_utterance().keys()) == {'utt-4', 'utt-5'}
+
+    def test_mixed_store_and_label_lists(self, corpus):
+        corpus.compact_labels()
+        corpus.utterances['utt-1'].set_label_list(assets.LabelList(idx='other', labels=[
+            assets.Label('noise', 0, 1.5)
+        ]))
+
+        stats = label_statistics.LabelStatistics(corpus.utterances.values())
+
+        assert stats.label_count() == {'music': 11, 'speech': 7, 'noise': 1}
+        assert stats.label_count(label_list_ids=['other']) == {'noise': 1}
+        assert stats.label_durations(label_list_ids=['other'])['noise'] == pytest.approx(1.5)
+
+    @pytest.mark.parametrize('compact', [False, True])
+    def test_counts_and_values_without_file_access(self, compact):
+        corpus = audiomate.Corpus()
+        corpus.new_file('/nonexistent/a.wav', 'a')
+        utterance = corpus.new_utterance('utt-1', 'a')
+        utterance.set_label_list(assets.LabelList(idx='default', labels=[assets.Label('a')]))
+        sv = subset.Subview(corpus, filter_criteria=[subset.MatchingUtteranceIdxFilter(utterance_idxs={'utt-1'})])
+
+        if compact:
+            corpus.compact_labels()
+
+        assert corpus.label_count() == {'a': 1}
+        assert corpus.all_label_values() == {'a'}
+        assert sv.label_count() == {'a': 1}
+        assert corpus.label_statistics().label_count_per_utterance() == {'utt-1': {'a': 1}}
+
+        with pytest.raises(Exception):
+            corpus.label_durations()
@@ -5,6 +5,8 @@ import pytest
 from audiomate.corpus import assets
 from audiomate.corpus.utils import relabeling
 
+from tests import resources
+
 
 class TestLabelListUtilities(object):
 
@@ -177,6 +179,67 @@ class TestLabelListUtilities(object):
         assert actual[4].end == 5.1
         assert actual[4].value == 'new_label_a'
 
+    def test_relabel_with_many_overlapping_labels(self):
+        label_list = assets.LabelList(labels=[assets.Label('v{:02}'.format(i), i, 100) for i in range(40)])
+        values = tuple('v{:02}'.format(i) for i in range(40))
+
+        actual = relabeling.relabel(label_list, {values: 'all', ('**',): 'some'})
+
+        assert len(actual) == 40
+        assert [label.value for label in actual] == ['some'] * 39 + ['all']
+        assert actual[39].start == 39
+        assert actual[39].end == 100
+
+    def test_relabel_label_lists(self):
+        label_lists = [
+            assets.LabelList(idx='a', labels=[
+                assets.Label('a', 3.2, 4.5),
+                assets.Label('b', 4.0, 4.9)
+            ]),
+            assets.LabelList(idx='b', labels=[]),
+            assets.LabelList(idx='c', labels=[
+                assets.Label('b', 1.0, -1),
+                assets.Label('a', 2.0, 4.0)
+            ])
+        ]
+
+        actual = relabeling.relabel_label_lists(label_lists, {('a',): 'x', ('b',): 'y', ('a', 'b'): 'z'})
+
+        assert [ll.idx for ll in actual] == ['a', 'b', 'c']
+        assert [(label.value, label.start, label.end) for label in actual[0]] == [
+            ('x', 3.2, 4.0), ('z', 4.0, 4.5), ('y', 4.5, 4.9)
+        ]
+        assert len(actual[1]) == 0
+        assert [(label.value, label.start, label.end) for label in actual[2]] == [
+            ('y', 1.0, 2.0), ('z', 2.0, 4.0), ('y', 4.0, -1)
+        ]
+
+    def test_relabel_label_lists_throws_error_if_any_unmapped(self):
+        label_lists = [
+            assets.LabelList(labels=[assets.Label('a', 3.2, 4.5)]),
+            assets.LabelList(labels=[assets.Label('b', 3.2, 4.5)])
+        ]
+
+        with pytest.raises(relabeling.UnmappedLabelsException):
+            relabeling.relabel_label_lists(label_lists, {('a',): 'x'})
+
+    def test_relabel_corpus(self):
+        corpus = resources.create_single_label_corpus()
+
+        relabeling.relabel_corpus(corpus, {('music',): 'm', ('speech',): ''})
+
+        assert corpus.utterances['utt-1'].label_lists['default'][0].value == 'm'
+        assert corpus.utterances['utt-1'].label_lists['default'][0].end == -1
+        assert len(corpus.utterances['utt-3'].label_lists['default']) == 0
+
+    def test_relabel_corpus_keeps_label_lists_if_unmapped(self):
+        corpus = resources.create_single_label_corpus()
+
+        with pytest.raises(relabeling.UnmappedLabelsException):
+            relabeling.relabel_corpus(corpus, {('music',): 'm'})
+
+        assert corpus.utterances['utt-1'].label_lists['default'][0].value == 'music'
+
     def test_load_projections_from_file(self):
         path = os.path.join(os.path.dirname(__file__), 'projections.txt')
         projections = relabeling.load_projections(path)
@@ -41,3 +41,100 @@ def test_move_all_files_from_subfolders_to_top_and_delete_subfolders(tmpdir):
     assert os.path.isdir(os.path.join(base_path, 'asub'))
     assert os.path.isfile(os.path.join(base_path, '1.txt'))
     assert os.path.isfile(os.path.join(base_path, '2.txt'))
+
+
+def test_staged_directory(tmpdir):
+    base_path = tmpdir.strpath
+
+    for name in ['a.txt', 'b.txt']:
+        with open(os.path.join(base_path, name), 'w') as f:
+            f.write('old')
+
+    with files.staged_directory(base_path) as tmp_path:
+        for name in ['a.txt', 'c.txt']:
+            with open(os.path.join(tmp_path, name), 'w') as f:
+                f.write('new')
+
+        assert open(os.path.join(base_path, 'a.txt')).read() == 'old'
+
+    assert sorted(os.listdir(base_path)) == ['a.txt', 'b.txt', 'c.txt']
+    assert open(os.path.join(base_path, 'a.txt')).read() == 'new'
+    assert open(os.path.join(base_path, 'b.txt')).read() == 'old'
+
+
+def test_staged_directory_discards_files_on_error(tmpdir):
+    base_path = tmpdir.strpath
+
+    with open(os.path.join(base_path, 'a.txt'), 'w') as f:
+        f.write('old')
+
+    try:
+        with files.staged_directory(base_path) as tmp_path:
+            with open(os.path.join(tmp_path, 'a.txt'), 'w') as f:
+                f.write('new')
+
+            raise ValueError()
+    except ValueError:
+        pass
+
+    assert os.listdir(base_path) == ['a.txt']
+    assert open(os.path.join(base_path, 'a.txt')).read() == 'old'
+
+
+def test_remove_staged_directories(tmpdir):
+    base_path = tmpdir.strpath
+
+    os.makedirs(os.path.join(base_path, '.staged-abc', 'sub'))
+    os.makedirs(os.path.join(base_path, 'features'))
+
+    with open(os.path.join(base_path, '.staged-abc', 'utterances.txt'), 'w') as f:
+        f.write('partial')
+
+    files.remove_staged_directories(base_path)
+    files.remove_staged_directories(os.path.join(base_path, 'missing'))
+
+    assert os.listdir(base_path) == ['features']
+
+
+def test_scan_directories(tmpdir):
+    base_path = tmpdir.strpath
+
+    for name in ['a', 'b', 'c']:
+        os.makedirs(os.path.join(base_path, name))
+
+    open(os.path.join(base_path, 'a', '1.txt'), 'w').close()
+    open(os.path.join(base_path, 'c', '2.txt'), 'w').close()
+    open(os.path.join(base_path, 'c', '3.txt'), 'w').close()
+
+    paths = [os.path.join(base_path, name) for name in ['c', 'b', 'a']]
+    entries = files.scan_directories(paths, num_threads=2)
+
+    names = [sorted(entry.name for entry in dir_entries) for dir_entries in entries]
+
+    assert names == [['2.txt', '3.txt'], [], ['1.txt']]
+    assert entries[0][0].path == os.path.join(base_path, 'c', entries[0][0].name)
+
+
+def test_parallel_map_with_threads():
+    assert list(files.parallel_map(abs, range(-50, 50), num_workers=3)) == [abs(x) for x in range(-50, 50)]
+
+
+def test_parallel_map_with_processes():
+    results = files.parallel_map(abs, range(-50, 50), num_workers=2, processes=True, chunk_size=7)
+    assert list(results) == [abs(x) for x in range(-50, 50)]
+
+
+def test_parallel_map_consumes_items_lazily():
+    consumed = []
+
+    def items():
+        for x in range(100):
+            consumed.append(x)
+            yield x
+
+    results = files.parallel_map(abs, items(), num_workers=2)
+
+    assert next(results) == 0
+    assert len(consumed) <= 5
+
+    results.close()
@@ -1,3 +1,5 @@
+import gc
+
 import pytest
 
 from audiomate.utils import misc
@@ -15,3 +17,22 @@ class TestMisc:
     ])
     def test_length_of_overlap(self, first_start, first_end, second_start, second_end, overlap):
         assert misc.length_of_overlap(first_start, first_end, second_start, second_end) == pytest.approx(overlap)
+
+    def test_paused_garbage_collection(self):
+        assert gc.isenabled()
+
+        with misc.paused_garbage_collection():
+            assert not gc.isenabled()
+
+        assert gc.isenabled()
+
+    def test_paused_garbage_collection_keeps_disabled_state(self):
+        gc.disable()
+
+        try:
+            with misc.paused_garbage_collection():
+                assert not gc.isenabled()
+
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
@@ -0,0 +1,27 @@
+from audiomate.utils import naming
+
+
+def test_index_name_if_in_list():
+    assert naming.index_name_if_in_list('a', ['b']) == 'a'
+    assert naming.index_name_if_in_list('a', ['a', 'a_1']) == 'a_2'
+
+
+class TestUniqueNames:
+
+    def test_index_name_returns_unused_name(self):
+        names = naming.UniqueNames({'b': 1})
+        assert names.index_name('a') == 'a'
+
+    def test_index_name_appends_next_free_index(self):
+        used = {'a': 1, 'a_1': 2, 'a_3': 3}
+        names = naming.UniqueNames(used)
+
+        for expected in ['a_2', 'a_4', 'a_5']:
+            name = names.index_name('a')
+            assert name == expected
+            used[name] = 0
+
+    def test_index_name_with_prefix_and_suffix(self):
+        names = naming.UniqueNames({'a', 'a_x1y'})
+        assert names.index_name('a', prefix='x', suffix='y') == 'a_x2y'
+        assert names.index_name('a') == 'a_1'
@@ -73,6 +73,87 @@ class TextFileUtilsTest(unittest.TestCase):
         self.assertTrue(lines[3].endswith('hallo-0_1'))
         self.assertTrue(lines[4].endswith('hallo-0_1'))
 
+    def test_read_separated_lines_generator_missing_file_raises_error(self):
+        with self.assertRaises(IOError):
+            list(textfile.read_separated_lines_generator('/not/existing/file.txt'))
+
+    def test_read_separated_lines_generator_ignores_lines_with_prefix(self):
+        path = self._write_temp_file('a 1\n# comment\n\n b  2 \n')
+
+        records = list(textfile.read_separated_lines_generator(path, ignore_lines_starting_with=['#']))
+
+        self.assertListEqual([['a', '1'], ['b', '', '2']], records)
+
+    def test_read_separated_columns(self):
+        path = self._write_temp_file('utt-1 0 1.5 hello world\n\nutt-2 1.5 -1  bye \r\nutt-3 2 3')
+
+        utt_ids, starts, ends, values = textfile.read_separated_columns(path, 4, float_columns=[1, 2])
+
+        self.assertListEqual(['utt-1', 'utt-2', 'utt-3'], utt_ids)
+        self.assertListEqual([0.0, 1.5, 2.0], starts.tolist())
+        self.assertListEqual([1.5, -1.0, 3.0], ends.tolist())
+        self.assertListEqual(['hello world', 'bye', ''], values)
+
+    def test_read_separated_columns_with_fill_values(self):
+        path = self._write_temp_file('utt-1 a\nutt-2 b 2.5\n')
+
+        _, file_ids, starts, ends = textfile.read_separated_columns(path, 4, fill_values=['', '', '0', '-1'],
+                                                                    float_columns=[2, 3])
+
+        self.assertListEqual(['a', 'b'], file_ids)
+        self.assertListEqual([0.0, 2.5], starts.tolist())
+        self.assertListEqual([-1.0, -1.0], ends.tolist())
+
+    def test_read_separated_columns_across_blocks(self):
+        lines = ['utt-{} {}'.format(index, index) for index in range(1000)]
+        path = self._write_temp_file('\n'.join(lines))
+        block_size = textfile.BLOCK_SIZE
+
+        try:
+            textfile.BLOCK_SIZE = 7
+            keys, values = textfile.read_separated_columns(path, 2, float_columns=[1])
+        finally:
+            textfile.BLOCK_SIZE = block_size
+
+        self.assertListEqual(['utt-{}'.format(index) for index in range(1000)], keys)
+        self.assertListEqual(list(range(1000)), values.tolist())
+
+    def test_read_separated_columns_empty_file(self):
+        path = self._write_temp_file('\n')
+
+        keys, values = textfile.read_separated_columns(path, 2, float_columns=[1])
+
+        self.assertListEqual([], keys)
+        self.assertEqual(0, values.size)
+
+    def test_read_separated_columns_missing_file_raises_error(self):
+        with self.assertRaises(IOError):
+            textfile.read_separated_columns('/not/existing/file.txt', 2)
+
+    def test_sorted_lines(self):
+        lines = textfile.SortedLines(buffer_size=2)
+
+        for key, line in [('c', 'c 1'), ('a', 'a 1'), ('b', 'b 1'), ('a', 'a 2'), ('c', 'c 2')]:
+            lines.add(key, line)
+
+        path = self._write_temp_file('')
+        lines.write(path, header='header')
+
+        with open(path, 'r', encoding='utf-8') as f:
+            self.assertEqual('header\na 1\na 2\nb 1\nc 1\nc 2\n', f.read())
+
+        self.assertEqual(0, len(lines))
+
+    def _write_temp_file(self, content):
+        f, path = tempfile.mkstemp(text=True)
+        os.close(f)
+
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+
+        self.addCleanup(os.remove, path)
+        return path
+
 
 if __name__ == '__main__':
     unittest.main()